@@ -0,0 +1,253 @@
+"""Benchmark cases for the frame pipeline hot paths.
+
+Themes come from the bundled src/trcc/data/Theme<W><H>.7z archives (real
+config1.dc files, backgrounds and masks), extracted once per run.  Device
+sends go through a VirtualProtocol with an unlimited link, so the numbers
+are host CPU cost only.
+"""
+import io
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List
+
+from harness import Bench, case
+
+# Fixed values so renders are comparable across runs and machines
+METRICS: Dict[str, Any] = {
+    'cpu_temp': 54.0, 'cpu_percent': 37.5, 'cpu_freq': 4200.0, 'cpu_power': 65.0,
+    'gpu_temp': 61.0, 'gpu_usage': 88.0, 'gpu_clock': 1950.0, 'gpu_power': 220.0,
+    'mem_percent': 42.0, 'mem_clock': 3200.0, 'mem_available': 18000.0,
+    'disk_activity': 3.0, 'net_total_up': 120.0, 'net_total_down': 880.0,
+    'date_year': 2026, 'date_month': 1, 'date_day': 2,
+    'time_hour': 12, 'time_minute': 34, 'time_second': 56, 'day_of_week': 4,
+    'date': 0, 'time': 0, 'weekday': 0,
+}
+
+ZT_FRAMES = 30
+LED_COUNT = 124  # LF12, the largest LED style
+
+
+# =========================================================================
+# Fixtures
+# =========================================================================
+
+def themes(bench: Bench) -> List[Path]:
+    """Theme directories (with config1.dc) bundled for this resolution."""
+    key = f'themes:{bench.width}x{bench.height}'
+    if key not in bench.fixtures:
+        from trcc.paths import _extract_7z
+        archive = (Path(__file__).resolve().parent.parent / 'src' / 'trcc' / 'data'
+                   / f'Theme{bench.width}{bench.height}.7z')
+        target = Path(bench.fixtures['tmp']) / archive.stem
+        if not target.exists() and not _extract_7z(str(archive), str(target)):
+            raise RuntimeError(f"Cannot extract {archive.name} (needs py7zr or 7z)")
+        bench.fixtures[key] = sorted(p.parent for p in target.glob('*/config1.dc'))
+    return bench.fixtures[key]
+
+
+def overlay_renderers(bench: Bench) -> list:
+    """One OverlayRenderer per bundled theme: DC config, background, mask."""
+    from PIL import Image
+
+    from trcc.dc_parser import dc_to_overlay_config, parse_dc_file
+    from trcc.overlay_renderer import OverlayRenderer
+
+    renderers = []
+    for theme in themes(bench):
+        r = OverlayRenderer(bench.width, bench.height)
+        r.set_config(dc_to_overlay_config(parse_dc_file(str(theme / 'config1.dc')),
+                                          bench.width, bench.height))
+        r.set_config_resolution(bench.width, bench.height)
+        with Image.open(theme / '00.png') as bg:
+            r.set_background(bg.convert('RGB'))
+        mask = theme / '01.png'
+        if mask.exists():
+            with Image.open(mask) as m:
+                r.set_theme_mask(m.convert('RGBA'))
+        renderers.append(r)
+    return renderers
+
+
+def frame(bench: Bench):
+    """A rendered theme frame (realistic content for the conversion stages)."""
+    return overlay_renderers(bench)[0].render(METRICS)
+
+
+def controller(bench: Bench):
+    """FormCZTVController at the bench resolution (50% brightness, 90 deg)."""
+    from trcc.core.controllers import FormCZTVController
+    ctrl = FormCZTVController()
+    bench.defer(ctrl.cleanup)
+    ctrl.lcd_width, ctrl.lcd_height = bench.width, bench.height
+    ctrl.brightness = 50
+    ctrl.rotation = 90
+    return ctrl
+
+
+def theme_zt(bench: Bench) -> str:
+    """A ZT_FRAMES-frame Theme.zt at the bench resolution."""
+    from PIL import Image
+
+    path = os.path.join(bench.fixtures['tmp'], f'Theme{bench.width}x{bench.height}.zt')
+    if not os.path.exists(path):
+        base = frame(bench)
+        blobs = []
+        for i in range(ZT_FRAMES):
+            buf = io.BytesIO()
+            Image.eval(base, lambda v, i=i: (v + i * 8) & 0xFF).save(
+                buf, format='JPEG', quality=90)
+            blobs.append(buf.getvalue())
+        with open(path, 'wb') as f:
+            f.write(struct.pack('<Bi', 0xDC, ZT_FRAMES))
+            f.write(struct.pack(f'<{ZT_FRAMES}i', *(i * 42 for i in range(ZT_FRAMES))))
+            for blob in blobs:
+                f.write(struct.pack('<i', len(blob)))
+                f.write(blob)
+    return path
+
+
+def _cycle(items, fn):
+    """Callable applying *fn* to the next item on each call."""
+    state = {'i': 0}
+
+    def call():
+        item = items[state['i'] % len(items)]
+        state['i'] += 1
+        return fn(item)
+    return call
+
+
+# =========================================================================
+# Overlay
+# =========================================================================
+
+@case('overlay.render')
+def overlay_render(bench):
+    """OverlayRenderer.render, bundled themes in turn, same metrics every call."""
+    return _cycle(overlay_renderers(bench), lambda r: r.render(METRICS))
+
+
+@case('overlay.render_changing')
+def overlay_render_changing(bench):
+    """OverlayRenderer.render with new metric values on every call."""
+    renderers = overlay_renderers(bench)
+    state = {'n': 0}
+
+    def call():
+        state['n'] += 1
+        n = state['n']
+        metrics = dict(METRICS, cpu_temp=40.0 + n % 50, cpu_percent=float(n % 100),
+                       gpu_temp=50.0 + n % 40, time_second=n % 60)
+        return renderers[n % len(renderers)].render(metrics)
+    return call
+
+
+# =========================================================================
+# Frame conversion (FormCZTVController)
+# =========================================================================
+
+@case('frame.apply_brightness')
+def apply_brightness(bench):
+    """FormCZTVController._apply_brightness at 50%."""
+    ctrl, img = controller(bench), frame(bench)
+    return lambda: ctrl._apply_brightness(img)
+
+
+@case('frame.apply_rotation')
+def apply_rotation(bench):
+    """FormCZTVController._apply_rotation at 90 degrees."""
+    ctrl, img = controller(bench), frame(bench)
+    return lambda: ctrl._apply_rotation(img)
+
+
+@case('frame.image_to_rgb565')
+def image_to_rgb565(bench):
+    """FormCZTVController._image_to_rgb565, brightness 50% + rotation 90 fused."""
+    ctrl, img = controller(bench), frame(bench)
+    return lambda: ctrl._image_to_rgb565(img, ctrl.brightness, ctrl.rotation)
+
+
+# =========================================================================
+# Packets
+# =========================================================================
+
+@case('hid.type3_packet')
+def type3_packet(bench):
+    """HidDeviceType3.build_frame_packet on a full RGB565 frame."""
+    from trcc.hid_device import HidDeviceType3
+    data = os.urandom(bench.width * bench.height * 2)
+    return lambda: HidDeviceType3.build_frame_packet(data)
+
+
+@case('led.packet', per_resolution=False)
+def led_packet(bench):
+    """LedPacketBuilder.build_led_packet for LED_COUNT LEDs at 80% brightness."""
+    from trcc.led_device import LedPacketBuilder
+    colors = [((i * 7) & 0xFF, (i * 13) & 0xFF, (i * 29) & 0xFF) for i in range(LED_COUNT)]
+    return lambda: LedPacketBuilder.build_led_packet(colors, None, True, 80)
+
+
+# =========================================================================
+# Loading
+# =========================================================================
+
+@case('dc.parse')
+def dc_parse(bench):
+    """parse_dc_file over the bundled config1.dc files in turn."""
+    from trcc.dc_parser import parse_dc_file
+    return _cycle([str(t / 'config1.dc') for t in themes(bench)], parse_dc_file)
+
+
+@case('zt.load')
+def zt_load(bench):
+    """ThemeZtPlayer load of a ZT_FRAMES-frame Theme.zt, every frame decoded."""
+    from trcc.gif_animator import ThemeZtPlayer
+    path = theme_zt(bench)
+
+    def load():
+        player = ThemeZtPlayer(path, (bench.width, bench.height))
+        for img in player.frames:
+            img.load()  # PIL opens JPEGs lazily; playback decodes them
+        return player
+    return load
+
+
+@case('metrics.get_all', per_resolution=False)
+def get_all_metrics(bench):
+    """system_info.get_all_metrics on this machine's sensors."""
+    from trcc.system_info import get_all_metrics
+    return get_all_metrics
+
+
+# =========================================================================
+# End to end: render -> convert -> device send (loopback)
+# =========================================================================
+
+def _pipeline(bench, kind, device_type=2):
+    from trcc.virtual_device import LinkProfile, VirtualProtocol
+
+    ctrl = controller(bench)
+    renderers = overlay_renderers(bench)
+    proto = VirtualProtocol(kind, device_type, profile=LinkProfile())
+    bench.defer(proto.close)
+    w, h = bench.width, bench.height
+
+    def send(r):
+        img = r.render(METRICS)
+        if not proto.send_image(ctrl._image_to_rgb565(img, ctrl.brightness, ctrl.rotation),
+                                w, h):
+            raise RuntimeError("virtual send failed")
+    return _cycle(renderers, send)
+
+
+@case('pipeline.scsi')
+def pipeline_scsi(bench):
+    """Overlay render + RGB565 + SCSI chunked send to a VirtualProtocol."""
+    return _pipeline(bench, 'scsi')
+
+
+@case('pipeline.hid_type3')
+def pipeline_hid_type3(bench):
+    """Overlay render + RGB565 + HID Type 3 packet/ACK to a VirtualProtocol."""
+    return _pipeline(bench, 'hid', 3)
@@ -0,0 +1,173 @@
+"""Benchmark registry, timing loop and JSON report / comparison.
+
+A case is a setup function registered with ``@case(name)``; it receives a
+Bench (resolution + shared fixtures) and returns the zero-argument callable
+to time.  Cleanup goes through ``bench.defer()``.
+
+Results are keyed ``"<case>@<W>x<H>"`` (or just ``"<case>"`` for cases
+that do not depend on the resolution), so two reports diff line by line.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Resolution = Tuple[int, int]
+
+RESOLUTIONS: List[Resolution] = [(240, 240), (320, 320), (480, 480), (640, 480)]
+REPORT_VERSION = 1
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[['Bench'], Callable[[], Any]]
+    per_resolution: bool = True
+    doc: str = ''
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, per_resolution: bool = True):
+    """Register a benchmark setup function under *name*."""
+    def register(setup):
+        CASES[name] = Case(name, setup, per_resolution, (setup.__doc__ or '').strip())
+        return setup
+    return register
+
+
+@dataclass
+class Bench:
+    """What a case setup gets: the resolution and a shared fixture store."""
+    resolution: Optional[Resolution]
+    fixtures: Dict[str, Any]
+    _cleanup: List[Callable[[], Any]] = field(default_factory=list)
+
+    @property
+    def width(self) -> int:
+        return self.resolution[0] if self.resolution else 320
+
+    @property
+    def height(self) -> int:
+        return self.resolution[1] if self.resolution else 320
+
+    def defer(self, fn: Callable[[], Any]) -> None:
+        """Run *fn* after the case has been measured."""
+        self._cleanup.append(fn)
+
+    def close(self) -> None:
+        while self._cleanup:
+            self._cleanup.pop()()
+
+
+def measure(fn: Callable[[], Any], calls: int, max_seconds: float) -> Dict[str, float]:
+    """Time *fn* for *calls* calls (fewer, but at least 3, past *max_seconds*)."""
+    fn()  # Warm up: caches, buffers, handshakes
+    times = []
+    deadline = time.perf_counter() + max_seconds
+    for i in range(calls):
+        start = time.perf_counter()
+        fn()
+        end = time.perf_counter()
+        times.append((end - start) * 1e3)
+        if i >= 2 and end > deadline:
+            break
+    mean = statistics.fmean(times)
+    ordered = sorted(times)
+    return {
+        'calls': len(times),
+        'ms_per_call': round(mean, 4),
+        'p50_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        'min_ms': round(ordered[0], 4),
+        'fps': round(1e3 / mean, 1) if mean else 0.0,
+    }
+
+
+def result_key(name: str, resolution: Optional[Resolution]) -> str:
+    return f"{name}@{resolution[0]}x{resolution[1]}" if resolution else name
+
+
+def run_cases(names: List[str], resolutions: List[Resolution], calls: int,
+              max_seconds: float, fixtures: Dict[str, Any],
+              log: Callable[[str], None] = print) -> Dict[str, Dict[str, Any]]:
+    """Measure every (case, resolution); failures are recorded, not raised."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        c = CASES[name]
+        for res in (resolutions if c.per_resolution else [None]):
+            key = result_key(name, res)
+            bench = Bench(res, fixtures)
+            try:
+                fn = c.setup(bench)
+                results[key] = measure(fn, calls, max_seconds)
+            except Exception as e:
+                results[key] = {'error': f"{type(e).__name__}: {e}"}
+            finally:
+                bench.close()
+            r = results[key]
+            if 'error' in r:
+                log(f"{key:<36} ERROR {r['error']}")
+            else:
+                log(f"{key:<36} {r['p50_ms']:>9.3f} ms  {r['fps']:>9.1f}/s  "
+                    f"(n={r['calls']})")
+    return results
+
+
+def make_report(results: Dict[str, Dict[str, Any]], calls: int) -> Dict[str, Any]:
+    try:
+        from trcc.__version__ import __version__
+    except Exception:
+        __version__ = 'unknown'
+    return {
+        'version': REPORT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'trcc': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'calls': calls,
+        'results': results,
+    }
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    """Sorted, indented JSON: one metric per line, stable across runs."""
+    text = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if path == '-':
+        sys.stdout.write(text)
+    else:
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float,
+            log: Callable[[str], None] = print) -> List[str]:
+    """Print p50 changes between two reports; returns the regressed keys.
+
+    A case regresses when its median got more than *threshold* percent
+    slower (or started failing).
+    """
+    regressions = []
+    old_results = old.get('results', {})
+    for key, r in sorted(new.get('results', {}).items()):
+        before = old_results.get(key)
+        if before is None or 'p50_ms' not in before:
+            continue
+        if 'p50_ms' not in r:
+            regressions.append(key)
+            log(f"{key:<36} now failing: {r.get('error')}")
+            continue
+        change = (r['p50_ms'] / before['p50_ms'] - 1) * 100 if before['p50_ms'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        log(f"{key:<36} {before['p50_ms']:>9.3f} -> {r['p50_ms']:>9.3f} ms "
+            f"({change:+6.1f}%){flag}")
+    return regressions
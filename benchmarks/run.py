@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Frame pipeline benchmarks: time per call and calls per second, as JSON.
+
+Runs every case in cases.py at 240x240, 320x320, 480x480 and 640x480
+(resolution-independent cases once) and writes a report whose keys are
+stable, so two reports can be diffed or compared with --compare.
+
+Usage:
+    python benchmarks/run.py                          # all cases, report to stdout log
+    python benchmarks/run.py -o before.json
+    python benchmarks/run.py -o after.json --compare before.json
+    python benchmarks/run.py -k overlay -r 320x320 -n 50
+    python benchmarks/run.py --list
+"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import cases  # noqa: E402,F401  (registers the cases)
+from harness import CASES, RESOLUTIONS, compare, make_report, run_cases, write_report  # noqa: E402
+
+
+def _resolution(text):
+    try:
+        w, h = text.lower().split('x')
+        return int(w), int(h)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-o', '--output', help="write the JSON report here ('-' = stdout)")
+    parser.add_argument('-n', '--calls', type=int, default=100,
+                        help='timed calls per case (default 100)')
+    parser.add_argument('-t', '--max-seconds', type=float, default=5.0,
+                        help='stop a case early after this long (default 5)')
+    parser.add_argument('-k', '--filter', action='append', default=[],
+                        help='only cases whose name contains this (repeatable)')
+    parser.add_argument('-r', '--resolution', type=_resolution, action='append',
+                        help='only this WxH (repeatable)')
+    parser.add_argument('--compare', metavar='REPORT',
+                        help='compare medians with an earlier report; exit 1 on regression')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent slowdown counted as a regression (default 10)')
+    parser.add_argument('--list', action='store_true', help='list cases and exit')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, c in CASES.items():
+            scope = '' if c.per_resolution else '  (resolution-independent)'
+            print(f"{name:<26} {c.doc}{scope}")
+        return 0
+
+    names = [n for n in CASES if not args.filter or any(f in n for f in args.filter)]
+    if not names:
+        parser.error(f"no case matches {args.filter}")
+    log = (lambda s: print(s, file=sys.stderr)) if args.output == '-' else print
+
+    with tempfile.TemporaryDirectory(prefix='trcc_bench_') as tmp:
+        results = run_cases(names, args.resolution or RESOLUTIONS, args.calls,
+                            args.max_seconds, {'tmp': tmp}, log)
+    report = make_report(results, args.calls)
+    if args.output:
+        write_report(report, args.output)
+
+    failed = [k for k, r in results.items() if 'error' in r]
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        log('')
+        if compare(baseline, report, args.threshold, log):
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -106,6 +106,10 @@ Examples:
         action="store_true",
         help="Use decorated window (normal window with titlebar, can minimize)"
     )
+    gui_parser.add_argument(
+        "--source", metavar="NAME",
+        help="Show frames from a shared-memory ring (name or path) instead of the theme"
+    )
 
     # Detect command
     detect_parser = subparsers.add_parser("detect", help="Detect LCD device")
@@ -147,6 +151,27 @@ Examples:
     # Resume command
     subparsers.add_parser("resume", help="Send last-used theme to each detected device (headless)")
 
+    # Headless daemon (live themes without GUI)
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Run saved themes, overlays and LED effects on all devices (headless)")
+    daemon_parser.add_argument("--socket", help="Control socket path (default: $XDG_RUNTIME_DIR/trcc.sock)")
+    daemon_parser.add_argument("--no-control", action="store_true", help="Don't open the control socket")
+
+    # Control client for a running daemon
+    ctl_parser = subparsers.add_parser(
+        "ctl", help="Send commands to a running daemon (e.g. brightness level=3 + stats)")
+    ctl_parser.add_argument(
+        "commands", nargs="+",
+        help="cmd [key=value ...], several joined with '+': ping, devices, theme, "
+             "brightness, rotation, image, stats")
+    ctl_parser.add_argument("--socket", help="Control socket path")
+
+    # Baked video playback setting
+    baked_parser = subparsers.add_parser(
+        "baked-playback", help="Cache looping video frames as device bytes (GUI and daemon)")
+    baked_parser.add_argument("state", nargs="?", choices=["on", "off"],
+                              help="Turn on or off (omit to show the current setting)")
+
     # Uninstall command
     subparsers.add_parser("uninstall", help="Remove all TRCC config, udev rules, and autostart files")
 
@@ -184,7 +209,7 @@ Examples:
         return 0
 
     if args.command == "gui":
-        return gui(verbose=args.verbose, decorated=args.decorated)
+        return gui(verbose=args.verbose, decorated=args.decorated, source=args.source)
     elif args.command == "detect":
         return detect(show_all=args.all)
     elif args.command == "select":
@@ -205,6 +230,12 @@ Examples:
         return install_desktop()
     elif args.command == "resume":
         return resume()
+    elif args.command == "daemon":
+        return daemon(socket_path=args.socket, control=not args.no_control)
+    elif args.command == "ctl":
+        return ctl(args.commands, socket_path=args.socket)
+    elif args.command == "baked-playback":
+        return baked_playback(args.state)
     elif args.command == "uninstall":
         return uninstall()
     elif args.command == "led-diag":
@@ -220,13 +251,14 @@ Examples:
     return 0
 
 
-def gui(verbose=0, decorated=False, start_hidden=False):
+def gui(verbose=0, decorated=False, start_hidden=False, source=None):
     """Launch the GUI application.
 
     Args:
         verbose: Logging verbosity (0=warning, 1=info, 2=debug).
         decorated: Use decorated window with titlebar.
         start_hidden: Start minimized to system tray (used by --last-one autostart).
+        source: Shared-memory ring name or path to show (shm_source).
     """
     import logging
 
@@ -242,7 +274,7 @@ def gui(verbose=0, decorated=False, start_hidden=False):
     try:
         from trcc.qt_components.qt_app_mvc import run_mvc_app
         print("[TRCC] Starting LCD Control Center...")
-        return run_mvc_app(decorated=decorated, start_hidden=start_hidden)
+        return run_mvc_app(decorated=decorated, start_hidden=start_hidden, source=source)
     except ImportError as e:
         print(f"Error: PyQt6 not available: {e}")
         print("Install with: pip install PyQt6")
@@ -484,36 +516,20 @@ def resume():
                 continue
 
             try:
-                from PIL import Image, ImageEnhance
+                from PIL import Image
+
+                from trcc.rgb565 import image_to_rgb565
 
                 driver = LCDDriver(device_path=dev.scsi_device)
                 w, h = driver.implementation.resolution
 
                 img = Image.open(image_path).convert("RGB").resize((w, h))
 
-                # Apply brightness
+                # Brightness + rotation are applied during RGB565 conversion
                 brightness_level = cfg.get("brightness_level", 3)
                 brightness_pct = {1: 25, 2: 50, 3: 100}.get(brightness_level, 100)
-                if brightness_pct < 100:
-                    img = ImageEnhance.Brightness(img).enhance(brightness_pct / 100.0)
-
-                # Apply rotation
                 rotation = cfg.get("rotation", 0)
-                if rotation == 90:
-                    img = img.transpose(Image.Transpose.ROTATE_270)
-                elif rotation == 180:
-                    img = img.transpose(Image.Transpose.ROTATE_180)
-                elif rotation == 270:
-                    img = img.transpose(Image.Transpose.ROTATE_90)
-
-                # Convert to RGB565 and send (must match controllers._image_to_rgb565)
-                import numpy as np
-                arr = np.array(img, dtype=np.uint16)
-                r = (arr[:, :, 0] >> 3) & 0x1F
-                g = (arr[:, :, 1] >> 2) & 0x3F
-                b = (arr[:, :, 2] >> 3) & 0x1F
-                rgb565 = (r << 11) | (g << 5) | b
-                frame = rgb565.astype('>u2').tobytes()
+                frame = image_to_rgb565(img, brightness_pct, rotation)
 
                 driver.send_frame(frame)
                 print(f"  [{dev.product_name}] Sent: {os.path.basename(theme_path)}")
@@ -533,6 +549,52 @@ def resume():
         return 1
 
 
+def daemon(socket_path=None, control=True):
+    """Run every detected device's saved theme live (headless, no Qt)."""
+    try:
+        from trcc.daemon import run_daemon
+        return run_daemon(socket_path=socket_path, control=control)
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+def ctl(commands, socket_path=None):
+    """Send one batch of commands to a running daemon and print the replies."""
+    import json
+
+    from trcc.control import parse_command_args, send_commands
+
+    try:
+        batch = parse_command_args(commands)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    try:
+        replies = send_commands(batch, socket_path)
+    except OSError as e:
+        print(f"Error: cannot reach trcc daemon: {e}")
+        return 1
+    for reply in replies:
+        print(json.dumps(reply))
+    return 0 if all(r.get('ok') for r in replies) else 1
+
+
+def baked_playback(state=None):
+    """Show or save the baked video playback setting."""
+    from trcc.paths import get_saved_baked_playback, save_baked_playback
+
+    if state is not None:
+        save_baked_playback(state == "on")
+    enabled = get_saved_baked_playback()
+    print(f"Baked playback: {'on' if enabled else 'off'}")
+    if state is not None:
+        print("Applies the next time the GUI or daemon starts.")
+    return 0
+
+
 def reset_device(device=None):
     """Reset/reinitialize the LCD device."""
     try:
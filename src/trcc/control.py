@@ -0,0 +1,315 @@
+"""
+Local control socket for ``trcc daemon`` (``trcc ctl`` is the client).
+
+Unix-domain stream socket, JSON lines.  Each request line is one command
+object, or a JSON array of commands that run together in one scheduler
+turn (one round-trip for a whole batch).  Each answer is one line: an
+object, or an array in the same order as the batch::
+
+    -> {"cmd": "brightness", "level": 3}
+    <- {"ok": true}
+    -> [{"cmd": "theme", "path": "/path/Theme320320/003a", "device": 0},
+        {"cmd": "stats", "device": 0}]
+    <- [{"ok": true}, {"ok": true, "devices": [{"index": 0, ...}]}]
+
+Commands (``device`` = session index or device path; omitted = all LCDs):
+
+    ping                        liveness check
+    devices                     list sessions
+    theme       path            switch theme (saved, like the GUI)
+    brightness  level (1-3)     saved as brightness_level
+    rotation    degrees         0/90/180/270, saved
+    image       path            show an image file (not saved)
+    source      path            take frames from a shared-memory ring
+                                (shm_source); path null = back to the theme
+    stats                       frame / latency counters per device
+
+Commands run on the daemon's scheduler thread, so they never race the
+video and overlay ticks.  The socket is created mode 0600.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+COMMAND_TIMEOUT = 10.0  # s, one request (including theme loads)
+
+
+def default_socket_path() -> str:
+    """$XDG_RUNTIME_DIR/trcc.sock, or /tmp/trcc-<uid>.sock without a runtime dir."""
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, 'trcc.sock')
+    return f'/tmp/trcc-{os.getuid()}.sock'
+
+
+class CommandError(Exception):
+    """Invalid command or arguments (reported back as ok=false)."""
+
+
+# =============================================================================
+# Command dispatch (runs on the scheduler thread)
+# =============================================================================
+
+def _select(daemon, args: Dict[str, Any], lcd_only: bool = True) -> List[Any]:
+    """Sessions addressed by args['device'] (index or path; default all)."""
+    from .daemon import LcdSession
+
+    sessions = list(enumerate(daemon.sessions))
+    target = args.get('device')
+    if target is not None:
+        if isinstance(target, int) and not isinstance(target, bool):
+            sessions = [(i, s) for i, s in sessions if i == target]
+        else:
+            sessions = [(i, s) for i, s in sessions if s.device.path == str(target)]
+        if not sessions:
+            raise CommandError(f"No such device: {target}")
+    if lcd_only:
+        sessions = [(i, s) for i, s in sessions if isinstance(s, LcdSession)]
+        if not sessions:
+            raise CommandError("No LCD device selected")
+    return sessions
+
+
+def _require(args: Dict[str, Any], key: str) -> Any:
+    if key not in args:
+        raise CommandError(f"Missing argument: {key}")
+    return args[key]
+
+
+def _describe(index: int, session) -> Dict[str, Any]:
+    from .daemon import LcdSession
+
+    device = session.device
+    info: Dict[str, Any] = {
+        'index': index,
+        'name': session.name,
+        'path': device.path,
+        'kind': 'lcd' if isinstance(session, LcdSession) else 'led',
+        'resolution': list(device.resolution),
+    }
+    if isinstance(session, LcdSession):
+        theme = session.controller.current_theme_path
+        info['theme'] = str(theme) if theme else None
+    return info
+
+
+def _cmd_ping(daemon, args):
+    return {}
+
+
+def _cmd_devices(daemon, args):
+    return {'devices': [_describe(i, s) for i, s in _select(daemon, args, lcd_only=False)]}
+
+
+def _cmd_theme(daemon, args):
+    path = Path(_require(args, 'path')).expanduser()
+    for _, session in _select(daemon, args):
+        session.load_theme(path)
+    return {}
+
+
+def _cmd_brightness(daemon, args):
+    level = _require(args, 'level')
+    for _, session in _select(daemon, args):
+        session.set_brightness_level(int(level))
+    return {}
+
+
+def _cmd_rotation(daemon, args):
+    degrees = _require(args, 'degrees')
+    for _, session in _select(daemon, args):
+        session.set_rotation(int(degrees))
+    return {}
+
+
+def _cmd_image(daemon, args):
+    path = Path(_require(args, 'path')).expanduser()
+    for _, session in _select(daemon, args):
+        session.show_image(path)
+    return {}
+
+
+def _cmd_source(daemon, args):
+    path = _require(args, 'path')
+    if path:
+        from .shm_source import shm_path
+        path = shm_path(str(path))
+    for _, session in _select(daemon, args):
+        session.set_source(path)
+    return {}
+
+
+def _cmd_stats(daemon, args):
+    return {'devices': [dict(_describe(i, s), **s.stats()) for i, s in _select(daemon, args)]}
+
+
+COMMANDS: Dict[str, Callable[[Any, Dict[str, Any]], Dict[str, Any]]] = {
+    'ping': _cmd_ping,
+    'devices': _cmd_devices,
+    'theme': _cmd_theme,
+    'brightness': _cmd_brightness,
+    'rotation': _cmd_rotation,
+    'image': _cmd_image,
+    'source': _cmd_source,
+    'stats': _cmd_stats,
+}
+
+
+def execute(daemon, command: Any) -> Dict[str, Any]:
+    """Run one command object; errors become {"ok": false, "error": ...}."""
+    if not isinstance(command, dict):
+        return {'ok': False, 'error': 'Command must be a JSON object'}
+    handler = COMMANDS.get(command.get('cmd'))
+    if handler is None:
+        return {'ok': False, 'error': f"Unknown command: {command.get('cmd')}"}
+    try:
+        return dict(handler(daemon, command), ok=True)
+    except (CommandError, ValueError, TypeError) as e:
+        return {'ok': False, 'error': str(e)}
+    except Exception as e:
+        print(f"[!] Control command {command.get('cmd')} failed: {e}")
+        return {'ok': False, 'error': str(e)}
+
+
+def execute_request(daemon, request: Any) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """One request line: a command object or a batch (list) of them."""
+    if isinstance(request, list):
+        return [execute(daemon, command) for command in request]
+    return execute(daemon, request)
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        server: 'ControlServer' = self.server  # type: ignore[assignment]
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                reply: Any = {'ok': False, 'error': f"Invalid JSON: {e}"}
+            else:
+                reply = server.run_request(request)
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Accepts ctl connections on a background thread.
+
+    Each request is handed to the daemon's scheduler and the connection
+    thread waits for the result, so commands are serialized with the
+    device ticks.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, daemon, path: Optional[str] = None):
+        self.daemon = daemon
+        self.path = path or default_socket_path()
+        _remove_stale_socket(self.path)
+        old_umask = os.umask(0o177)  # Socket file mode 0600
+        try:
+            super().__init__(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._thread: Optional[threading.Thread] = None
+
+    def run_request(self, request: Any) -> Any:
+        future = self.daemon.scheduler.submit(lambda: execute_request(self.daemon, request))
+        try:
+            return future.result(COMMAND_TIMEOUT)
+        except Exception as e:
+            return {'ok': False, 'error': f"Command did not complete: {e}"}
+
+    def start(self) -> None:
+        """Serve on a daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name='trcc-ctl',
+                                        daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop serving and remove the socket file."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Delete a socket file left by a dead daemon; refuse if one is alive."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"Another trcc daemon is listening on {path}")
+    finally:
+        probe.close()
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+def send_commands(commands: List[Dict[str, Any]], path: Optional[str] = None,
+                  timeout: float = COMMAND_TIMEOUT) -> List[Dict[str, Any]]:
+    """Send a batch of commands in one round-trip; returns one reply per command.
+
+    Raises:
+        OSError: daemon not running / socket not reachable.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or default_socket_path())
+        sock.sendall(json.dumps(commands).encode() + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise OSError("Daemon closed the connection")
+    replies = json.loads(line)
+    if not isinstance(replies, list):
+        replies = [replies]
+    return replies
+
+
+def parse_command_args(argv: List[str]) -> List[Dict[str, Any]]:
+    """``cmd key=value ... + cmd key=value`` -> list of command objects.
+
+    Values are read as JSON where possible (numbers, true/false), else as
+    strings: ``brightness level=3 device=0 + stats``.
+    """
+    commands: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for arg in argv:
+        if arg == '+':
+            current = None
+            continue
+        if current is None:
+            current = {'cmd': arg}
+            commands.append(current)
+            continue
+        key, sep, value = arg.partition('=')
+        if not sep:
+            raise ValueError(f"Expected key=value, got {arg!r}")
+        try:
+            current[key] = json.loads(value)
+        except ValueError:
+            current[key] = value
+    return commands
@@ -11,10 +11,11 @@ from __future__ import annotations
 import json
 import shutil
 import tempfile
-import threading
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from ..frame_diff import FrameDiff
+from ..jpeg_encoder import AdaptiveJpegEncoder
 from ..paths import (
     ensure_themes_extracted,
     ensure_web_extracted,
@@ -24,6 +25,7 @@ from ..paths import (
     get_web_masks_dir,
     save_resolution,
 )
+from ..rgb565 import BakedFrames, Rgb565Converter
 from .models import (
     DeviceInfo,
     DeviceModel,
@@ -119,6 +121,26 @@ class ThemeController:
             self.on_theme_selected(theme)
 
 
+def _device_id(device: DeviceInfo) -> Tuple[int, int, str]:
+    """Identity of a physical device (same fields as the protocol cache key)."""
+    return (device.vid, device.pid, device.path)
+
+
+def _rotate_rect(rect: Tuple[int, int, int, int], size: Tuple[int, int],
+                 rotation: int) -> Tuple[int, int, int, int]:
+    """*rect* of a *size* image, in the coordinates of the image after
+    FormCZTVController._apply_rotation (directionB *rotation*)."""
+    x0, y0, x1, y1 = rect
+    w, h = size
+    if rotation == 90:  # PIL ROTATE_270 (CW)
+        return (h - y1, x0, h - y0, x1)
+    if rotation == 180:
+        return (w - x1, h - y1, w - x0, h - y0)
+    if rotation == 270:  # PIL ROTATE_90 (CCW)
+        return (y0, w - x1, y1, w - x0)
+    return rect
+
+
 class DeviceController:
     """
     Controller for device management.
@@ -128,6 +150,11 @@ class DeviceController:
 
     def __init__(self):
         self.model = DeviceModel()
+        self.frame_diff = FrameDiff()  # Selected device
+
+        # Mirroring: every attached LCD shows the selected device's frames
+        self.mirroring = False
+        self._mirror_diffs: Dict[Tuple[int, int, str], FrameDiff] = {}
 
         # View callbacks
         self.on_devices_changed: Optional[Callable[[List[DeviceInfo]], None]] = None
@@ -156,23 +183,121 @@ class DeviceController:
         """Get currently selected device."""
         return self.model.selected_device
 
-    def send_image_async(self, rgb565_data: bytes, width: int, height: int):
+    def set_mirroring(self, enabled: bool):
+        """Send every frame to all attached LCDs, not just the selected one."""
+        self.mirroring = enabled
+        self._mirror_diffs.clear()
+
+    def get_targets(self) -> List[DeviceInfo]:
+        """Devices that receive frames: the selected one first, then mirrors."""
+        selected = self.model.selected_device
+        if not selected:
+            return []
+        if not self.mirroring:
+            return [selected]
+        mirrors = [d for d in self.model.devices
+                   if _device_id(d) != _device_id(selected) and d.implementation != 'hid_led']
+        return [selected] + mirrors
+
+    def _diff_for(self, device: DeviceInfo) -> FrameDiff:
+        selected = self.model.selected_device
+        if selected is None or _device_id(device) == _device_id(selected):
+            return self.frame_diff
+        return self._mirror_diffs.setdefault(_device_id(device), FrameDiff())
+
+    def send_image_async(self, rgb565_data: bytes, width: int, height: int,
+                         changed_chunks: Optional[List[int]] = None,
+                         device: Optional[DeviceInfo] = None) -> bool:
         """
-        Send image to device in background thread.
+        Post image to a device's background sender (default: selected).
+
+        Non-blocking - emits on_send_complete when done.  Each device has
+        one worker thread with a single-slot mailbox: a frame posted while
+        an earlier one is still waiting replaces it, so the device always
+        converges on the newest frame.  Different devices send in parallel.
 
-        Non-blocking - emits on_send_complete when done.
+        Returns:
+            False if no device is selected or the sender is unavailable.
         """
-        if self.model.is_busy:
-            return  # Skip if already sending
+        selected = self.model.selected_device
+        if device is None:
+            device = selected
+        if not device:
+            return False
 
-        if self.on_send_started:
-            self.on_send_started()
+        try:
+            from ..device_factory import DeviceProtocolFactory
+            sender = DeviceProtocolFactory.get_sender(device)
+        except Exception as e:
+            print(f"[!] Device send error: {e}")
+            return False
 
-        def send_worker():
-            self.model.send_image(rgb565_data, width, height)
+        if selected is not None and _device_id(device) == _device_id(selected):
+            on_done = self._on_frame_sent
+            if self.on_send_started:
+                self.on_send_started()
+        else:
+            diff = self._diff_for(device)
 
-        thread = threading.Thread(target=send_worker, daemon=True)
-        thread.start()
+            def on_done(success: bool):
+                if not success:
+                    diff.reset()
+        return sender.submit(rgb565_data, width, height, changed_chunks, on_done=on_done)
+
+    def send_frame_async(self, rgb565_data: bytes, width: int, height: int,
+                         device: Optional[DeviceInfo] = None,
+                         candidates: Optional[List[int]] = None,
+                         since: Any = None, source: Any = None) -> bool:
+        """
+        Send a frame unless it matches the last frame posted to *device*.
+
+        Runs the frame-diff stage before send_image_async: identical frames
+        are skipped, changed frames carry their dirty chunk indices (the
+        sender merges them if a waiting frame gets replaced).  Each device
+        has its own diff state.  *candidates*, *since* and *source* narrow
+        the comparison to known-dirty chunks (see FrameDiff.changed_chunks).
+
+        Returns:
+            True if the frame was dispatched.
+        """
+        diff = self.frame_diff if device is None else self._diff_for(device)
+        changed = diff.changed_chunks(rgb565_data, candidates, since)
+        if not changed:
+            if source is not None:
+                diff.source = source  # The device shows this render as well
+            return False
+
+        diff.commit(rgb565_data, changed, source)
+        # The diff's private copy: callers may pass a buffer they reuse
+        data = diff.last
+        if device is None:
+            posted = self.send_image_async(data, width, height, changed)
+        else:
+            posted = self.send_image_async(data, width, height, changed, device=device)
+        if not posted:
+            diff.reset()  # Never posted — don't skip it next time
+            return False
+        return True
+
+    def get_send_stats(self, device: Optional[DeviceInfo] = None):
+        """Latency / drop counters of a device's sender (default: selected).
+
+        Returns:
+            SendStats (from frame_sender) or None if no device is selected.
+        """
+        if device is None:
+            device = self.model.selected_device
+        if not device:
+            return None
+        from ..device_factory import DeviceProtocolFactory
+        return DeviceProtocolFactory.get_sender(device).stats
+
+    def _on_frame_sent(self, success: bool):
+        """Sender worker finished a frame (runs on the worker thread)."""
+        if not success:
+            self.frame_diff.reset()  # Device state unknown — resend in full
+        if self.model.on_send_complete:
+            self.model.on_send_complete(success)
 
     def _on_model_devices_changed(self):
         """Handle model devices changed."""
@@ -181,6 +306,7 @@ class DeviceController:
 
     def _on_model_selection_changed(self, device: Optional[DeviceInfo]):
         """Handle model selection changed."""
+        self.frame_diff.reset()
         if self.on_device_selected and device:
             self.on_device_selected(device)
 
@@ -242,6 +368,10 @@ class VideoController:
         """Set target frame size."""
         self.model.target_size = (width, height)
 
+    def set_memory_budget(self, budget: int):
+        """Set the preload limit in bytes; longer videos are streamed."""
+        self.model.set_memory_budget(budget)
+
     def load(self, path: Path) -> bool:
         """
         Load video file.
@@ -316,8 +446,8 @@ class VideoController:
         return self.model.is_playing
 
     def has_frames(self) -> bool:
-        """Check if video/animation frames are loaded."""
-        return bool(self.model.frames)
+        """Check if video/animation frames are loaded (or streamable)."""
+        return bool(self.model.frames) or self.model.streaming
 
     def _on_model_state_changed(self, state: VideoState):
         """Handle model state changed."""
@@ -399,6 +529,17 @@ class OverlayController:
             self.model.set_background(background)
         return self.model.render(self._metrics)
 
+    def dirty_since_previous(self, image: Any) -> Optional[Tuple[int, List[Tuple]]]:
+        """Render number and dirty rects of *image*, if it is the last render.
+
+        The rects (x0, y0, x1, y1) are the areas that differ from render
+        number - 1.  None when *image* did not come from the overlay.
+        """
+        renderer = self.model._renderer
+        if not self.model.enabled or renderer is None or image is not renderer.last_image:
+            return None
+        return renderer.render_serial, renderer.dirty_rects
+
     def _ensure_renderer(self):
         """Ensure the internal renderer is initialized. Returns it or None."""
         if not self.model._renderer:
@@ -488,6 +629,14 @@ class FormCZTVController:
         self.auto_send = True
         self.rotation = 0         # directionB: 0, 90, 180, 270
         self.brightness = 50      # myLddVal mapped: L1=25, L2=50, L3=100
+        self._rgb565 = Rgb565Converter()
+        self.baked_playback = False  # Opt-in: cache video frames as device bytes
+        self._baked = BakedFrames()
+        self._jpeg = AdaptiveJpegEncoder()  # HID Type 2 panels take JPEG frames
+        # Mirrored Type 2 panels adapt to their own send times
+        self._mirror_jpeg: Dict[Tuple[int, int, str], AdaptiveJpegEncoder] = {}
+        self._shm: Optional[Any] = None  # ShmFrameSource (external renderer)
+        self._shm_buf = bytearray()  # RGB565 ring frame, reused every tick
 
         # View callbacks (unified interface)
         self.on_preview_update: Optional[Callable[[Any], None]] = None  # PIL Image
@@ -525,14 +674,16 @@ class FormCZTVController:
 
     def cleanup(self):
         """Clean up working directory on exit."""
+        self.set_shm_source(None)
         if self.working_dir and self.working_dir.exists():
             shutil.rmtree(self.working_dir, ignore_errors=True)
 
-    def initialize(self, data_dir: Path):
+    def initialize(self, data_dir: Path, detect: bool = True):
         """
         Initialize controller with data directory.
 
-        Sets up theme directories and detects devices.
+        Sets up theme directories and detects devices (unless *detect* is
+        False, e.g. when the caller assigns the device itself).
         """
         self._data_dir = data_dir
 
@@ -560,7 +711,8 @@ class FormCZTVController:
         self.themes.load_local_themes((self.lcd_width, self.lcd_height))
 
         # Detect devices
-        self.devices.detect_devices()
+        if detect:
+            self.devices.detect_devices()
 
     def set_resolution(self, width: int, height: int, persist: bool = True):
         """Set LCD resolution, update sub-controllers, and optionally persist to config."""
@@ -602,13 +754,41 @@ class FormCZTVController:
         Rectangular displays: extra +90° base (not yet needed, all current devices square).
         """
         self.rotation = degrees % 360
+        device = self.devices.get_selected()
+        if device is not None:
+            device.rotation = self.rotation  # Kept when another LCD is selected
         self._render_and_send()
 
     def set_brightness(self, percent: int):
         """Set display brightness (25, 50, 100)."""
         self.brightness = max(0, min(100, percent))
+        device = self.devices.get_selected()
+        if device is not None:
+            device.brightness = self.brightness
         self._render_and_send()
 
+    def set_baked_playback(self, enabled: bool):
+        """Enable/disable baked video playback.
+
+        When enabled and no overlay is active, each video frame is converted
+        to device bytes once and replayed from cache on later loops.  Videos
+        larger than BAKE_MAX_BYTES of device frames (or, when streamed, than
+        the video memory budget) are converted per frame as usual.  Saved with save_baked_playback (``trcc baked-playback``).
+        """
+        self.baked_playback = enabled
+        if not enabled:
+            self._baked.invalidate()
+
+    def set_jpeg_budget(self, target_bytes: Optional[int] = None,
+                        target_fps: Optional[float] = None):
+        """Set the JPEG size / frame-rate budget for HID Type 2 panels."""
+        for encoder in (self._jpeg, *self._mirror_jpeg.values()):
+            encoder.set_budget(target_bytes, target_fps)
+
+    def get_jpeg_stats(self):
+        """Encode metrics (JpegStats) of the HID Type 2 JPEG stage."""
+        return self._jpeg.stats
+
     # =========================================================================
     # Theme Operations
     # =========================================================================
@@ -1009,6 +1189,111 @@ class FormCZTVController:
         """Check if video is playing."""
         return self.video.is_playing()
 
+    # =========================================================================
+    # Shared-memory source (external renderers)
+    # =========================================================================
+
+    def set_shm_source(self, path: Optional[str]) -> bool:
+        """Take frames from a shared-memory ring (see shm_source); None detaches.
+
+        Replaces the video while attached.  RGB565 rings must match the
+        LCD resolution and are sent unchanged (not for JPEG panels).
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+        if not path:
+            return True
+        try:
+            from ..shm_source import FORMAT_RGB565, ShmFrameSource
+            source = ShmFrameSource(path)
+        except (OSError, ValueError) as e:
+            self._handle_error(f"Cannot open frame source: {e}")
+            return False
+        if source.format == FORMAT_RGB565 and (
+                source.size != (self.lcd_width, self.lcd_height) or self._wants_jpeg()):
+            source.close()
+            self._handle_error(
+                f"RGB565 source {source.width}x{source.height} does not fit this LCD; use RGB888")
+            return False
+        self.video.stop()
+        self._shm = source
+        self._update_status(f"Source: {path}")
+        return True
+
+    def is_shm_active(self) -> bool:
+        """Whether frames come from a shared-memory source."""
+        return self._shm is not None
+
+    def get_shm_source(self):
+        """The attached ShmFrameSource (frames / torn counters), or None."""
+        return self._shm
+
+    def shm_tick(self) -> bool:
+        """Send the newest shared-memory frame, if there is a new one.
+
+        RGB888 without overlay is converted straight from the shared
+        mapping (one pass, device bytes out); with an overlay, a JPEG
+        panel or mirrors it is copied into a PIL image first.  A frame the
+        writer lapped while it was being read is dropped.
+
+        Returns:
+            True if a frame was sent.
+        """
+        source = self._shm
+        if source is None:
+            return False
+        frame = source.latest()
+        if frame is None:
+            return False
+        seq, view = frame
+        pixels = None
+        try:
+            from ..shm_source import FORMAT_RGB565
+            w, h = source.size
+            if source.format == FORMAT_RGB565:
+                # The slot can be rewritten before the sender runs: take it
+                # into a reused buffer (the diff stage keeps the only copy)
+                buf = self._shm_buf
+                if len(buf) != len(view):
+                    buf = self._shm_buf = bytearray(len(view))
+                buf[:] = view
+                if not source.is_intact(seq):
+                    return False
+                self.devices.send_frame_async(buf, w, h)
+                return True
+
+            fast = (not self.overlay.is_enabled()
+                    and (w, h) == (self.lcd_width, self.lcd_height)
+                    and len(self.devices.get_targets()) == 1
+                    and not self._wants_jpeg())
+            if fast:
+                import numpy as np
+                pixels = np.frombuffer(view, dtype=np.uint8).reshape(h, w, 3)
+                data = self._image_to_rgb565(pixels, self.brightness, self.rotation)
+                if not source.is_intact(seq):
+                    return False
+                self.devices.send_frame_async(data, w, h)
+                return True
+
+            from PIL import Image
+            image = Image.frombytes('RGB', (w, h), view)
+            if not source.is_intact(seq):
+                return False
+            if image.size != (self.lcd_width, self.lcd_height):
+                image = image.resize((self.lcd_width, self.lcd_height),
+                                     Image.Resampling.LANCZOS)
+            if self.overlay.is_enabled():
+                image = self.overlay.render(image)
+            self._send_frame_to_lcd(image)
+            return True
+        except Exception as e:
+            self._handle_error(f"Frame source error: {e}")
+            return False
+        finally:
+            pixels = None  # Drop the export before releasing the view
+            view.release()
+
     # =========================================================================
     # Device Operations
     # =========================================================================
@@ -1021,16 +1306,84 @@ class FormCZTVController:
         """
         if self.overlay.is_enabled():
             frame = self.overlay.render(frame)
+        elif self._send_sidecar_frame():
+            return
+        elif self.baked_playback and self._send_baked_frame(frame):
+            return
         self._send_frame_to_lcd(frame)
 
+    def _send_sidecar_frame(self) -> bool:
+        """Send the current Theme.zt frame straight from its RGB565 sidecar.
+
+        The sidecar holds device bytes at 100% brightness and no rotation,
+        so it is only usable with those settings on a single RGB565 LCD.
+        Returns False when the frame has to be converted.
+        """
+        if (self.brightness != 100 or self.rotation != 0
+                or len(self.devices.get_targets()) != 1 or self._wants_jpeg()):
+            return False
+        model = self.video.model
+        data = model.device_frame(model.last_frame_index)
+        if data is None or len(data) != self.lcd_width * self.lcd_height * 2:
+            return False
+        try:
+            self.devices.frame_diff.reset()  # Bypasses the diff stage
+            self.devices.send_image_async(data, self.lcd_width, self.lcd_height)
+        except Exception as e:
+            self._handle_error(f"LCD send error: {e}")
+        return True
+
+    def _send_baked_frame(self, frame: Any) -> bool:
+        """Send a video frame from the baked cache.
+
+        Works for preloaded videos and for streaming players (Theme.zt,
+        long videos) once their frame count is known.  Streaming players
+        only bake within their ``memory_budget``, so a long video keeps the
+        bounded memory it streams for.  Returns False if the frame can't be
+        served from cache (no device, unknown length, video larger than
+        BAKE_MAX_BYTES or the streaming budget), so the caller converts it.
+        """
+        model = self.video.model
+        index = model.last_frame_index
+        limit = None
+        if len(self.devices.get_targets()) != 1 or self._wants_jpeg():
+            return False
+        if model.frames:
+            count = len(model.frames)
+            if not 0 <= index < count or model.frames[index] is not frame:
+                return False
+        elif model.streaming:
+            # Streaming length is an estimate until EOF; a corrected count
+            # re-keys the cache once.
+            count = model.state.total_frames
+            if not 0 <= index < count:
+                return False
+            limit = model.memory_budget
+        else:
+            return False
+
+        try:
+            if not self._baked.configure(model.source_path, count,
+                                         self.lcd_width, self.lcd_height,
+                                         self.brightness, self.rotation,
+                                         max_bytes=limit):
+                return False
+            data = self._baked.get(index, frame)
+            self.devices.frame_diff.reset()  # Bypasses the diff stage
+            self.devices.send_image_async(data, self.lcd_width, self.lcd_height)
+        except Exception as e:
+            self._handle_error(f"LCD send error: {e}")
+        return True
+
     def send_current_image(self):
         """Send current image to LCD."""
         if self.current_image:
+            self.devices.frame_diff.reset()  # Explicit send — never skip
             self._send_frame_to_lcd(self.current_image)
             self._update_status("Sent to LCD")
 
-    def _apply_rotation(self, image: Any) -> Any:
-        """Apply display rotation to image.
+    def _apply_rotation(self, image: Any, rotation: Optional[int] = None) -> Any:
+        """Apply display rotation (default: the controller's) to image.
 
         Windows ImageTo565 for square displays:
           directionB 0 → no rotation
@@ -1039,50 +1392,124 @@ class FormCZTVController:
           directionB 270 → RotateImg(90°CW) = PIL ROTATE_270 (CCW)
         """
         from PIL import Image as PILImage
-        if self.rotation == 90:
+        if rotation is None:
+            rotation = self.rotation
+        if rotation == 90:
             return image.transpose(PILImage.Transpose.ROTATE_270)
-        elif self.rotation == 180:
+        elif rotation == 180:
             return image.transpose(PILImage.Transpose.ROTATE_180)
-        elif self.rotation == 270:
+        elif rotation == 270:
             return image.transpose(PILImage.Transpose.ROTATE_90)
         return image
 
-    def _apply_brightness(self, image: Any) -> Any:
-        """Apply brightness adjustment to image.
+    def _apply_brightness(self, image: Any, brightness: Optional[int] = None) -> Any:
+        """Apply brightness adjustment (default: the controller's) to image.
 
         L1=25%, L2=50%, L3=100%. At 100% the image is unchanged.
         """
-        if self.brightness >= 100:
+        if brightness is None:
+            brightness = self.brightness
+        if brightness >= 100:
             return image
         from PIL import ImageEnhance
-        return ImageEnhance.Brightness(image).enhance(self.brightness / 100.0)
+        return ImageEnhance.Brightness(image).enhance(brightness / 100.0)
 
     def _send_frame_to_lcd(self, image: Any):
-        """Send PIL Image to LCD device (with rotation and brightness applied)."""
-        if not self.devices.get_selected():
+        """Send PIL Image to LCD device (with rotation and brightness applied).
+
+        With mirroring on, every attached LCD gets the frame, with its own
+        rotation and brightness (those set while it was selected).  The
+        image is scaled and converted once per distinct (resolution,
+        rotation, brightness, pixel format) and the bytes are shared; JPEG
+        panels each have their own encoder.  Each device's sender thread
+        then sends in parallel.
+        """
+        targets = self.devices.get_targets()
+        if not targets:
             return
 
-        try:
-            adjusted = self._apply_brightness(image)
-            rotated = self._apply_rotation(adjusted)
-            rgb565_data = self._image_to_rgb565(rotated)
-            self.devices.send_image_async(rgb565_data, self.lcd_width, self.lcd_height)
-        except Exception as e:
-            self._handle_error(f"LCD send error: {e}")
-
-    def _image_to_rgb565(self, img: Any) -> bytes:
-        """Convert PIL Image to RGB565 bytes."""
-        import numpy as np
+        # Overlay frames: compare only the chunks under the redrawn areas
+        dirty = self.overlay.dirty_since_previous(image)
 
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
-
-        arr = np.array(img, dtype=np.uint16)
-        r = (arr[:, :, 0] >> 3) & 0x1F
-        g = (arr[:, :, 1] >> 2) & 0x3F
-        b = (arr[:, :, 2] >> 3) & 0x1F
-        rgb565 = (r << 11) | (g << 5) | b
-        return rgb565.astype('>u2').tobytes()
+        encoded: Dict[Tuple, bytes] = {}
+        for i, device in enumerate(targets):
+            try:
+                # The selected device follows the controller's settings
+                if i == 0:
+                    w, h = self.lcd_width, self.lcd_height
+                    rotation, brightness = self.rotation, self.brightness
+                else:
+                    w, h = device.resolution
+                    rotation, brightness = device.rotation, device.brightness
+                jpeg = self._wants_jpeg(device)
+                key = (w, h, rotation, brightness, _device_id(device) if jpeg else None)
+                data = encoded.get(key)
+                if data is None:
+                    frame = image
+                    if (w, h) != (self.lcd_width, self.lcd_height) and image.size != (w, h):
+                        from PIL import Image as PILImage
+                        frame = image.resize((w, h), PILImage.Resampling.LANCZOS)
+                    if jpeg:
+                        data = self._image_to_jpeg(frame, brightness, rotation,
+                                                   device=None if i == 0 else device)
+                    else:
+                        data = self._image_to_rgb565(frame, brightness, rotation)
+                    encoded[key] = data
+                hint: Dict[str, Any] = {}
+                if dirty is not None and not jpeg and image.size == (w, h):
+                    serial, rects = dirty
+                    size = (h, w) if rotation in (90, 270) else (w, h)
+                    diff = self.devices._diff_for(device)
+                    hint = dict(
+                        candidates=diff.chunks_for_rects(
+                            [_rotate_rect(r, (w, h), rotation) for r in rects], *size),
+                        since=(serial - 1, w, h, rotation, brightness),
+                        source=(serial, w, h, rotation, brightness))
+                if i == 0:
+                    self.devices.send_frame_async(data, w, h, **hint)
+                else:
+                    self.devices.send_frame_async(data, w, h, device=device, **hint)
+            except Exception as e:
+                self._handle_error(f"LCD send error: {e}")
+
+    def set_mirroring(self, enabled: bool):
+        """Mirror the display to every attached LCD (render once per format)."""
+        self.devices.set_mirroring(enabled)
+        self._mirror_jpeg.clear()
+        self._update_status(f"Mirroring {'on' if enabled else 'off'}")
+
+    def _wants_jpeg(self, device: Optional[DeviceInfo] = None) -> bool:
+        """Whether *device* (default: selected) is a HID Type 2 panel (JPEG frames)."""
+        if device is None:
+            device = self.devices.get_selected()
+        return (device is not None and device.protocol == 'hid'
+                and device.device_type == 2 and device.implementation != 'hid_led')
+
+    def _image_to_jpeg(self, img: Any, brightness: Optional[int] = None,
+                       rotation: Optional[int] = None,
+                       device: Optional[DeviceInfo] = None) -> bytes:
+        """Encode PIL Image as JPEG for *device* (default: selected).
+
+        Rotation and brightness (default: the controller's) are applied
+        first.  Each device has its own encoder, and the send time of that
+        device's previous frame is fed back to it, so an FPS budget
+        accounts for the USB transfer too.
+        """
+        encoder = self._jpeg
+        if device is not None:
+            encoder = self._mirror_jpeg.get(_device_id(device))
+            if encoder is None:
+                encoder = self._mirror_jpeg[_device_id(device)] = AdaptiveJpegEncoder(
+                    target_bytes=self._jpeg.target_bytes, target_fps=self._jpeg.target_fps)
+        stats = self.devices.get_send_stats(device)
+        if stats is not None:
+            encoder.observe_send_ms(stats.last_send_ms)
+        return encoder.encode(
+            self._apply_brightness(self._apply_rotation(img, rotation), brightness))
+
+    def _image_to_rgb565(self, img: Any, brightness: int = 100, rotation: int = 0) -> bytes:
+        """Convert PIL Image to RGB565 bytes (brightness + rotation fused)."""
+        return self._rgb565.to_bytes(img, brightness, rotation)
 
     # =========================================================================
     # Callbacks from sub-controllers
@@ -1090,6 +1517,7 @@ class FormCZTVController:
 
     def _on_theme_selected(self, theme: ThemeInfo):
         """Handle theme selection."""
+        self.set_shm_source(None)  # A chosen theme replaces the external source
         if theme.theme_type == ThemeType.CLOUD:
             self.load_cloud_theme(theme)
         else:
@@ -236,7 +236,7 @@ class DeviceInfo:
     pid: int = 0
     device_index: int = 0  # 0-based ordinal among detected devices
     fbl_code: Optional[int] = None  # Resolution identifier
-    protocol: str = "scsi"  # "scsi" or "hid"
+    protocol: str = "scsi"  # "scsi", "hid" or "virtual" (loopback, virtual_device.py)
     device_type: int = 1  # 1=SCSI, 2=HID Type 2 ("H"), 3=HID Type 3 ("ALi")
     implementation: str = "generic"  # e.g. "thermalright_lcd_v1", "hid_type2", "hid_led"
 
@@ -310,7 +310,8 @@ class DeviceModel:
         if self.on_selection_changed:
             self.on_selection_changed(device)
 
-    def send_image(self, image_data: bytes, width: int, height: int) -> bool:
+    def send_image(self, image_data: bytes, width: int, height: int,
+                   changed_chunks: Optional[List[int]] = None) -> bool:
         """
         Send image data to selected device via factory-routed protocol.
 
@@ -323,6 +324,8 @@ class DeviceModel:
             image_data: Pixel bytes (RGB565 for SCSI, JPEG for HID).
             width: Image width in pixels.
             height: Image height in pixels.
+            changed_chunks: 64 KiB chunk indices that differ from the last
+                frame (from FrameDiff), or None for a full send.
 
         Returns:
             True if send was successful.
@@ -331,11 +334,11 @@ class DeviceModel:
             return False
 
         try:
-            from ..device_factory import DeviceProtocolFactory
+            from ..device_factory import DeviceProtocolFactory, send_frame
             self._send_busy = True
 
             protocol = DeviceProtocolFactory.get_protocol(self.selected_device)
-            success = protocol.send_image(image_data, width, height)
+            success = send_frame(protocol, image_data, width, height, changed_chunks)
 
             self._send_busy = False
 
@@ -408,6 +411,14 @@ class VideoState:
         return int(1000 / self.fps)
 
 
+# Preload a video only if all its frames fit in this many bytes; longer
+# videos play from a bounded ring buffer (gif_animator.StreamingDecoder).
+VIDEO_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Theme.zt frames decoded ahead of playback by the lazy player
+ZT_DECODE_AHEAD = 4
+
+
 @dataclass
 class VideoModel:
     """
@@ -424,6 +435,20 @@ class VideoModel:
     on_state_changed: Optional[Callable[[VideoState], None]] = None
     on_frame_ready: Optional[Callable[[Any], None]] = None  # PIL Image
 
+    # Index of the frame most recently returned by advance_frame()
+    last_frame_index: int = 0
+
+    # Preload vs streaming (see VIDEO_MEMORY_BUDGET).  Streaming players
+    # decode on demand and keep few frames; self.frames stays empty.
+    memory_budget: int = VIDEO_MEMORY_BUDGET
+    streaming: bool = False
+
+    # Open Theme.zt lazily (mmap + LRU, gif_animator.MappedThemeZtPlayer).
+    # On by default on purpose: memory no longer grows with the animation
+    # length, and playback matches ThemeZtPlayer (the eager player's tests
+    # also run against the lazy one).  False restores the preloading player.
+    lazy_zt: bool = True
+
     # Internal player reference
     _player: Any = None
 
@@ -439,18 +464,32 @@ class VideoModel:
             True if loaded successfully
         """
         self.stop()
+        self._stop_streaming()
         self.source_path = path
         self.frames.clear()
+        self.streaming = False
 
         try:
-            from ..gif_animator import ThemeZtPlayer, VideoPlayer
+            from ..gif_animator import MappedThemeZtPlayer, ThemeZtPlayer, VideoPlayer
 
             suffix = path.suffix.lower()
 
-            if suffix == '.zt':
+            if suffix == '.zt' and self.lazy_zt:
+                self._player = MappedThemeZtPlayer(str(path), self.target_size,
+                                                   decode_ahead=ZT_DECODE_AHEAD)
+                self.streaming = True
+            elif suffix == '.zt':
                 self._player = ThemeZtPlayer(str(path), self.target_size)
             else:
-                self._player = VideoPlayer(str(path), self.target_size)
+                # Probe first, then preload or stream depending on size
+                self._player = VideoPlayer(str(path), self.target_size, preload=False)
+                w, h = self.target_size
+                estimate = self._player.frame_count * w * h * 3  # RGB frames
+                if preload and estimate <= self.memory_budget:
+                    self._player.load_all()
+                else:
+                    self._player.start_streaming()
+                    self.streaming = True
 
             # Update state
             self.state.total_frames = self._player.frame_count
@@ -459,7 +498,7 @@ class VideoModel:
             self.state.state = PlaybackState.STOPPED
 
             # Preload frames if requested (matches Windows behavior)
-            if preload and hasattr(self._player, 'frames'):
+            if preload and not self.streaming and hasattr(self._player, 'frames'):
                 self.frames = self._player.frames
 
             if self.on_state_changed:
@@ -471,6 +510,15 @@ class VideoModel:
             print(f"[!] Failed to load video: {e}")
             return False
 
+    def _stop_streaming(self):
+        """Stop the previous player's background decoder, if any."""
+        if self.streaming and self._player is not None:
+            self._player.close_stream()
+
+    def set_memory_budget(self, budget: int):
+        """Set the preload limit in bytes (applies to the next load)."""
+        self.memory_budget = max(0, budget)
+
     def play(self):
         """Start playback."""
         if self._player:
@@ -523,6 +571,14 @@ class VideoModel:
 
         return None
 
+    def device_frame(self, index: int) -> Optional[Any]:
+        """Frame *index* as device-ready RGB565 bytes from a Theme.zt
+        sidecar (see zt_cache), or None if the player has none."""
+        device_frame = getattr(self._player, 'device_frame', None)
+        if not self.streaming or device_frame is None:
+            return None
+        return device_frame(index)
+
     def advance_frame(self) -> Optional[Any]:
         """
         Advance to next frame and return it.
@@ -534,10 +590,21 @@ class VideoModel:
             return None
 
         frame = self.get_frame()
+        self.last_frame_index = self.state.current_frame
+        if self.streaming:
+            # A lagging decoder repeats its previous frame
+            self.last_frame_index = getattr(self._player, 'shown_index',
+                                            self.last_frame_index)
+
+        # Streaming length is an estimate until the decoder reaches EOF
+        if self.streaming and self._player.frame_count:
+            self.state.total_frames = self._player.frame_count
 
-        # Advance
+        # Advance (an unknown streaming length just counts up until EOF)
         self.state.current_frame += 1
-        if self.state.current_frame >= self.state.total_frames:
+        if self.streaming and not self.state.total_frames:
+            pass
+        elif self.state.current_frame >= self.state.total_frames:
             if self.state.loop:
                 self.state.current_frame = 0
             else:
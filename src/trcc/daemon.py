@@ -0,0 +1,543 @@
+"""
+Headless multi-device daemon (``trcc daemon``).
+
+Runs the same controllers as the GUI for every detected device, without
+importing PyQt:
+
+- LCDs: one FormCZTVController each (with its VideoController and
+  OverlayController), restored from the device's saved config;
+- LED devices: one FormLEDController each.
+
+The Qt timers of qt_app_mvc are replaced by a single monotonic scheduler
+on the main thread:
+
+- video / Theme.zt frames at the theme's frame interval;
+- overlay metrics once per second, collected once and shared by all devices;
+- LED animation every 30 ms (FormLED timer1);
+- shared-memory frame rings (shm_source), when attached, every 5 ms.
+
+Saved settings (theme_path, brightness_level, rotation, overlay,
+led_config) come from paths.get_device_config(), i.e. whatever the GUI
+last used for that device.  Device writes go through the per-device
+FrameSender workers, so a slow panel never delays the others.
+"""
+
+import heapq
+import itertools
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .core.controllers import FormCZTVController, FormLEDController
+from .core.models import DeviceInfo, ThemeInfo
+from .paths import (
+    device_config_key,
+    get_device_config,
+    get_saved_baked_playback,
+    get_saved_temp_unit,
+    save_device_setting,
+)
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.webm')
+BRIGHTNESS_LEVELS = {1: 25, 2: 50, 3: 100}  # brightness_level -> percent
+
+METRICS_INTERVAL = 1.0   # s, overlay refresh (GUI _metrics_timer)
+LED_INTERVAL = 0.030     # s, LED animation (GUI _led_timer)
+IDLE_INTERVAL = 0.5      # s, video poll while nothing is playing
+SHM_POLL_INTERVAL = 0.005  # s, shared-memory ring poll (a header read)
+MAX_SLEEP = 0.5          # s, bounds how long a stop request can go unnoticed
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+class Scheduler:
+    """Run callbacks at fixed intervals on the calling thread.
+
+    Deadlines are kept on time.monotonic() in a heap, so the loop sleeps
+    exactly until the next task is due.  A task that falls behind skips
+    the missed slots instead of running them back to back.  Other threads
+    hand work to the loop with submit(), which also wakes it up.
+
+    Usage::
+
+        sched = Scheduler()
+        sched.every(0.03, led.tick)
+        sched.every(lambda: ctrl.get_video_interval() / 1000, video_tick)
+        sched.run()                       # until sched.stop()
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sleep: Optional[Callable[[float], None]] = None):
+        self._clock = clock
+        self._sleep = sleep or self._wait
+        self._heap: List[Any] = []
+        self._seq = itertools.count()  # Tie-breaker: equal deadlines run FIFO
+        self._running = False
+        self._calls: Deque[Tuple[Callable[[], Any], Future]] = deque()
+        self._wake = threading.Event()
+
+    def _wait(self, timeout: float) -> None:
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def submit(self, fn: Callable[[], Any]) -> Future:
+        """Run *fn* once on the scheduler thread, as soon as possible.
+
+        Thread-safe.  The returned Future holds fn's result or exception.
+        """
+        future: Future = Future()
+        self._calls.append((fn, future))
+        self._wake.set()
+        return future
+
+    def every(self, interval: Union[float, Callable[[], float]],
+              fn: Callable[[], None], delay: float = 0.0) -> None:
+        """Call *fn* every *interval* seconds, first after *delay*.
+
+        *interval* may be a callable, re-read after each run (e.g. a video
+        whose frame rate changes when a new theme is loaded).
+        """
+        get_interval = interval if callable(interval) else (lambda: interval)
+        due = self._clock() + delay
+        heapq.heappush(self._heap, (due, next(self._seq), get_interval, fn))
+
+    def run_pending(self) -> Optional[float]:
+        """Run every task that is due.
+
+        Returns:
+            Seconds until the next task, or None if nothing is scheduled.
+        """
+        while self._calls:
+            fn, future = self._calls.popleft()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn())
+                except Exception as e:
+                    future.set_exception(e)
+
+        now = self._clock()
+        while self._heap and self._heap[0][0] <= now:
+            due, _, get_interval, fn = heapq.heappop(self._heap)
+            try:
+                fn()
+            except Exception as e:
+                print(f"[!] Scheduled task error: {e}")
+            try:
+                interval = max(0.001, float(get_interval()))
+            except Exception:
+                interval = IDLE_INTERVAL
+            now = self._clock()
+            next_due = due + interval
+            if next_due <= now:
+                next_due = now + interval  # Behind schedule: skip, don't burst
+            heapq.heappush(self._heap, (next_due, next(self._seq), get_interval, fn))
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - now)
+
+    def run(self) -> None:
+        """Run tasks until stop() is called (from a task or signal handler)."""
+        self._running = True
+        while self._running:
+            wait = self.run_pending()
+            if not self._running:
+                break
+            if self._calls:
+                continue
+            self._sleep(MAX_SLEEP if wait is None else min(wait, MAX_SLEEP))
+
+    def stop(self) -> None:
+        """Make run() return after the current task."""
+        self._running = False
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+# =============================================================================
+# Device sessions
+# =============================================================================
+
+class LcdSession:
+    """One LCD: a FormCZTVController restored from the device's saved config."""
+
+    def __init__(self, device: DeviceInfo, data_dir: Path = DATA_DIR):
+        self.device = device
+        self.data_dir = data_dir
+        self.key = device_config_key(device.device_index, device.vid, device.pid)
+        self.controller = FormCZTVController()
+
+    @property
+    def name(self) -> str:
+        return self.device.name or self.device.path
+
+    def start(self) -> bool:
+        """Select the device and load its saved theme, brightness, rotation
+        and overlay (same order as the GUI's _on_device_selected).
+
+        Returns:
+            False if the device has no usable saved theme.
+        """
+        ctrl = self.controller
+        ctrl.set_resolution(*self.device.resolution, persist=False)
+        ctrl.initialize(self.data_dir, detect=False)
+        ctrl.overlay.set_temp_unit(get_saved_temp_unit())
+        ctrl.set_baked_playback(get_saved_baked_playback())
+        ctrl.devices.model.devices = [self.device]
+        ctrl.devices.select_device(self.device)
+
+        cfg = get_device_config(self.key)
+        ctrl.set_brightness(BRIGHTNESS_LEVELS.get(cfg.get('brightness_level', 2), 50))
+        ctrl.set_rotation((cfg.get('rotation', 0) // 90) * 90)
+
+        theme_path = cfg.get('theme_path')
+        if not theme_path or not Path(theme_path).exists():
+            print(f"  [{self.name}] No saved theme, skipping")
+            return False
+        self._load_theme(Path(theme_path), cfg.get('overlay'))
+        print(f"  [{self.name}] {Path(theme_path).name}")
+        return True
+
+    def _load_theme(self, path: Path, overlay: Any) -> None:
+        """Load a theme directory or video, then apply the saved overlay setting."""
+        ctrl = self.controller
+        if path.suffix in VIDEO_EXTENSIONS:
+            preview = path.parent / f"{path.stem}.png"
+            theme = ThemeInfo.from_video(path, preview if preview.exists() else None)
+        else:
+            theme = ThemeInfo.from_directory(path)
+        ctrl.themes.select_theme(theme)
+
+        if overlay and isinstance(overlay, dict):
+            config = overlay.get('config', {})
+            if config:
+                ctrl.overlay.set_config(config)
+            ctrl.overlay.enable(overlay.get('enabled', False))
+        else:
+            ctrl.overlay.enable(False)
+
+        if not ctrl.is_video_playing():
+            self.refresh()
+
+    # =========================================================================
+    # Runtime changes (control socket)
+    # =========================================================================
+
+    def load_theme(self, path: Path) -> None:
+        """Switch to another theme and remember it for this device."""
+        if not path.exists():
+            raise ValueError(f"Theme not found: {path}")
+        self._load_theme(path, get_device_config(self.key).get('overlay'))
+        save_device_setting(self.key, 'theme_path', str(path))
+
+    def set_brightness_level(self, level: int) -> None:
+        """Brightness level 1-3 (25/50/100%), saved like the GUI button."""
+        if level not in BRIGHTNESS_LEVELS:
+            raise ValueError(f"Brightness level must be 1, 2 or 3, not {level}")
+        self.controller.set_brightness(BRIGHTNESS_LEVELS[level])
+        save_device_setting(self.key, 'brightness_level', level)
+
+    def set_rotation(self, degrees: int) -> None:
+        if degrees not in (0, 90, 180, 270):
+            raise ValueError(f"Rotation must be 0, 90, 180 or 270, not {degrees}")
+        self.controller.set_rotation(degrees)
+        save_device_setting(self.key, 'rotation', degrees)
+
+    def show_image(self, path: Path) -> None:
+        """Show an image file until the next theme change (not saved)."""
+        if not path.is_file():
+            raise ValueError(f"Image not found: {path}")
+        self.controller.video.stop()
+        self.controller.load_image_file(path)
+
+    def set_source(self, path: Optional[str]) -> None:
+        """Attach a shared-memory frame ring (None: back to the saved theme)."""
+        ctrl = self.controller
+        if path:
+            if not ctrl.set_shm_source(path):
+                raise ValueError(f"Cannot use frame source: {path}")
+            return
+        if ctrl.is_shm_active():
+            ctrl.set_shm_source(None)
+            theme_path = get_device_config(self.key).get('theme_path')
+            if theme_path and Path(theme_path).exists():
+                self._load_theme(Path(theme_path), get_device_config(self.key).get('overlay'))
+
+    def stats(self) -> Dict[str, Any]:
+        """Send and encode counters for status queries."""
+        ctrl = self.controller
+        send = ctrl.devices.get_send_stats()
+        result: Dict[str, Any] = {
+            'video_playing': ctrl.is_video_playing(),
+            'overlay': ctrl.overlay.is_enabled(),
+            'brightness': ctrl.brightness,
+            'rotation': ctrl.rotation,
+        }
+        if send is not None:
+            result['send'] = dict(asdict(send), avg_latency_ms=send.avg_latency_ms)
+        source = ctrl.get_shm_source()
+        if source is not None:
+            result['source'] = {'path': source.path, 'frames': source.frames,
+                                'torn': source.torn}
+        jpeg = ctrl.get_jpeg_stats()
+        if jpeg.frames:
+            result['jpeg'] = asdict(jpeg)
+        return result
+
+    def video_interval(self) -> float:
+        """Seconds until the next video tick (slow poll while stopped)."""
+        if self.controller.is_video_playing():
+            return self.controller.get_video_interval() / 1000.0
+        return IDLE_INTERVAL
+
+    def video_tick(self) -> None:
+        """Advance the video; VideoController sends the frame itself.
+
+        Calls VideoController.tick() directly rather than video_tick(),
+        which would render the overlay a second time for the preview.
+        """
+        if self.controller.is_video_playing():
+            self.controller.video.tick()
+
+    def shm_interval(self) -> float:
+        return SHM_POLL_INTERVAL if self.controller.is_shm_active() else IDLE_INTERVAL
+
+    def shm_tick(self) -> None:
+        self.controller.shm_tick()
+
+    @property
+    def wants_metrics(self) -> bool:
+        return self.controller.overlay.is_enabled()
+
+    def update_metrics(self, metrics: Dict[str, Any]) -> None:
+        """New sensor values: re-render a static overlay theme (GUI _on_metrics_tick).
+
+        Playing videos and shared-memory sources pick the values up on
+        their next frame.
+        """
+        ctrl = self.controller
+        ctrl.overlay.update_metrics(metrics)
+        if not ctrl.is_video_playing() and not ctrl.is_shm_active():
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Send the current image, with the overlay if enabled."""
+        ctrl = self.controller
+        if ctrl.overlay.is_enabled():
+            img = ctrl.render_overlay_and_preview()
+            if img:
+                ctrl._send_frame_to_lcd(img)
+        else:
+            ctrl.send_current_image()
+
+    def close(self) -> None:
+        self.controller.video.stop()
+        self.controller.cleanup()
+
+
+class LedSession:
+    """One LED device: a FormLEDController with its saved led_config."""
+
+    def __init__(self, device: DeviceInfo):
+        self.device = device
+        self.controller = FormLEDController()
+
+    @property
+    def name(self) -> str:
+        return self.device.name or self.device.path
+
+    def start(self) -> bool:
+        self.controller.initialize(self.device, led_style_for_model(self.device.model))
+        print(f"  [{self.name}] LED")
+        return True
+
+    def tick(self) -> None:
+        self.controller.led.tick()
+
+    @property
+    def wants_metrics(self) -> bool:
+        return True  # Temperature/load-linked modes
+
+    def update_metrics(self, metrics: Dict[str, Any]) -> None:
+        self.controller.led.update_metrics(metrics)
+
+    def close(self) -> None:
+        self.controller.cleanup()
+
+
+def led_style_for_model(model: Optional[str]) -> int:
+    """LED style id for a probed model name (default 1).
+
+    The model was identified during detection, so no second handshake
+    (which would time out) is needed — same lookup as the GUI.
+    """
+    from .led_device import LED_STYLES
+    for style_id, style in LED_STYLES.items():
+        if style.model_name == (model or ''):
+            return style_id
+    return 1
+
+
+def find_devices() -> List[DeviceInfo]:
+    """Detected LCD and LED devices as DeviceInfo (with implementation)."""
+    from .scsi_device import find_lcd_devices
+    return [
+        DeviceInfo(
+            name=d.get('name', 'LCD'),
+            path=d.get('path', ''),
+            resolution=d.get('resolution', (320, 320)),
+            vendor=d.get('vendor'),
+            product=d.get('product'),
+            model=d.get('model'),
+            vid=d.get('vid', 0),
+            pid=d.get('pid', 0),
+            device_index=d.get('device_index', 0),
+            protocol=d.get('protocol', 'scsi'),
+            device_type=d.get('device_type', 1),
+            implementation=d.get('implementation', 'generic'),
+        )
+        for d in find_lcd_devices()
+    ]
+
+
+# =============================================================================
+# Daemon
+# =============================================================================
+
+class Daemon:
+    """All device sessions plus the scheduler that drives them."""
+
+    def __init__(self, data_dir: Path = DATA_DIR, scheduler: Optional[Scheduler] = None):
+        self.data_dir = data_dir
+        self.scheduler = scheduler or Scheduler()
+        self.sessions: List[Union[LcdSession, LedSession]] = []
+
+    def add_device(self, device: DeviceInfo) -> bool:
+        """Start a session for *device* and schedule its ticks.
+
+        Returns:
+            False if the device could not be started (nothing scheduled).
+        """
+        if device.implementation == 'hid_led':
+            session: Union[LcdSession, LedSession] = LedSession(device)
+        else:
+            session = LcdSession(device, self.data_dir)
+        try:
+            started = session.start()
+        except Exception as e:
+            print(f"  [{session.name}] Error: {e}")
+            started = False
+        if not started:
+            session.close()
+            return False
+
+        if isinstance(session, LedSession):
+            self.scheduler.every(LED_INTERVAL, session.tick)
+        else:
+            self.scheduler.every(session.video_interval, session.video_tick)
+            self.scheduler.every(session.shm_interval, session.shm_tick)
+        self.sessions.append(session)
+        return True
+
+    def start(self, devices: List[DeviceInfo]) -> int:
+        """Start sessions for *devices*; returns how many are running."""
+        for device in devices:
+            self.add_device(device)
+        if self.sessions:
+            self.scheduler.every(METRICS_INTERVAL, self.update_metrics,
+                                 delay=METRICS_INTERVAL)
+        return len(self.sessions)
+
+    def update_metrics(self) -> None:
+        """Collect system metrics once and hand them to every session that needs them."""
+        targets = [s for s in self.sessions if s.wants_metrics]
+        if not targets:
+            return
+        from .system_info import get_all_metrics
+        metrics = get_all_metrics()
+        for session in targets:
+            try:
+                session.update_metrics(metrics)
+            except Exception as e:
+                print(f"[!] [{session.name}] Metrics update failed: {e}")
+
+    def run(self) -> None:
+        """Run until SIGINT/SIGTERM."""
+        def _handle_signal(signum, frame):
+            self.scheduler.stop()
+
+        signal.signal(signal.SIGTERM, _handle_signal)
+        signal.signal(signal.SIGINT, _handle_signal)
+        self.scheduler.run()
+
+    def close(self) -> None:
+        """Stop all sessions and release device handles."""
+        for session in self.sessions:
+            try:
+                session.close()
+            except Exception as e:
+                print(f"[!] [{session.name}] Cleanup failed: {e}")
+        self.sessions.clear()
+        from .device_factory import DeviceProtocolFactory
+        DeviceProtocolFactory.close_all()
+
+
+def run_daemon(data_dir: Optional[Path] = None, wait_attempts: int = 10,
+               socket_path: Optional[str] = None, control: bool = True) -> int:
+    """Detect devices, restore their saved themes and run until signalled.
+
+    Args:
+        data_dir: Theme data directory (default: package data).
+        wait_attempts: Device detection attempts, 2 s apart (boot race).
+        socket_path: Control socket path (default: control.default_socket_path()).
+        control: Serve the ``trcc ctl`` control socket.
+
+    Returns:
+        Exit code (0 = clean shutdown, 1 = nothing to run).
+    """
+    devices: List[DeviceInfo] = []
+    for attempt in range(wait_attempts):
+        devices = find_devices()
+        if devices:
+            break
+        print(f"Waiting for device... ({attempt + 1}/{wait_attempts})")
+        time.sleep(2)
+
+    if not devices:
+        print("No compatible TRCC device detected.")
+        return 1
+
+    daemon = Daemon(data_dir or DATA_DIR)
+    server = None
+    try:
+        if daemon.start(devices) == 0:
+            print("No device could be started. Use the GUI to set a theme first.")
+            return 1
+        if control:
+            from .control import ControlServer
+            try:
+                server = ControlServer(daemon, socket_path)
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                return 1
+            except OSError as e:
+                print(f"[!] Control socket unavailable: {e}")
+            else:
+                server.start()
+                print(f"Control socket: {server.path}")
+        print(f"Running {len(daemon.sessions)} device(s). Press Ctrl+C to stop.")
+        daemon.run()
+        return 0
+    finally:
+        if server is not None:
+            server.close()
+        daemon.close()
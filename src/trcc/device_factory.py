@@ -16,12 +16,17 @@ Usage::
     protocol.on_error = lambda msg: print(f"err: {msg}")
     protocol.send_image(rgb565_data, width, height)      # LCD devices
     protocol.send_led_data(colors, is_on, True, 100)     # LED devices
+
+    # Non-blocking: one worker thread per device, latest frame wins
+    DeviceProtocolFactory.get_sender(device_info).submit(rgb565_data, width, height)
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Optional, Tuple
 
+from .frame_sender import FrameSender
+
 # =========================================================================
 # DeviceProtocol ABC — the contract both SCSI and HID implement
 # =========================================================================
@@ -57,6 +62,21 @@ class DeviceProtocol(ABC):
             True if the send succeeded.
         """
 
+    def send_image_partial(self, image_data: bytes, width: int, height: int,
+                           changed_chunks: List[int]) -> bool:
+        """Send a frame of which only *changed_chunks* (64 KiB each) differ.
+
+        Default implementation sends the whole frame.  Protocols that can
+        update part of the panel override this and set
+        ``supports_partial_update``.
+        """
+        return self.send_image(image_data, width, height)
+
+    @property
+    def supports_partial_update(self) -> bool:
+        """Whether send_image_partial() really sends only changed chunks."""
+        return False
+
     @abstractmethod
     def close(self) -> None:
         """Release resources (USB transport, SCSI state, etc.)."""
@@ -117,14 +137,26 @@ class DeviceProtocol(ABC):
             self.on_state_changed(key, value)
 
 
+def send_frame(protocol: DeviceProtocol, image_data: bytes, width: int, height: int,
+               changed_chunks: Optional[List[int]] = None) -> bool:
+    """Send a frame, as a partial update when the protocol supports it.
+
+    *changed_chunks* comes from FrameDiff; None means a full send.
+    """
+    if changed_chunks is not None and protocol.supports_partial_update:
+        return protocol.send_image_partial(image_data, width, height, changed_chunks)
+    return protocol.send_image(image_data, width, height)
+
+
 # =========================================================================
-# ScsiProtocol — SCSI/sg_raw implementation
+# ScsiProtocol — SCSI implementation (SG_IO ioctl, sg_raw fallback)
 # =========================================================================
 
 class ScsiProtocol(DeviceProtocol):
-    """LCD communication via SCSI protocol (sg_raw).
+    """LCD communication via SCSI protocol (SG_IO, sg_raw fallback).
 
-    Wraps scsi_device.py. Uses subprocess per send (stateless transport).
+    Wraps scsi_device.py. The device's ScsiSession (handshake state, header
+    table, SG_IO fd) stays alive across sends and is released by close().
     """
 
     def __init__(self, device_path: str):
@@ -143,18 +175,30 @@ class ScsiProtocol(DeviceProtocol):
             return False
 
     def close(self) -> None:
-        pass  # SCSI uses subprocess per call, nothing to release
+        from .scsi_device import close_session
+        close_session(self._path)
 
     def get_info(self) -> 'ProtocolInfo':
         import shutil
+
+        from .sg_io import SG_IO_AVAILABLE, is_sg_transport_open
         sg_raw = shutil.which("sg_raw") is not None
+        sg_io_open = is_sg_transport_open(self._path)
+        if sg_io_open:
+            active = "sg_io"
+        elif sg_raw:
+            active = "sg_raw"
+        else:
+            active = "none"
         return ProtocolInfo(
             protocol="scsi",
             device_type=1,
-            protocol_display="SCSI (sg_raw)",
+            protocol_display=scsi_protocol_display(active),
             device_type_display="SCSI RGB565",
-            active_backend="sg_raw" if sg_raw else "none",
-            backends={"sg_raw": sg_raw, "pyusb": False, "hidapi": False},
+            active_backend=active,
+            backends={"sg_io": SG_IO_AVAILABLE, "sg_raw": sg_raw,
+                      "pyusb": False, "hidapi": False},
+            transport_open=sg_io_open,
         )
 
     @property
@@ -164,7 +208,9 @@ class ScsiProtocol(DeviceProtocol):
     @property
     def is_available(self) -> bool:
         import shutil
-        return shutil.which("sg_raw") is not None
+
+        from .sg_io import SG_IO_AVAILABLE
+        return SG_IO_AVAILABLE or shutil.which("sg_raw") is not None
 
     def __repr__(self) -> str:
         return f"ScsiProtocol(path={self._path!r})"
@@ -178,14 +224,18 @@ class HidProtocol(DeviceProtocol):
     """LCD communication via HID USB bulk protocol (pyusb or hidapi).
 
     Wraps hid_device.py. Transport opens lazily on first send.
-    Prefers pyusb, falls back to hidapi.
+    Prefers pyusb, falls back to hidapi.  With pyusb, up to
+    *max_in_flight* frames are queued for the transfer threads, which send
+    them one at a time (1 = synchronous).
     """
 
-    def __init__(self, vid: int, pid: int, device_type: int):
+    def __init__(self, vid: int, pid: int, device_type: int,
+                 max_in_flight: Optional[int] = None):
         super().__init__()
         self._vid = vid
         self._pid = pid
         self._device_type = device_type
+        self._max_in_flight = max_in_flight
         self._transport = None
 
     def send_image(self, image_data: bytes, width: int, height: int) -> bool:
@@ -238,10 +288,11 @@ class HidProtocol(DeviceProtocol):
 
     def _create_transport(self):
         """Create the best available USB transport."""
-        from .hid_device import HIDAPI_AVAILABLE, PYUSB_AVAILABLE
+        from .hid_device import DEFAULT_MAX_IN_FLIGHT, HIDAPI_AVAILABLE, PYUSB_AVAILABLE
         if PYUSB_AVAILABLE:
             from .hid_device import PyUsbTransport
-            return PyUsbTransport(self._vid, self._pid)
+            depth = self._max_in_flight or DEFAULT_MAX_IN_FLIGHT
+            return PyUsbTransport(self._vid, self._pid, max_in_flight=depth)
         elif HIDAPI_AVAILABLE:
             from .hid_device import HidApiTransport
             return HidApiTransport(self._vid, self._pid)
@@ -456,11 +507,15 @@ class DeviceProtocolFactory:
         protocol.on_send_complete = lambda ok: update_ui(ok)
         protocol.send_image(data, w, h)
 
+        # Frame streams (video, overlay ticks) go through the sender:
+        DeviceProtocolFactory.get_sender(device_info).submit(data, w, h)
+
         # When done:
         DeviceProtocolFactory.close_all()
     """
 
     _protocols: Dict[str, DeviceProtocol] = {}
+    _senders: Dict[str, FrameSender] = {}
 
     @classmethod
     def _device_key(cls, device_info) -> str:
@@ -474,7 +529,8 @@ class DeviceProtocolFactory:
     def create_protocol(cls, device_info) -> DeviceProtocol:
         """Create a new protocol for the given device (not cached).
 
-        Routes to ScsiProtocol or HidProtocol based on device_info.protocol.
+        Routes to ScsiProtocol or HidProtocol based on device_info.protocol
+        ('virtual' gives a loopback VirtualProtocol, see virtual_device.py).
         SCSI is the default when protocol is unset.
 
         Args:
@@ -491,6 +547,9 @@ class DeviceProtocolFactory:
 
         if protocol == 'scsi':
             return ScsiProtocol(device_info.path)
+        elif protocol == 'virtual':
+            from .virtual_device import VirtualProtocol
+            return VirtualProtocol.from_device_info(device_info)
         elif protocol == 'hid':
             # LED devices use a different protocol than LCD HID devices
             if implementation == 'hid_led':
@@ -498,10 +557,12 @@ class DeviceProtocolFactory:
                     vid=device_info.vid,
                     pid=device_info.pid,
                 )
+            from .paths import get_saved_hid_max_in_flight
             return HidProtocol(
                 vid=device_info.vid,
                 pid=device_info.pid,
                 device_type=getattr(device_info, 'device_type', 2),
+                max_in_flight=get_saved_hid_max_in_flight(),
             )
         else:
             raise ValueError(f"Unknown protocol: {protocol!r}")
@@ -521,10 +582,30 @@ class DeviceProtocolFactory:
             cls._protocols[key] = cls.create_protocol(device_info)
         return cls._protocols[key]
 
+    @classmethod
+    def get_sender(cls, device_info) -> FrameSender:
+        """Get or create the background frame sender for the device.
+
+        One long-lived worker thread per cached protocol, fed by a
+        latest-frame-wins mailbox (see frame_sender.py).
+        """
+        key = cls._device_key(device_info)
+        sender = cls._senders.get(key)
+        if sender is None:
+            protocol = cls.get_protocol(device_info)
+            sender = FrameSender(
+                lambda data, w, h, changed: send_frame(protocol, data, w, h, changed),
+                name=f"trcc-send-{key}")
+            cls._senders[key] = sender
+        return sender
+
     @classmethod
     def remove_protocol(cls, device_info) -> None:
-        """Remove and close a cached protocol."""
+        """Remove and close a cached protocol (stopping its sender first)."""
         key = cls._device_key(device_info)
+        sender = cls._senders.pop(key, None)
+        if sender is not None:
+            sender.stop()
         proto = cls._protocols.pop(key, None)
         if proto is not None:
             proto.close()
@@ -532,6 +613,9 @@ class DeviceProtocolFactory:
     @classmethod
     def close_all(cls) -> None:
         """Close all cached protocols and clear the cache."""
+        for sender in cls._senders.values():
+            sender.stop()
+        cls._senders.clear()
         for proto in cls._protocols.values():
             try:
                 proto.close()
@@ -554,9 +638,10 @@ DeviceSenderFactory = DeviceProtocolFactory
 # =========================================================================
 
 PROTOCOL_NAMES = {
-    "scsi": "SCSI (sg_raw)",
+    "scsi": "SCSI",  # With the backend in use: scsi_protocol_display()
     "hid": "HID (USB bulk)",
     "led": "LED (HID 64-byte)",
+    "virtual": "Virtual (loopback)",
 }
 
 DEVICE_TYPE_NAMES = {
@@ -567,6 +652,14 @@ DEVICE_TYPE_NAMES = {
 
 LED_DEVICE_TYPE_NAME = "RGB LED Controller"
 
+_SCSI_BACKEND_NAMES = {"sg_io": "SG_IO", "sg_raw": "sg_raw"}
+
+
+def scsi_protocol_display(active_backend: str) -> str:
+    """SCSI label naming the transport in use, e.g. "SCSI (SG_IO)"."""
+    backend = _SCSI_BACKEND_NAMES.get(active_backend)
+    return f"{PROTOCOL_NAMES['scsi']} ({backend})" if backend else PROTOCOL_NAMES["scsi"]
+
 
 @dataclass
 class ProtocolInfo:
@@ -601,7 +694,9 @@ class ProtocolInfo:
     def has_backend(self) -> bool:
         """Whether at least one usable backend is available."""
         if self.protocol == "scsi":
-            return self.backends.get("sg_raw", False)
+            return self.backends.get("sg_raw", False) or self.backends.get("sg_io", False)
+        if self.protocol == "virtual":
+            return True
         return self.backends.get("pyusb", False) or self.backends.get("hidapi", False)
 
 
@@ -696,7 +791,8 @@ def get_protocol_info(device_info=None) -> ProtocolInfo:
     return ProtocolInfo(
         protocol=protocol,
         device_type=device_type,
-        protocol_display=PROTOCOL_NAMES.get(protocol, protocol),
+        protocol_display=(scsi_protocol_display(active) if protocol == "scsi"
+                          else PROTOCOL_NAMES.get(protocol, protocol)),
         device_type_display=DEVICE_TYPE_NAMES.get(device_type, f"Type {device_type}"),
         active_backend=active,
         backends=backends,
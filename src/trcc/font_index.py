@@ -0,0 +1,239 @@
+"""
+Process-wide font lookup for overlay rendering.
+
+Resolving a font used to cost an ``fc-match`` subprocess per family name, an
+``os.listdir`` of every FONT_SEARCH_DIRS entry as fallback, and dozens of
+``os.path.exists`` probes for the default chain.  Each OverlayRenderer has
+its own font cache, so that cost came back on every theme or resolution
+change.
+
+FontIndex keeps the file listing of each search directory together with the
+directory's mtime, plus the fc-match answers seen so far, and persists both
+to ~/.config/trcc/font_index.json.  Listings are refreshed from directory
+mtimes (checked at most every REFRESH_INTERVAL seconds).  The remembered
+fc-match answers are dropped when any listing changes or when fontconfig's
+cache directories (FONTCONFIG_CACHE_DIRS) do, i.e. after fc-cache picked up
+fonts installed anywhere fontconfig looks, since a newly installed font may
+now be the better match.
+
+load_font() is a shared LRU of ImageFont objects keyed by (path, size), so
+renderers created for a new theme reuse fonts already loaded.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from PIL import ImageFont
+
+from trcc.paths import FONT_INDEX_PATH, FONT_SEARCH_DIRS, FONTCONFIG_CACHE_DIRS
+
+INDEX_VERSION = 2
+REFRESH_INTERVAL = 10.0  # Seconds between directory mtime checks
+
+_NO_MATCH = ''  # Stored fc-match answer: nothing usable
+
+
+def default_font_filenames(bold: bool) -> List[str]:
+    """Default fallback font files in priority order.
+
+    Priority: bundled MSYH → Noto CJK → Noto Sans → DejaVu.
+    """
+    bold_suffix = '-Bold' if bold else ''
+    bold_style = 'Bold' if bold else 'Regular'
+    msyh_name = 'MSYHBD.TTC' if bold else 'MSYH.TTC'
+    return [
+        msyh_name, msyh_name.lower(),                           # Microsoft YaHei (bundled)
+        'NotoSansCJK-VF.ttc', 'NotoSansCJK-Regular.ttc',        # Noto CJK
+        'NotoSans[wght].ttf', f'NotoSans-{bold_style}.ttf',    # Noto Sans
+        f'DejaVuSans{bold_suffix}.ttf',                          # DejaVu
+    ]
+
+
+def _fc_match(font_name: str, bold: bool) -> Optional[str]:
+    """Font file fontconfig picks for *font_name*, or None."""
+    try:
+        style = 'Bold' if bold else 'Regular'
+        result = subprocess.run(
+            ['fc-match', f'{font_name}:style={style}', '--format=%{file}'],
+            capture_output=True, text=True, timeout=2
+        )
+        if result.returncode == 0 and result.stdout and os.path.exists(result.stdout):
+            return result.stdout
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+    return None
+
+
+def _mtimes(dirs: Sequence[str]) -> List[Optional[float]]:
+    """mtime of each directory (None if missing)."""
+    stamps: List[Optional[float]] = []
+    for d in dirs:
+        try:
+            stamps.append(os.stat(d).st_mtime)
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+
+class FontIndex:
+    """Font directory listings and fc-match answers, refreshed by mtime.
+
+    Args:
+        dirs: Directories to index, in search order (default FONT_SEARCH_DIRS)
+        path: JSON file to persist the index to, or None to keep it in memory
+        fc_cache_dirs: fontconfig cache directories whose changes invalidate
+            the fc-match answers (default FONTCONFIG_CACHE_DIRS)
+    """
+
+    def __init__(self, dirs: Optional[Sequence[str]] = None, path: Optional[str] = None,
+                 fc_cache_dirs: Optional[Sequence[str]] = None):
+        self.dirs = list(FONT_SEARCH_DIRS if dirs is None else dirs)
+        self.path = path
+        self.fc_cache_dirs = list(FONTCONFIG_CACHE_DIRS if fc_cache_dirs is None
+                                  else fc_cache_dirs)
+        self._lock = threading.Lock()
+        self._listings: Dict[str, dict] = {}   # dir -> {'mtime': float, 'files': [...]}
+        self._matches: Dict[str, str] = {}     # 'name:Style' -> path or _NO_MATCH
+        self._fc_cache: Optional[list] = None  # fontconfig cache mtimes the matches are from
+        self._checked = 0.0
+        self._dirty = False
+        self._load()
+
+    # ── persistence ──────────────────────────────────────────────────────
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            return
+        listings = data.get('dirs', {})
+        self._listings = {d: v for d, v in listings.items()
+                          if d in self.dirs and isinstance(v, dict)}
+        self._matches = {k: v for k, v in data.get('matches', {}).items()
+                         if v == _NO_MATCH or os.path.exists(v)}
+        self._fc_cache = data.get('fc_cache')
+
+    def save(self):
+        """Write the index if it changed since it was loaded / last saved."""
+        if not self.path or not self._dirty:
+            return
+        data = {'version': INDEX_VERSION, 'dirs': self._listings, 'matches': self._matches,
+                'fc_cache': self._fc_cache}
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+    # ── refresh ──────────────────────────────────────────────────────────
+
+    def _refresh(self, force: bool = False):
+        """Re-list directories whose mtime changed (caller holds the lock)."""
+        now = time.monotonic()
+        if not force and self._checked and now - self._checked < REFRESH_INTERVAL:
+            return
+        self._checked = now
+        changed = False
+        for font_dir in self.dirs:
+            try:
+                mtime = os.stat(font_dir).st_mtime
+            except OSError:
+                mtime = None
+            entry = self._listings.get(font_dir)
+            if entry is not None and entry.get('mtime') == mtime:
+                continue
+            files: List[str] = []
+            if mtime is not None:
+                try:
+                    files = os.listdir(font_dir)
+                except OSError:
+                    pass
+            if entry is None or entry.get('files') != files:
+                changed = True
+            self._listings[font_dir] = {'mtime': mtime, 'files': files}
+            self._dirty = True
+        fc_cache = _mtimes(self.fc_cache_dirs)
+        if fc_cache != self._fc_cache:
+            changed = True  # fc-cache ran: fonts may be new anywhere fontconfig looks
+            self._fc_cache = fc_cache
+            self._dirty = True
+        if changed and self._matches:
+            self._matches = {}
+        if self._dirty:
+            self.save()
+
+    def refresh(self):
+        """Check every directory now, ignoring REFRESH_INTERVAL."""
+        with self._lock:
+            self._refresh(force=True)
+
+    # ── lookups ──────────────────────────────────────────────────────────
+
+    def find(self, font_name: str, bold: bool = False) -> Optional[str]:
+        """Resolve a family name to a font file (fc-match, then file names)."""
+        key = f"{font_name}:{'Bold' if bold else 'Regular'}"
+        with self._lock:
+            self._refresh()
+            match = self._matches.get(key)
+        if match is None:
+            match = _fc_match(font_name, bold) or _NO_MATCH  # Outside the lock (subprocess)
+            with self._lock:
+                self._matches[key] = match
+                self._dirty = True
+                self.save()
+        if match:
+            return match
+
+        with self._lock:
+            # Manual scan using centralized cross-distro font search dirs
+            name_lower = font_name.lower().replace(' ', '')
+            for font_dir in self.dirs:
+                for fname in self._listings.get(font_dir, {}).get('files') or []:
+                    if name_lower in fname.lower().replace(' ', ''):
+                        return os.path.join(font_dir, fname)
+        return None
+
+    def default_path(self, bold: bool = False) -> Optional[str]:
+        """First available default font file (see default_font_filenames)."""
+        names = default_font_filenames(bold)
+        with self._lock:
+            self._refresh()
+            for font_dir in self.dirs:
+                files = set(self._listings.get(font_dir, {}).get('files') or [])
+                for fname in names:
+                    if fname in files:
+                        return os.path.join(font_dir, fname)
+        return None
+
+
+_index: Optional[FontIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_font_index() -> FontIndex:
+    """The process-wide FontIndex (FONT_SEARCH_DIRS, persisted to FONT_INDEX_PATH)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FontIndex(path=FONT_INDEX_PATH)
+        return _index
+
+
+@lru_cache(maxsize=128)
+def load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Shared ImageFont for *path* at *size* (LRU across all renderers)."""
+    return ImageFont.truetype(path, size)
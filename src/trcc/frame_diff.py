@@ -0,0 +1,128 @@
+"""
+Frame-diff stage for LCD sends.
+
+Sits between RGB565 conversion and the device send.  Each outgoing frame is
+compared against the last frame actually handed to the device; identical
+frames (a static theme between clock ticks) are skipped, and for changed
+frames the indices of the 64 KiB chunks that differ are reported so that
+protocols able to do partial updates can resend only those.
+
+The chunk size matches the SCSI frame chunking in scsi_device.py, so chunk
+index N here is the same chunk the device receives with cmd 0x101F5 | N<<24.
+
+When the caller knows which screen areas changed (the overlay renderer's
+dirty rects), only the chunks covering them are compared.
+"""
+
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+CHUNK_SIZE = 0x10000  # 64 KiB, same as scsi_device._CHUNK_SIZE
+
+
+class FrameDiff:
+    """Compare RGB565 frames against the last one sent.
+
+    Usage::
+
+        changed = diff.changed_chunks(data)
+        if changed:
+            diff.commit(data)
+            send(data, changed)
+
+    ``commit()`` keeps a private copy, so callers may reuse their output
+    buffer.  Call ``reset()`` when the last send failed or the device
+    changed, so the next frame is sent in full.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._last: Optional[bytes] = None
+        self.source: Any = None  # What the committed frame was rendered from
+
+        # Counters (for status display / benchmarking)
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.chunks_sent = 0
+        self.chunks_total = 0
+
+    def chunk_count(self, size: int) -> int:
+        """Number of chunks a frame of *size* bytes is split into."""
+        return -(-size // self.chunk_size)
+
+    def chunks_for_rects(self, rects: Iterable[Tuple[int, int, int, int]],
+                         width: int, height: int, bytes_per_pixel: int = 2) -> List[int]:
+        """Chunk indices covering *rects* (x0, y0, x1, y1) of a row-major
+        frame *width* x *height* pixels, clipped to the frame."""
+        cs = self.chunk_size
+        chunks = set()
+        for x0, y0, x1, y1 in rects:
+            x0, y0 = max(0, x0), max(0, y0)
+            x1, y1 = min(width, x1), min(height, y1)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            start = (y0 * width + x0) * bytes_per_pixel
+            end = ((y1 - 1) * width + x1) * bytes_per_pixel
+            chunks.update(range(start // cs, (end - 1) // cs + 1))
+        return sorted(chunks)
+
+    def changed_chunks(self, data, candidates: Optional[Sequence[int]] = None,
+                       since: Any = None) -> List[int]:
+        """Return indices of chunks that differ from the last committed frame.
+
+        Returns every index when there is no previous frame or the size
+        changed, and an empty list when the frame is identical.
+
+        *candidates* limits the comparison to those chunks (the rest are
+        known to match).  They are only trusted when *since* equals the
+        ``source`` committed with the last frame, i.e. they were worked
+        out against that very frame.
+        """
+        last = self._last
+        n = self.chunk_count(len(data))
+        if last is None or len(last) != len(data):
+            return list(range(n))
+        if candidates is not None and since is not None and since == self.source:
+            indices: Iterable[int] = [i for i in candidates if 0 <= i < n]
+        elif last == data:
+            self.frames_skipped += 1
+            return []
+        else:
+            indices = range(n)
+
+        # bytes slices compare with memcmp (memoryview compares per item)
+        cur = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+        cs = self.chunk_size
+        changed = [
+            i for i in indices
+            if cur[i * cs:(i + 1) * cs] != last[i * cs:(i + 1) * cs]
+        ]
+        if not changed:
+            self.frames_skipped += 1
+        return changed
+
+    def commit(self, data, changed: Optional[List[int]] = None, source: Any = None) -> None:
+        """Record *data* as the frame now on the device.
+
+        *source* identifies what the frame was rendered from, for the
+        *since* check of the next changed_chunks() call.
+        """
+        self._last = bytes(data)
+        self.source = source
+        n = self.chunk_count(len(data))
+        self.frames_sent += 1
+        self.chunks_sent += n if changed is None else len(changed)
+        self.chunks_total += n
+
+    @property
+    def last(self) -> Optional[bytes]:
+        """Private copy of the last committed frame (safe to hand to a sender)."""
+        return self._last
+
+    def reset(self) -> None:
+        """Forget the last frame so the next one is sent in full."""
+        self._last = None
+        self.source = None
+
+    def __repr__(self) -> str:
+        return (f"FrameDiff(sent={self.frames_sent}, skipped={self.frames_skipped}, "
+                f"chunks={self.chunks_sent}/{self.chunks_total})")
@@ -0,0 +1,193 @@
+"""
+Per-device send worker with a latest-frame-wins mailbox.
+
+One long-lived thread per device protocol takes frames from a single-slot
+mailbox and hands them to the device.  Posting a frame while another is
+still waiting replaces the waiting one (counted as dropped), so a slow
+device always receives the freshest frame instead of a backlog, and the
+sender never blocks the caller::
+
+    sender = FrameSender(lambda data, w, h, changed: proto.send_image(data, w, h))
+    sender.submit(rgb565, 320, 320)     # returns immediately
+    sender.stats.avg_latency_ms         # submit -> device ack
+
+Changed-chunk lists (FrameDiff) are merged when a frame is replaced, and
+the frame after a failed send always goes out in full, since the device
+state is unknown at that point.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+SendFunc = Callable[[bytes, int, int, Optional[List[int]]], bool]
+DoneCallback = Callable[[bool], None]
+
+
+@dataclass
+class SendStats:
+    """Counters for one sender (for status display / benchmarking)."""
+    frames_submitted: int = 0
+    frames_sent: int = 0
+    frames_failed: int = 0
+    frames_dropped: int = 0       # Replaced in the mailbox before being sent
+    last_latency_ms: float = 0.0  # Submit -> send finished, last frame
+    max_latency_ms: float = 0.0
+    total_latency_ms: float = 0.0
+    last_send_ms: float = 0.0     # Time spent in the device send itself
+
+    @property
+    def avg_latency_ms(self) -> float:
+        done = self.frames_sent + self.frames_failed
+        return self.total_latency_ms / done if done else 0.0
+
+
+@dataclass
+class _Pending:
+    data: bytes
+    width: int
+    height: int
+    changed: Optional[List[int]]
+    on_done: Optional[DoneCallback]
+    submitted: float
+
+
+def _merge_chunks(old: Optional[List[int]],
+                  new: Optional[List[int]]) -> Optional[List[int]]:
+    """Chunks to send when a frame replaces one that was never sent."""
+    if old is None or new is None:
+        return None  # Either side was a full send
+    return sorted(set(old) | set(new))
+
+
+class FrameSender:
+    """Single-slot mailbox drained by one daemon thread.
+
+    Args:
+        send: Called on the worker thread as ``send(data, w, h, changed)``;
+            returns True on success.  Exceptions count as failures.
+        name: Thread name (shows up in py-spy / top -H).
+    """
+
+    def __init__(self, send: SendFunc, name: str = 'trcc-send'):
+        self._send = send
+        self._name = name
+        self._cond = threading.Condition()
+        self._pending: Optional[_Pending] = None
+        self._busy = False
+        self._force_full = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = SendStats()
+
+    def submit(self, data: bytes, width: int, height: int,
+               changed_chunks: Optional[List[int]] = None,
+               on_done: Optional[DoneCallback] = None) -> bool:
+        """Post a frame, replacing any frame still waiting to be sent.
+
+        *data* must not be modified afterwards (pass bytes, or a view of a
+        buffer that is never overwritten in place).  *on_done(success)*
+        runs on the worker thread; a replaced frame's callback never runs.
+
+        Returns:
+            False if the sender has been stopped.
+        """
+        with self._cond:
+            if self._stopped:
+                return False
+            old = self._pending
+            if old is not None:
+                self.stats.frames_dropped += 1
+                changed_chunks = _merge_chunks(old.changed, changed_chunks)
+            self._pending = _Pending(data, width, height, changed_chunks,
+                                     on_done, time.monotonic())
+            self.stats.frames_submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name,
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    def _take(self) -> Optional[Tuple[_Pending, bool]]:
+        """Wait for the next frame; None once stopped."""
+        with self._cond:
+            while self._pending is None and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return None
+            job, self._pending = self._pending, None
+            full, self._force_full = self._force_full, False
+            self._busy = True
+            return job, full
+
+    def _run(self) -> None:
+        while True:
+            item = self._take()
+            if item is None:
+                return
+            job, full = item
+            start = time.monotonic()
+            try:
+                ok = bool(self._send(job.data, job.width, job.height,
+                                     None if full else job.changed))
+            except Exception as e:
+                print(f"[!] Device send error: {e}")
+                ok = False
+            end = time.monotonic()
+
+            with self._cond:
+                stats = self.stats
+                latency = (end - job.submitted) * 1000.0
+                stats.last_send_ms = (end - start) * 1000.0
+                stats.last_latency_ms = latency
+                stats.max_latency_ms = max(stats.max_latency_ms, latency)
+                stats.total_latency_ms += latency
+                if ok:
+                    stats.frames_sent += 1
+                else:
+                    stats.frames_failed += 1
+                    self._force_full = True
+
+            if job.on_done:
+                try:
+                    job.on_done(ok)
+                except Exception as e:
+                    print(f"[!] Send callback error: {e}")
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    @property
+    def is_busy(self) -> bool:
+        """Whether a frame is being sent or waiting to be sent."""
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until the mailbox is empty and no send is running.
+
+        Returns:
+            False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._stopped or (not self._busy and self._pending is None),
+                timeout)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Discard any waiting frame and stop the worker thread."""
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def __repr__(self) -> str:
+        s = self.stats
+        return (f"FrameSender(sent={s.frames_sent}, failed={s.frames_failed}, "
+                f"dropped={s.frames_dropped}, avg={s.avg_latency_ms:.1f}ms)")
@@ -8,11 +8,13 @@ Handles GIF theme playback and video frame extraction using FFmpeg.
 from __future__ import annotations
 
 import os
-import shutil
 import subprocess
-import tempfile
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterator
 
+import numpy as np
 from PIL import Image
 
 
@@ -264,6 +266,254 @@ class GIFThemeLoader:
         return animator.frame_count
 
 
+class FFmpegFrameStream:
+    """Stream raw rgb24 frames from an ffmpeg stdout pipe.
+
+    ffmpeg scales to the target size and resamples to 16 fps (Windows
+    originalImageHz), then writes packed RGB bytes to stdout; each frame is
+    read straight into its own numpy buffer and wrapped as a PIL Image
+    without another copy.  Nothing touches the disk, and the first frame is
+    available as soon as ffmpeg has decoded it.
+
+    Iterate to get frames; the process is reaped (and killed if iteration
+    stops early) when the iterator finishes or close() is called.
+    """
+
+    def __init__(self, video_path, target_size=(320, 320), fps=16, start_time=0.0):
+        self.video_path = video_path
+        self.target_size = target_size
+        self.fps = fps
+        self.start_time = start_time
+        self.returncode: int | None = None
+        self.error = ''
+        self._proc: subprocess.Popen | None = None
+
+    def command(self) -> list:
+        """ffmpeg argv for this stream."""
+        w, h = self.target_size
+        cmd = ['ffmpeg', '-v', 'error', '-nostdin']
+        if self.start_time > 0:
+            cmd += ['-ss', f'{self.start_time:.3f}']  # Input seek (fast)
+        cmd += [
+            '-i', self.video_path,
+            '-r', str(self.fps),
+            '-vf', f'scale={w}:{h}',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            'pipe:1',
+        ]
+        return cmd
+
+    def __iter__(self) -> Iterator[Image.Image]:
+        w, h = self.target_size
+        frame_bytes = w * h * 3
+        self._proc = subprocess.Popen(self.command(), stdout=subprocess.PIPE,
+                                      stderr=subprocess.PIPE)
+        stdout = self._proc.stdout
+        assert stdout is not None
+        finished = False
+        try:
+            while True:
+                buf = np.empty((h, w, 3), dtype=np.uint8)
+                view = memoryview(buf).cast('B')
+                got = 0
+                while got < frame_bytes:
+                    n = stdout.readinto(view[got:])
+                    if not n:
+                        break
+                    got += n
+                if got < frame_bytes:
+                    finished = True  # EOF (a trailing partial frame is dropped)
+                    break
+                yield Image.fromarray(buf)
+        finally:
+            self.close(kill=not finished)
+
+    def close(self, kill: bool = True):
+        """Stop ffmpeg (if still running) and collect its exit status."""
+        proc = self._proc
+        if proc is None:
+            return
+        self._proc = None
+        if kill and proc.poll() is None:
+            proc.kill()
+        try:
+            _, err = proc.communicate(timeout=5)
+            self.error = (err or b'').decode(errors='replace').strip()
+        except Exception:
+            pass
+        self.returncode = proc.returncode
+
+    def kill(self):
+        """Kill ffmpeg from another thread; the reader sees EOF and reaps it."""
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+
+# Frames held by a streaming VideoPlayer (2 s at 16 fps)
+RING_BUFFER_FRAMES = 32
+
+
+class StreamingDecoder:
+    """Fixed-size ring buffer of decoded frames, filled by a background thread.
+
+    The decoder thread runs an FFmpegFrameStream from a start frame and
+    blocks once ``capacity`` frames are waiting, so memory stays bounded
+    regardless of video length.  At end of file it wraps back to frame 0
+    (when looping), which also reveals the exact frame count.
+
+    ``get(index)`` pops the next frame when *index* follows on from the last
+    one (or is a few frames past it, if the consumer skipped ahead while the
+    decoder lagged); any other index (seek, or a loop point the consumer
+    guessed wrong) restarts ffmpeg with ``-ss index / fps``.  A decoder
+    slower than playback still shows its newest frame each tick, so the
+    video advances at the decoder's pace instead of freezing.
+    ``last_index`` is the index of the frame ``get`` returned last.
+    """
+
+    def __init__(self, video_path, target_size=(320, 320), fps=16,
+                 capacity=RING_BUFFER_FRAMES, loop=True):
+        self.video_path = video_path
+        self.target_size = target_size
+        self.fps = fps
+        self.capacity = max(1, capacity)
+        self.loop = loop
+        self.frame_count = 0  # Exact count, known after the first EOF
+        self.last_index = 0   # Index of the frame get() returned last
+
+        self._ring: deque = deque()
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._next: int | None = None  # Index the consumer is expected to ask for
+        self._eof = False
+        self._stream: FFmpegFrameStream | None = None
+        self._thread: threading.Thread | None = None
+
+    def __len__(self):
+        return len(self._ring)
+
+    def start(self, index=0):
+        """(Re)start decoding at frame *index*, discarding buffered frames."""
+        past_end = bool(self.frame_count) and index >= self.frame_count
+        if past_end and self.loop:
+            index, past_end = 0, False
+        with self._cond:
+            self._generation += 1
+            self._ring.clear()
+            self._next = index
+            self._eof = past_end
+            stream, self._stream = self._stream, None
+            self._cond.notify_all()
+            generation = self._generation
+        if stream is not None:
+            stream.kill()
+        if past_end:
+            return
+        self._thread = threading.Thread(target=self._decode, args=(index, generation),
+                                        daemon=True, name='trcc-video-decode')
+        self._thread.start()
+
+    def _decode(self, index, generation):
+        """Decoder thread: push (index, frame) pairs until stopped."""
+        while True:
+            stream = FFmpegFrameStream(self.video_path, self.target_size, self.fps,
+                                       start_time=index / self.fps)
+            with self._cond:
+                if generation != self._generation:
+                    return
+                self._stream = stream
+
+            start = index
+            frames = iter(stream)
+            try:
+                for frame in frames:
+                    with self._cond:
+                        while (len(self._ring) >= self.capacity
+                               and generation == self._generation):
+                            self._cond.wait()
+                        if generation != self._generation:
+                            return
+                        self._ring.append((index, frame))
+                        self._cond.notify_all()
+                    index += 1
+            except OSError as e:
+                print(f"[!] Video decode failed: {e}")
+                with self._cond:
+                    self._eof = True
+                    self._cond.notify_all()
+                return
+            finally:
+                frames.close()  # type: ignore[attr-defined]
+
+            with self._cond:
+                if generation != self._generation:
+                    return
+                if index > start or start == 0:
+                    self.frame_count = index  # Reached EOF: exact length
+                if not self.loop or index == 0:
+                    self._eof = True
+                    self._cond.notify_all()
+                    return
+            index = 0
+
+    def get(self, index, timeout=0.0):
+        """Frame *index*, or None if no frame is decoded within *timeout* s.
+
+        Non-blocking by default, so a playback tick never waits on ffmpeg;
+        on None the caller shows its previous frame again.  When the caller
+        moved on while the decoder was behind (*index* at most ``capacity``
+        frames past the expected one), the missed frames are dropped instead
+        of restarting ffmpeg, and if *index* itself isn't decoded yet the
+        newest of them is returned (see ``last_index``).
+        """
+        with self._cond:
+            expected = self._next
+        lag = index - expected if expected is not None else -1
+        past_end = bool(self.frame_count) and index >= self.frame_count
+        if index != expected and (past_end or not 0 < lag <= self.capacity):
+            self.start(index)
+        elif lag > 0:
+            with self._cond:
+                self._next = index
+
+        newest = None  # Latest frame missed while the decoder was behind
+
+        def ready():
+            nonlocal newest
+            while self._ring and 0 < index - self._ring[0][0] <= self.capacity:
+                newest = self._ring.popleft()
+                self._cond.notify_all()
+            return bool(self._ring) or self._eof
+
+        with self._cond:
+            if self._cond.wait_for(ready, timeout) and self._ring:
+                frame_index, frame = self._ring.popleft()
+            elif newest is not None:
+                frame_index, frame = newest  # Wanted frame not decoded yet
+            else:
+                return None  # Nothing new (or at EOF) — caller repeats last frame
+            self.last_index = frame_index
+            self._next = frame_index + 1
+            if self.loop and self.frame_count and self._next >= self.frame_count:
+                self._next = 0
+            self._cond.notify_all()
+            return frame
+
+    def stop(self):
+        """Stop the decoder thread and ffmpeg."""
+        with self._cond:
+            self._generation += 1
+            self._ring.clear()
+            self._next = None
+            stream, self._stream = self._stream, None
+            self._cond.notify_all()
+        if stream is not None:
+            stream.kill()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+
 class VideoPlayer(AbstractMediaPlayer):
     """
     Video player using FFmpeg for frame extraction.
@@ -272,13 +522,15 @@ class VideoPlayer(AbstractMediaPlayer):
     Uses FFmpeg subprocess matching Windows TRCC behavior.
     """
 
-    def __init__(self, video_path, target_size=(320, 320)):
+    def __init__(self, video_path, target_size=(320, 320), preload=True):
         """
         Initialize video player
 
         Args:
             video_path: Path to video file
             target_size: Target frame size (width, height)
+            preload: Decode all frames now (blocking).  If False, frames
+                are decoded as iter_frames() is consumed.
         """
         if not FFMPEG_AVAILABLE:
             raise RuntimeError("FFmpeg not available. Install it:\n"
@@ -289,8 +541,11 @@ class VideoPlayer(AbstractMediaPlayer):
         self.target_size = target_size
         self.fps = 30
         self.speed_multiplier = 1.0
-        self.preload = True  # Preload frames for smooth playback (matches Windows Theme.zt pattern)
-        self._temp_dir: str | None = None  # For FFmpeg temp files
+        self.preload = preload  # Preload frames for smooth playback (matches Windows Theme.zt pattern)
+        self._stream: FFmpegFrameStream | None = None
+        self._decoder: StreamingDecoder | None = None
+        self._last_frame = None  # Last streamed frame (repeated if decoder lags)
+        self.shown_index = 0     # Index of _last_frame
 
         # Load video
         self._load_video()
@@ -301,8 +556,8 @@ class VideoPlayer(AbstractMediaPlayer):
 
     def _load_video_ffmpeg(self):
         """
-        Load video using FFmpeg (matching Windows TRCC behavior).
-        Extracts frames to BMP files, then loads them.
+        Load video using FFmpeg (matching Windows TRCC frame rate and size).
+        Frames are decoded from an rgb24 pipe — no temp files.
         """
         print(f"[*] Loading video with FFmpeg: {self.video_path}")
 
@@ -338,61 +593,76 @@ class VideoPlayer(AbstractMediaPlayer):
             self.width = self.target_size[0]
             self.height = self.target_size[1]
 
-        # Create temp directory for BMP frames (matching Windows TRCC)
-        self._temp_dir = tempfile.mkdtemp(prefix='trcc_video_')
-        assert self._temp_dir is not None
-
-        # Extract frames with FFmpeg (matching Windows command)
         # Windows: ffmpeg -i "{VIDEO}" -y -r 16 -s {W}x{H} -f image2 "{OUTPUT}%04d.bmp"
-        # originalImageHz = 16 in UCBoFangQiKongZhi.cs
-        w, h = self.target_size
-        ffmpeg_cmd = [
-            'ffmpeg',
-            '-i', self.video_path,
-            '-y',  # Overwrite
-            '-r', '16',  # Windows: originalImageHz = 16
-            '-vf', f'scale={w}:{h}',
-            '-f', 'image2',
-            os.path.join(self._temp_dir, '%04d.bmp')
-        ]
-
-        print(f"[*] Extracting frames at 16 FPS to {self._temp_dir}...")
-        try:
-            result = subprocess.run(ffmpeg_cmd, capture_output=True, timeout=300)
-            if result.returncode != 0:
-                raise RuntimeError(f"FFmpeg failed: {result.stderr.decode()[:200]}")
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("FFmpeg timed out (video too long?)")
-
-        # Windows plays at 16fps (62.5ms per frame)
+        # originalImageHz = 16 in UCBoFangQiKongZhi.cs — same rate and size,
+        # but streamed as raw rgb24 instead of BMP files.
+        source_fps = self.fps
         self.fps = 16
 
-        # Load extracted BMP frames
-        self._preload_frames_ffmpeg()
+        if not self.preload:
+            # Estimated length at 16 fps (exact once decoded/streamed)
+            if self.frame_count > 0 and source_fps > 0:
+                self.frame_count = max(1, round(self.frame_count / source_fps * self.fps))
+            return
+
+        self.load_all()
 
+    def load_all(self):
+        """Decode every frame into memory (blocking)."""
+        print("[*] Decoding frames at 16 FPS...")
+        for _ in self.iter_frames():
+            pass
         print(f"[+] Video (FFmpeg): {self.frame_count} frames @ {self.fps:.1f} FPS")
 
-    def _preload_frames_ffmpeg(self):
-        """Load extracted BMP frames from temp directory"""
+    @property
+    def frame_bytes(self) -> int:
+        """Memory per decoded frame (packed RGB)."""
+        return self.target_size[0] * self.target_size[1] * 3
+
+    def start_streaming(self, buffer_frames=RING_BUFFER_FRAMES):
+        """Play from a bounded ring buffer instead of preloaded frames.
+
+        Only *buffer_frames* decoded frames are held at a time; seeking
+        restarts ffmpeg at the new position.
+        """
+        self.close_stream()
         self.frames = []
+        self._decoder = StreamingDecoder(self.video_path, self.target_size, self.fps,
+                                         capacity=buffer_frames, loop=self.loop)
+        self._decoder.start(self.current_frame)
 
-        # Get sorted list of BMP files
-        assert self._temp_dir is not None
-        bmp_files = sorted([f for f in os.listdir(self._temp_dir) if f.endswith('.bmp')])
+    @property
+    def is_streaming(self) -> bool:
+        return self._decoder is not None
 
-        print(f"[*] Loading {len(bmp_files)} BMP frames...")
-        for bmp_file in bmp_files:
-            bmp_path = os.path.join(self._temp_dir, bmp_file)
-            try:
-                frame = Image.open(bmp_path).convert('RGB')
-                if frame.size != self.target_size:
-                    frame = frame.resize(self.target_size, Image.Resampling.LANCZOS)
-                self.frames.append(frame)
-            except Exception as e:
-                print(f"[!] Failed to load {bmp_file}: {e}")
+    def iter_frames(self) -> Iterator[Image.Image]:
+        """Decode frames from ffmpeg, appending each to self.frames.
 
-        self.frame_count = len(self.frames)
-        print(f"[+] Loaded {self.frame_count} frames")
+        Yields every frame as soon as it is decoded, so playback can start
+        after the first one.  Raises RuntimeError if ffmpeg fails before
+        producing any frame.
+        """
+        self.close_stream()
+        self.frames = []
+        self.frame_count = 0
+        self._stream = stream = FFmpegFrameStream(self.video_path, self.target_size, self.fps)
+
+        for frame in stream:
+            self.frames.append(frame)
+            self.frame_count = len(self.frames)
+            yield frame
+
+        if not self.frames and stream.returncode:
+            raise RuntimeError(f"FFmpeg failed: {stream.error[:200]}")
+
+    def close_stream(self):
+        """Stop an in-progress decode (preload iterator or ring buffer)."""
+        if getattr(self, '_stream', None) is not None:
+            self._stream.close()
+            self._stream = None
+        if getattr(self, '_decoder', None) is not None:
+            self._decoder.stop()
+            self._decoder = None
 
     def get_frame(self, frame_index=None):
         """
@@ -407,6 +677,16 @@ class VideoPlayer(AbstractMediaPlayer):
         if frame_index is None:
             frame_index = self.current_frame
 
+        decoder = getattr(self, '_decoder', None)
+        if decoder is not None:
+            frame = decoder.get(frame_index)
+            if decoder.frame_count:
+                self.frame_count = decoder.frame_count
+            if frame is not None:
+                self._last_frame = frame
+                self.shown_index = decoder.last_index
+            return self._last_frame
+
         if 0 <= frame_index < len(self.frames):
             return self.frames[frame_index]
         return self.frames[0] if self.frames else None
@@ -439,18 +719,10 @@ class VideoPlayer(AbstractMediaPlayer):
         return (self.current_frame / self.frame_count) * 100
 
     def close(self):
-        """Release resources and cleanup temp files."""
+        """Release resources and stop any running decode."""
         self.frames = []
-
-        # Clean up FFmpeg temp directory
-        temp_dir = getattr(self, '_temp_dir', None)
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-                print(f"[*] Cleaned up temp dir: {temp_dir}")
-            except Exception as e:
-                print(f"[!] Failed to cleanup temp dir: {e}")
-            self._temp_dir = None
+        self.close_stream()
+        self._last_frame = None
 
     def __del__(self):
         """Cleanup on deletion"""
@@ -524,6 +796,52 @@ class VideoPlayer(AbstractMediaPlayer):
         return extracted
 
 
+def zt_delays(timestamps):
+    """Per-frame delays (ms) from Theme.zt timestamps."""
+    delays = []
+    for i in range(len(timestamps)):
+        if i < len(timestamps) - 1:
+            delay = timestamps[i + 1] - timestamps[i]
+        else:
+            # Last frame - use same delay as previous
+            delay = delays[-1] if delays else 42  # ~24fps default
+        delays.append(max(1, delay))
+    return delays
+
+
+def read_zt_index(buf):
+    """Parse a Theme.zt header and locate every JPEG without decoding.
+
+    One pass over the size fields of *buf* (bytes or mmap).
+
+    Returns:
+        (timestamps, [(offset, size), ...]) with offsets into *buf*
+    """
+    import struct
+
+    if len(buf) < 5 or buf[0] != 0xDC:
+        magic = buf[0] if len(buf) else 0
+        raise ValueError(f"Invalid Theme.zt magic: 0x{magic:02X}, expected 0xDC")
+
+    frame_count = struct.unpack_from('<i', buf, 1)[0]
+    pos = 5 + 4 * frame_count
+    if frame_count < 0 or pos > len(buf):
+        raise ValueError(f"Invalid Theme.zt frame count: {frame_count}")
+    timestamps = list(struct.unpack_from(f'<{frame_count}i', buf, 5))
+
+    index = []
+    for i in range(frame_count):
+        if pos + 4 > len(buf):
+            raise ValueError(f"Theme.zt truncated at frame {i}")
+        size = struct.unpack_from('<i', buf, pos)[0]
+        pos += 4
+        if size < 0 or pos + size > len(buf):
+            raise ValueError(f"Theme.zt truncated at frame {i}")
+        index.append((pos, size))
+        pos += size
+    return timestamps, index
+
+
 class ThemeZtPlayer(AbstractMediaPlayer):
     """
     Plays Theme.zt animation files.
@@ -545,14 +863,34 @@ class ThemeZtPlayer(AbstractMediaPlayer):
             zt_path: Path to Theme.zt file
             target_size: Optional (width, height) to resize frames
         """
-        import io
-        import struct
+        from .zt_cache import open_zt_cache
 
         super().__init__()
         self.zt_path = zt_path
         self.target_size = target_size
         self.timestamps = []
 
+        # Pre-decoded sidecar (zt_cache.py) if one matches target_size
+        cache = open_zt_cache(zt_path, target_size)
+        if cache is not None:
+            with cache:
+                self.timestamps = cache.timestamps
+                self.frames = [cache.image(i) for i in range(cache.frame_count)]
+        else:
+            self._read_zt(zt_path)
+
+        self.frame_count = len(self.frames)
+
+        # Calculate delays from timestamps
+        self.delays = zt_delays(self.timestamps)
+
+    def _read_zt(self, zt_path):
+        """Decode every JPEG frame of *zt_path* into self.frames."""
+        import io
+        import struct
+
+        target_size = self.target_size
+
         # Parse Theme.zt file
         with open(zt_path, 'rb') as f:
             # Read magic byte
@@ -586,18 +924,6 @@ class ThemeZtPlayer(AbstractMediaPlayer):
 
                 self.frames.append(img)
 
-        self.frame_count = len(self.frames)
-
-        # Calculate delays from timestamps
-        self.delays = []
-        for i in range(len(self.timestamps)):
-            if i < len(self.timestamps) - 1:
-                delay = self.timestamps[i + 1] - self.timestamps[i]
-            else:
-                # Last frame - use same delay as previous
-                delay = self.delays[-1] if self.delays else 42  # ~24fps default
-            self.delays.append(max(1, delay))
-
     def get_current_frame(self):
         """Get current frame as PIL Image (copy to prevent mutation)."""
         if 0 <= self.current_frame < len(self.frames):
@@ -629,6 +955,225 @@ class ThemeZtPlayer(AbstractMediaPlayer):
         self.frames = []
 
 
+ZT_CACHE_FRAMES = 8  # Decoded frames kept by MappedThemeZtPlayer
+
+
+class MappedThemeZtPlayer(AbstractMediaPlayer):
+    """
+    Plays Theme.zt animation files without loading them up front.
+
+    Same format and playback API as ThemeZtPlayer, but the file is mmapped
+    and only indexed on open (read_zt_index); each JPEG is decoded when its
+    frame is first requested.  Decoded frames live in a small LRU cache, so
+    memory scales with ``cache_size`` instead of the animation length.
+    With ``decode_ahead`` > 0 a worker thread decodes the next frames while
+    the current one is on screen.
+
+    A pre-decoded sidecar (zt_cache.py) matching ``target_size`` is read
+    instead of the JPEGs when present; an RGB565 one also serves
+    device_frame(), so the controller can send frames without converting.
+
+    ``frames`` stays empty — use get_frame()/get_current_frame().
+    """
+
+    def __init__(self, zt_path, target_size=None, cache_size=ZT_CACHE_FRAMES,
+                 decode_ahead=0):
+        """
+        Open Theme.zt animation.
+
+        Args:
+            zt_path: Path to Theme.zt file
+            target_size: Optional (width, height) to resize frames
+            cache_size: Decoded frames to keep
+            decode_ahead: Frames to decode ahead on a worker thread (0 = off)
+        """
+        import mmap
+        from collections import OrderedDict
+
+        from .zt_cache import open_zt_cache
+
+        super().__init__()
+        self.zt_path = zt_path
+        self.target_size = target_size
+        self.decode_ahead = max(0, decode_ahead)
+        self.cache_size = max(1, cache_size, self.decode_ahead + 1)
+
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._ahead = threading.Condition(self._lock)
+        self._ahead_from: int | None = None  # Worker: decode after this index
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._mm: mmap.mmap | None = None
+        self._file = None
+        self._zt_cache = open_zt_cache(zt_path, target_size)
+        self._device_cache = self._zt_cache  # RGB565 sidecar (device bytes)
+        if self._zt_cache is not None and self._zt_cache.format != 'rgb565':
+            self._device_cache = open_zt_cache(zt_path, target_size, 'rgb565')
+        if self._zt_cache is not None:
+            self.timestamps = self._zt_cache.timestamps
+            self.frame_count = self._zt_cache.frame_count
+        else:
+            self._file = open(zt_path, 'rb')
+            try:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.timestamps, self._index = read_zt_index(self._mm)
+            except Exception:
+                self.close()
+                raise
+            self.frame_count = len(self._index)
+
+        self.delays = zt_delays(self.timestamps)
+
+        if self.decode_ahead:
+            self._thread = threading.Thread(target=self._decode_ahead_loop,
+                                            daemon=True, name='trcc-zt-decode')
+            self._thread.start()
+
+    def _decode(self, index):
+        """Decode frame *index* from the mapped file (no caching)."""
+        import io
+
+        with self._lock:
+            if self._closed:
+                return None
+            if self._zt_cache is not None:
+                return self._zt_cache.image(index)
+            offset, size = self._index[index]
+            jpeg_data = self._mm[offset:offset + size]
+
+        img = Image.open(io.BytesIO(jpeg_data))
+        if self.target_size and img.size != self.target_size:
+            img = img.resize(self.target_size, Image.Resampling.LANCZOS)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        return img
+
+    def _cache_put(self, index, img):
+        """Insert under self._lock, evicting the least recently used."""
+        self._cache[index] = img
+        self._cache.move_to_end(index)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_frame(self, index):
+        """Decoded frame *index* (shared with the cache — don't mutate)."""
+        if not 0 <= index < self.frame_count:
+            return None
+        with self._lock:
+            img = self._cache.get(index)
+            if img is not None:
+                self._cache.move_to_end(index)
+            if self.decode_ahead:
+                self._ahead_from = index
+                self._ahead.notify()
+        if img is None:
+            img = self._decode(index)
+            if img is not None:
+                with self._lock:
+                    self._cache_put(index, img)
+        return img
+
+    def _decode_ahead_loop(self):
+        """Worker: keep the frames after the last requested one decoded."""
+        while True:
+            with self._lock:
+                while not self._closed and self._ahead_from is None:
+                    self._ahead.wait()
+                if self._closed:
+                    return
+                start, self._ahead_from = self._ahead_from, None
+                todo = []
+                for k in range(1, self.decode_ahead + 1):
+                    i = (start + k) % self.frame_count
+                    if i not in self._cache and i not in todo:
+                        todo.append(i)
+
+            for i in todo:
+                try:
+                    img = self._decode(i)
+                except Exception as e:
+                    print(f"[!] Theme.zt frame {i} decode failed: {e}")
+                    break
+                with self._lock:
+                    if img is None or self._closed:
+                        return
+                    # Don't evict frames newer than the one just requested
+                    if i not in self._cache:
+                        self._cache[i] = img
+                        while len(self._cache) > self.cache_size:
+                            self._cache.popitem(last=False)
+                    if self._ahead_from is not None:
+                        break  # Playback moved on — replan from there
+
+    def device_frame(self, index):
+        """Frame *index* as device-ready RGB565 (view into the sidecar), or
+        None without an RGB565 sidecar."""
+        with self._lock:
+            cache = self._device_cache
+            if self._closed or cache is None or not 0 <= index < cache.frame_count:
+                return None
+            return cache.frame_bytes(index)
+
+    @property
+    def cached_count(self) -> int:
+        """Number of decoded frames currently held."""
+        return len(self._cache)
+
+    def get_current_frame(self):
+        """Get current frame as PIL Image (copy to prevent mutation)."""
+        img = self.get_frame(self.current_frame)
+        return img.copy() if img is not None else None
+
+    def get_delay(self):
+        """Get delay for current frame in ms."""
+        if self.current_frame < len(self.delays):
+            return self.delays[self.current_frame]
+        return 42  # ~24fps default
+
+    def seek(self, position):
+        """Seek to position (0.0-1.0)."""
+        position = max(0.0, min(1.0, position))
+        self.current_frame = int(position * (self.frame_count - 1))
+
+    def get_progress(self):
+        """Get current playback progress (0-100)."""
+        if self.frame_count <= 1:
+            return 0
+        return int((self.current_frame / (self.frame_count - 1)) * 100)
+
+    def close_stream(self):
+        """Stop decode-ahead and unmap the file."""
+        with self._ahead:
+            self._closed = True
+            self._ahead.notify_all()
+            mm, self._mm = self._mm, None
+            zt_cache, self._zt_cache = self._zt_cache, None
+            device_cache, self._device_cache = self._device_cache, None
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+        if mm is not None:
+            mm.close()
+        if zt_cache is not None:
+            zt_cache.close()
+        if device_cache is not None and device_cache is not zt_cache:
+            device_cache.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Release resources."""
+        self.close_stream()
+        self._cache.clear()
+
+    def __del__(self):
+        """Cleanup on deletion"""
+        if hasattr(self, '_ahead'):
+            self.close()
+
+
 def test_video_player():
     """Test video player"""
     import sys
@@ -0,0 +1,160 @@
+"""
+Glyph atlas for overlay metric text.
+
+Metric values are short strings from a small alphabet (digits, ``.``, ``%``,
+``°C``, ``:``, ``/``, AM/PM, weekday names), redrawn every second.  Instead
+of shaping and rasterizing each string through FreeType, a GlyphAtlas keeps
+one alpha mask per (character, sub-pixel pen phase) for a font and builds the
+string mask by placing those masks at the pen positions FreeType would use:
+
+- advances and pair kerning come from ``font.getlength`` (cached per
+  character / pair), in 26.6 fixed point like FreeType's own layout;
+- each glyph is rasterized at its fractional pen offset and overlapping
+  glyphs are combined with the same alpha "over" FreeType rendering in
+  Pillow uses, so composited masks match ``ImageDraw.text`` pixel for pixel;
+- the ``anchor='mm'`` shift is computed the way Pillow does it (middle of
+  the advance width, half way between ascender and descender, both rounded
+  to whole pixels).
+
+Masks are colour-independent: the fill is applied when the string mask is
+pasted, so one atlas serves every colour of a font.
+
+Only fonts using Pillow's BASIC layout get an atlas.  With RAQM, HarfBuzz
+shapes the whole string (ligatures such as "fi", contextual forms, GPOS
+kerning), which per-character masks cannot reproduce, so those fonts are
+always drawn through ImageDraw.text.
+"""
+
+import string
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Characters drawn from the atlas; anything else goes through ImageDraw.text
+ATLAS_CHARS = frozenset(string.digits + string.ascii_letters + string.punctuation + ' °')
+
+# Glyphs rasterized up front (format_metric output)
+PRELOAD_CHARS = string.digits + ' .:/%-°CFGHKMBRPNSAU'
+
+_PAD = 2  # Margin around each glyph mask (sub-pixel phase can grow the ink box)
+
+# Atlases kept at once (least recently used dropped), like font_index.load_font
+ATLAS_CACHE_SIZE = 128
+
+# (font file, size, face index) -> atlas, shared by all renderers
+_atlases: 'OrderedDict[tuple, GlyphAtlas]' = OrderedDict()
+
+
+class GlyphAtlas:
+    """Pre-rasterized glyph masks and metrics for one FreeType font."""
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        self.font = font
+        self._glyphs: Dict[Tuple[str, int], Tuple[np.ndarray, int, int]] = {}
+        self._advance: Dict[str, int] = {}
+        self._kerning: Dict[Tuple[str, str], int] = {}
+        # Baseline offset from an 'mm' anchor point (font metric, not ink)
+        self._baseline_dy = font.getbbox('0', anchor='mm')[1] - font.getbbox('0', anchor='ls')[1]
+        for ch in PRELOAD_CHARS:
+            self._glyph(ch, 0)
+
+    @staticmethod
+    def supports(text: str) -> bool:
+        """Whether every character of *text* can come from an atlas."""
+        return bool(text) and all(ch in ATLAS_CHARS for ch in text)
+
+    def _advance64(self, ch: str) -> int:
+        adv = self._advance.get(ch)
+        if adv is None:
+            adv = self._advance[ch] = round(self.font.getlength(ch) * 64)
+        return adv
+
+    def _kerning64(self, left: str, right: str) -> int:
+        kern = self._kerning.get((left, right))
+        if kern is None:
+            pair = round(self.font.getlength(left + right) * 64)
+            kern = pair - self._advance64(left) - self._advance64(right)
+            self._kerning[(left, right)] = kern
+        return kern
+
+    def _glyph(self, ch: str, phase: int) -> Tuple[np.ndarray, int, int]:
+        """Alpha mask of *ch* with the pen at *phase*/64 px, and its offset
+        from the pen position on the baseline."""
+        key = (ch, phase)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            x0, y0, x1, y1 = self.font.getbbox(ch, anchor='ls')
+            size = (x1 - x0 + 2 * _PAD, y1 - y0 + 2 * _PAD)
+            im = Image.new('L', size, 0)
+            ImageDraw.Draw(im).text((_PAD - x0 + phase / 64, _PAD - y0), ch,
+                                    fill=255, font=self.font, anchor='ls')
+            ink = im.getbbox() or (0, 0, 0, 0)  # Trim to the ink (none for spaces)
+            glyph = (np.asarray(im.crop(ink)), x0 - _PAD + ink[0], y0 - _PAD + ink[1])
+            self._glyphs[key] = glyph
+        return glyph
+
+    def mask(self, text: str) -> Tuple[Image.Image, Tuple[int, int]]:
+        """Alpha mask of *text* and its top-left offset from an 'mm' anchor."""
+        placed = []
+        pen = 0
+        prev = None
+        for ch in text:
+            if prev is not None:
+                pen += self._kerning64(prev, ch)
+            arr, gx, gy = self._glyph(ch, pen & 63)
+            if arr.size:
+                placed.append((arr, (pen >> 6) + gx, gy))
+            pen += self._advance64(ch)
+            prev = ch
+
+        # Half the advance width, rounded to the nearest pixel (halves up)
+        anchor_x = (pen + 64) >> 7
+        if not placed:  # Only spaces
+            return Image.new('L', (0, 0)), (-anchor_x, self._baseline_dy)
+
+        left = min(x for _, x, _ in placed)
+        top = min(y for _, _, y in placed)
+        right = max(x + a.shape[1] for a, x, _ in placed)
+        bottom = max(y + a.shape[0] for a, _, y in placed)
+        out = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        inked = left  # Right edge of the ink drawn so far
+        for arr, x, y in placed:
+            h, w = arr.shape
+            region = out[y - top:y - top + h, x - left:x - left + w]
+            if x >= inked:
+                region[:] = arr
+            else:
+                # Overlapping glyphs: g + dst * (255 - g) / 255, MULDIV255 rounding
+                t = region.astype(np.uint16) * (255 - arr) + 128
+                region[:] = arr + (((t >> 8) + t) >> 8)
+            inked = max(inked, x + w)
+
+        return Image.fromarray(out), (left - anchor_x, top + self._baseline_dy)
+
+    def draw(self, image: Image.Image, xy: Tuple[int, int], text: str, fill) -> None:
+        """Draw *text* centred on *xy* (``anchor='mm'``), like ImageDraw.text."""
+        mask, (dx, dy) = self.mask(text)
+        if mask.width:
+            x, y = xy[0] + dx, xy[1] + dy
+            image.paste(fill, (x, y, x + mask.width, y + mask.height), mask)
+
+
+def atlas_for(font) -> Optional[GlyphAtlas]:
+    """Shared atlas for *font*, or None if it is not a file-backed FreeType
+    font using the BASIC layout engine."""
+    path = getattr(font, 'path', None)
+    if not isinstance(font, ImageFont.FreeTypeFont) or not isinstance(path, str):
+        return None
+    if font.layout_engine != ImageFont.Layout.BASIC:
+        return None
+    key = (path, font.size, font.index)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font)
+        if len(_atlases) > ATLAS_CACHE_SIZE:
+            _atlases.popitem(last=False)
+    else:
+        _atlases.move_to_end(key)
+    return atlas
@@ -13,16 +13,32 @@ The ``UsbTransport`` ABC abstracts the raw USB I/O so that:
   • ``PyUsbTransport`` provides real USB via pyusb (libusb backend).
   • ``HidApiTransport`` provides an alternative via HIDAPI.
 
+``PyUsbTransport(..., max_in_flight=N)`` with N > 1 enables queued mode
+(opt-in; the default is synchronous).  This is not libusb's asynchronous
+transfer API: each endpoint direction gets one worker thread that makes
+the same blocking pyusb calls as synchronous mode, so exactly one transfer
+per direction is on the wire at a time.  What it buys is overlap with the
+caller: ``submit_write()`` returns at once, so the next frame is encoded
+while the thread waits on the bus (pyusb releases the GIL inside libusb),
+and Type 3 ACKs are read by the IN-direction thread (``submit_read()``),
+queued once their frame has been written.  N bounds how many submitted
+frames may be waiting for, or on, the wire — a queue depth, not a count of
+concurrent USB transfers.
+
 Linux dependencies (install one):
   • pyusb:  ``pip install pyusb``  (needs libusb1 — ``apt install libusb-1.0-0``)
   • hidapi: ``pip install hidapi`` (needs libhidapi — ``apt install libhidapi-dev``)
 """
 
+import array
+import queue
 import struct
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Set
+from typing import Any, Callable, Deque, List, Optional, Set, Tuple
 
 # Optional USB backends — graceful import
 try:
@@ -74,6 +90,8 @@ TYPE3_RESPONSE_SIZE = 1024
 TYPE3_DATA_SIZE = 204800  # 320*320*2, fixed payload size
 TYPE3_FRAME_TOTAL = 204816  # 16-byte prefix + 204800 data
 TYPE3_ACK_SIZE = 16
+TYPE2_HEADER_SIZE = 20
+TYPE3_HEADER_SIZE = 16
 
 # Alignment
 USB_BULK_ALIGNMENT = 512
@@ -81,6 +99,11 @@ USB_BULK_ALIGNMENT = 512
 # Default timeout (ms)
 DEFAULT_TIMEOUT_MS = 100
 
+# Frames queued per endpoint thread (PyUsbTransport max_in_flight); the
+# thread still sends them one at a time.  1 = synchronous, like the C# app.
+# Queued mode is opt-in ("hid_max_in_flight" in config.json).
+DEFAULT_MAX_IN_FLIGHT = 1
+
 # Timing delays from C# (Thread.Sleep calls in USBLCDNEW.exe)
 DELAY_PRE_INIT_S = 0.050    # Sleep(50)  — before sending init packet
 DELAY_POST_INIT_S = 0.200   # Sleep(200) — after async init write+read
@@ -135,6 +158,95 @@ class UsbTransport(ABC):
         """Whether the device is currently open."""
 
 
+# =========================================================================
+# Async transfers
+# =========================================================================
+
+class UsbTransfer:
+    """Handle for a queued bulk transfer (see PyUsbTransport.submit_write)."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def _finish(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        self.result = result
+        self.error = error
+        self._event.set()
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """Wait for completion and return the transfer result.
+
+        Raises:
+            TimeoutError: If the transfer is still running after *timeout* s.
+            Exception: Whatever the transfer itself raised.
+        """
+        if not self._event.wait(timeout):
+            raise TimeoutError("USB transfer still in flight")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class TransferQueue:
+    """Bulk transfers on one endpoint direction, run in order by one thread.
+
+    The thread makes ordinary blocking calls, so one transfer is on the
+    wire at a time; *max_in_flight* only bounds the queue.  ``submit()``
+    returns immediately unless that many transfers are already pending
+    (queued or running), in which case it blocks until one completes.  pyusb
+    releases the GIL inside libusb, so the caller keeps encoding frames
+    while the thread waits on the bus.  An optional *then* callback runs on
+    the queue thread once the transfer has finished (e.g. to queue the
+    read that answers a write).
+    """
+
+    def __init__(self, fn: Callable[[int, Any, int], Any], max_in_flight: int,
+                 name: str = 'trcc-usb'):
+        self._fn = fn
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight))
+        self._queue: 'queue.Queue[Optional[tuple]]' = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, endpoint: int, arg: Any, timeout: int,
+               then: Optional[Callable[[UsbTransfer], None]] = None) -> UsbTransfer:
+        if self._closed:
+            raise RuntimeError("Transfer queue closed")
+        self._slots.acquire()
+        transfer = UsbTransfer()
+        self._queue.put((transfer, endpoint, arg, timeout, then))
+        return transfer
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            transfer, endpoint, arg, timeout, then = item
+            try:
+                transfer._finish(result=self._fn(endpoint, arg, timeout))
+            except Exception as e:
+                transfer._finish(error=e)
+            finally:
+                self._slots.release()
+            if then is not None:
+                then(transfer)
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Let queued transfers finish, then stop the thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
 # =========================================================================
 # Helpers
 # =========================================================================
@@ -151,6 +263,81 @@ def _ceil_to_512(n: int) -> int:
     )
 
 
+class _AsyncFrames:
+    """In-flight frame bookkeeping shared by the Type 2 / Type 3 handlers.
+
+    Each entry is the list of transfers making up one frame.  A frame
+    succeeded when every transfer returned a non-empty result.
+    """
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self._pending: Deque[Tuple[UsbTransfer, ...]] = deque()
+
+    @staticmethod
+    def _ok(frame: Tuple[UsbTransfer, ...]) -> bool:
+        for t in frame:
+            result = t.wait()
+            if not (len(result) if isinstance(result, (bytes, bytearray)) else result):
+                return False
+        return True
+
+    def add(self, *transfers: UsbTransfer) -> bool:
+        """Track a submitted frame; wait for old ones beyond the depth.
+
+        Returns False if any frame that completed in the meantime failed.
+        Transfer exceptions propagate (so the caller re-handshakes).
+        """
+        self._pending.append(transfers)
+        ok = True
+        while self._pending and (len(self._pending) > self.depth
+                                 or all(t.done for t in self._pending[0])):
+            ok = self._ok(self._pending.popleft()) and ok
+        return ok
+
+    def flush(self) -> bool:
+        """Wait for every frame in flight."""
+        ok = True
+        while self._pending:
+            ok = self._ok(self._pending.popleft()) and ok
+        return ok
+
+
+def _max_in_flight(transport: UsbTransport) -> int:
+    """Async depth of *transport* (1 = synchronous transfers)."""
+    depth = getattr(transport, 'max_in_flight', 1)
+    return depth if isinstance(depth, int) else 1
+
+
+# Zero source for padding packet buffers in place (sliced via memoryview)
+_ZEROS = memoryview(bytes(TYPE3_DATA_SIZE))
+
+
+class _PacketBuffers:
+    """Reusable packet buffers for one device.
+
+    Frames are assembled into a preallocated ``array.array('B')`` sized to
+    the largest packet seen (its capacity) and sent as a memoryview slice
+    of it, so a frame send copies the image once and allocates no
+    packet-sized objects.  array.array is the type pyusb hands to libusb
+    without copying (see PyUsbTransport.write).  Async mode rotates through
+    ``max_in_flight + 1`` buffers: by the time a buffer comes round again,
+    the frame that used it has completed (see _AsyncFrames.add).
+    """
+
+    def __init__(self, count: int, size: int = 0):
+        self._bufs: List[array.array] = [array.array('B', bytes(size)) for _ in range(count)]
+        self._next = 0
+
+    def take(self, size: int) -> array.array:
+        """Next buffer, grown to at least *size* bytes (kept for reuse)."""
+        i = self._next
+        self._next = (i + 1) % len(self._bufs)
+        if len(self._bufs[i]) < size:
+            self._bufs[i] = array.array('B', bytes(size))
+        return self._bufs[i]
+
+
 # =========================================================================
 # Type 2 — "H" variant  (VID 0x0416, PID 0x5302)
 # =========================================================================
@@ -166,6 +353,9 @@ class HidDeviceType2:
         self.transport = transport
         self._initialized = False
         self.device_info: Optional[DeviceInfo] = None
+        depth = _max_in_flight(transport)
+        self._in_flight = _AsyncFrames(depth) if depth > 1 else None
+        self._packets = _PacketBuffers(depth + 1 if depth > 1 else 1)
 
     # -- Init packet ---------------------------------------------------
 
@@ -264,6 +454,31 @@ class HidDeviceType2:
 
     # -- Frame send -------------------------------------------------------
 
+    @staticmethod
+    def frame_packet_size(data_len: int) -> int:
+        """USB transfer length for *data_len* bytes of image data."""
+        return _ceil_to_512(TYPE2_HEADER_SIZE + data_len)
+
+    @staticmethod
+    def pack_frame_into(buf: Any, image_data: bytes) -> int:
+        """Assemble the frame packet for *image_data* in place in *buf*.
+
+        Same layout as build_frame_packet(); *buf* (any writable byte
+        buffer) must hold at least frame_packet_size(len(image_data)) bytes.
+
+        Returns:
+            Packet length (the first N bytes of *buf*).
+        """
+        data_len = len(image_data)
+        size = _ceil_to_512(TYPE2_HEADER_SIZE + data_len)
+        end = TYPE2_HEADER_SIZE + data_len
+        view = memoryview(buf)
+        view[:16] = _ZEROS[:16]
+        struct.pack_into('<I', buf, 16, data_len)
+        view[TYPE2_HEADER_SIZE:end] = image_data
+        view[end:size] = _ZEROS[:size - end]
+        return size
+
     @staticmethod
     def build_frame_packet(image_data: bytes) -> bytes:
         """Build a frame packet from raw image data.
@@ -279,25 +494,30 @@ class HidDeviceType2:
 
         Returns the padded packet ready for USB bulk write.
         """
-        data_len = len(image_data)
         # 20-byte header: 16 zero bytes + LE uint32 image size
-        header = b'\x00' * 16 + struct.pack('<I', data_len)
-        raw = header + image_data
-        padded_len = _ceil_to_512(len(raw))
-        return raw.ljust(padded_len, b'\x00')
+        buf = bytearray(HidDeviceType2.frame_packet_size(len(image_data)))
+        HidDeviceType2.pack_frame_into(buf, image_data)
+        return bytes(buf)
+
+    def _frame_view(self, image_data: bytes) -> memoryview:
+        """Frame packet assembled in this device's reusable buffer."""
+        buf = self._packets.take(self.frame_packet_size(len(image_data)))
+        return memoryview(buf)[:self.pack_frame_into(buf, image_data)]
 
     def send_frame(self, image_data: bytes) -> bool:
         """Send one image frame to the device.
 
         Matches C# frame loop: synchronous Transfer() to Ep02,
-        then Thread.Sleep(1).
+        then Thread.Sleep(1).  In async mode the write is queued instead
+        (no sleep — the queue already serialises writes).
 
         Args:
             image_data: Raw image bytes (JPEG or other format the
                         device expects).
 
         Returns:
-            True if the transfer succeeded.
+            True if the transfer succeeded.  In async mode: True if the
+            frame was queued and no earlier frame has failed.
 
         Raises:
             RuntimeError: If device not initialized.
@@ -305,7 +525,11 @@ class HidDeviceType2:
         if not self._initialized:
             raise RuntimeError("Type 2 device not initialized — call handshake() first")
 
-        packet = self.build_frame_packet(image_data)
+        packet = self._frame_view(image_data)
+        if self._in_flight is not None:
+            return self._in_flight.add(
+                self.transport.submit_write(EP_WRITE_02, packet, DEFAULT_TIMEOUT_MS))
+
         transferred = self.transport.write(EP_WRITE_02, packet, DEFAULT_TIMEOUT_MS)
 
         # C#: Thread.Sleep(1) after frame transfer
@@ -313,6 +537,10 @@ class HidDeviceType2:
 
         return transferred > 0
 
+    def flush(self) -> bool:
+        """Wait for frames still in flight (async mode).  True if all succeeded."""
+        return self._in_flight.flush() if self._in_flight is not None else True
+
 
 # =========================================================================
 # Type 3 — "ALi" variant  (VID 0x0418, PID 0x5303/0x5304)
@@ -329,6 +557,9 @@ class HidDeviceType3:
         self.transport = transport
         self._initialized = False
         self.device_info: Optional[DeviceInfo] = None
+        depth = _max_in_flight(transport)
+        self._in_flight = _AsyncFrames(depth) if depth > 1 else None
+        self._packets = _PacketBuffers(depth + 1 if depth > 1 else 1, TYPE3_FRAME_TOTAL)
 
     # -- Init packet ---------------------------------------------------
 
@@ -433,17 +664,34 @@ class HidDeviceType3:
         Data is padded/truncated to exactly 204800 bytes.
         Total packet = 204816 bytes.
         """
-        prefix = (
-            TYPE3_FRAME_PREFIX
-            + b'\x00\x00\x00\x00'
-            + struct.pack('<I', TYPE3_DATA_SIZE)
-        )
+        buf = bytearray(TYPE3_FRAME_TOTAL)
+        HidDeviceType3.pack_frame_into(buf, image_data)
+        return bytes(buf)
+
+    @staticmethod
+    def pack_frame_into(buf: Any, image_data: bytes) -> int:
+        """Assemble the frame packet for *image_data* in place in *buf*.
+
+        Same layout as build_frame_packet(); *buf* (any writable byte
+        buffer) must hold at least TYPE3_FRAME_TOTAL bytes.
+
+        Returns:
+            Packet length (always TYPE3_FRAME_TOTAL).
+        """
+        view = memoryview(buf)
+        view[:8] = TYPE3_FRAME_PREFIX
+        view[8:12] = _ZEROS[:4]
+        struct.pack_into('<I', buf, 12, TYPE3_DATA_SIZE)
         # Pad or truncate image data to fixed size
-        if len(image_data) < TYPE3_DATA_SIZE:
-            padded = image_data + b'\x00' * (TYPE3_DATA_SIZE - len(image_data))
-        else:
-            padded = image_data[:TYPE3_DATA_SIZE]
-        return prefix + padded
+        n = min(len(image_data), TYPE3_DATA_SIZE)
+        view[TYPE3_HEADER_SIZE:TYPE3_HEADER_SIZE + n] = memoryview(image_data)[:n]
+        view[TYPE3_HEADER_SIZE + n:TYPE3_FRAME_TOTAL] = _ZEROS[:TYPE3_DATA_SIZE - n]
+        return TYPE3_FRAME_TOTAL
+
+    def _frame_view(self, image_data: bytes) -> memoryview:
+        """Frame packet assembled in this device's reusable buffer."""
+        buf = self._packets.take(TYPE3_FRAME_TOTAL)
+        return memoryview(buf)[:self.pack_frame_into(buf, image_data)]
 
     def send_frame(self, image_data: bytes) -> bool:
         """Send one image frame and read ACK.
@@ -456,8 +704,15 @@ class HidDeviceType3:
         Args:
             image_data: Raw image bytes.
 
+        In async mode the write and the ACK read run on separate endpoint
+        threads, so the next frame can be written while this one's ACK is
+        outstanding.  The ACK read is queued only once its write has
+        completed, so its timeout starts when the frame is on the device
+        (not while the frame still waits behind earlier ones).
+
         Returns:
-            True if the transfer and ACK succeeded.
+            True if the transfer and ACK succeeded.  In async mode: True if
+            the frame was queued and no earlier frame has failed.
 
         Raises:
             RuntimeError: If device not initialized.
@@ -465,7 +720,13 @@ class HidDeviceType3:
         if not self._initialized:
             raise RuntimeError("Type 3 device not initialized — call handshake() first")
 
-        packet = self.build_frame_packet(image_data)
+        packet = self._frame_view(image_data)
+        if self._in_flight is not None:
+            ack = UsbTransfer()
+            write = self.transport.submit_write(EP_WRITE_02, packet, DEFAULT_TIMEOUT_MS,
+                                                then=self._ack_after(ack))
+            return self._in_flight.add(write, ack)
+
         transferred = self.transport.write(EP_WRITE_02, packet, DEFAULT_TIMEOUT_MS)
         if transferred == 0:
             return False
@@ -474,6 +735,25 @@ class HidDeviceType3:
         ack = self.transport.read(EP_READ_01, TYPE3_ACK_SIZE, DEFAULT_TIMEOUT_MS)
         return len(ack) > 0
 
+    def _ack_after(self, ack: UsbTransfer) -> Callable[[UsbTransfer], None]:
+        """OUT-thread callback: queue the ACK read for a completed write,
+        reporting its outcome through *ack*."""
+        def read_ack(write: UsbTransfer) -> None:
+            if write.error is not None or not write.result:
+                ack._finish(result=b'')  # The write itself is reported as failed
+                return
+            try:
+                self.transport.submit_read(
+                    EP_READ_01, TYPE3_ACK_SIZE, DEFAULT_TIMEOUT_MS,
+                    then=lambda read: ack._finish(read.result, read.error))
+            except Exception as e:
+                ack._finish(error=e)
+        return read_ack
+
+    def flush(self) -> bool:
+        """Wait for frames still in flight (async mode).  True if all succeeded."""
+        return self._in_flight.flush() if self._in_flight is not None else True
+
 
 # =========================================================================
 # Public API  (mirrors scsi_device.send_image_to_device)
@@ -522,7 +802,12 @@ def send_image_to_hid_device(
     except Exception as e:
         print(f"[!] HID send failed: {e}")
         _initialized_transports.discard(transport_id)
-        _device_handlers.pop(transport_id, None)
+        handler = _device_handlers.pop(transport_id, None)
+        if handler is not None:
+            try:
+                handler.flush()  # Drain queued frames before the next handshake
+            except Exception:
+                pass
         return False
 
 
@@ -547,10 +832,17 @@ class PyUsbTransport(UsbTransport):
     3. ClaimInterface(0)
     4. Bulk read/write to endpoints
 
+    With ``max_in_flight`` > 1, ``submit_write()`` / ``submit_read()`` queue
+    transfers on one thread per direction (OUT and IN).  Each thread sends
+    its queue one blocking transfer at a time; up to ``max_in_flight``
+    frames wait in it while the caller prepares the next one.  The default
+    (1) keeps the synchronous C# behaviour.
+
     Requires: ``pip install pyusb`` + ``apt install libusb-1.0-0``
     """
 
-    def __init__(self, vid: int, pid: int, serial: Optional[str] = None):
+    def __init__(self, vid: int, pid: int, serial: Optional[str] = None,
+                 max_in_flight: int = 1):
         if not PYUSB_AVAILABLE:
             raise ImportError(
                 "pyusb is not installed. Install with: pip install pyusb\n"
@@ -562,6 +854,10 @@ class PyUsbTransport(UsbTransport):
         self._serial = serial
         self._device = None
         self._is_open = False
+        self.max_in_flight = max(1, max_in_flight)
+        self._write_queue: Optional[TransferQueue] = None
+        self._read_queue: Optional[TransferQueue] = None
+        self._write_buf: Optional[array.array] = None
 
     def open(self) -> None:
         """Find USB device and claim interface.
@@ -601,6 +897,10 @@ class PyUsbTransport(UsbTransport):
             usbDevice.Close();
             UsbDevice.Exit();
         """
+        for q in (self._write_queue, self._read_queue):
+            if q is not None:
+                q.close()
+        self._write_queue = self._read_queue = None
         if self._device is not None:
             try:
                 usb.util.release_interface(self._device, USB_INTERFACE)
@@ -619,9 +919,31 @@ class PyUsbTransport(UsbTransport):
         C# equivalent::
 
             usbEndpointWriter.Transfer(data, 0, length, timeout, out transferred);
+
+        *data* may be a memoryview slice of a handler's packet buffer
+        (_PacketBuffers).  pyusb hands an array.array to libusb as is but
+        copies anything else item by item, so a view covering a whole array
+        is sent as that array (no copy: every Type 3 frame).  A shorter
+        view (Type 2, whose packet size follows the JPEG) is copied once
+        into a scratch array that is resized in place.
         """
         if not self._is_open or self._device is None:
             raise RuntimeError("Transport not open")
+        if isinstance(data, memoryview):
+            obj = data.obj
+            if isinstance(obj, array.array) and data.nbytes == len(obj) * obj.itemsize:
+                data = obj
+            else:
+                buf = self._write_buf
+                if buf is None:
+                    buf = self._write_buf = array.array('B')
+                n = data.nbytes
+                if len(buf) > n:
+                    del buf[n:]
+                elif len(buf) < n:
+                    buf.frombytes(data[len(buf):])
+                memoryview(buf)[:] = data
+                data = buf
         return self._device.write(endpoint, data, timeout=timeout)
 
     def read(self, endpoint: int, length: int, timeout: int = DEFAULT_TIMEOUT_MS) -> bytes:
@@ -636,6 +958,27 @@ class PyUsbTransport(UsbTransport):
         data = self._device.read(endpoint, length, timeout=timeout)
         return bytes(data)
 
+    def submit_write(self, endpoint: int, data: bytes,
+                     timeout: int = DEFAULT_TIMEOUT_MS,
+                     then: Optional[Callable[[UsbTransfer], None]] = None) -> UsbTransfer:
+        """Queue a bulk write on the OUT thread; blocks while max_in_flight are pending.
+
+        *then* runs on the OUT thread after the write (see TransferQueue).
+        """
+        if self._write_queue is None:
+            self._write_queue = TransferQueue(self.write, self.max_in_flight,
+                                              'trcc-usb-out')
+        return self._write_queue.submit(endpoint, data, timeout, then)
+
+    def submit_read(self, endpoint: int, length: int,
+                    timeout: int = DEFAULT_TIMEOUT_MS,
+                    then: Optional[Callable[[UsbTransfer], None]] = None) -> UsbTransfer:
+        """Queue a bulk read (e.g. a Type 3 ACK) on the IN-direction thread."""
+        if self._read_queue is None:
+            self._read_queue = TransferQueue(self.read, self.max_in_flight,
+                                             'trcc-usb-in')
+        return self._read_queue.submit(endpoint, length, timeout, then)
+
     @property
     def is_open(self) -> bool:
         return self._is_open
@@ -0,0 +1,143 @@
+"""
+Adaptive JPEG encoder stage for HID Type 2 panels.
+
+Type 2 ("H") panels take a JPEG per frame instead of RGB565 pixels.  The
+encoder turns the rendered frame into JPEG and steers quality and chroma
+subsampling towards a budget after every frame:
+
+- ``target_bytes``: keep frames around this size (USB bandwidth bound);
+- ``target_fps``: keep encode + device send time within 1/fps seconds
+  (send time is reported back with ``observe_send_ms()``).
+
+Too slow or too large: first lower the quality, then subsample chroma
+more (4:4:4 -> 4:2:2 -> 4:2:0).  Well under budget: undo in reverse
+order.  Without a budget the settings stay fixed.
+
+Usage::
+
+    enc = AdaptiveJpegEncoder(target_bytes=60_000)
+    data = enc.encode(image)          # bytes, ready for send_image()
+    enc.stats.last_encode_ms, enc.stats.last_bytes, enc.quality
+"""
+
+import io
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# PIL subsampling codes: 0 = 4:4:4, 1 = 4:2:2, 2 = 4:2:0
+SUBSAMPLING_NAMES = {0: '4:4:4', 1: '4:2:2', 2: '4:2:0'}
+
+JPEG_QUALITY_DEFAULT = 85
+JPEG_QUALITY_MIN = 40
+JPEG_QUALITY_MAX = 95
+JPEG_QUALITY_STEP = 5
+
+# Hysteresis: adapt down above the budget, up only well below it
+_OVER = 1.05
+_UNDER = 0.80
+
+
+@dataclass
+class JpegStats:
+    """Per-frame encode metrics (for status display / benchmarking)."""
+    frames: int = 0
+    last_bytes: int = 0
+    last_encode_ms: float = 0.0
+    total_bytes: int = 0
+    total_encode_ms: float = 0.0
+    last_send_ms: float = 0.0  # As reported by observe_send_ms()
+
+    @property
+    def avg_bytes(self) -> float:
+        return self.total_bytes / self.frames if self.frames else 0.0
+
+    @property
+    def avg_encode_ms(self) -> float:
+        return self.total_encode_ms / self.frames if self.frames else 0.0
+
+
+class AdaptiveJpegEncoder:
+    """Image -> JPEG bytes, adapting quality/subsampling to a budget.
+
+    The output BytesIO is kept and rewound between frames instead of
+    being recreated.  Not thread-safe; use one encoder per send path.
+    """
+
+    def __init__(self, quality: int = JPEG_QUALITY_DEFAULT, subsampling: int = 0,
+                 target_bytes: Optional[int] = None, target_fps: Optional[float] = None,
+                 min_quality: int = JPEG_QUALITY_MIN, max_quality: int = JPEG_QUALITY_MAX):
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.quality = max(min_quality, min(max_quality, quality))
+        self.subsampling = subsampling
+        self.preferred_subsampling = subsampling  # Never upgrade past this
+        self.target_bytes = target_bytes
+        self.target_fps = target_fps
+        self.stats = JpegStats()
+        self._out = io.BytesIO()
+
+    def set_budget(self, target_bytes: Optional[int] = None,
+                   target_fps: Optional[float] = None) -> None:
+        """Change the budget (None for both = fixed settings)."""
+        self.target_bytes = target_bytes
+        self.target_fps = target_fps
+
+    def observe_send_ms(self, ms: float) -> None:
+        """Report how long the device took for the last frame."""
+        self.stats.last_send_ms = ms
+
+    def encode(self, image: Any) -> bytes:
+        """Encode *image* (PIL Image) as JPEG with the current settings."""
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        out = self._out
+        out.seek(0)
+        start = time.perf_counter()
+        image.save(out, format='JPEG', quality=self.quality,
+                   subsampling=self.subsampling, optimize=False)
+        encode_ms = (time.perf_counter() - start) * 1000.0
+        size = out.tell()
+        out.truncate(size)
+        data = out.getvalue()
+
+        stats = self.stats
+        stats.frames += 1
+        stats.last_bytes = size
+        stats.last_encode_ms = encode_ms
+        stats.total_bytes += size
+        stats.total_encode_ms += encode_ms
+
+        self._adapt()
+        return data
+
+    def _load(self) -> Optional[float]:
+        """Fraction of the budget used by the last frame (None = no budget)."""
+        loads = []
+        if self.target_bytes:
+            loads.append(self.stats.last_bytes / self.target_bytes)
+        if self.target_fps:
+            frame_ms = self.stats.last_encode_ms + self.stats.last_send_ms
+            loads.append(frame_ms * self.target_fps / 1000.0)
+        return max(loads) if loads else None
+
+    def _adapt(self) -> None:
+        load = self._load()
+        if load is None:
+            return
+        if load > _OVER:
+            if self.quality > self.min_quality:
+                self.quality = max(self.min_quality, self.quality - JPEG_QUALITY_STEP)
+            elif self.subsampling < 2:
+                self.subsampling += 1
+        elif load < _UNDER:
+            if self.subsampling > self.preferred_subsampling:
+                self.subsampling -= 1
+            elif self.quality < self.max_quality:
+                self.quality = min(self.max_quality, self.quality + JPEG_QUALITY_STEP)
+
+    def __repr__(self) -> str:
+        return (f"AdaptiveJpegEncoder(q={self.quality}, "
+                f"{SUBSAMPLING_NAMES.get(self.subsampling, self.subsampling)}, "
+                f"avg={self.stats.avg_bytes / 1024:.1f}KiB/{self.stats.avg_encode_ms:.1f}ms)")
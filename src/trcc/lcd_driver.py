@@ -15,6 +15,7 @@ try:
     from .device_detector import DetectedDevice, detect_devices, get_default_device
     from .device_implementations import LCDDeviceImplementation, get_implementation
     from .paths import require_sg_raw
+    from .sg_io import close_sg_transport, get_sg_transport
 except ImportError:
     from trcc.device_detector import (  # type: ignore[no-redef]
         DetectedDevice,
@@ -26,6 +27,10 @@ except ImportError:
         get_implementation,
     )
     from trcc.paths import require_sg_raw  # type: ignore[no-redef]
+    from trcc.sg_io import (  # type: ignore[no-redef]
+        close_sg_transport,
+        get_sg_transport,
+    )
 
 
 class LCDDriver:
@@ -112,9 +117,17 @@ class LCDDriver:
         require_sg_raw()
 
     def _scsi_read(self, cdb: bytes, length: int) -> bytes:
-        """Execute SCSI READ command"""
+        """Execute SCSI READ command (SG_IO, sg_raw fallback)"""
         if not self.device_path:
             raise RuntimeError("No device path available")
+
+        transport = get_sg_transport(self.device_path)
+        if transport is not None:
+            try:
+                return transport.read(cdb, length)
+            except OSError:
+                close_sg_transport(self.device_path)
+
         self._check_sg_raw()
 
         cdb_hex = ' '.join(f'{b:02x}' for b in cdb)
@@ -123,10 +136,18 @@ class LCDDriver:
         result = subprocess.run(cmd, capture_output=True, timeout=10)
         return result.stdout if result.returncode == 0 else b''
 
-    def _scsi_write(self, header: bytes, data: bytes) -> bool:
-        """Execute SCSI WRITE command"""
+    def _scsi_write(self, header: bytes, data) -> bool:
+        """Execute SCSI WRITE command (SG_IO, sg_raw fallback)"""
         if not self.device_path:
             raise RuntimeError("No device path available")
+
+        transport = get_sg_transport(self.device_path)
+        if transport is not None:
+            try:
+                return transport.write(header[:16], data)
+            except OSError:
+                close_sg_transport(self.device_path)
+
         self._check_sg_raw()
 
         cdb = list(header[:16])
@@ -183,13 +204,14 @@ class LCDDriver:
 
         # Pad image data if needed
         if len(image_data) < total_size:
-            image_data += b'\x00' * (total_size - len(image_data))
+            image_data = bytes(image_data) + b'\x00' * (total_size - len(image_data))
 
-        # Send chunks
+        # Send chunks (memoryview slices — no per-chunk copy)
+        view = memoryview(image_data)
         offset = 0
         for cmd, size in chunks:
             header = self._build_header(cmd, size)
-            self._scsi_write(header, image_data[offset:offset + size])
+            self._scsi_write(header, view[offset:offset + size])
             offset += size
 
     def create_solid_color(self, r: int, g: int, b: int) -> bytes:
@@ -202,21 +224,18 @@ class LCDDriver:
         return pixel * (width * height)
 
     def load_image(self, path: str) -> bytes:
-        """Load and convert image to device format"""
+        """Load and convert image to device format (big-endian RGB565)"""
         if not self.implementation:
             raise RuntimeError("No implementation loaded")
 
         try:
             from PIL import Image
+
+            from .rgb565 import image_to_rgb565
             assert self.implementation is not None
             width, height = self.implementation.resolution
             img = Image.open(path).convert('RGB').resize((width, height))
-            data = bytearray()
-            for y in range(height):
-                for x in range(width):
-                    r, g, b = img.getpixel((x, y))  # type: ignore[misc]
-                    data.extend(self.implementation.rgb_to_bytes(r, g, b))
-            return bytes(data)
+            return image_to_rgb565(img)
         except ImportError:
             raise RuntimeError("PIL not installed. Run: pip install Pillow")
 
@@ -5,8 +5,6 @@ This module handles rendering text overlays (time, date, CPU temp, etc.)
 onto theme backgrounds for LCD display.
 """
 
-import os
-
 from PIL import Image, ImageDraw, ImageFont
 
 # Try to import format_metric for system info display
@@ -21,8 +19,8 @@ except ImportError:
             return f"{value:.0f}°C"
         return str(value)
 
-# Use centralized path definitions
-from trcc.paths import FONT_SEARCH_DIRS
+from trcc.font_index import get_font_index, load_font
+from trcc.glyph_atlas import GlyphAtlas, atlas_for
 
 
 class OverlayRenderer:
@@ -35,6 +33,13 @@ class OverlayRenderer:
     - Text overlays with customizable position, color, font
     - Time/date with multiple format options
     - Hardware metrics (CPU, GPU, etc.)
+
+    The background + mask composite is cached as an RGB base layer, so a
+    metrics tick only draws text onto a copy of it.  The base is rebuilt
+    when the background, mask, mask visibility/position, resolution or
+    scale changes.  Text elements whose string and style are unchanged
+    since the previous render are not redrawn (see render_dirty), and
+    metric strings are drawn from per-font glyph atlases (glyph_atlas).
     """
 
     # Base resolution for scaling (most common device)
@@ -70,6 +75,24 @@ class OverlayRenderer:
         # Stores the resolution the config was designed for
         self._config_resolution = (width, height)
         self._scale_enabled = True  # Enable scaling by default
+        self._scale_key = None  # Memoized _get_scale_factor inputs / result
+        self._scale = 1.0
+        self._scaled_fonts = {}  # (base size, bold, name, scale) -> font
+        self._scaled_mask_key = None  # (mask id, position, scale)
+        self._scaled_mask = None  # (mask, scaled mask, scaled position)
+
+        # Cached RGB background + mask layer (see _get_base)
+        self._base = None
+        self._base_key = None
+        self._base_refs = None  # Keeps the keyed images alive (ids stay unique)
+
+        # Previous frame and its elements, for partial redraw (see render_dirty)
+        self._frame = None
+        self._frame_base = None
+        self._elements = []
+        self.dirty_rects = []
+        self.render_serial = 0  # dirty_rects are relative to render number serial - 1
+        self.last_image = None  # Image returned by the last render
 
     def set_resolution(self, width, height):
         """Update LCD resolution."""
@@ -77,8 +100,10 @@ class OverlayRenderer:
         self.height = height
         # Clear font cache as sizes will change with new scale
         self.font_cache = {}
+        self._scaled_fonts = {}
         # Clear background as it needs to be resized
         self.background = None
+        self._invalidate_base()
 
     def set_config_resolution(self, width, height):
         """Set the resolution the current config was designed for.
@@ -91,12 +116,15 @@ class OverlayRenderer:
             height: Config's target height
         """
         self._config_resolution = (width, height)
+        self._invalidate_base()
 
     def set_scale_enabled(self, enabled):
         """Enable or disable dynamic font/coordinate scaling."""
         self._scale_enabled = enabled
         # Clear font cache when toggling
         self.font_cache = {}
+        self._scaled_fonts = {}
+        self._invalidate_base()
 
     def _get_scale_factor(self):
         """Calculate scale factor from config resolution to display resolution.
@@ -107,18 +135,57 @@ class OverlayRenderer:
         Returns:
             Float scale factor (1.0 = no scaling)
         """
-        if not self._scale_enabled:
-            return 1.0
-
-        cfg_w, cfg_h = self._config_resolution
-        # Use minimum dimension for uniform scaling
-        cfg_size = min(cfg_w, cfg_h)
-        disp_size = min(self.width, self.height)
+        key = (self._scale_enabled, self._config_resolution, self.width, self.height)
+        if key == self._scale_key:
+            return self._scale
+
+        scale = 1.0
+        if self._scale_enabled:
+            cfg_w, cfg_h = self._config_resolution
+            # Use minimum dimension for uniform scaling
+            cfg_size = min(cfg_w, cfg_h)
+            disp_size = min(self.width, self.height)
+            if cfg_size > 0:
+                scale = disp_size / cfg_size
+
+        self._scale_key = key
+        self._scale = scale
+        return scale
+
+    def _get_scaled_font(self, base_size, bold, font_name, scale):
+        """Font for a config font size at the current scale (memoized)."""
+        key = (base_size, bold, font_name, scale)
+        font = self._scaled_fonts.get(key)
+        if font is None:
+            size = max(8, int(base_size * scale))  # Min 8pt for readability
+            font = self._scaled_fonts[key] = self.get_font(size, bold=bold, font_name=font_name)
+        return font
+
+    def _get_scaled_mask(self, mask, scale):
+        """Theme mask and its position scaled by *scale* (memoized).
+
+        Video themes rebuild the base layer on every frame; keeping the
+        LANCZOS-resampled mask avoids resampling it each time.
 
-        if cfg_size <= 0:
-            return 1.0
+        Returns:
+            (image, (x, y))
+        """
+        key = (id(mask), self.theme_mask_position, scale)
+        if self._scaled_mask is not None and key == self._scaled_mask_key:
+            return self._scaled_mask[1:]
+
+        if abs(scale - 1.0) > 0.01:  # Scaling enabled and needed
+            mask_w = int(mask.width * scale)
+            mask_h = int(mask.height * scale)
+            scaled = mask.resize((mask_w, mask_h), Image.Resampling.LANCZOS)
+            pos = (int(self.theme_mask_position[0] * scale),
+                   int(self.theme_mask_position[1] * scale))
+        else:
+            scaled, pos = mask, self.theme_mask_position
 
-        return disp_size / cfg_size
+        self._scaled_mask_key = key
+        self._scaled_mask = (mask, scaled, pos)  # Holds mask so its id stays unique
+        return scaled, pos
 
     def set_format_options(self, time_format=0, date_format=0, temp_unit=0):
         """
@@ -162,6 +229,7 @@ class OverlayRenderer:
         Args:
             image: PIL Image or None to clear
         """
+        self._invalidate_base()
         if image is None:
             self.background = None
             return
@@ -184,6 +252,7 @@ class OverlayRenderer:
             image: PIL Image with alpha channel, or None to clear
             position: (x, y) tuple, or None for auto-position at bottom
         """
+        self._invalidate_base()
         if image is None:
             self.theme_mask = None
             self.theme_mask_position = (0, 0)
@@ -207,7 +276,9 @@ class OverlayRenderer:
         Get font by name with fallback chain.
 
         If font_name is given, resolves it via fc-match. Otherwise uses
-        the default fallback chain (bundled → user → system).
+        the default fallback chain (bundled → user → system).  Lookups go
+        through the shared font index and font objects are shared between
+        renderers (trcc.font_index).
 
         Args:
             size: Font size in points
@@ -221,66 +292,33 @@ class OverlayRenderer:
         if key in self.font_cache:
             return self.font_cache[key]
 
+        candidates = []
         # Try resolving by name first (user-picked fonts)
         if font_name and font_name != 'Microsoft YaHei':
-            path = self._resolve_font_path(font_name, bold)
-            if path:
-                self.font_cache[key] = ImageFont.truetype(path, size)
-                return self.font_cache[key]
+            candidates.append(self._resolve_font_path(font_name, bold))
+        # Bundled → user → system fallback chain (font_index.default_font_filenames)
+        candidates.append(get_font_index().default_path(bold))
 
-        # Build font search list from centralized FONT_SEARCH_DIRS
-        # Priority: bundled MSYH → Noto CJK → Noto Sans → DejaVu
-        bold_suffix = '-Bold' if bold else ''
-        bold_style = 'Bold' if bold else 'Regular'
-        msyh_name = 'MSYHBD.TTC' if bold else 'MSYH.TTC'
-        msyh_lower = msyh_name.lower()
-
-        # Preferred font filenames in priority order
-        font_filenames = [
-            msyh_name, msyh_lower,                                    # Microsoft YaHei (bundled)
-            'NotoSansCJK-VF.ttc', 'NotoSansCJK-Regular.ttc',        # Noto CJK
-            'NotoSans[wght].ttf', f'NotoSans-{bold_style}.ttf',    # Noto Sans
-            f'DejaVuSans{bold_suffix}.ttf',                          # DejaVu
-        ]
-
-        paths = []
-        for font_dir in FONT_SEARCH_DIRS:
-            for fname in font_filenames:
-                paths.append(os.path.join(font_dir, fname))
-
-        for path in paths:
-            if os.path.exists(path):
-                self.font_cache[key] = ImageFont.truetype(path, size)
+        for path in candidates:
+            if not path:
+                continue
+            try:
+                self.font_cache[key] = load_font(path, size)
                 return self.font_cache[key]
+            except OSError:
+                continue
 
         # Ultimate fallback
         self.font_cache[key] = ImageFont.load_default()
         return self.font_cache[key]
 
     def _resolve_font_path(self, font_name, bold=False):
-        """Resolve font family name to file path using fc-match."""
-        import subprocess
-        try:
-            style = 'Bold' if bold else 'Regular'
-            result = subprocess.run(
-                ['fc-match', f'{font_name}:style={style}', '--format=%{file}'],
-                capture_output=True, text=True, timeout=2
-            )
-            if result.returncode == 0 and result.stdout and os.path.exists(result.stdout):
-                return result.stdout
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            pass
-
-        # Manual scan using centralized cross-distro font search dirs
-        name_lower = font_name.lower().replace(' ', '')
-        for font_dir in FONT_SEARCH_DIRS:
-            if not os.path.isdir(font_dir):
-                continue
-            for fname in os.listdir(font_dir):
-                if name_lower in fname.lower().replace(' ', ''):
-                    return os.path.join(font_dir, fname)
+        """Resolve font family name to file path (fc-match, then file names).
 
-        return None
+        Answers come from the process-wide font index, so fc-match runs
+        once per family/style rather than once per renderer.
+        """
+        return get_font_index().find(font_name, bold)
 
     def render(self, metrics=None):
         """
@@ -295,52 +333,90 @@ class OverlayRenderer:
         Returns:
             PIL Image with overlay rendered
         """
+        return self.render_dirty(metrics)[0]
+
+    def render_dirty(self, metrics=None):
+        """
+        Render the overlay and report which areas changed.
+
+        The previous frame is kept together with each element's text,
+        style and bounding box.  Unchanged elements are not redrawn; for
+        changed ones only their old and new boxes are restored from the
+        cached base layer and repainted (along with any element that
+        overlaps them).
+
+        The returned image is a copy of the working frame, so it stays
+        valid after later renders; when nothing changed the previous copy
+        is returned again, so callers must not modify it.
+
+        Args:
+            metrics: Dict of metric values (from system_info.get_all_metrics())
+
+        Returns:
+            (image, dirty_rects) - dirty_rects is a list of (x0, y0, x1, y1)
+            boxes that differ from the previous render; the whole frame
+            when the base layer or element order changed.
+        """
         metrics = metrics or {}
+        full = [(0, 0, self.width, self.height)]
+        self.render_serial += 1
 
         # Fast path: no overlays, just return background as-is (video playback optimization)
         has_overlays = (self.theme_mask and self.theme_mask_visible) or (self.config and isinstance(self.config, dict))
         if not has_overlays and self.background:
-            return self.background
-
-        # Create base image
-        if self.background is None:
-            # Transparent background for themes without 00.png
-            img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+            self._frame = None
+            self.dirty_rects = full
+            self.last_image = self.background
+            return self.background, full
+
+        base = self._get_base()
+        elements = self._layout_elements(metrics)
+
+        if self._frame is None or self._frame_base is not base \
+                or [e[0] for e in elements] != [e[0] for e in self._elements]:
+            # Full redraw: new base layer, or elements added/removed/reordered
+            frame = base.copy()
+            draw = ImageDraw.Draw(frame)
+            for elem in elements:
+                self._draw_element(frame, draw, elem, (0, 0))
+            dirty = full
         else:
-            img = self.background.copy()
-            if img.mode != 'RGBA':
-                img = img.convert('RGBA')
-
-        # Apply theme mask (Windows: isDrawMbImage check)
-        if self.theme_mask and self.theme_mask_visible:
-            # Scale mask and position if needed
-            scale = self._get_scale_factor()
-            if abs(scale - 1.0) > 0.01:  # Scaling enabled and needed
-                mask_w = int(self.theme_mask.width * scale)
-                mask_h = int(self.theme_mask.height * scale)
-                scaled_mask = self.theme_mask.resize(
-                    (mask_w, mask_h), Image.Resampling.LANCZOS)
-                pos_x = int(self.theme_mask_position[0] * scale)
-                pos_y = int(self.theme_mask_position[1] * scale)
-                img.paste(scaled_mask, (pos_x, pos_y), scaled_mask)
-            else:
-                img.paste(self.theme_mask, self.theme_mask_position, self.theme_mask)
-
-        # Convert to RGB before drawing text (matches Windows GenerateImage pattern).
-        # Drawing text on RGBA causes PIL to replace alpha at anti-aliased edges;
-        # when pil_to_pixmap composites RGBA onto black, this creates dark fringes.
-        # Windows draws text on an RGB GDI+ Bitmap — no alpha issues.
-        if img.mode == 'RGBA':
-            img = img.convert('RGB')
-
-        # Draw text overlays
-        draw = ImageDraw.Draw(img)
+            frame = self._frame
+            dirty = []
+            for (_, state, bbox, _), (_, old_state, old_bbox, _) in zip(elements, self._elements):
+                if state != old_state:
+                    dirty.extend(r for r in (old_bbox, bbox) if r and r not in dirty)
+            for rect in dirty:
+                self._repaint(frame, base, rect, elements)
+
+        self._frame = frame
+        self._frame_base = base
+        self._elements = elements
+        self.dirty_rects = dirty
+        if dirty or self.last_image is None:
+            self.last_image = frame.copy()
+        return self.last_image, dirty
+
+    def _layout_elements(self, metrics):
+        """Formatted text, position, font and bounding box of each drawn element.
+
+        Elements whose text and style match the previous render keep their
+        measured bbox (and atlas mask) instead of being measured again.
 
+        Returns:
+            List of (key, (text, (x, y), color, font), bbox, glyphs) in draw
+            order; glyphs is the atlas (mask, offset) or None for text drawn
+            through ImageDraw.text.
+        """
         if not self.config or not isinstance(self.config, dict):
-            return img
+            return []
 
         # Get scale factor for dynamic font/coordinate scaling
         scale = self._get_scale_factor()
+        measure = None
+        same_size = self._frame is not None and self._frame.size == (self.width, self.height)
+        previous = {e[0]: e for e in self._elements} if same_size else {}
+        elements = []
 
         for elem_idx, (key, cfg) in enumerate(self.config.items()):
             if not isinstance(cfg, dict) or not cfg.get('enabled', True):
@@ -359,7 +435,6 @@ class OverlayRenderer:
             # Apply scaling to coordinates and font size
             x = int(base_x * scale)
             y = int(base_y * scale)
-            font_size = max(8, int(base_font_size * scale))  # Min 8pt for readability
 
             # Get text to render
             if 'text' in cfg:
@@ -379,15 +454,113 @@ class OverlayRenderer:
 
             bold = font_cfg.get('style') == 'bold' if isinstance(font_cfg, dict) else False
             font_name = font_cfg.get('name') if isinstance(font_cfg, dict) else None
-            font = self.get_font(font_size, bold=bold, font_name=font_name)
+            font = self._get_scaled_font(base_font_size, bold, font_name, scale)
+            state = (text, (x, y), color, font)
+            prev = previous.get(key)
+            if prev is not None and prev[1] == state:
+                elements.append(prev)
+                continue
+
+            atlas = atlas_for(font) if GlyphAtlas.supports(text) else None
+            if atlas is not None:
+                mask, (dx, dy) = glyphs = atlas.mask(text)
+                bbox = self._clip_rect((x + dx, y + dy, x + dx + mask.width,
+                                        y + dy + mask.height)) if mask.width else None
+            else:
+                glyphs = None
+                if measure is None:
+                    measure = ImageDraw.Draw(self._base)
+                # Use center anchor - Windows TRCC uses center coordinates
+                bbox = self._clip_rect(measure.textbbox((x, y), text, font=font, anchor='mm'))
+            elements.append((key, state, bbox, glyphs))
+
+        return elements
+
+    def _clip_rect(self, bbox):
+        """Grow a text bbox by 1px (anti-aliasing) and clip it to the frame."""
+        x0, y0, x1, y1 = bbox
+        rect = (max(0, int(x0) - 1), max(0, int(y0) - 1),
+                min(self.width, int(x1) + 2), min(self.height, int(y1) + 2))
+        return rect if rect[0] < rect[2] and rect[1] < rect[3] else None
+
+    @staticmethod
+    def _draw_element(img, draw, elem, origin):
+        """Draw one laid-out element onto *img*, whose top-left is *origin*."""
+        _, (text, (x, y), color, font), _, glyphs = elem
+        x, y = x - origin[0], y - origin[1]
+        if glyphs is None:
             # Use center anchor - Windows TRCC uses center coordinates
             draw.text((x, y), text, fill=color, font=font, anchor='mm')
+        else:
+            mask, (dx, dy) = glyphs
+            if mask.width:
+                img.paste(color, (x + dx, y + dy, x + dx + mask.width, y + dy + mask.height),
+                          mask)
+
+    def _repaint(self, frame, base, rect, elements):
+        """Restore *rect* from the base layer and redraw the elements over it."""
+        x0, y0, x1, y1 = rect
+        patch = base.crop(rect)
+        draw = ImageDraw.Draw(patch)
+        for elem in elements:
+            bbox = elem[2]
+            if bbox and bbox[0] < x1 and bbox[2] > x0 and bbox[1] < y1 and bbox[3] > y0:
+                self._draw_element(patch, draw, elem, (x0, y0))
+        frame.paste(patch, (x0, y0))
+
+    def _invalidate_base(self):
+        """Drop the cached background + mask layer."""
+        self._base = None
+        self._base_key = None
+        self._base_refs = None
+
+    def _get_base(self):
+        """Background with the theme mask pasted on, as RGB (cached).
+
+        The cache is keyed on the identity of the background and mask
+        images plus everything that affects the composite, so attributes
+        assigned directly are picked up as well as the setters.
+        """
+        mask_on = bool(self.theme_mask and self.theme_mask_visible)
+        mask = self.theme_mask if mask_on else None
+        scale = self._get_scale_factor() if mask_on else 1.0
+        key = (id(self.background), id(mask),
+               self.theme_mask_position if mask_on else None,
+               self.width, self.height, scale)
+        if self._base is not None and key == self._base_key:
+            return self._base
+
+        # Create base image
+        if self.background is None:
+            # Transparent background for themes without 00.png
+            img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        else:
+            img = self.background.copy()
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+
+        # Apply theme mask (Windows: isDrawMbImage check)
+        if mask is not None:
+            # Scale mask and position if needed
+            scaled_mask, pos = self._get_scaled_mask(mask, scale)
+            img.paste(scaled_mask, pos, scaled_mask)
+
+        # Convert to RGB before drawing text (matches Windows GenerateImage pattern).
+        # Drawing text on RGBA causes PIL to replace alpha at anti-aliased edges;
+        # when pil_to_pixmap composites RGBA onto black, this creates dark fringes.
+        # Windows draws text on an RGB GDI+ Bitmap — no alpha issues.
+        if img.mode == 'RGBA':
+            img = img.convert('RGB')
 
+        self._base = img
+        self._base_key = key
+        self._base_refs = (self.background, mask)
         return img
 
     def set_mask_visible(self, visible):
         """Toggle mask visibility without destroying it (Windows SetDrawMengBan)."""
         self.theme_mask_visible = visible
+        self._invalidate_base()
 
     def clear(self):
         """Clear all settings."""
@@ -396,3 +569,4 @@ class OverlayRenderer:
         self.theme_mask = None
         self.theme_mask_position = (0, 0)
         self.theme_mask_visible = True
+        self._invalidate_base()
@@ -263,6 +263,7 @@ def build_search_paths(resource_dir: Optional[str] = None) -> list:
 _XDG_CONFIG = os.environ.get('XDG_CONFIG_HOME', os.path.expanduser('~/.config'))
 CONFIG_DIR = os.path.join(_XDG_CONFIG, 'trcc')
 CONFIG_PATH = os.path.join(CONFIG_DIR, 'config.json')
+FONT_INDEX_PATH = os.path.join(CONFIG_DIR, 'font_index.json')  # font_index.FontIndex
 
 # USBLCD (SCSI/RGB565) supported resolutions
 SUPPORTED_RESOLUTIONS = [
@@ -317,6 +318,28 @@ def save_temp_unit(unit: int):
     save_config(config)
 
 
+def get_saved_baked_playback() -> bool:
+    """Get saved baked video playback preference. Defaults to off."""
+    return bool(load_config().get('baked_playback', False))
+
+
+def save_baked_playback(enabled: bool):
+    """Persist baked video playback preference to config."""
+    config = load_config()
+    config['baked_playback'] = bool(enabled)
+    save_config(config)
+
+
+def get_saved_hid_max_in_flight() -> Optional[int]:
+    """Get the HID frame queue depth ('hid_max_in_flight'), or None if unset.
+
+    Queued HID sending is opt-in: set it above 1 in config.json.  Frames
+    are still sent one transfer at a time (see hid_device).
+    """
+    value = load_config().get('hid_max_in_flight')
+    return value if isinstance(value, int) and value >= 1 else None
+
+
 # =========================================================================
 # Per-device configuration
 # =========================================================================
@@ -406,3 +429,12 @@ FONT_SEARCH_DIRS: List[str] = [
     '/run/current-system/sw/share/fonts/opentype',      # NixOS
     '/gnu/store/fonts',                                 # Guix (approx)
 ]
+
+# fontconfig cache directories: fc-cache rewrites them whenever fonts are
+# added anywhere fontconfig looks (including subdirectories not listed above)
+FONTCONFIG_CACHE_DIRS: List[str] = [
+    os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(_HOME, '.cache')),
+                 'fontconfig'),                         # per-user cache
+    '/var/cache/fontconfig',                            # system cache
+    '/usr/lib/fontconfig/cache',                        # Arch, NixOS
+]
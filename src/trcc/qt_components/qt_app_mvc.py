@@ -45,6 +45,7 @@ from ..dc_writer import CarouselConfig, read_carousel_config, write_carousel_con
 from ..paths import (
     device_config_key,
     get_device_config,
+    get_saved_baked_playback,
     get_saved_temp_unit,
     get_web_dir,
     get_web_masks_dir,
@@ -107,6 +108,9 @@ def detect_language() -> str:
     return 'en'  # Default to English
 
 
+SHM_POLL_MS = 5  # Shared-memory ring poll (daemon.SHM_POLL_INTERVAL)
+
+
 class TRCCMainWindowMVC(QMainWindow):
     """
     Main TRCC application window using MVC pattern.
@@ -208,6 +212,9 @@ class TRCCMainWindowMVC(QMainWindow):
         if saved_unit == 1:
             self.uc_about._set_temp('F')
 
+        # Baked video playback (trcc baked-playback on|off)
+        self.controller.set_baked_playback(get_saved_baked_playback())
+
         # Auto-enable autostart on first launch (matches Windows KaijiQidong)
         autostart_state = ensure_autostart()
         self.uc_about._autostart = autostart_state
@@ -1966,8 +1973,34 @@ class TRCCMainWindowMVC(QMainWindow):
             self.brightness_btn.setStyleSheet(Styles.TEXT_BUTTON)
 
     def _on_animation_tick(self):
-        """Handle animation timer tick - forward to controller."""
-        self.controller.video_tick()
+        """Handle animation timer tick - forward to controller.
+
+        An attached shared-memory source replaces the video, so the same
+        tick polls it instead.
+        """
+        if self.controller.is_shm_active():
+            self.controller.shm_tick()
+        elif self.controller.is_video_playing():
+            self.controller.video_tick()
+        else:
+            self._animation_timer.stop()  # Source detached (e.g. a theme was chosen)
+
+    def set_frame_source(self, path: str | None) -> bool:
+        """Take LCD frames from a shared-memory ring (None: detach).
+
+        Like the daemon's ``source`` command: the ring replaces the video
+        and screencast until detached or another theme is chosen.
+        """
+        if path:
+            self._screencast_timer.stop()
+            self._screencast_active = False
+        if not self.controller.set_shm_source(path):
+            return False
+        if path:
+            self._animation_timer.start(SHM_POLL_MS)
+        elif not self.controller.is_video_playing():
+            self._animation_timer.stop()
+        return True
 
     def _on_metrics_tick(self):
         """Collect system metrics and re-render overlay, send to LCD."""
@@ -1977,7 +2010,10 @@ class TRCCMainWindowMVC(QMainWindow):
             self.controller.overlay.update_metrics(metrics)
             if self.controller.current_image and self.controller.overlay.is_enabled():
                 img = self.controller.render_overlay_and_preview()
-                if img and self.controller.auto_send and not self.controller.video.is_playing():
+                # Video and shm frames carry the overlay themselves
+                if (img and self.controller.auto_send
+                        and not self.controller.video.is_playing()
+                        and not self.controller.is_shm_active()):
                     self.controller._send_frame_to_lcd(img)
         except ImportError:
             pass
@@ -2056,13 +2092,14 @@ class TRCCMainWindowMVC(QMainWindow):
 
 
 def run_mvc_app(data_dir: Path | None = None, decorated: bool = False,
-                start_hidden: bool = False):
+                start_hidden: bool = False, source: str | None = None):
     """Run the MVC PyQt6 application.
 
     Args:
         data_dir: Override data directory path.
         decorated: Use decorated window with titlebar.
         start_hidden: Start minimized to system tray (--last-one autostart).
+        source: Shared-memory ring to show instead of the theme (shm_source).
     """
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
@@ -2073,6 +2110,9 @@ def run_mvc_app(data_dir: Path | None = None, decorated: bool = False,
     app.setFont(font)
 
     window = TRCCMainWindowMVC(data_dir, decorated=decorated)
+    if source:
+        from ..shm_source import shm_path
+        window.set_frame_source(shm_path(source))
     if not start_hidden:
         window.show()
 
@@ -0,0 +1,218 @@
+"""
+Shared RGB565 converter for SCSI LCD sends.
+
+One conversion path for every sender (GUI controller, CLI resume).  The
+output buffer for each frame shape is allocated once and reused, all bit
+operations run in place, and brightness and rotation are fused into the
+same pass instead of going through PIL first:
+
+- rotation is a numpy view (``rot90``), so the conversion reads the source
+  pixels in rotated order and never materialises a rotated image;
+- brightness is folded into a 3x256 lookup table (channel value -> RGB565
+  bits), built from PIL's own ImageEnhance.Brightness so results match the
+  preview exactly.  The table is also usable at 100% (``use_lut=True``).
+
+BakedFrames keeps a whole looping video as device-ready bytes, so replaying
+a frame is a slice of one buffer instead of a fresh conversion.
+
+Pixel format: big-endian RGB565 (R5 G6 B5), as expected by the device.
+"""
+
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_SWAP = sys.byteorder == 'little'  # Device wants big-endian words
+
+# Rotation (directionB) -> np.rot90 k, matching FormCZTVController._apply_rotation:
+#   90 -> PIL ROTATE_270 (CW), 180 -> ROTATE_180, 270 -> PIL ROTATE_90 (CCW)
+_ROT90_K = {0: 0, 90: -1, 180: 2, 270: 1}
+
+
+def _brightness_ramp(brightness: int) -> np.ndarray:
+    """Channel value 0..255 after PIL ImageEnhance.Brightness at *brightness*%."""
+    if brightness >= 100:
+        return np.arange(256, dtype=np.uint16)
+    from PIL import Image, ImageEnhance
+    ramp = Image.frombytes('L', (256, 1), bytes(range(256))).convert('RGB')
+    ramp = ImageEnhance.Brightness(ramp).enhance(brightness / 100.0)
+    return np.asarray(ramp, dtype=np.uint16)[0, :, 0]
+
+
+def build_lut(brightness: int = 100) -> np.ndarray:
+    """Build the 3x256 table of per-channel RGB565 bits (device byte order)."""
+    v = _brightness_ramp(brightness)
+    lut = np.empty((3, 256), dtype=np.uint16)
+    lut[0] = (v & 0xF8) << 8
+    lut[1] = (v & 0xFC) << 3
+    lut[2] = v >> 3
+    if _SWAP:
+        lut.byteswap(inplace=True)  # OR of swapped words == swapped OR
+    return lut
+
+
+class Rgb565Converter:
+    """Reusable image -> big-endian RGB565 converter.
+
+    ``convert()`` returns a view of an internal buffer that is overwritten
+    by the next call with the same output shape — use ``to_bytes()`` when
+    the result outlives the call (e.g. handed to a send thread).  Not
+    thread-safe; give each thread its own converter.
+    """
+
+    def __init__(self, use_lut: bool = False):
+        self.use_lut = use_lut
+        self._out: Dict[Tuple[int, int], np.ndarray] = {}
+        self._tmp: Dict[Tuple[int, int], np.ndarray] = {}
+        self._luts: Dict[int, np.ndarray] = {}
+
+    def _buffers(self, shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        out = self._out.get(shape)
+        if out is None:
+            out = self._out[shape] = np.empty(shape, dtype=np.uint16)
+            self._tmp[shape] = np.empty(shape, dtype=np.uint16)
+        return out, self._tmp[shape]
+
+    def _lut(self, brightness: int) -> np.ndarray:
+        lut = self._luts.get(brightness)
+        if lut is None:
+            lut = self._luts[brightness] = build_lut(brightness)
+        return lut
+
+    @staticmethod
+    def _pixels(image: Any) -> np.ndarray:
+        """HxWx3+ uint8 array for a PIL Image or ndarray (alpha ignored)."""
+        if isinstance(image, np.ndarray):
+            return image
+        if image.mode not in ('RGB', 'RGBA', 'RGBX'):
+            image = image.convert('RGB')
+        return np.asarray(image)
+
+    def convert(self, image: Any, brightness: int = 100, rotation: int = 0) -> np.ndarray:
+        """Convert *image* to a (H, W) big-endian RGB565 array.
+
+        Args:
+            image: PIL Image (any mode) or HxWx3/4 uint8 array.
+            brightness: Percent, 100 = unchanged (same as PIL Brightness).
+            rotation: directionB 0/90/180/270.
+        """
+        arr = self._pixels(image)
+        k = _ROT90_K.get(rotation, 0)
+        if k:
+            arr = np.rot90(arr, k)
+
+        r, g, b = arr[..., 0], arr[..., 1], arr[..., 2]
+        out, tmp = self._buffers(r.shape)
+
+        if self.use_lut or brightness < 100:
+            lut = self._lut(min(brightness, 100))
+            np.take(lut[0], r, out=out, mode='clip')
+            np.take(lut[1], g, out=tmp, mode='clip')
+            out |= tmp
+            np.take(lut[2], b, out=tmp, mode='clip')
+            out |= tmp
+        else:
+            np.left_shift(r, 8, out=out, dtype=np.uint16)
+            out &= 0xF800
+            np.left_shift(g, 3, out=tmp, dtype=np.uint16)
+            tmp &= 0x07E0
+            out |= tmp
+            np.right_shift(b, 3, out=tmp, dtype=np.uint16)
+            out |= tmp
+            if _SWAP:
+                out.byteswap(inplace=True)
+
+        return out.view('>u2')
+
+    def to_bytes(self, image: Any, brightness: int = 100, rotation: int = 0) -> bytes:
+        """Like convert(), but returns an independent bytes copy."""
+        return self.convert(image, brightness, rotation).tobytes()
+
+
+_shared = Rgb565Converter()
+_shared_lock = threading.Lock()
+
+
+def image_to_rgb565(image: Any, brightness: int = 100, rotation: int = 0) -> bytes:
+    """Convert an image to big-endian RGB565 bytes (shared converter)."""
+    with _shared_lock:
+        return _shared.to_bytes(image, brightness, rotation)
+
+
+# =========================================================================
+# Baked video playback
+# =========================================================================
+
+BAKE_MAX_BYTES = 256 * 1024 * 1024  # ~580 frames at 480x480
+
+
+class BakedFrames:
+    """Device-ready RGB565 frames for a looping video, in one contiguous buffer.
+
+    Frames are converted lazily the first time they are sent and returned
+    as memoryview slices afterwards.  The cache is keyed by source, frame
+    count, resolution, brightness and rotation; any change drops it.  A new
+    buffer is allocated on every change (never overwritten in place), so a
+    slice still held by a send thread stays valid.
+    """
+
+    def __init__(self, max_bytes: int = BAKE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._converter = Rgb565Converter()
+        self._key: Optional[Tuple] = None
+        self._buf: Optional[bytearray] = None
+        self._baked: List[bool] = []
+        self._frame_size = 0
+        self._brightness = 100
+        self._rotation = 0
+
+    def configure(self, source: Any, count: int, width: int, height: int,
+                  brightness: int = 100, rotation: int = 0,
+                  max_bytes: Optional[int] = None) -> bool:
+        """Select the cache for these settings, dropping a stale one.
+
+        Returns False when the video does not fit in ``max_bytes`` (or the
+        smaller per-call *max_bytes*, e.g. a streaming player's budget).
+        """
+        limit = self.max_bytes if max_bytes is None else min(max_bytes, self.max_bytes)
+        key = (source, count, width, height, brightness, rotation, limit)
+        if key != self._key:
+            self._key = key
+            self._frame_size = width * height * 2
+            self._brightness = brightness
+            self._rotation = rotation
+            total = count * self._frame_size
+            if 0 < total <= limit:
+                self._buf = bytearray(total)
+                self._baked = [False] * count
+            else:
+                self._buf = None
+                self._baked = []
+        return self._buf is not None
+
+    def get(self, index: int, image: Any) -> memoryview:
+        """Device bytes for frame *index*, converting *image* on first use."""
+        assert self._buf is not None
+        start = index * self._frame_size
+        view = memoryview(self._buf)[start:start + self._frame_size]
+        if not self._baked[index]:
+            arr = self._converter.convert(image, self._brightness, self._rotation)
+            if arr.nbytes != self._frame_size:
+                raise ValueError(f"frame {index} is {arr.shape[1]}x{arr.shape[0]}, "
+                                 f"cache expects {self._frame_size // 2} pixels")
+            view[:] = memoryview(arr).cast('B')
+            self._baked[index] = True
+        return view
+
+    @property
+    def baked_count(self) -> int:
+        """Number of frames converted so far."""
+        return sum(self._baked)
+
+    def invalidate(self) -> None:
+        """Drop the cache (frees the buffer)."""
+        self._key = None
+        self._buf = None
+        self._baked = []
@@ -7,6 +7,9 @@ This module provides those two functions.
 SCSI send protocol is inlined here (from trcc_handshake_v2) so everything
 lives in one place under src/trcc/.  LCDDriver is used only for resolution
 auto-detection during device discovery.
+
+Commands go through the in-process SG_IO transport (sg_io.py) when the
+/dev/sgX node can be opened; sg_raw subprocesses remain as the fallback.
 """
 
 import binascii
@@ -14,12 +17,11 @@ import os
 import struct
 import subprocess
 import tempfile
-from typing import Dict, List, Set
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from .paths import require_sg_raw
-
-# Track which devices have been initialized (poll + init sent)
-_initialized_devices: Set[str] = set()
+from .sg_io import close_sg_transport, get_sg_transport
 
 # NOTE: SCSI devices (0402:3922, 87CD:70DB, 0416:5406) cannot be identified
 # beyond their VID:PID. The firmware reports "USBLCD / USB PRC System" for all
@@ -69,8 +71,28 @@ def _build_header(cmd: int, size: int) -> bytes:
     return header_16 + struct.pack('<I', crc)
 
 
+@lru_cache(maxsize=8)
+def _build_frame_table(width: int, height: int) -> Tuple[Tuple[int, int, bytes], ...]:
+    """Precompute the ``(cmd, size, header)`` table for one resolution.
+
+    Headers (and their CRC32) depend only on the chunk layout, so they are
+    built once per resolution and shared by every session.
+    """
+    return tuple(
+        (cmd, size, _build_header(cmd, size))
+        for cmd, size in _get_frame_chunks(width, height)
+    )
+
+
 def _scsi_read(dev: str, cdb: bytes, length: int) -> bytes:
-    """Execute SCSI READ via sg_raw."""
+    """Execute SCSI READ via SG_IO, falling back to sg_raw."""
+    transport = get_sg_transport(dev)
+    if transport is not None:
+        try:
+            return transport.read(cdb, length)
+        except OSError:
+            close_sg_transport(dev)  # Stale fd or not an sg node — use sg_raw
+
     require_sg_raw()
     cdb_hex = ' '.join(f'{b:02x}' for b in cdb)
     cmd = ['sg_raw', '-r', str(length), dev] + cdb_hex.split()
@@ -78,8 +100,18 @@ def _scsi_read(dev: str, cdb: bytes, length: int) -> bytes:
     return result.stdout if result.returncode == 0 else b''
 
 
-def _scsi_write(dev: str, header: bytes, data: bytes) -> bool:
-    """Execute SCSI WRITE via sg_raw with temp file for payload."""
+def _scsi_write(dev: str, header: bytes, data) -> bool:
+    """Execute SCSI WRITE via SG_IO, falling back to sg_raw with a temp file.
+
+    *data* may be any buffer (bytes, bytearray, memoryview slice).
+    """
+    transport = get_sg_transport(dev)
+    if transport is not None:
+        try:
+            return transport.write(header[:16], data)
+        except OSError:
+            close_sg_transport(dev)  # Stale fd or not an sg node — use sg_raw
+
     require_sg_raw()
     cdb_hex = ' '.join(f'{b:02x}' for b in list(header[:16]))
 
@@ -106,18 +138,94 @@ def _init_device(dev: str):
     _scsi_write(dev, init_header, b'\x00' * 0xE100)
 
 
-def _send_frame(dev: str, rgb565_data: bytes, width: int = 320, height: int = 320):
-    """Send one RGB565 frame in SCSI chunks sized for the resolution."""
-    chunks = _get_frame_chunks(width, height)
-    total_size = sum(size for _, size in chunks)
-    if len(rgb565_data) < total_size:
-        rgb565_data += b'\x00' * (total_size - len(rgb565_data))
+class ScsiSession:
+    """Persistent per-device SCSI state.
 
-    offset = 0
-    for cmd, size in chunks:
-        header = _build_header(cmd, size)
-        _scsi_write(dev, header, rgb565_data[offset:offset + size])
-        offset += size
+    Tracks whether the poll + init handshake has been sent and holds the
+    precomputed frame header table for the current resolution, so the
+    per-frame path is just one write per chunk (no header building, no
+    CRC32, no buffer copies for full-size frames).
+    """
+
+    def __init__(self, path: str, width: int = 320, height: int = 320):
+        self.path = path
+        self.initialized = False
+        self.width = 0
+        self.height = 0
+        self.frame_size = 0
+        self._table: Tuple[Tuple[int, int, bytes], ...] = ()
+        self._pad: Optional[bytearray] = None  # Reused for short frames
+        self.set_resolution(width, height)
+
+    def set_resolution(self, width: int, height: int) -> None:
+        """Switch the cached header table (no-op if unchanged)."""
+        if (width, height) == (self.width, self.height):
+            return
+        self.width = width
+        self.height = height
+        self._table = _build_frame_table(width, height)
+        self.frame_size = sum(size for _, size, _ in self._table)
+        self._pad = None
+
+    def init(self) -> None:
+        """Send the poll + init handshake."""
+        _init_device(self.path)
+        self.initialized = True
+
+    def send_frame(self, buffer) -> None:
+        """Send one RGB565 frame in the chunks for the current resolution.
+
+        *buffer* may be any buffer; short frames are zero-padded into a
+        session-owned scratch buffer. Sends the handshake first if needed.
+        """
+        if not self.initialized:
+            self.init()
+
+        view = memoryview(buffer)
+        if len(view) < self.frame_size:
+            if self._pad is None:
+                self._pad = bytearray(self.frame_size)
+            n = len(view)
+            self._pad[:n] = view
+            self._pad[n:] = bytes(self.frame_size - n)
+            view = memoryview(self._pad)
+
+        offset = 0
+        for _, size, header in self._table:
+            self._write(header, view[offset:offset + size])
+            offset += size
+
+    def _write(self, header: bytes, data) -> bool:
+        """One SCSI WRITE (overridden by virtual_device's loopback session)."""
+        return _scsi_write(self.path, header, data)
+
+    def reset(self) -> None:
+        """Force a fresh handshake (and SG_IO fd) on the next send."""
+        self.initialized = False
+        close_sg_transport(self.path)
+
+    def __repr__(self) -> str:
+        return (f"ScsiSession(path={self.path!r}, {self.width}x{self.height}, "
+                f"initialized={self.initialized})")
+
+
+# One session per device path for the life of the process
+_sessions: Dict[str, ScsiSession] = {}
+
+
+def get_session(device_path: str) -> ScsiSession:
+    """Get or create the ScsiSession for *device_path*."""
+    session = _sessions.get(device_path)
+    if session is None:
+        session = _sessions[device_path] = ScsiSession(device_path)
+    return session
+
+
+def close_session(device_path: str) -> None:
+    """Drop the session for *device_path* and release its SG_IO fd."""
+    session = _sessions.pop(device_path, None)
+    if session is not None:
+        session.reset()
 
 
 # =========================================================================
@@ -228,8 +336,8 @@ def send_image_to_device(
 ) -> bool:
     """Send RGB565 image data to an LCD device via SCSI.
 
-    Initializes (poll + init) on first send to each device, then skips
-    init for subsequent sends.
+    Uses the device's ScsiSession, which initializes (poll + init) on the
+    first send and skips init for subsequent sends.
 
     Args:
         device_path: SCSI device path (e.g. /dev/sg0)
@@ -240,15 +348,13 @@ def send_image_to_device(
     Returns:
         True if the send succeeded.
     """
+    session = get_session(device_path)
     try:
-        if device_path not in _initialized_devices:
-            _init_device(device_path)
-            _initialized_devices.add(device_path)
-
-        _send_frame(device_path, rgb565_data, width, height)
+        session.set_resolution(width, height)
+        session.send_frame(rgb565_data)
         return True
     except Exception as e:
         print(f"[!] SCSI send failed ({device_path}): {e}")
-        # Allow re-init on next attempt
-        _initialized_devices.discard(device_path)
+        # Allow re-init (and a fresh SG_IO fd) on next attempt
+        session.reset()
         return False
@@ -0,0 +1,227 @@
+"""
+Native SG_IO transport for SCSI generic (/dev/sgX) LCD devices.
+
+Issues the 16-byte CDB and its data phase with a single ioctl(SG_IO) on a
+file descriptor that stays open for the life of the device.  This replaces
+the sg_raw path, which forks a process and round-trips a temp file for every
+64 KiB chunk (8 fork/execs per 480x480 frame).
+
+scsi_device.py and lcd_driver.py try this transport first and fall back to
+sg_raw when the device node cannot be opened or the kernel rejects the ioctl.
+
+Struct layout and constants from <scsi/sg.h>.
+"""
+
+import ctypes
+import os
+import sys
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+    SG_IO_AVAILABLE = sys.platform.startswith('linux')
+except ImportError:  # pragma: no cover — non-POSIX
+    fcntl = None  # type: ignore[assignment]
+    SG_IO_AVAILABLE = False
+
+
+# =========================================================================
+# Constants (from <scsi/sg.h>)
+# =========================================================================
+
+SG_IO = 0x2285
+SG_INTERFACE_ID = ord('S')
+
+SG_DXFER_NONE = -1
+SG_DXFER_TO_DEV = -2
+SG_DXFER_FROM_DEV = -3
+
+SG_INFO_OK_MASK = 0x1
+SG_INFO_OK = 0x0
+
+SENSE_BUFFER_SIZE = 32
+DEFAULT_TIMEOUT_MS = 10000  # Same budget as the sg_raw subprocess timeout
+
+
+class SgIoHeader(ctypes.Structure):
+    """struct sg_io_hdr (sg_io_hdr_t) — natural C alignment."""
+    _fields_ = [
+        ('interface_id', ctypes.c_int),
+        ('dxfer_direction', ctypes.c_int),
+        ('cmd_len', ctypes.c_ubyte),
+        ('mx_sb_len', ctypes.c_ubyte),
+        ('iovec_count', ctypes.c_ushort),
+        ('dxfer_len', ctypes.c_uint),
+        ('dxferp', ctypes.c_void_p),
+        ('cmdp', ctypes.c_void_p),
+        ('sbp', ctypes.c_void_p),
+        ('timeout', ctypes.c_uint),
+        ('flags', ctypes.c_uint),
+        ('pack_id', ctypes.c_int),
+        ('usr_ptr', ctypes.c_void_p),
+        ('status', ctypes.c_ubyte),
+        ('masked_status', ctypes.c_ubyte),
+        ('msg_status', ctypes.c_ubyte),
+        ('sb_len_wr', ctypes.c_ubyte),
+        ('host_status', ctypes.c_ushort),
+        ('driver_status', ctypes.c_ushort),
+        ('resid', ctypes.c_int),
+        ('duration', ctypes.c_uint),
+        ('info', ctypes.c_uint),
+    ]
+
+
+# =========================================================================
+# Transport
+# =========================================================================
+
+class SgIoTransport:
+    """Persistent SG_IO handle for one /dev/sgX node.
+
+    The header struct, CDB buffer and sense buffer are allocated once and
+    reused for every command; write payloads are passed to the kernel by
+    address, so bytes, bytearray and memoryview slices are sent without
+    being copied in Python.
+    """
+
+    def __init__(self, path: str, timeout_ms: int = DEFAULT_TIMEOUT_MS):
+        self.path = path
+        self.timeout_ms = timeout_ms
+        self._fd: Optional[int] = None
+        self._hdr = SgIoHeader()
+        self._cdb = (ctypes.c_ubyte * 16)()
+        self._sense = (ctypes.c_ubyte * SENSE_BUFFER_SIZE)()
+
+    def open(self) -> None:
+        """Open the device node (O_RDWR).  Raises OSError on failure."""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+
+    def close(self) -> None:
+        """Close the file descriptor (safe to call repeatedly)."""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._fd is not None
+
+    def _execute(self, cdb: bytes, direction: int, address: Optional[int],
+                 length: int) -> SgIoHeader:
+        """Fill the reusable sg_io_hdr and issue ioctl(SG_IO)."""
+        if self._fd is None:
+            raise OSError(f"SG_IO transport not open: {self.path}")
+
+        n = min(len(cdb), len(self._cdb))
+        ctypes.memmove(self._cdb, bytes(cdb[:n]), n)
+
+        hdr = self._hdr
+        hdr.interface_id = SG_INTERFACE_ID
+        hdr.dxfer_direction = direction
+        hdr.cmd_len = n
+        hdr.mx_sb_len = SENSE_BUFFER_SIZE
+        hdr.iovec_count = 0
+        hdr.dxfer_len = length
+        hdr.dxferp = address
+        hdr.cmdp = ctypes.addressof(self._cdb)
+        hdr.sbp = ctypes.addressof(self._sense)
+        hdr.timeout = self.timeout_ms
+        hdr.flags = 0
+        hdr.pack_id = 0
+        hdr.usr_ptr = None
+        hdr.info = 0
+
+        assert fcntl is not None
+        fcntl.ioctl(self._fd, SG_IO, hdr)
+        return hdr
+
+    @staticmethod
+    def _ok(hdr: SgIoHeader) -> bool:
+        return (hdr.info & SG_INFO_OK_MASK) == SG_INFO_OK
+
+    def write(self, cdb: bytes, data) -> bool:
+        """Send *cdb* with *data* (any buffer) as the data-out phase.
+
+        Returns True if the command completed with good status.
+        Raises OSError if the ioctl itself fails (stale fd, not an sg node).
+        """
+        length = len(data)
+        if length:
+            # frombuffer shares memory with *data*; keep it alive for the ioctl
+            payload = np.frombuffer(data, dtype=np.uint8)
+            hdr = self._execute(cdb, SG_DXFER_TO_DEV, payload.ctypes.data, length)
+        else:
+            hdr = self._execute(cdb, SG_DXFER_NONE, None, 0)
+        return self._ok(hdr)
+
+    def read(self, cdb: bytes, length: int) -> bytes:
+        """Send *cdb* and read up to *length* bytes (data-in phase).
+
+        Returns the bytes actually transferred, or b'' on bad status.
+        Raises OSError if the ioctl itself fails.
+        """
+        buf = bytearray(length)
+        address = ctypes.addressof((ctypes.c_char * length).from_buffer(buf))
+        hdr = self._execute(cdb, SG_DXFER_FROM_DEV, address, length)
+        if not self._ok(hdr):
+            return b''
+        return bytes(buf[:length - max(hdr.resid, 0)])
+
+    def __repr__(self) -> str:
+        state = 'open' if self.is_open else 'closed'
+        return f"SgIoTransport(path={self.path!r}, {state})"
+
+
+# =========================================================================
+# Per-device cache (one fd per /dev/sgX for the life of the process)
+# =========================================================================
+
+_transports: Dict[str, SgIoTransport] = {}
+
+
+def get_sg_transport(path: str) -> Optional[SgIoTransport]:
+    """Return the open SG_IO transport for *path*, opening it on first use.
+
+    Returns None when SG_IO is unavailable or the node cannot be opened
+    (missing, no permission) — callers then fall back to sg_raw.  Failed
+    opens are not cached so a later udev permission fix is picked up.
+    """
+    transport = _transports.get(path)
+    if transport is not None:
+        return transport
+    if not SG_IO_AVAILABLE or not path:
+        return None
+
+    transport = SgIoTransport(path)
+    try:
+        transport.open()
+    except OSError:
+        return None
+    _transports[path] = transport
+    return transport
+
+
+def is_sg_transport_open(path: str) -> bool:
+    """Whether an SG_IO fd is currently held for *path*."""
+    transport = _transports.get(path)
+    return transport is not None and transport.is_open
+
+
+def close_sg_transport(path: str) -> None:
+    """Close and forget the cached transport for *path* (if any)."""
+    transport = _transports.pop(path, None)
+    if transport is not None:
+        transport.close()
+
+
+def close_all_sg_transports() -> None:
+    """Close every cached SG_IO transport."""
+    for transport in _transports.values():
+        transport.close()
+    _transports.clear()
@@ -0,0 +1,191 @@
+"""
+Shared-memory frame source for external renderers.
+
+An external process (dashboard, game overlay, anything that can mmap a
+file) writes raw frames into a ring of slots in a file under /dev/shm;
+trcc maps the same file and sends the newest complete frame.  No PNG
+encoding, no disk, no process per frame.
+
+File layout (all integers little-endian)::
+
+    offset  size  field
+    0       8     magic  b'TRCCSHM1'
+    8       4     version (1)
+    12      4     width
+    16      4     height
+    20      4     format  0 = RGB888 (R, G, B bytes, row-major)
+                          1 = RGB565 device bytes (big-endian, already
+                              rotated; sent unchanged)
+    24      4     slots   (ring length, >= 2)
+    28      4     frame_size (width * height * 3 or 2)
+    32      8     latest  sequence number of the newest frame (0 = none)
+    40      24    reserved
+    64      ...   slots: [u64 seq, u64 reserved, frame_size bytes] each
+
+Writing frame number *n* (1, 2, 3...) into slot ``n % slots``:
+
+1. set the slot's seq to 0 (slot being written);
+2. write the pixels;
+3. set the slot's seq to n;
+4. set ``latest`` to n.
+
+The reader takes ``latest``, checks the slot carries the same seq, uses
+the pixels in place and checks the seq again afterwards: a frame the
+writer lapped in the meantime is reported as torn and skipped.  Use at
+least 3 slots so a writer running ahead never touches the slot being
+read.  ShmFrameWriter implements the writer side for Python producers.
+"""
+
+import mmap
+import os
+import struct
+from typing import Optional, Tuple
+
+MAGIC = b'TRCCSHM1'
+VERSION = 1
+FORMAT_RGB888 = 0
+FORMAT_RGB565 = 1
+FORMAT_NAMES = {FORMAT_RGB888: 'rgb888', FORMAT_RGB565: 'rgb565'}
+BYTES_PER_PIXEL = {FORMAT_RGB888: 3, FORMAT_RGB565: 2}
+
+_HEADER = struct.Struct('<8sIIIIII')  # magic .. frame_size
+HEADER_SIZE = 64
+SLOT_HEADER_SIZE = 16
+_LATEST_OFFSET = 32
+_U64 = struct.Struct('<Q')
+
+DEFAULT_SLOTS = 3
+SHM_DIR = '/dev/shm'
+
+
+def shm_path(name: str) -> str:
+    """Path for a ring called *name* (/dev/shm/trcc-<name>)."""
+    if os.sep in name:
+        return name
+    base = SHM_DIR if os.path.isdir(SHM_DIR) else '/tmp'
+    return os.path.join(base, f'trcc-{name}')
+
+
+class ShmFrameSource:
+    """Read side: maps an existing ring and hands out the newest frame.
+
+    ``latest()`` returns a memoryview straight into the shared mapping;
+    release it (or let it go out of scope) before close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, w, h, fmt, slots, frame_size = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Not a trcc frame ring: {path}")
+            if fmt not in BYTES_PER_PIXEL or slots < 2:
+                raise ValueError(f"Unsupported ring format {fmt} / {slots} slots")
+            if frame_size != w * h * BYTES_PER_PIXEL[fmt]:
+                raise ValueError(f"Frame size {frame_size} does not match {w}x{h}")
+            if len(self._mm) < HEADER_SIZE + slots * (SLOT_HEADER_SIZE + frame_size):
+                raise ValueError(f"Ring file truncated: {path}")
+        except (ValueError, struct.error):
+            self._mm.close()
+            raise
+        self.width, self.height = w, h
+        self.format = fmt
+        self.slots = slots
+        self.frame_size = frame_size
+        self.last_seq = 0
+        self.frames = 0  # Frames handed out
+        self.torn = 0    # Frames lapped by the writer while in use
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def format_name(self) -> str:
+        return FORMAT_NAMES[self.format]
+
+    def _slot_offset(self, seq: int) -> int:
+        return HEADER_SIZE + (seq % self.slots) * (SLOT_HEADER_SIZE + self.frame_size)
+
+    def latest(self) -> Optional[Tuple[int, memoryview]]:
+        """(seq, pixels) of a frame newer than the last one, else None."""
+        seq = _U64.unpack_from(self._mm, _LATEST_OFFSET)[0]
+        if seq == 0 or seq == self.last_seq:
+            return None
+        offset = self._slot_offset(seq)
+        if _U64.unpack_from(self._mm, offset)[0] != seq:
+            return None  # Being rewritten; pick it up next poll
+        start = offset + SLOT_HEADER_SIZE
+        self.last_seq = seq
+        self.frames += 1
+        return seq, memoryview(self._mm)[start:start + self.frame_size]
+
+    def is_intact(self, seq: int) -> bool:
+        """Whether frame *seq* is still in its slot (not lapped by the writer)."""
+        if _U64.unpack_from(self._mm, self._slot_offset(seq))[0] == seq:
+            return True
+        self.torn += 1
+        return False
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # A frame view is still alive; the mapping goes with it
+
+    def __repr__(self) -> str:
+        return (f"ShmFrameSource({self.path!r}, {self.width}x{self.height} "
+                f"{self.format_name}, frames={self.frames}, torn={self.torn})")
+
+
+class ShmFrameWriter:
+    """Write side, for Python producers (and tests).
+
+    Creates (or replaces) the ring file; ``write()`` publishes one frame.
+    """
+
+    def __init__(self, path: str, width: int, height: int,
+                 fmt: int = FORMAT_RGB888, slots: int = DEFAULT_SLOTS):
+        if fmt not in BYTES_PER_PIXEL:
+            raise ValueError(f"Unknown format {fmt}")
+        if slots < 2:
+            raise ValueError("A ring needs at least 2 slots")
+        self.path = path
+        self.frame_size = width * height * BYTES_PER_PIXEL[fmt]
+        self.slots = slots
+        self.seq = 0
+        total = HEADER_SIZE + slots * (SLOT_HEADER_SIZE + self.frame_size)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, total)
+            self._mm = mmap.mmap(fd, total)
+        finally:
+            os.close(fd)
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, width, height, fmt,
+                          slots, self.frame_size)
+
+    def write(self, data) -> int:
+        """Publish one frame (bytes-like, exactly frame_size bytes); returns its seq."""
+        data = memoryview(data).cast('B')
+        if data.nbytes != self.frame_size:
+            raise ValueError(f"Frame is {data.nbytes} bytes, expected {self.frame_size}")
+        seq = self.seq + 1
+        offset = HEADER_SIZE + (seq % self.slots) * (SLOT_HEADER_SIZE + self.frame_size)
+        _U64.pack_into(self._mm, offset, 0)
+        start = offset + SLOT_HEADER_SIZE
+        self._mm[start:start + self.frame_size] = data
+        _U64.pack_into(self._mm, offset, seq)
+        _U64.pack_into(self._mm, _LATEST_OFFSET, seq)
+        self.seq = seq
+        return seq
+
+    def close(self, unlink: bool = False) -> None:
+        self._mm.close()
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
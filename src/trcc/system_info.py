@@ -2,13 +2,21 @@
 """
 System Info Provider for TRCC LCD
 Reads CPU/GPU temps, usage, frequencies from hwmon and lm_sensors
+
+Sampling is meant to run every second, so the fast paths avoid forking:
+NVIDIA GPUs are read through NVML (optional nvidia-ml-py) with the device
+handle kept open, hwmon directories are located once and then read
+directly, and subprocess tools (nvidia-smi, sensors, smartctl, dmidecode,
+lshw) are only fallbacks.  A fallback that yields nothing on its first run
+is remembered as unavailable and not forked again (see reset_sampler()).
 """
 
 import os
 import re
 import subprocess
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 # Try to import psutil for cross-platform system monitoring
 try:
@@ -35,21 +43,163 @@ def read_file(path: str) -> Optional[str]:
         return None
 
 
+# =========================================================================
+# Sampler state (hwmon paths, NVML handle, subprocess fallbacks)
+# =========================================================================
+
+# find_hwmon_by_name() results: name -> (path or None, monotonic scan time)
+_hwmon_cache: Dict[str, Tuple[Optional[str], float]] = {}
+_HWMON_RESCAN_S = 60.0  # Retry a name that wasn't found after this long
+
+# Subprocess fallbacks that produced nothing on their first run / ever worked
+_unavailable: Set[str] = set()
+_working: Set[str] = set()
+
+# NVML device handle for GPU 0 (opened on first use, kept open)
+_nvml_handle: Any = None
+_nvml_probed = False
+
+# One nvidia-smi run serves temperature, usage and clock
+_NVIDIA_SMI_QUERY = ['nvidia-smi', '--query-gpu=temperature.gpu,utilization.gpu,clocks.gr',
+                     '--format=csv,noheader,nounits']
+_NVIDIA_SMI_MAX_AGE = 0.5  # Seconds a sample is reused across the getters
+_nvidia_smi_sample: Tuple[float, Optional[List[float]]] = (0.0, None)
+
+# Memory clock doesn't change at runtime; looked up once (hit or miss), kept
+_memory_clock: Optional[float] = None
+_memory_clock_probed = False
+
+
+def reset_sampler():
+    """Forget cached hwmon paths, the NVML handle and unavailable fallbacks."""
+    global _nvml_handle, _nvml_probed, _nvidia_smi_sample, _memory_clock, _memory_clock_probed
+    _hwmon_cache.clear()
+    _unavailable.clear()
+    _working.clear()
+    _nvml_handle = None
+    _nvml_probed = False
+    _nvidia_smi_sample = (0.0, None)
+    _memory_clock = None
+    _memory_clock_probed = False
+
+
+def _run_fallback(key: str, cmd: List[str], parse: Callable[[str], Any],
+                  check: bool = True) -> Any:
+    """Run a subprocess fallback unless it is known to be unavailable.
+
+    *parse* gets stdout and returns a value or None.  If the first run
+    yields None (tool missing, no permission, nothing matched), *key* is
+    marked unavailable and the command is not forked again.
+
+    Args:
+        check: Ignore output when the command exits non-zero.
+    """
+    if key in _unavailable:
+        return None
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        value = parse(result.stdout) if result.returncode == 0 or not check else None
+    except Exception:
+        value = None
+
+    if value is not None:
+        _working.add(key)
+    elif key not in _working:
+        _unavailable.add(key)
+    return value
+
+
 def find_hwmon_by_name(name: str) -> Optional[str]:
-    """Find hwmon path by sensor name (k10temp, coretemp, amdgpu, etc.)"""
+    """Find hwmon path by sensor name (k10temp, coretemp, amdgpu, etc.)
+
+    Results are cached; a cached path is re-checked against its name file
+    (hwmon numbering can change when a driver reloads).
+    """
+    key = name.lower()
+    cached = _hwmon_cache.get(key)
+    if cached is not None:
+        path, scanned = cached
+        if path is not None:
+            sensor_name = read_file(f"{path}/name")
+            if sensor_name and key in sensor_name.lower():
+                return path
+        elif time.monotonic() - scanned < _HWMON_RESCAN_S:
+            return None
+
+    found = None
     hwmon_base = "/sys/class/hwmon"
-    if not os.path.exists(hwmon_base):
-        return None
+    if os.path.exists(hwmon_base):
+        for i in range(20):
+            hwmon_path = f"{hwmon_base}/hwmon{i}"
+            name_file = f"{hwmon_path}/name"
+            sensor_name = read_file(name_file)
+            if sensor_name and key in sensor_name.lower():
+                found = hwmon_path
+                break
+
+    _hwmon_cache[key] = (found, time.monotonic())
+    return found
+
+
+def _nvml_device() -> Any:
+    """NVML handle for GPU 0, or None without nvidia-ml-py / NVIDIA GPU."""
+    global _nvml_handle, _nvml_probed
+    if not _nvml_probed:
+        _nvml_probed = True
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            _nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        except Exception:
+            _nvml_handle = None
+    return _nvml_handle
+
 
-    for i in range(20):
-        hwmon_path = f"{hwmon_base}/hwmon{i}"
-        name_file = f"{hwmon_path}/name"
-        sensor_name = read_file(name_file)
-        if sensor_name and name.lower() in sensor_name.lower():
-            return hwmon_path
+def _nvml_read(metric: str) -> Optional[float]:
+    """Read 'temp', 'usage' or 'clock' for GPU 0 through NVML."""
+    handle = _nvml_device()
+    if handle is None:
+        return None
+    try:
+        import pynvml
+        if metric == 'temp':
+            return float(pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU))
+        if metric == 'usage':
+            return float(pynvml.nvmlDeviceGetUtilizationRates(handle).gpu)
+        if metric == 'clock':
+            return float(pynvml.nvmlDeviceGetClockInfo(handle, pynvml.NVML_CLOCK_GRAPHICS))
+    except Exception:
+        pass
     return None
 
 
+def _parse_nvidia_smi(stdout: str) -> Optional[List[float]]:
+    try:
+        values = [float(v) for v in stdout.strip().splitlines()[0].split(',')]
+    except (ValueError, IndexError):
+        return None
+    return values if len(values) == 3 else None
+
+
+def _nvidia_smi(field: int) -> Optional[float]:
+    """Field 0/1/2 (temperature, usage, clock) from a shared nvidia-smi sample."""
+    global _nvidia_smi_sample
+    now = time.monotonic()
+    sampled, values = _nvidia_smi_sample
+    if values is None or now - sampled > _NVIDIA_SMI_MAX_AGE:
+        values = _run_fallback('nvidia-smi', _NVIDIA_SMI_QUERY, _parse_nvidia_smi)
+        _nvidia_smi_sample = (now, values)
+    return values[field] if values else None
+
+
+def _nvidia_metric(metric: str, field: int) -> Optional[float]:
+    """NVIDIA metric via NVML, falling back to nvidia-smi."""
+    value = _nvml_read(metric)
+    if value is None:
+        value = _nvidia_smi(field)
+    return value
+
+
 def get_cpu_temperature() -> Optional[float]:
     """Get CPU temperature from hwmon (k10temp for AMD, coretemp for Intel)"""
     # Try k10temp (AMD)
@@ -66,16 +216,15 @@ def get_cpu_temperature() -> Optional[float]:
                 return float(temp) / 1000.0
 
     # Fallback: try lm_sensors
-    try:
-        result = subprocess.run(['sensors', '-u'], capture_output=True, text=True, timeout=5)
-        for line in result.stdout.split('\n'):
-            if 'temp1_input' in line or 'Tctl' in line.lower():
-                match = re.search(r':\s*([0-9.]+)', line)
-                if match:
-                    return float(match.group(1))
-    except Exception:
-        pass
+    return _run_fallback('sensors:cpu', ['sensors', '-u'], _parse_sensors_cpu, check=False)
+
 
+def _parse_sensors_cpu(stdout: str) -> Optional[float]:
+    for line in stdout.split('\n'):
+        if 'temp1_input' in line or 'Tctl' in line.lower():
+            match = re.search(r':\s*([0-9.]+)', line)
+            if match:
+                return float(match.group(1))
     return None
 
 
@@ -146,17 +295,7 @@ def get_gpu_temperature() -> Optional[float]:
             return float(temp) / 1000.0
 
     # NVIDIA GPU
-    try:
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=temperature.gpu', '--format=csv,noheader,nounits'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            return float(result.stdout.strip())
-    except Exception:
-        pass
-
-    return None
+    return _nvidia_metric('temp', 0)
 
 
 def get_gpu_usage() -> Optional[float]:
@@ -170,17 +309,7 @@ def get_gpu_usage() -> Optional[float]:
             return float(usage)
 
     # NVIDIA GPU
-    try:
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=utilization.gpu', '--format=csv,noheader,nounits'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            return float(result.stdout.strip())
-    except Exception:
-        pass
-
-    return None
+    return _nvidia_metric('usage', 1)
 
 
 def get_gpu_clock() -> Optional[float]:
@@ -193,17 +322,7 @@ def get_gpu_clock() -> Optional[float]:
             return float(freq) / 1000000.0  # Convert to MHz
 
     # NVIDIA GPU
-    try:
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=clocks.gr', '--format=csv,noheader,nounits'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            return float(result.stdout.strip())
-    except Exception:
-        pass
-
-    return None
+    return _nvidia_metric('clock', 2)
 
 
 def get_memory_usage() -> Optional[float]:
@@ -265,63 +384,69 @@ def get_memory_temperature() -> Optional[float]:
                     return float(temp) / 1000.0
 
     # Try lm_sensors output for memory temps
-    try:
-        result = subprocess.run(['sensors', '-u'], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
+    return _run_fallback('sensors:mem', ['sensors', '-u'], _parse_sensors_memory)
+
+
+def _parse_sensors_memory(stdout: str) -> Optional[float]:
+    in_memory_section = False
+    for line in stdout.split('\n'):
+        line_lower = line.lower()
+        if any(x in line_lower for x in ['ddr', 'dimm', 'memory']):
+            in_memory_section = True
+        elif line and not line.startswith(' ') and ':' not in line:
             in_memory_section = False
-            for line in result.stdout.split('\n'):
-                line_lower = line.lower()
-                if any(x in line_lower for x in ['ddr', 'dimm', 'memory']):
-                    in_memory_section = True
-                elif line and not line.startswith(' ') and ':' not in line:
-                    in_memory_section = False
-                if in_memory_section and 'temp' in line_lower and '_input' in line_lower:
-                    match = re.search(r':\s*([0-9.]+)', line)
-                    if match:
-                        return float(match.group(1))
-    except Exception:
-        pass
+        if in_memory_section and 'temp' in line_lower and '_input' in line_lower:
+            match = re.search(r':\s*([0-9.]+)', line)
+            if match:
+                return float(match.group(1))
+    return None
+
 
+def _parse_dmidecode_speed(stdout: str) -> Optional[float]:
+    lines = stdout.split('\n')
+    # Look for configured speed first, then max speed
+    for line in lines:
+        if 'Configured Memory Speed' in line:
+            match = re.search(r'(\d+)\s*(?:MT/s|MHz)', line)
+            if match:
+                return float(match.group(1))
+    # Fallback to "Speed:" if configured not found
+    for line in lines:
+        if 'Speed:' in line and 'Unknown' not in line:
+            match = re.search(r'(\d+)\s*(?:MT/s|MHz)', line)
+            if match:
+                return float(match.group(1))
     return None
 
 
+def _parse_lshw_speed(stdout: str) -> Optional[float]:
+    match = re.search(r'(\d+)\s*(?:MT/s|MHz)', stdout)
+    return float(match.group(1)) if match else None
+
+
 def get_memory_clock() -> Optional[float]:
-    """Get memory clock speed in MHz (typically requires root)"""
+    """Get memory clock speed in MHz (typically requires root)
+
+    The value is fixed at runtime, so it is looked up once and kept; a
+    failed lookup is kept too (dmidecode/lshw are not retried every tick).
+    """
+    global _memory_clock, _memory_clock_probed
+    if not _memory_clock_probed:
+        _memory_clock_probed = True
+        _memory_clock = _find_memory_clock()
+    return _memory_clock
+
+
+def _find_memory_clock() -> Optional[float]:
     # Try reading from dmidecode (requires root)
-    try:
-        result = subprocess.run(
-            ['dmidecode', '-t', 'memory'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                # Look for configured speed first, then max speed
-                if 'Configured Memory Speed' in line:
-                    match = re.search(r'(\d+)\s*(?:MT/s|MHz)', line)
-                    if match:
-                        return float(match.group(1))
-            # Fallback to "Speed:" if configured not found
-            for line in result.stdout.split('\n'):
-                if 'Speed:' in line and 'Unknown' not in line:
-                    match = re.search(r'(\d+)\s*(?:MT/s|MHz)', line)
-                    if match:
-                        return float(match.group(1))
-    except Exception:
-        pass
+    clock = _run_fallback('dmidecode', ['dmidecode', '-t', 'memory'], _parse_dmidecode_speed)
+    if clock is not None:
+        return clock
 
     # Try lshw (also requires root typically)
-    try:
-        result = subprocess.run(
-            ['lshw', '-class', 'memory', '-short'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            # Look for speed in the output
-            match = re.search(r'(\d+)\s*(?:MT/s|MHz)', result.stdout)
-            if match:
-                return float(match.group(1))
-    except Exception:
-        pass
+    clock = _run_fallback('lshw', ['lshw', '-class', 'memory', '-short'], _parse_lshw_speed)
+    if clock is not None:
+        return clock
 
     # Try reading from /sys EDAC (rarely has frequency)
     mc_path = "/sys/devices/system/edac/mc"
@@ -400,21 +525,15 @@ def get_disk_temperature() -> Optional[float]:
             return float(temp) / 1000.0
 
     # Try smartctl fallback
-    try:
-        result = subprocess.run(
-            ['smartctl', '-A', '/dev/sda'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if 'Temperature' in line or 'Airflow_Temperature' in line:
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if part.isdigit() and int(part) < 100:
-                            return float(part)
-    except Exception:
-        pass
+    return _run_fallback('smartctl', ['smartctl', '-A', '/dev/sda'], _parse_smartctl_temp)
+
 
+def _parse_smartctl_temp(stdout: str) -> Optional[float]:
+    for line in stdout.split('\n'):
+        if 'Temperature' in line or 'Airflow_Temperature' in line:
+            for part in line.split():
+                if part.isdigit() and int(part) < 100:
+                    return float(part)
     return None
 
 
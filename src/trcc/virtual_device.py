@@ -0,0 +1,504 @@
+"""
+Virtual (loopback) devices for throughput testing without hardware.
+
+VirtualProtocol is a DeviceProtocol that runs the real wire formats —
+ScsiSession chunking, HidDeviceType2/3 framing and handshakes, LedHidSender
+64-byte reports — against a simulated link instead of a USB device::
+
+    from trcc.virtual_device import VirtualProtocol
+
+    proto = VirtualProtocol('hid', device_type=3, sink='/dev/shm/trcc-panel')
+    proto.send_image(rgb565, 320, 320)
+    proto.stats.avg_frame_ms       # link time per frame
+    proto.frames[-1]               # VirtualFrame(seq, start, end, ...)
+
+Every transfer costs ``latency + bytes / bandwidth`` of wall time (a
+``time.sleep``), so a bench sees roughly the frame rate the real bus would
+allow.  LINK_PROFILES holds rough USB 2.0 defaults per kind; pass a
+LinkProfile to override (bandwidth 0 = unlimited, for pure CPU cost).
+
+*sink* receives what would go on the wire:
+
+- None: discarded;
+- a FIFO: every transfer is written to it in order (``cat`` / ``pv`` it);
+- any other path: an mmapped file holding what the panel last received
+  (SCSI: the RGB565 frame, chunks at their offsets; HID/LED: the last
+  transfer, i.e. the frame packet / the last 64-byte report).
+
+DeviceProtocolFactory creates one for ``device_info.protocol == 'virtual'``;
+``device_type`` / ``implementation`` pick the emulated kind and a
+``device_info.path`` starting with ``/`` is used as the sink.
+"""
+
+import mmap
+import os
+import stat
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from .device_factory import DeviceProtocol, ProtocolInfo
+from .hid_device import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_TIMEOUT_MS,
+    TYPE2_MAGIC,
+    TYPE2_RESPONSE_SIZE,
+    TransferQueue,
+    UsbTransfer,
+    UsbTransport,
+    send_image_to_hid_device,
+)
+from .led_device import LED_MAGIC, LedHidSender, LedPacketBuilder
+from .scsi_device import ScsiSession
+
+KINDS = ('scsi', 'hid', 'led')
+
+FRAME_HISTORY = 1000  # VirtualFrame records kept per protocol
+
+# Handshake replies the virtual devices give (see hid_device / led_device)
+VIRTUAL_SERIAL = bytes(range(16))
+TYPE3_FBL_BYTE = 0x65  # resp[0] = fbl + 1 (fbl 100 = 320x320)
+LED_PM = 128           # LC1 (31 LEDs)
+
+
+@dataclass(frozen=True)
+class LinkProfile:
+    """Simulated link: bytes per second (0 = unlimited) and per-transfer latency."""
+    bandwidth: float = 0.0
+    latency: float = 0.0
+
+
+# Rough USB 2.0 figures: SCSI/HID LCD frames go over high-speed bulk
+# endpoints, LED reports are 64-byte interrupt transfers at 1 ms intervals.
+LINK_PROFILES = {
+    'scsi': LinkProfile(bandwidth=40e6, latency=0.0005),
+    'hid': LinkProfile(bandwidth=30e6, latency=0.000125),
+    'led': LinkProfile(bandwidth=64_000, latency=0.001),
+}
+
+
+@dataclass
+class VirtualFrame:
+    """One send through a virtual device (perf_counter timestamps)."""
+    seq: int
+    start: float
+    end: float
+    nbytes: int     # Bytes on the wire, headers and padding included
+    transfers: int
+    ok: bool
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+@dataclass
+class VirtualStats:
+    """Totals for one virtual device."""
+    frames: int = 0
+    failed: int = 0
+    transfers: int = 0
+    bytes: int = 0
+    link_time: float = 0.0   # s spent "on the wire"
+    frame_time: float = 0.0  # s spent in send_image / send_led_data
+
+    @property
+    def avg_frame_ms(self) -> float:
+        return self.frame_time * 1000 / self.frames if self.frames else 0.0
+
+    @property
+    def throughput_mbps(self) -> float:
+        """Wire bytes per second of send time, in MB/s."""
+        return self.bytes / self.frame_time / 1e6 if self.frame_time else 0.0
+
+
+# =========================================================================
+# Link and sink
+# =========================================================================
+
+class _Sink:
+    """Where wire bytes go: nothing, a FIFO, or an mmapped frame file."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self.is_pipe = False
+        if path is None:
+            return
+        try:
+            self.is_pipe = stat.S_ISFIFO(os.stat(path).st_mode)
+        except OSError:
+            pass
+        if self.is_pipe:
+            self._fd = os.open(path, os.O_WRONLY)
+        else:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def write(self, offset: int, data) -> None:
+        if self._fd is None:
+            return
+        if self.is_pipe:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            return
+        end = offset + len(data)
+        if self._mm is None or len(self._mm) < end:
+            self._remap(end)
+        self._mm[offset:end] = data  # type: ignore[index]
+
+    def _remap(self, size: int) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        os.ftruncate(self._fd, size)  # type: ignore[arg-type]
+        self._mm = mmap.mmap(self._fd, size)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class VirtualLink:
+    """Charges each transfer its simulated wire time and forwards it to the sink."""
+
+    def __init__(self, profile: LinkProfile, sink: Optional[str] = None):
+        self.profile = profile
+        self.sink = _Sink(sink)
+        self.transfers = 0
+        self.bytes = 0
+        self.link_time = 0.0
+        self._lock = threading.Lock()  # Async HID: IN and OUT threads
+
+    def transfer(self, data, offset: int = 0, header: bytes = b'') -> int:
+        """Move *header* + *data* over the link as one transfer; returns len(data).
+
+        A framebuffer sink stores *data* alone at *offset*; a FIFO gets both.
+        """
+        n = len(header) + len(data)
+        cost = self.profile.latency
+        if self.profile.bandwidth:
+            cost += n / self.profile.bandwidth
+        if cost:
+            time.sleep(cost)
+        with self._lock:
+            if header and self.sink.is_pipe:
+                self.sink.write(0, header)
+            self.sink.write(offset, data)
+            self.transfers += 1
+            self.bytes += n
+            self.link_time += cost
+        return len(data)
+
+    def read(self, length: int) -> int:
+        """A device-to-host transfer of *length* bytes (timed, not sunk)."""
+        cost = self.profile.latency
+        if self.profile.bandwidth:
+            cost += length / self.profile.bandwidth
+        if cost:
+            time.sleep(cost)
+        with self._lock:
+            self.transfers += 1
+            self.link_time += cost
+        return length
+
+    def close(self) -> None:
+        self.sink.close()
+
+
+# =========================================================================
+# Loopback SCSI session and USB transport
+# =========================================================================
+
+class VirtualScsiSession(ScsiSession):
+    """ScsiSession whose WRITEs go over a VirtualLink (same chunk table)."""
+
+    def __init__(self, link: VirtualLink, width: int = 320, height: int = 320):
+        super().__init__('virtual', width, height)
+        self.link = link
+        self._offset = 0
+
+    def init(self) -> None:
+        self.link.read(0xE100)               # Poll
+        self.link.transfer(bytes(0xE100))    # Init
+        self.initialized = True
+
+    def send_frame(self, buffer) -> None:
+        self._offset = 0
+        super().send_frame(buffer)
+
+    def _write(self, header: bytes, data) -> bool:
+        self.link.transfer(data, self._offset, header[:16])  # CDB + chunk
+        self._offset += len(data)
+        return True
+
+    def reset(self) -> None:
+        self.initialized = False
+
+
+class VirtualUsbTransport(UsbTransport):
+    """UsbTransport that answers like a panel: handshakes and Type 3 ACKs.
+
+    With *max_in_flight* > 1 it queues transfers like PyUsbTransport, so
+    the async HID path can be measured as well.
+    """
+
+    def __init__(self, link: VirtualLink, kind: str, device_type: int = 2,
+                 max_in_flight: int = 1):
+        self.link = link
+        self.kind = kind
+        self.device_type = device_type
+        self.max_in_flight = max_in_flight
+        self._is_open = False
+        self._write_queue: Optional[TransferQueue] = None
+        self._read_queue: Optional[TransferQueue] = None
+
+    def open(self) -> None:
+        self._is_open = True
+
+    def close(self) -> None:
+        for q in (self._write_queue, self._read_queue):
+            if q is not None:
+                q.close()
+        self._write_queue = self._read_queue = None
+        self._is_open = False
+
+    def write(self, endpoint: int, data: bytes, timeout: int = DEFAULT_TIMEOUT_MS) -> int:
+        if not self._is_open:
+            raise RuntimeError("Transport not open")
+        return self.link.transfer(data)
+
+    def read(self, endpoint: int, length: int, timeout: int = DEFAULT_TIMEOUT_MS) -> bytes:
+        if not self._is_open:
+            raise RuntimeError("Transport not open")
+        self.link.read(length)
+        return self._reply(length)
+
+    def _reply(self, length: int) -> bytes:
+        """Handshake response, or a Type 3 frame ACK."""
+        resp = bytearray(max(length, TYPE2_RESPONSE_SIZE))
+        if self.kind == 'led':
+            resp[0:4] = LED_MAGIC
+            resp[6] = LED_PM
+            resp[12] = 1
+        elif self.device_type == 3:
+            resp[0] = TYPE3_FBL_BYTE
+            resp[10:14] = VIRTUAL_SERIAL[:4]
+        else:
+            resp[0:4] = TYPE2_MAGIC
+            resp[12] = 0x01
+            resp[16] = 0x10
+            resp[20:36] = VIRTUAL_SERIAL
+        return bytes(resp[:length])
+
+    def submit_write(self, endpoint: int, data: bytes,
+                     timeout: int = DEFAULT_TIMEOUT_MS,
+                     then: Optional[Callable[[UsbTransfer], None]] = None) -> UsbTransfer:
+        if self._write_queue is None:
+            self._write_queue = TransferQueue(self.write, self.max_in_flight,
+                                              'trcc-virtual-out')
+        return self._write_queue.submit(endpoint, data, timeout, then)
+
+    def submit_read(self, endpoint: int, length: int,
+                    timeout: int = DEFAULT_TIMEOUT_MS,
+                    then: Optional[Callable[[UsbTransfer], None]] = None) -> UsbTransfer:
+        if self._read_queue is None:
+            self._read_queue = TransferQueue(self.read, self.max_in_flight,
+                                             'trcc-virtual-in')
+        return self._read_queue.submit(endpoint, length, timeout, then)
+
+    @property
+    def is_open(self) -> bool:
+        return self._is_open
+
+
+# =========================================================================
+# VirtualProtocol
+# =========================================================================
+
+class VirtualProtocol(DeviceProtocol):
+    """DeviceProtocol over a simulated link (see module docstring).
+
+    Args:
+        kind: 'scsi', 'hid' or 'led' — which wire format to run.
+        device_type: HID LCD variant (2 or 3); ignored otherwise.
+        profile: Link bandwidth/latency; defaults to LINK_PROFILES[kind].
+        sink: None, a FIFO path, or a file to mmap (see module docstring).
+        max_in_flight: HID frame queue depth (1 = synchronous, like hidapi).
+    """
+
+    def __init__(self, kind: str = 'scsi', device_type: int = 2,
+                 profile: Optional[LinkProfile] = None, sink: Optional[str] = None,
+                 max_in_flight: int = 1):
+        super().__init__()
+        if kind not in KINDS:
+            raise ValueError(f"Unknown virtual device kind: {kind!r}")
+        self.kind = kind
+        self.device_type = device_type if kind == 'hid' else (1 if kind == 'scsi' else 0)
+        self.link = VirtualLink(profile or LINK_PROFILES[kind], sink)
+        self.stats = VirtualStats()
+        self.frames: Deque[VirtualFrame] = deque(maxlen=FRAME_HISTORY)
+        self._max_in_flight = max_in_flight
+        self._session: Optional[VirtualScsiSession] = None
+        self._transport: Optional[VirtualUsbTransport] = None
+        self._led: Optional[LedHidSender] = None
+        self._handshake_info: Any = None
+
+    @classmethod
+    def from_device_info(cls, device_info) -> 'VirtualProtocol':
+        """Factory hook: kind from implementation/device_type, sink from path."""
+        if getattr(device_info, 'implementation', '') == 'hid_led':
+            kind = 'led'
+        elif getattr(device_info, 'device_type', 1) in (2, 3):
+            kind = 'hid'
+        else:
+            kind = 'scsi'
+        path = getattr(device_info, 'path', '') or ''
+        return cls(kind, getattr(device_info, 'device_type', 2),
+                   sink=path if path.startswith('/') else None,
+                   max_in_flight=DEFAULT_MAX_IN_FLIGHT if kind == 'hid' else 1)
+
+    # -- Sends ------------------------------------------------------------
+
+    def _timed(self, nbytes_before: int, transfers_before: int,
+               start: float, ok: bool) -> bool:
+        end = time.perf_counter()
+        stats = self.stats
+        stats.frames += 1
+        stats.failed += not ok
+        stats.frame_time += end - start
+        stats.transfers = self.link.transfers
+        stats.bytes = self.link.bytes
+        stats.link_time = self.link.link_time
+        self.frames.append(VirtualFrame(
+            stats.frames, start, end, self.link.bytes - nbytes_before,
+            self.link.transfers - transfers_before, ok))
+        self._notify_send_complete(ok)
+        return ok
+
+    def send_image(self, image_data: bytes, width: int, height: int) -> bool:
+        if self.kind == 'led':
+            return False
+        nbytes, transfers = self.link.bytes, self.link.transfers
+        start = time.perf_counter()
+        try:
+            if self.kind == 'scsi':
+                if self._session is None:
+                    self._session = VirtualScsiSession(self.link, width, height)
+                self._session.set_resolution(width, height)
+                self._session.send_frame(image_data)
+                ok = True
+            else:
+                ok = send_image_to_hid_device(self._usb(), image_data, self.device_type)
+        except Exception as e:
+            self._notify_error(f"Virtual send failed: {e}")
+            ok = False
+        return self._timed(nbytes, transfers, start, ok)
+
+    def send_led_data(
+        self,
+        led_colors: List[Tuple[int, int, int]],
+        is_on: Optional[List[bool]] = None,
+        global_on: bool = True,
+        brightness: int = 100,
+    ) -> bool:
+        if self.kind != 'led':
+            return False
+        nbytes, transfers = self.link.bytes, self.link.transfers
+        start = time.perf_counter()
+        try:
+            self.handshake()
+            packet = LedPacketBuilder.build_led_packet(led_colors, is_on, global_on,
+                                                       brightness)
+            ok = self._led_sender().send_led_data(packet)
+        except Exception as e:
+            self._notify_error(f"Virtual LED send failed: {e}")
+            ok = False
+        return self._timed(nbytes, transfers, start, ok)
+
+    def handshake(self) -> Optional[object]:
+        """LED handshake (cached); None for LCD kinds."""
+        if self.kind != 'led':
+            return None
+        if self._handshake_info is None:
+            self._handshake_info = self._led_sender().handshake()
+        return self._handshake_info
+
+    def _usb(self) -> VirtualUsbTransport:
+        if self._transport is None:
+            self._transport = VirtualUsbTransport(self.link, self.kind, self.device_type,
+                                                  self._max_in_flight)
+            self._transport.open()
+            self._notify_state_changed("transport_open", True)
+        return self._transport
+
+    def _led_sender(self) -> LedHidSender:
+        if self._led is None:
+            self._led = LedHidSender(self._usb())
+        return self._led
+
+    # -- Records ------------------------------------------------------------
+
+    def frame_times(self) -> List[float]:
+        """Durations (ms) of the recorded frames, oldest first."""
+        return [f.duration_ms for f in self.frames]
+
+    def reset_stats(self) -> None:
+        self.stats = VirtualStats()
+        self.frames.clear()
+        self.link.transfers = self.link.bytes = 0
+        self.link.link_time = 0.0
+
+    # -- DeviceProtocol ---------------------------------------------------
+
+    def close(self) -> None:
+        if self._transport is not None:
+            from .hid_device import _device_handlers, _initialized_transports
+            handler = _device_handlers.pop(id(self._transport), None)
+            _initialized_transports.discard(id(self._transport))
+            if handler is not None:
+                handler.flush()
+            self._transport.close()
+            self._transport = None
+            self._led = None
+            self._notify_state_changed("transport_open", False)
+        self.link.close()
+
+    def get_info(self) -> ProtocolInfo:
+        return ProtocolInfo(
+            protocol="virtual",
+            device_type=self.device_type,
+            protocol_display=f"Virtual ({self.kind})",
+            device_type_display=f"Loopback {self.kind.upper()}",
+            active_backend="virtual",
+            backends={"virtual": True},
+            transport_open=True,
+        )
+
+    @property
+    def protocol_name(self) -> str:
+        return "virtual"
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+    @property
+    def is_led(self) -> bool:
+        return self.kind == 'led'
+
+    @property
+    def handshake_info(self):
+        return self._handshake_info
+
+    def __repr__(self) -> str:
+        p = self.link.profile
+        return (f"VirtualProtocol({self.kind!r}, type={self.device_type}, "
+                f"bandwidth={p.bandwidth:g}, latency={p.latency:g}, "
+                f"sink={self.link.sink.path!r})")
@@ -0,0 +1,250 @@
+"""
+Pre-decoded sidecar cache for Theme.zt animations.
+
+Theme.zt stores each frame as a JPEG, so every load decodes (and resizes)
+the whole animation again.  A sidecar cache holds the frames already
+decoded at one LCD resolution, next to the source file::
+
+    Theme.zt
+    Theme.zt.320x320.rgb565     # one file per resolution / pixel format
+    Theme.zt.480x480.rgb888
+
+Layout (little-endian header, then fixed-stride frames, so frame N is at
+``data_offset + N * frame_size`` and the file can be mmapped as is):
+
+    4s   magic  b'TZTC'
+    B    version (1)
+    B    pixel format (0 = RGB565 big-endian, as sent to the device;
+                       1 = packed RGB888)
+    H    width
+    H    height
+    H    reserved (0)
+    I    frame_count
+    i[frame_count]  timestamps in ms (copied from Theme.zt)
+    ...  zero padding to a 16-byte boundary
+    frames
+
+The two formats serve different paths.  RGB888 is what the players need
+for preview, overlay, brightness and rotation (``image()`` is a plain
+``frombytes``).  RGB565 is already device-ready: with no overlay, 100%
+brightness and no rotation the controller sends ``frame_bytes()`` straight
+to the LCD.  The players open the RGB888 cache for images and, when an
+RGB565 one exists, keep it open for those direct sends.
+
+A cache is only used while it is at least as new as its Theme.zt
+(find_zt_cache); compile_zt_cache() rebuilds it.
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+ZT_CACHE_MAGIC = b'TZTC'
+ZT_CACHE_VERSION = 1
+
+# Pixel formats: name -> (header code, bytes per pixel)
+ZT_CACHE_FORMATS = {'rgb565': (0, 2), 'rgb888': (1, 3)}
+
+_HEADER = struct.Struct('<4sBBHHHI')
+_ALIGN = 16
+
+PathLike = Union[str, Path]
+
+
+def zt_cache_path(zt_path: PathLike, size: Tuple[int, int], fmt: str = 'rgb565') -> Path:
+    """Sidecar path for *zt_path* at *size* in pixel format *fmt*."""
+    if fmt not in ZT_CACHE_FORMATS:
+        raise ValueError(f"Unknown cache format: {fmt}")
+    w, h = size
+    zt_path = Path(zt_path)
+    return zt_path.with_name(f"{zt_path.name}.{w}x{h}.{fmt}")
+
+
+def find_zt_cache(zt_path: PathLike, size: Tuple[int, int],
+                  fmt: Optional[str] = None) -> Optional[Path]:
+    """Fresh sidecar for *zt_path* at *size*, or None.
+
+    With *fmt* None either format will do, RGB888 preferred (it decodes to
+    images without expanding pixels).  A cache older than its Theme.zt is
+    ignored.
+    """
+    try:
+        source_mtime = os.stat(zt_path).st_mtime
+    except OSError:
+        return None
+    for name in ([fmt] if fmt else ['rgb888', 'rgb565']):
+        path = zt_cache_path(zt_path, size, name)
+        try:
+            if path.stat().st_mtime >= source_mtime:
+                return path
+        except OSError:
+            continue
+    return None
+
+
+def _data_offset(frame_count: int) -> int:
+    end = _HEADER.size + 4 * frame_count
+    return -(-end // _ALIGN) * _ALIGN
+
+
+def compile_zt_cache(zt_path: PathLike, size: Tuple[int, int],
+                     fmt: str = 'rgb565') -> Path:
+    """Decode *zt_path* at *size* and write its sidecar cache.
+
+    Frames are resized and converted exactly as ThemeZtPlayer does.  The
+    file is written under a temporary name and renamed into place.
+
+    Returns:
+        Path of the written cache.
+    """
+    import io
+
+    from .gif_animator import read_zt_index
+    from .rgb565 import Rgb565Converter
+
+    out_path = zt_cache_path(zt_path, size, fmt)
+    code, bpp = ZT_CACHE_FORMATS[fmt]
+    w, h = size
+    tmp_path = out_path.with_name(out_path.name + '.tmp')
+    converter = Rgb565Converter()
+
+    with open(zt_path, 'rb') as f:
+        data = f.read()
+    timestamps, index = read_zt_index(data)
+    count = len(index)
+
+    try:
+        with open(tmp_path, 'wb') as out:
+            out.write(_HEADER.pack(ZT_CACHE_MAGIC, ZT_CACHE_VERSION, code, w, h, 0, count))
+            out.write(struct.pack(f'<{count}i', *timestamps))
+            out.write(b'\x00' * (_data_offset(count) - out.tell()))
+
+            for offset, length in index:
+                img = Image.open(io.BytesIO(data[offset:offset + length]))
+                if img.size != (w, h):
+                    img = img.resize((w, h), Image.Resampling.LANCZOS)
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                if fmt == 'rgb565':
+                    out.write(converter.convert(img).tobytes())
+                else:
+                    out.write(img.tobytes())
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+    print(f"[+] Theme.zt cache: {out_path.name} ({count} frames, "
+          f"{count * w * h * bpp // 1024} KiB)")
+    return out_path
+
+
+class ZtCache:
+    """Read-only, mmapped view of a sidecar cache.
+
+    ``frame_bytes(i)`` is a zero-copy view of the stored pixels;
+    ``image(i)`` returns a new RGB PIL Image.
+    """
+
+    def __init__(self, path: PathLike):
+        import mmap
+
+        self.path = Path(path)
+        self._mm: Optional[mmap.mmap] = None
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._mm) < _HEADER.size:
+                raise ValueError(f"Theme.zt cache truncated: {self.path.name}")
+            magic, version, code, w, h, _, count = _HEADER.unpack_from(self._mm, 0)
+            if magic != ZT_CACHE_MAGIC or version != ZT_CACHE_VERSION:
+                raise ValueError(f"Not a Theme.zt cache (v{ZT_CACHE_VERSION}): {self.path.name}")
+            formats = {c: (name, bpp) for name, (c, bpp) in ZT_CACHE_FORMATS.items()}
+            if code not in formats:
+                raise ValueError(f"Unknown cache pixel format {code}: {self.path.name}")
+
+            self.format, bpp = formats[code]
+            self.width = w
+            self.height = h
+            self.frame_count = count
+            self.frame_size = w * h * bpp
+            self._offset = _data_offset(count)
+            if len(self._mm) < self._offset + count * self.frame_size:
+                raise ValueError(f"Theme.zt cache truncated: {self.path.name}")
+            self.timestamps: List[int] = list(
+                struct.unpack_from(f'<{count}i', self._mm, _HEADER.size))
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    def frame_bytes(self, index: int) -> memoryview:
+        """Stored pixels of frame *index* (view into the mapping)."""
+        assert self._mm is not None
+        start = self._offset + index * self.frame_size
+        return memoryview(self._mm)[start:start + self.frame_size]
+
+    def image(self, index: int) -> Image.Image:
+        """Frame *index* as a new RGB image."""
+        assert self._mm is not None
+        start = self._offset + index * self.frame_size
+        raw = self._mm[start:start + self.frame_size]
+        size = (self.width, self.height)
+        if self.format == 'rgb888':
+            return Image.frombytes('RGB', size, raw)
+
+        v = np.frombuffer(raw, dtype='>u2').reshape(self.height, self.width)
+        rgb = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        r = (v >> 11).astype(np.uint8)
+        g = ((v >> 5) & 0x3F).astype(np.uint8)
+        b = (v & 0x1F).astype(np.uint8)
+        rgb[..., 0] = (r << 3) | (r >> 2)  # Replicate high bits into the low ones
+        rgb[..., 1] = (g << 2) | (g >> 4)
+        rgb[..., 2] = (b << 3) | (b >> 2)
+        return Image.fromarray(rgb)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                pass  # A frame_bytes() view is still alive; GC will unmap
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_zt_cache(zt_path: PathLike, size: Optional[Tuple[int, int]],
+                  fmt: Optional[str] = None) -> Optional[ZtCache]:
+    """Open the fresh sidecar for *zt_path* at *size*, or None.
+
+    *fmt* as for find_zt_cache.  Unreadable or mismatched caches are
+    reported and ignored.
+    """
+    if not size:
+        return None
+    path = find_zt_cache(zt_path, size, fmt)
+    if path is None:
+        return None
+    try:
+        cache = ZtCache(path)
+    except (OSError, ValueError) as e:
+        print(f"[!] Ignoring Theme.zt cache: {e}")
+        return None
+    if cache.size != tuple(size):
+        cache.close()
+        return None
+    return cache
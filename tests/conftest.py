@@ -0,0 +1,16 @@
+"""Keep the test run away from the user's persisted state."""
+import pytest
+
+import trcc.font_index
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _font_index_in_tmp(tmp_path_factory):
+    """Persist the process-wide font index (get_font_index) to a temp dir,
+    not ~/.config/trcc/font_index.json."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(trcc.font_index, 'FONT_INDEX_PATH',
+               str(tmp_path_factory.mktemp('config') / 'font_index.json'))
+    mp.setattr(trcc.font_index, '_index', None)
+    yield
+    mp.undo()
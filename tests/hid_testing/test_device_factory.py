@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from typing import Optional
 from unittest.mock import MagicMock, patch, PropertyMock
 
+from trcc.hid_device import DEFAULT_MAX_IN_FLIGHT
+
 
 # =========================================================================
 # Minimal DeviceInfo stand-in (avoids importing full models.py)
@@ -250,6 +252,20 @@ class TestScsiProtocol:
         assert info.is_scsi is True
         assert "SCSI" in info.protocol_display
 
+    @pytest.mark.parametrize("sg_io_open, sg_raw, active, label", [
+        (True, True, "sg_io", "SCSI (SG_IO)"),
+        (False, True, "sg_raw", "SCSI (sg_raw)"),
+        (False, False, "none", "SCSI"),
+    ])
+    def test_protocol_display_names_active_backend(self, sg_io_open, sg_raw, active, label):
+        s = ScsiProtocol("/dev/sg0")
+        with patch("trcc.sg_io.is_sg_transport_open", return_value=sg_io_open), \
+             patch("shutil.which", return_value="/usr/bin/sg_raw" if sg_raw else None):
+            info = s.get_info()
+        assert info.active_backend == active
+        assert info.protocol_display == label
+        assert info.transport_open is sg_io_open
+
     def test_is_available_checks_sg_raw(self):
         s = ScsiProtocol("/dev/sg0")
         # is_available depends on system state, just verify it returns bool
@@ -287,10 +303,19 @@ class TestHidProtocol:
         result = s.send_image(b'\x00' * 100, 320, 320)
 
         assert result is True
-        MockPyUsb.assert_called_once_with(0x0416, 0x5302)
+        MockPyUsb.assert_called_once_with(0x0416, 0x5302,
+                                          max_in_flight=DEFAULT_MAX_IN_FLIGHT)
         mock_transport.open.assert_called_once()
         mock_send_hid.assert_called_once_with(mock_transport, b'\x00' * 100, 2)
 
+    @patch("trcc.hid_device.PYUSB_AVAILABLE", True)
+    @patch("trcc.hid_device.PyUsbTransport")
+    @patch("trcc.hid_device.send_image_to_hid_device", return_value=True)
+    def test_send_uses_configured_in_flight(self, mock_send_hid, MockPyUsb):
+        s = HidProtocol(0x0418, 0x5303, 3, max_in_flight=4)
+        s.send_image(b'\x00', 320, 320)
+        MockPyUsb.assert_called_once_with(0x0418, 0x5303, max_in_flight=4)
+
     @patch("trcc.hid_device.PYUSB_AVAILABLE", False)
     @patch("trcc.hid_device.HIDAPI_AVAILABLE", True)
     @patch("trcc.hid_device.HidApiTransport")
@@ -388,6 +413,15 @@ class TestDeviceProtocolFactory:
         assert isinstance(proto, HidProtocol)
         assert proto._device_type == 3
 
+    def test_hid_async_is_opt_in(self, hid_type3_device):
+        with patch("trcc.paths.get_saved_hid_max_in_flight", return_value=None):
+            proto = DeviceProtocolFactory.create_protocol(hid_type3_device)
+        assert proto._max_in_flight is None
+        assert DEFAULT_MAX_IN_FLIGHT == 1  # Synchronous unless configured
+        with patch("trcc.paths.get_saved_hid_max_in_flight", return_value=3):
+            proto = DeviceProtocolFactory.create_protocol(hid_type3_device)
+        assert proto._max_in_flight == 3
+
     def test_unknown_protocol_raises(self):
         device = FakeDeviceInfo(protocol="bluetooth")
         with pytest.raises(ValueError, match="Unknown protocol"):
@@ -418,6 +452,28 @@ class TestDeviceProtocolFactory:
         DeviceProtocolFactory.close_all()
         assert DeviceProtocolFactory.get_cached_count() == 0
 
+    def test_get_sender_cached_per_device(self, scsi_device, hid_type2_device):
+        s1 = DeviceProtocolFactory.get_sender(scsi_device)
+        assert DeviceProtocolFactory.get_sender(scsi_device) is s1
+        assert DeviceProtocolFactory.get_sender(hid_type2_device) is not s1
+
+    def test_remove_protocol_stops_sender(self, scsi_device):
+        sender = DeviceProtocolFactory.get_sender(scsi_device)
+        DeviceProtocolFactory.remove_protocol(scsi_device)
+        assert sender.submit(b'\x00', 1, 1) is False
+        assert DeviceProtocolFactory.get_sender(scsi_device) is not sender
+
+    def test_sender_routes_partial_updates(self, scsi_device):
+        from unittest.mock import MagicMock
+        proto = MagicMock()
+        proto.supports_partial_update = True
+        DeviceProtocolFactory._protocols[
+            DeviceProtocolFactory._device_key(scsi_device)] = proto
+        sender = DeviceProtocolFactory.get_sender(scsi_device)
+        sender.submit(b'\x00', 320, 320, [1])
+        assert sender.flush(2)
+        proto.send_image_partial.assert_called_once_with(b'\x00', 320, 320, [1])
+
     def test_device_key_format(self, scsi_device):
         key = DeviceProtocolFactory._device_key(scsi_device)
         assert key == "87cd_70db_/dev/sg0"
@@ -758,6 +814,8 @@ class TestProtocolInfo:
         assert info.is_hid is False
         assert "SCSI" in info.protocol_display
         assert "sg_raw" in info.active_backend or info.active_backend == "none"
+        assert info.protocol_display == ("SCSI (sg_raw)" if info.active_backend == "sg_raw"
+                                         else "SCSI")
 
     def test_protocol_info_hid_type2(self, hid_type2_device):
         from trcc.device_factory import get_protocol_info
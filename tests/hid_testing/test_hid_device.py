@@ -5,6 +5,7 @@ No real USB hardware required — all USB I/O is mocked via UsbTransport.
 
 import struct
 import sys
+import time
 from unittest.mock import MagicMock, PropertyMock, call, patch
 
 import pytest
@@ -399,6 +400,30 @@ class TestType2FrameSend:
         assert len(pkt) == 512  # 20-byte header rounds to 512
         assert struct.unpack('<I', pkt[16:20])[0] == 0
 
+    def test_pack_into_matches_legacy_layout(self):
+        for data_len in [0, 10, 492, 493, 5000]:
+            data = bytes(range(256)) * (data_len // 256) + b'\x7F' * (data_len % 256)
+            legacy = (b'\x00' * 16 + struct.pack('<I', data_len) + data)
+            legacy = legacy.ljust(_ceil_to_512(len(legacy)), b'\x00')
+            assert HidDeviceType2.build_frame_packet(data) == legacy
+
+    def test_pack_into_clears_stale_bytes(self):
+        """A shorter frame in a reused buffer is padded with zeros again."""
+        buf = bytearray(2048)
+        HidDeviceType2.pack_frame_into(buf, b'\xFF' * 1500)
+        n = HidDeviceType2.pack_frame_into(buf, b'\xAA' * 10)
+        assert bytes(buf[:n]) == HidDeviceType2.build_frame_packet(b'\xAA' * 10)
+
+    def test_send_frame_reuses_buffer(self):
+        dev, transport = self._init_device()
+        dev.send_frame(b'\xFF' * 100)
+        first = transport.write.call_args[0][1]
+        dev.send_frame(b'\xEE' * 90)
+        second = transport.write.call_args[0][1]
+        assert isinstance(second, memoryview)
+        assert first.obj is second.obj
+        assert bytes(second) == HidDeviceType2.build_frame_packet(b'\xEE' * 90)
+
     def test_send_frame_timing(self):
         """Verify C# Sleep(1) inter-frame delay."""
         dev, transport = self._init_device()
@@ -645,6 +670,25 @@ class TestType3FrameSend:
         assert len(pkt) == TYPE3_FRAME_TOTAL
         assert pkt[16:] == data
 
+    def test_pack_into_matches_legacy_layout(self):
+        prefix = TYPE3_FRAME_PREFIX + b'\x00' * 4 + struct.pack('<I', TYPE3_DATA_SIZE)
+        for data in (b'\xAB' * 100, b'\xCD' * (TYPE3_DATA_SIZE + 3)):
+            legacy = prefix + data[:TYPE3_DATA_SIZE].ljust(TYPE3_DATA_SIZE, b'\x00')
+            buf = bytearray(b'\x55' * TYPE3_FRAME_TOTAL)  # Dirty buffer
+            assert HidDeviceType3.pack_frame_into(buf, data) == TYPE3_FRAME_TOTAL
+            assert bytes(buf) == legacy
+
+    def test_send_frame_reuses_buffer(self):
+        dev, transport = self._init_device()
+        dev.send_frame(b'\xFF' * 100)
+        first = transport.write.call_args[0][1]
+        dev.send_frame(b'\x11' * 50)
+        second = transport.write.call_args[0][1]
+        assert first.obj is second.obj
+        assert len(second) == TYPE3_FRAME_TOTAL
+        assert bytes(second[16:66]) == b'\x11' * 50
+        assert bytes(second[66:116]) == b'\x00' * 50
+
     def test_send_frame_writes_then_reads_ack(self):
         dev, transport = self._init_device()
         dev.send_frame(b'\xFF' * 100)
@@ -915,6 +959,224 @@ class TestPyUsbTransport:
             assert not t.is_open
 
 
+# =========================================================================
+# Async transfers (PyUsbTransport max_in_flight > 1)
+# =========================================================================
+
+def _make_async_transport(max_in_flight=2, write_gate=None):
+    """PyUsbTransport with a mocked pyusb device, in async mode."""
+    import threading
+
+    import trcc.hid_device as mod
+
+    with patch.object(mod, "PYUSB_AVAILABLE", True):
+        t = mod.PyUsbTransport(0x0418, 0x5303, max_in_flight=max_in_flight)
+    dev = MagicMock()
+    writes = []
+    lock = threading.Lock()
+
+    def write(endpoint, data, timeout):
+        if write_gate is not None:
+            write_gate.wait(2)
+        with lock:
+            writes.append(bytes(data[:1]))
+        return len(data)
+
+    dev.write.side_effect = write
+    dev.read.return_value = bytearray(TYPE3_ACK_SIZE)
+    t._device = dev
+    t._is_open = True
+    return t, writes
+
+
+class TestTransferQueue:
+    """Test TransferQueue / UsbTransfer."""
+
+    def test_runs_in_order(self):
+        from trcc.hid_device import TransferQueue
+        seen = []
+        q = TransferQueue(lambda ep, arg, timeout: seen.append(arg) or arg, 4)
+        transfers = [q.submit(1, i, 100) for i in range(5)]
+        assert [t.wait(1) for t in transfers] == [0, 1, 2, 3, 4]
+        assert seen == [0, 1, 2, 3, 4]
+        q.close()
+
+    def test_error_raised_on_wait(self):
+        from trcc.hid_device import TransferQueue
+
+        def fail(ep, arg, timeout):
+            raise OSError("stall")
+        q = TransferQueue(fail, 1)
+        with pytest.raises(OSError, match="stall"):
+            q.submit(1, b'', 100).wait(1)
+        q.close()
+
+    def test_submit_after_close_raises(self):
+        from trcc.hid_device import TransferQueue
+        q = TransferQueue(lambda *a: 1, 1)
+        q.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            q.submit(1, b'', 100)
+
+    def test_bounded_in_flight(self):
+        import threading
+
+        from trcc.hid_device import TransferQueue
+        gate = threading.Event()
+        q = TransferQueue(lambda ep, arg, timeout: gate.wait(2), 2)
+        q.submit(1, 0, 100)
+        q.submit(1, 1, 100)
+        blocked = threading.Thread(target=q.submit, args=(1, 2, 100))
+        blocked.start()
+        blocked.join(0.1)
+        assert blocked.is_alive()  # Third submit waits for a free slot
+        gate.set()
+        blocked.join(2)
+        assert not blocked.is_alive()
+        q.close()
+
+
+class TestAsyncFrameSend:
+    """Type 2 / Type 3 handlers on an async PyUsbTransport."""
+
+    def _handler(self, cls, transport, response):
+        transport._device.read.return_value = bytearray(response)
+        dev = cls(transport)
+        dev.handshake()
+        transport._device.read.return_value = bytearray(TYPE3_ACK_SIZE)
+        return dev
+
+    def test_sync_by_default(self):
+        import trcc.hid_device as mod
+        with patch.object(mod, "PYUSB_AVAILABLE", True):
+            t = mod.PyUsbTransport(0x0416, 0x5302)
+        assert t.max_in_flight == 1
+        assert HidDeviceType2(t)._in_flight is None
+
+    def test_type2_frames_queued(self):
+        import threading
+        gate = threading.Event()
+        gate.set()
+        t, writes = _make_async_transport(write_gate=gate)
+        dev = self._handler(HidDeviceType2, t, _make_type2_valid_response())
+        gate.clear()
+        # Two frames fit in flight: both return before any write finishes
+        assert dev.send_frame(b'\x01' * 100) is True
+        assert dev.send_frame(b'\x02' * 100) is True
+        gate.set()
+        assert dev.flush() is True
+        assert t._device.write.call_count == 3  # Init + 2 frames
+        t.close()
+
+    def test_buffers_rotate_in_async_mode(self):
+        t, _ = _make_async_transport(max_in_flight=2)
+        dev = self._handler(HidDeviceType3, t, _make_type3_valid_response())
+        views = [dev._frame_view(b'\x01') for _ in range(4)]
+        assert len({id(v.obj) for v in views[:3]}) == 3  # max_in_flight + 1
+        assert views[3].obj is views[0].obj
+        t.close()
+
+    def test_memoryview_write_copied_to_reused_array(self):
+        import array
+        t, _ = _make_async_transport()
+        t._device.write.side_effect = None
+        t._device.write.return_value = 4
+        buf = bytearray(b'\x01\x02\x03\x04')
+        t.write(EP_WRITE_02, memoryview(buf))
+        t.write(EP_WRITE_02, memoryview(buf))
+        calls = t._device.write.call_args_list
+        assert isinstance(calls[0][0][1], array.array)
+        assert calls[0][0][1] is calls[1][0][1]
+        assert calls[1][0][1].tobytes() == b'\x01\x02\x03\x04'
+        t.close()
+
+    def test_whole_packet_array_sent_without_copy(self):
+        t, _ = _make_async_transport()
+        t._device.write.side_effect = None
+        t._device.write.return_value = TYPE3_FRAME_TOTAL
+        dev = HidDeviceType3(t)
+        packet = dev._frame_view(b'\x01' * 10)
+        t.write(EP_WRITE_02, packet)
+        assert t._device.write.call_args[0][1] is packet.obj
+        assert t._write_buf is None
+        t.close()
+
+    def test_partial_packet_view_resizes_scratch_in_place(self):
+        import array
+        t, _ = _make_async_transport()
+        t._device.write.side_effect = lambda ep, data, timeout: data.tobytes()
+        buf = array.array('B', range(200))
+        sent = [t.write(EP_WRITE_02, memoryview(buf)[:n]) for n in (100, 40, 160)]
+        assert sent == [bytes(range(n)) for n in (100, 40, 160)]
+        t.close()
+
+    def test_type3_acks_on_separate_path(self):
+        t, _ = _make_async_transport(max_in_flight=3)
+        dev = self._handler(HidDeviceType3, t, _make_type3_valid_response())
+        for _ in range(5):
+            assert dev.send_frame(b'\xFF' * 100) is True
+        assert dev.flush() is True
+        ack_reads = [c for c in t._device.read.call_args_list
+                     if c[0][1] == TYPE3_ACK_SIZE]
+        assert len(ack_reads) == 5
+        assert t._read_queue is not None and t._write_queue is not None
+        t.close()
+        assert t._read_queue is None
+
+    def test_type3_ack_read_queued_after_its_write(self):
+        """The ACK timeout must not run while the frame waits to be written."""
+        import threading
+        gate = threading.Event()
+        gate.set()
+        t, _ = _make_async_transport(max_in_flight=2, write_gate=gate)
+        dev = self._handler(HidDeviceType3, t, _make_type3_valid_response())
+        reads = t._device.read.call_count
+        gate.clear()
+        assert dev.send_frame(b'\xFF' * 100) is True
+        time.sleep(0.05)
+        assert t._device.read.call_count == reads  # Write still blocked: no ACK read yet
+        gate.set()
+        assert dev.flush() is True
+        assert t._device.read.call_count == reads + 1
+        t.close()
+
+    def test_type3_failed_write_skips_ack_read(self):
+        t, _ = _make_async_transport()
+        dev = self._handler(HidDeviceType3, t, _make_type3_valid_response())
+        reads = t._device.read.call_count
+        t._device.write.side_effect = None
+        t._device.write.return_value = 0
+        dev.send_frame(b'\xFF')
+        assert dev.flush() is False
+        assert t._device.read.call_count == reads
+        t.close()
+
+    def test_type3_failed_ack_reported_later(self):
+        t, _ = _make_async_transport()
+        dev = self._handler(HidDeviceType3, t, _make_type3_valid_response())
+        t._device.read.return_value = bytearray()
+        dev.send_frame(b'\xFF')
+        assert dev.flush() is False
+        t.close()
+
+    def test_transfer_error_drops_handler(self):
+        import trcc.hid_device as mod
+        mod._initialized_transports.clear()
+        mod._device_handlers.clear()
+        t, _ = _make_async_transport(max_in_flight=2)
+        t._device.read.return_value = bytearray(_make_type2_valid_response())
+        assert send_image_to_hid_device(t, b'\x00', 2) is True
+        mod._device_handlers[id(t)].flush()
+        t._device.write.side_effect = OSError("pipe error")
+        for _ in range(3):
+            result = send_image_to_hid_device(t, b'\x00', 2)
+            if result is False:
+                break
+        assert result is False
+        assert id(t) not in mod._initialized_transports
+        t.close()
+
+
 # =========================================================================
 # HidApiTransport (mocked hidapi)
 # =========================================================================
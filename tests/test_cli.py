@@ -15,6 +15,7 @@ Tests cover:
 
 import json
 import os
+import shutil
 import sys
 import tempfile
 import unittest
@@ -26,6 +27,8 @@ from trcc.cli import (
     _get_selected_device,
     _get_settings_path,
     _set_selected_device,
+    baked_playback,
+    ctl,
     detect,
     download_themes,
     gui,
@@ -102,6 +105,13 @@ class TestMainEntryPoint(unittest.TestCase):
             result = main()
             mock_gui.assert_called_once()
 
+    def test_gui_source_dispatches(self):
+        """'gui --source' passes the shared-memory ring to gui()."""
+        with patch('sys.argv', ['trcc', 'gui', '--source', 'game']), \
+             patch('trcc.cli.gui', return_value=0) as mock_gui:
+            main()
+        self.assertEqual(mock_gui.call_args.kwargs['source'], 'game')
+
     def test_download_list(self):
         """'download --list' dispatches with show_list=True."""
         with patch('sys.argv', ['trcc', 'download', '--list']), \
@@ -279,6 +289,12 @@ class TestGui(unittest.TestCase):
             result = gui()
         self.assertEqual(result, 0)
 
+    def test_gui_source_forwarded(self):
+        mock_qt = MagicMock()
+        with patch.dict('sys.modules', {'trcc.qt_components.qt_app_mvc': mock_qt}):
+            gui(source='game')
+        self.assertEqual(mock_qt.run_mvc_app.call_args.kwargs['source'], 'game')
+
 
 # ── select_device() ──────────────────────────────────────────────────────────
 
@@ -668,6 +684,28 @@ class TestMainDispatch(unittest.TestCase):
         mock_fn.assert_called_once()
         self.assertEqual(result, 0)
 
+    @patch('trcc.cli.daemon', return_value=0)
+    def test_dispatch_daemon(self, mock_fn):
+        with patch('sys.argv', ['trcc', 'daemon', '--no-control']):
+            result = main()
+        mock_fn.assert_called_once_with(socket_path=None, control=False)
+        self.assertEqual(result, 0)
+
+    @patch('trcc.cli.baked_playback', return_value=0)
+    def test_dispatch_baked_playback(self, mock_fn):
+        with patch('sys.argv', ['trcc', 'baked-playback', 'on']):
+            result = main()
+        mock_fn.assert_called_once_with('on')
+        self.assertEqual(result, 0)
+
+    @patch('trcc.cli.ctl', return_value=0)
+    def test_dispatch_ctl(self, mock_fn):
+        with patch('sys.argv', ['trcc', 'ctl', 'brightness', 'level=3', '+', 'stats']):
+            result = main()
+        mock_fn.assert_called_once_with(['brightness', 'level=3', '+', 'stats'],
+                                        socket_path=None)
+        self.assertEqual(result, 0)
+
 
 # ── select_device exception ──────────────────────────────────────────────────
 
@@ -963,6 +1001,55 @@ class TestResume(unittest.TestCase):
         mock_fn.assert_called_once_with(verbose=0, start_hidden=True)
 
 
+# ── ctl() ───────────────────────────────────────────────────────────────────
+
+class TestCtl(unittest.TestCase):
+    """Test ctl() — control client for a running daemon."""
+
+    @patch('trcc.control.send_commands', return_value=[{'ok': True}, {'ok': True}])
+    def test_sends_one_batch(self, mock_send):
+        result = ctl(['brightness', 'level=3', '+', 'ping'])
+        self.assertEqual(result, 0)
+        mock_send.assert_called_once_with(
+            [{'cmd': 'brightness', 'level': 3}, {'cmd': 'ping'}], None)
+
+    @patch('trcc.control.send_commands', return_value=[{'ok': False, 'error': 'x'}])
+    def test_failed_command_exit_code(self, mock_send):
+        self.assertEqual(ctl(['stats']), 1)
+
+    @patch('trcc.control.send_commands', side_effect=FileNotFoundError('no socket'))
+    def test_daemon_not_running(self, mock_send):
+        self.assertEqual(ctl(['ping']), 1)
+
+
+# ── baked-playback ──────────────────────────────────────────────────────────
+
+class TestBakedPlayback(unittest.TestCase):
+    """Test baked_playback() — persisted video playback setting."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        for p in (patch('trcc.paths.CONFIG_PATH', os.path.join(self.tmp, 'config.json')),
+                  patch('trcc.paths.CONFIG_DIR', self.tmp)):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_on_off(self):
+        from trcc.paths import get_saved_baked_playback
+        with patch('builtins.print'):
+            self.assertEqual(baked_playback('on'), 0)
+            self.assertTrue(get_saved_baked_playback())
+            self.assertEqual(baked_playback('off'), 0)
+        self.assertFalse(get_saved_baked_playback())
+
+    def test_show_does_not_save(self):
+        with patch('builtins.print') as mock_print:
+            baked_playback()
+        mock_print.assert_called_once_with("Baked playback: off")
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, 'config.json')))
+
+
 # ── uninstall ────────────────────────────────────────────────────────────────
 
 class TestUninstall(unittest.TestCase):
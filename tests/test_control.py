@@ -0,0 +1,167 @@
+"""Tests for control – daemon control socket and trcc ctl client."""
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from trcc.control import (
+    ControlServer,
+    default_socket_path,
+    execute,
+    execute_request,
+    parse_command_args,
+    send_commands,
+)
+from trcc.core.models import DeviceInfo
+from trcc.daemon import Daemon, LcdSession, LedSession
+
+
+def _session(cls, path, index=0):
+    session = MagicMock(spec=cls)
+    session.device = DeviceInfo(name=path, path=path, device_index=index)
+    session.name = path
+    if cls is LcdSession:
+        session.controller = MagicMock(current_theme_path=None)
+        session.stats.return_value = {'brightness': 50}
+    return session
+
+
+def _daemon():
+    daemon = Daemon()
+    daemon.sessions = [_session(LcdSession, '/dev/sg0'),
+                       _session(LcdSession, '/dev/sg1', 1),
+                       _session(LedSession, 'hid:0416:8001')]
+    return daemon
+
+
+class TestExecute(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = _daemon()
+        self.lcd0, self.lcd1, self.led = self.daemon.sessions
+
+    def test_default_targets_all_lcds(self):
+        self.assertEqual(execute(self.daemon, {'cmd': 'brightness', 'level': 3}), {'ok': True})
+        self.lcd0.set_brightness_level.assert_called_once_with(3)
+        self.lcd1.set_brightness_level.assert_called_once_with(3)
+
+    def test_device_by_index_and_path(self):
+        execute(self.daemon, {'cmd': 'rotation', 'degrees': 90, 'device': 1})
+        execute(self.daemon, {'cmd': 'theme', 'path': '/t', 'device': '/dev/sg0'})
+        self.lcd0.set_rotation.assert_not_called()
+        self.lcd1.set_rotation.assert_called_once_with(90)
+        self.lcd0.load_theme.assert_called_once()
+        self.lcd1.load_theme.assert_not_called()
+
+    def test_led_is_not_an_lcd_target(self):
+        reply = execute(self.daemon, {'cmd': 'image', 'path': '/x.png', 'device': 2})
+        self.assertFalse(reply['ok'])
+
+    def test_errors_reported(self):
+        self.assertIn('Unknown', execute(self.daemon, {'cmd': 'nope'})['error'])
+        self.assertIn('Missing', execute(self.daemon, {'cmd': 'theme'})['error'])
+        self.assertIn('No such device', execute(self.daemon, {'cmd': 'stats', 'device': 7})['error'])
+        self.lcd0.set_brightness_level.side_effect = ValueError('bad level')
+        self.assertEqual(execute(self.daemon, {'cmd': 'brightness', 'level': 9}),
+                         {'ok': False, 'error': 'bad level'})
+
+    def test_source_name_and_detach(self):
+        execute(self.daemon, {'cmd': 'source', 'path': 'dash', 'device': 0})
+        self.assertTrue(self.lcd0.set_source.call_args[0][0].endswith('/trcc-dash'))
+        execute(self.daemon, {'cmd': 'source', 'path': None})
+        self.lcd1.set_source.assert_called_once_with(None)
+
+    def test_devices_lists_all_sessions(self):
+        reply = execute(self.daemon, {'cmd': 'devices'})
+        self.assertEqual([d['kind'] for d in reply['devices']], ['lcd', 'lcd', 'led'])
+
+    def test_batch_in_order(self):
+        replies = execute_request(self.daemon, [{'cmd': 'ping'}, {'cmd': 'stats', 'device': 0}])
+        self.assertEqual(replies[0], {'ok': True})
+        self.assertEqual(replies[1]['devices'][0]['brightness'], 50)
+
+
+class TestParseCommandArgs(unittest.TestCase):
+
+    def test_batch_and_values(self):
+        self.assertEqual(
+            parse_command_args(['brightness', 'level=3', 'device=/dev/sg0', '+', 'stats']),
+            [{'cmd': 'brightness', 'level': 3, 'device': '/dev/sg0'}, {'cmd': 'stats'}])
+
+    def test_bad_argument(self):
+        with self.assertRaises(ValueError):
+            parse_command_args(['theme', '/path'])
+
+
+class TestControlServer(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'trcc.sock')
+        self.daemon = _daemon()
+
+        # Scheduler loop on a thread, standing in for the daemon main loop
+        thread = threading.Thread(target=self.daemon.scheduler.run, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 2)
+        self.addCleanup(self.daemon.scheduler.stop)
+
+    def _server(self):
+        server = ControlServer(self.daemon, self.path)
+        server.start()
+        self.addCleanup(server.close)
+        return server
+
+    def test_round_trip_batch(self):
+        self._server()
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        replies = send_commands([{'cmd': 'brightness', 'level': 1}, {'cmd': 'devices'}],
+                                self.path)
+        self.assertEqual(replies[0], {'ok': True})
+        self.assertEqual(len(replies[1]['devices']), 3)
+        self.daemon.sessions[0].set_brightness_level.assert_called_once_with(1)
+
+    def test_invalid_json_line(self):
+        self._server()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(2)
+            sock.connect(self.path)
+            sock.sendall(b'{nope\n{"cmd": "ping"}\n')
+            reader = sock.makefile('rb')
+            self.assertIn(b'Invalid JSON', reader.readline())
+            self.assertEqual(reader.readline(), b'{"ok": true}\n')
+            reader.close()
+
+    def test_stale_socket_replaced_live_refused(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()  # File left behind, nobody listening
+        server = self._server()
+        with self.assertRaises(RuntimeError):
+            ControlServer(self.daemon, self.path)
+        server.close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_client_without_daemon(self):
+        with self.assertRaises(OSError):
+            send_commands([{'cmd': 'ping'}], self.path)
+
+
+class TestSocketPath(unittest.TestCase):
+
+    def test_runtime_dir(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+             patch.dict(os.environ, {'XDG_RUNTIME_DIR': tmp}):
+            self.assertEqual(default_socket_path(), os.path.join(tmp, 'trcc.sock'))
+
+    def test_fallback(self):
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': ''}):
+            self.assertEqual(default_socket_path(), f'/tmp/trcc-{os.getuid()}.sock')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -191,27 +191,148 @@ class TestDeviceController(unittest.TestCase):
         self.assertEqual(fired[0].path, '/dev/sg0')
 
     def test_send_started_callback(self):
-        """send_image_async fires on_send_started."""
+        """send_image_async fires on_send_started and posts to the sender."""
         started = []
         self.ctrl.on_send_started = lambda: started.append(True)
-
-        # Mock the model so send doesn't actually hit hardware
-        self.ctrl.model._send_busy = False
         self.ctrl.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
 
-        with patch.object(self.ctrl.model, 'send_image'):
-            self.ctrl.send_image_async(b'\x00' * 100, 10, 10)
+        sender = MagicMock()
+        with patch('trcc.device_factory.DeviceProtocolFactory.get_sender',
+                   return_value=sender):
+            self.assertTrue(self.ctrl.send_image_async(b'\x00' * 100, 10, 10))
 
         self.assertTrue(started)
+        sender.submit.assert_called_once_with(
+            b'\x00' * 100, 10, 10, None, on_done=self.ctrl._on_frame_sent)
 
-    def test_send_skipped_when_busy(self):
-        """send_image_async is a no-op when model is busy."""
+    def test_send_without_device(self):
+        """send_image_async is a no-op when no device is selected."""
         started = []
         self.ctrl.on_send_started = lambda: started.append(True)
-        self.ctrl.model._send_busy = True
-        self.ctrl.send_image_async(b'\x00', 1, 1)
+        self.assertFalse(self.ctrl.send_image_async(b'\x00', 1, 1))
         self.assertEqual(started, [])  # Never fired
 
+    def test_send_frame_skips_identical(self):
+        """send_frame_async dispatches a frame once, then skips repeats."""
+        frame = b'\x12' * 200
+        with patch.object(self.ctrl, 'send_image_async', return_value=True) as mock_send:
+            self.assertTrue(self.ctrl.send_frame_async(frame, 10, 10))
+            self.assertFalse(self.ctrl.send_frame_async(frame, 10, 10))
+        mock_send.assert_called_once_with(frame, 10, 10, [0])
+
+    def test_send_frame_not_posted_not_recorded(self):
+        """A frame that could not be posted is sent on the next attempt."""
+        frame = b'\x12' * 200
+        with patch.object(self.ctrl, 'send_image_async', return_value=False):
+            self.assertFalse(self.ctrl.send_frame_async(frame, 10, 10))
+        with patch.object(self.ctrl, 'send_image_async', return_value=True) as mock_send:
+            self.ctrl.send_frame_async(frame, 10, 10)
+        mock_send.assert_called_once()
+
+    def test_send_failure_resets_diff(self):
+        """A failed send forces the next identical frame to be resent."""
+        self.ctrl.frame_diff.commit(b'\x00' * 8)
+        self.ctrl._on_frame_sent(False)
+        self.assertEqual(self.ctrl.frame_diff.changed_chunks(b'\x00' * 8), [0])
+
+    def test_frame_sent_forwards_completion(self):
+        done = []
+        self.ctrl.on_send_complete = done.append
+        self.ctrl._on_frame_sent(True)
+        self.assertEqual(done, [True])
+
+    def test_send_stats_for_selected_device(self):
+        self.assertIsNone(self.ctrl.get_send_stats())
+        self.ctrl.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        sender = MagicMock()
+        with patch('trcc.device_factory.DeviceProtocolFactory.get_sender',
+                   return_value=sender):
+            self.assertIs(self.ctrl.get_send_stats(), sender.stats)
+
+    def test_frames_converge_on_latest(self):
+        """Frames posted while the device is slow collapse to the newest one."""
+        import threading
+
+        from trcc.frame_sender import FrameSender
+
+        gate = threading.Event()
+        sent = []
+
+        def slow_send(data, w, h, changed):
+            gate.wait(2)
+            sent.append(data)
+            return True
+
+        sender = FrameSender(slow_send)
+        self.addCleanup(sender.stop)
+        self.ctrl.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        with patch('trcc.device_factory.DeviceProtocolFactory.get_sender',
+                   return_value=sender):
+            for i in range(5):
+                self.assertTrue(self.ctrl.send_frame_async(bytes([i]) * 8, 2, 2))
+            gate.set()
+            self.assertTrue(sender.flush(2))
+        self.assertEqual(sent[-1], bytes([4]) * 8)
+        self.assertLess(len(sent), 5)
+        self.assertEqual(sender.stats.frames_dropped, 5 - len(sent))
+
+    def test_targets_without_mirroring(self):
+        self.assertEqual(self.ctrl.get_targets(), [])
+        a = DeviceInfo(name='A', path='/dev/sg0')
+        b = DeviceInfo(name='B', path='/dev/sg1')
+        self.ctrl.model.devices = [a, b]
+        self.ctrl.model.selected_device = a
+        self.assertEqual(self.ctrl.get_targets(), [a])
+
+    def test_targets_with_mirroring(self):
+        a = DeviceInfo(name='A', path='/dev/sg0')
+        b = DeviceInfo(name='B', path='/dev/sg1')
+        led = DeviceInfo(name='LED', path='hid:0416:8001', protocol='hid',
+                         implementation='hid_led')
+        self.ctrl.model.devices = [a, b, led]
+        self.ctrl.model.selected_device = b
+        self.ctrl.set_mirroring(True)
+        self.assertEqual(self.ctrl.get_targets(), [b, a])  # Selected first, no LED
+
+    def test_mirror_diff_per_device(self):
+        """Each mirror skips its own repeats; the selected diff is untouched."""
+        a = DeviceInfo(name='A', path='/dev/sg0')
+        b = DeviceInfo(name='B', path='/dev/sg1')
+        self.ctrl.model.selected_device = a
+        frame = b'\x12' * 200
+        with patch.object(self.ctrl, 'send_image_async', return_value=True) as mock_send:
+            self.assertTrue(self.ctrl.send_frame_async(frame, 10, 10, device=b))
+            self.assertFalse(self.ctrl.send_frame_async(frame, 10, 10, device=b))
+            self.assertTrue(self.ctrl.send_frame_async(frame, 10, 10))
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_mirror_send_uses_own_sender(self):
+        a = DeviceInfo(name='A', path='/dev/sg0')
+        b = DeviceInfo(name='B', path='/dev/sg1')
+        self.ctrl.model.selected_device = a
+        started = []
+        self.ctrl.on_send_started = lambda: started.append(True)
+        senders = {'/dev/sg0': MagicMock(), '/dev/sg1': MagicMock()}
+        with patch('trcc.device_factory.DeviceProtocolFactory.get_sender',
+                   side_effect=lambda d: senders[d.path]):
+            self.ctrl.send_image_async(b'\x00', 1, 1, device=b)
+        senders['/dev/sg1'].submit.assert_called_once()
+        senders['/dev/sg0'].submit.assert_not_called()
+        self.assertEqual(started, [])  # Status callbacks follow the selected device
+
+        # A failed mirror send resets only that device's diff
+        on_done = senders['/dev/sg1'].submit.call_args[1]['on_done']
+        self.ctrl._diff_for(b).commit(b'\x00')
+        self.ctrl.frame_diff.commit(b'\x00')
+        on_done(False)
+        self.assertEqual(self.ctrl._diff_for(b).changed_chunks(b'\x00'), [0])
+        self.assertEqual(self.ctrl.frame_diff.changed_chunks(b'\x00'), [])
+
+    def test_select_device_resets_diff(self):
+        self.ctrl.frame_diff.commit(b'\x00' * 8)
+        self.ctrl.select_device(DeviceInfo(name='LCD', path='/dev/sg1'))
+        self.assertEqual(self.ctrl.frame_diff.changed_chunks(b'\x00' * 8), [0])
+
     def test_devices_changed_callback(self):
         """on_devices_changed fires when model's callback triggers."""
         fired = []
@@ -731,6 +852,11 @@ class TestVideoControllerEdgeCases(unittest.TestCase):
         self.ctrl.model.frames = [MagicMock()]
         self.assertTrue(self.ctrl.has_frames())
 
+    def test_has_frames_streaming(self):
+        """Streaming players hold no frames but can still play."""
+        self.ctrl.model.streaming = True
+        self.assertTrue(self.ctrl.has_frames())
+
 
 # =============================================================================
 # OverlayController – renderer delegation
@@ -1157,6 +1283,133 @@ class TestFormCZTVVideoAndSend(unittest.TestCase):
 
         self.assertEqual(len(previews), 1)
 
+    def _setup_baked(self):
+        self.ctrl.devices.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        self.ctrl.set_baked_playback(True)
+        frames = [_make_test_image(), _make_test_image(color=(0, 0, 255))]
+        self.ctrl.video.model.frames = frames
+        self.ctrl.video.model.source_path = Path('/tmp/a.mp4')
+        self.ctrl.video.model.last_frame_index = 1
+        return frames
+
+    def test_baked_playback_sends_cached_slice(self):
+        """Baked mode sends frames from the cache, converting each once."""
+        frames = self._setup_baked()
+        with patch.object(self.ctrl.devices, 'send_image_async') as mock_send, \
+             patch.object(self.ctrl, '_image_to_rgb565') as mock_convert:
+            self.ctrl._on_video_send_frame(frames[1])
+            self.ctrl._on_video_send_frame(frames[1])
+        mock_convert.assert_not_called()
+        self.assertEqual(mock_send.call_count, 2)
+        data = mock_send.call_args[0][0]
+        self.assertIsInstance(data, memoryview)
+        self.assertEqual(bytes(data), self.ctrl._image_to_rgb565(frames[1], 50, 0))
+        self.assertEqual(self.ctrl._baked.baked_count, 1)
+
+    def test_baked_playback_skipped_with_overlay(self):
+        """Overlay frames change every tick, so they are never baked."""
+        frames = self._setup_baked()
+        self.ctrl.overlay.enable(True)
+        with patch.object(self.ctrl.overlay, 'render', return_value=frames[1]), \
+             patch.object(self.ctrl, '_send_frame_to_lcd') as mock_send:
+            self.ctrl._on_video_send_frame(frames[1])
+        mock_send.assert_called_once()
+        self.assertEqual(self.ctrl._baked.baked_count, 0)
+
+    def test_baked_playback_off_by_default(self):
+        frames = self._setup_baked()
+        self.ctrl.set_baked_playback(False)
+        with patch.object(self.ctrl, '_send_frame_to_lcd') as mock_send:
+            self.ctrl._on_video_send_frame(frames[1])
+        mock_send.assert_called_once_with(frames[1])
+
+    def test_baked_playback_invalidated_by_brightness(self):
+        frames = self._setup_baked()
+        with patch.object(self.ctrl.devices, 'send_image_async') as mock_send:
+            self.ctrl._on_video_send_frame(frames[1])
+            self.ctrl.brightness = 100
+            self.ctrl._on_video_send_frame(frames[1])
+        self.assertEqual(bytes(mock_send.call_args[0][0]),
+                         self.ctrl._image_to_rgb565(frames[1], 100, 0))
+
+    def test_sidecar_frame_sent_without_conversion(self):
+        """RGB565 Theme.zt sidecar bytes go straight to the LCD at 100% / 0°."""
+        self.ctrl.devices.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        model = self.ctrl.video.model
+        model.streaming = True
+        model.last_frame_index = 2
+        raw = memoryview(bytes(self.ctrl.lcd_width * self.ctrl.lcd_height * 2))
+        model._player = MagicMock()
+        model._player.device_frame.return_value = raw
+        frame = _make_test_image()
+        self.ctrl.brightness = 100
+        with patch.object(self.ctrl.devices, 'send_image_async') as mock_send, \
+             patch.object(self.ctrl, '_send_frame_to_lcd') as mock_convert:
+            self.ctrl._on_video_send_frame(frame)
+            model._player.device_frame.assert_called_once_with(2)
+            mock_send.assert_called_once_with(raw, self.ctrl.lcd_width, self.ctrl.lcd_height)
+            mock_convert.assert_not_called()
+
+            self.ctrl.brightness = 50  # Sidecar is stored at full brightness
+            self.ctrl._on_video_send_frame(frame)
+            mock_convert.assert_called_once_with(frame)
+
+    def test_baked_playback_streaming_player(self):
+        """Streamed videos (no preloaded frames) bake once their length is known."""
+        self.ctrl.devices.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        self.ctrl.set_baked_playback(True)
+        model = self.ctrl.video.model
+        model.source_path = Path('/tmp/Theme.zt')
+        model.streaming = True
+        model.last_frame_index = 1
+        frame = _make_test_image(color=(0, 0, 255))
+        with patch.object(self.ctrl.devices, 'send_image_async') as mock_send, \
+             patch.object(self.ctrl, '_send_frame_to_lcd') as mock_convert:
+            model.state.total_frames = 0  # Length not known yet
+            self.ctrl._on_video_send_frame(frame)
+            mock_convert.assert_called_once_with(frame)
+            model.state.total_frames = 3
+            self.ctrl._on_video_send_frame(frame)
+            self.ctrl._on_video_send_frame(frame)
+        self.assertEqual(mock_convert.call_count, 1)
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(self.ctrl._baked.baked_count, 1)
+
+    def test_baked_streaming_player_within_memory_budget(self):
+        """Streamed videos are only baked if the cache fits memory_budget."""
+        self.ctrl.devices.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        self.ctrl.set_baked_playback(True)
+        model = self.ctrl.video.model
+        model.source_path = Path('/tmp/long.mp4')
+        model.streaming = True
+        model.last_frame_index = 0
+        model.state.total_frames = 100
+        frame_bytes = self.ctrl.lcd_width * self.ctrl.lcd_height * 2
+        frame = _make_test_image()
+        with patch.object(self.ctrl.devices, 'send_image_async') as mock_send, \
+             patch.object(self.ctrl, '_send_frame_to_lcd') as mock_convert:
+            model.memory_budget = 100 * frame_bytes - 1
+            self.ctrl._on_video_send_frame(frame)
+            mock_convert.assert_called_once_with(frame)
+            mock_send.assert_not_called()
+            self.assertEqual(self.ctrl._baked.baked_count, 0)
+
+            model.memory_budget = 100 * frame_bytes
+            self.ctrl._on_video_send_frame(frame)
+            mock_send.assert_called_once()
+            self.assertEqual(mock_convert.call_count, 1)
+
+    def test_baked_index_follows_repeated_stream_frame(self):
+        """A lagging decoder repeats frame N; it must not be baked as N+1."""
+        model = self.ctrl.video.model
+        model.streaming = True
+        model.state.state = PlaybackState.PLAYING
+        model.state.total_frames = 10
+        model.state.current_frame = 5
+        model._player = MagicMock(shown_index=4, frame_count=10)
+        model.advance_frame()
+        self.assertEqual(model.last_frame_index, 4)
+
     def test_video_tick_no_frame(self):
         """video_tick with no frame is a no-op."""
         with patch.object(self.ctrl.video, 'tick', return_value=None):
@@ -1215,6 +1468,146 @@ class TestFormCZTVVideoAndSend(unittest.TestCase):
             self.assertEqual(args[0][1], 320)
             self.assertEqual(args[0][2], 320)
 
+    def test_send_frame_to_hid_type2_as_jpeg(self):
+        """HID Type 2 panels get a JPEG, not RGB565."""
+        dev = DeviceInfo(name='LCD', path='hid:0416:5302', protocol='hid',
+                         device_type=2, vid=0x0416, pid=0x5302)
+        self.ctrl.devices.model.selected_device = dev
+
+        with patch.object(self.ctrl.devices, 'send_image_async') as mock_send, \
+             patch.object(self.ctrl.devices, 'get_send_stats', return_value=None):
+            self.ctrl._send_frame_to_lcd(_make_test_image())
+        data = mock_send.call_args[0][0]
+        self.assertEqual(data[:2], b'\xff\xd8')  # JPEG SOI
+        self.assertEqual(self.ctrl.get_jpeg_stats().frames, 1)
+        self.assertEqual(self.ctrl.get_jpeg_stats().last_bytes, len(data))
+
+    def test_mirroring_converts_once_per_format(self):
+        """Same-format mirrors share one conversion; others get their own."""
+        a = DeviceInfo(name='A', path='/dev/sg0')
+        b = DeviceInfo(name='B', path='/dev/sg1')
+        c = DeviceInfo(name='C', path='/dev/sg2', resolution=(240, 240))
+        self.ctrl.devices.model.devices = [a, b, c]
+        self.ctrl.devices.model.selected_device = a
+        self.ctrl.brightness = b.brightness  # Same settings as the mirrors
+        self.ctrl.set_mirroring(True)
+
+        real = self.ctrl._image_to_rgb565
+        with patch.object(self.ctrl, '_image_to_rgb565', side_effect=real) as conv, \
+             patch.object(self.ctrl.devices, 'send_image_async', return_value=True) as send:
+            self.ctrl._send_frame_to_lcd(_make_test_image(320, 320))
+
+        self.assertEqual(conv.call_count, 2)  # 320x320 and 240x240
+        self.assertEqual(send.call_count, 3)
+        sent = {c[1].get('device', a).path: c[0] for c in send.call_args_list}
+        self.assertIs(sent['/dev/sg0'][0], sent['/dev/sg1'][0])  # Shared bytes
+        self.assertEqual(len(sent['/dev/sg2'][0]), 240 * 240 * 2)
+        self.assertEqual(sent['/dev/sg2'][1:3], (240, 240))
+
+    def test_mirrors_use_own_rotation_and_brightness(self):
+        """Mirrors keep the settings made while they were selected."""
+        a = DeviceInfo(name='A', path='/dev/sg0')
+        b = DeviceInfo(name='B', path='/dev/sg1')
+        self.ctrl.devices.model.devices = [a, b]
+        self.ctrl.devices.model.selected_device = b
+        with patch.object(self.ctrl, '_render_and_send'):
+            self.ctrl.set_rotation(90)
+            self.ctrl.set_brightness(25)
+            self.ctrl.devices.model.selected_device = a
+            self.ctrl.set_rotation(0)
+            self.ctrl.set_brightness(100)
+        self.assertEqual((b.rotation, b.brightness), (90, 25))
+        self.ctrl.set_mirroring(True)
+
+        real = self.ctrl._image_to_rgb565
+        with patch.object(self.ctrl, '_image_to_rgb565', side_effect=real) as conv, \
+             patch.object(self.ctrl.devices, 'send_image_async', return_value=True):
+            self.ctrl._send_frame_to_lcd(_make_test_image(320, 320))
+
+        self.assertEqual([c[0][1:] for c in conv.call_args_list], [(100, 0), (25, 90)])
+
+    def test_mirrored_jpeg_panels_have_own_encoders(self):
+        """Each Type 2 panel's encoder adapts to that panel's send time."""
+        a = DeviceInfo(name='A', path='hid:1', protocol='hid', device_type=2)
+        b = DeviceInfo(name='B', path='hid:2', protocol='hid', device_type=2)
+        self.ctrl.devices.model.devices = [a, b]
+        self.ctrl.devices.model.selected_device = a
+        self.ctrl.set_mirroring(True)
+        self.ctrl.set_jpeg_budget(target_fps=30)
+        slow = {'hid:2': MagicMock(last_send_ms=100.0)}  # Only B is over budget
+
+        def stats(device=None):
+            return slow.get(device.path) if device is not None else MagicMock(last_send_ms=1.0)
+
+        quality = self.ctrl._jpeg.quality
+        with patch.object(self.ctrl.devices, 'send_image_async', return_value=True) as send, \
+             patch.object(self.ctrl.devices, 'get_send_stats', side_effect=stats):
+            self.ctrl._send_frame_to_lcd(_make_test_image())
+            self.ctrl._send_frame_to_lcd(_make_test_image(320, 320, (1, 2, 3)))
+
+        mirror = self.ctrl._mirror_jpeg[(b.vid, b.pid, b.path)]
+        self.assertGreaterEqual(self.ctrl._jpeg.quality, quality)
+        self.assertLess(mirror.quality, quality)
+        self.assertEqual(mirror.target_fps, 30)
+        self.assertEqual(send.call_count, 4)
+
+    def _overlay_ctrl(self):
+        dev = DeviceInfo(name='LCD', path='/dev/sg0')
+        self.ctrl.devices.model.selected_device = dev
+        self.ctrl.overlay.set_config({
+            'temp': {'x': 60, 'y': 250, 'metric': 'cpu_temp', 'enabled': True}})
+        self.ctrl.overlay.enable(True)
+        self.ctrl.overlay.set_background(_make_test_image())
+
+    def test_overlay_dirty_rects_narrow_the_diff(self):
+        """Only chunks under the redrawn text are compared, at any rotation."""
+        from trcc.frame_diff import FrameDiff
+        self._overlay_ctrl()
+        for rotation in (0, 90, 180, 270):
+            self.ctrl.rotation = rotation
+            self.ctrl.devices.frame_diff.reset()
+            reference = FrameDiff()
+            with patch.object(self.ctrl.devices, 'send_image_async',
+                              return_value=True) as send:
+                for temp in (40, 41, 41, 57):
+                    self.ctrl.overlay.update_metrics({'cpu_temp': temp})
+                    self.ctrl._send_frame_to_lcd(self.ctrl.overlay.render())
+            sent = [c[0][3] for c in send.call_args_list]
+            expected = []
+            for data in (c[0][0] for c in send.call_args_list):
+                expected.append(reference.changed_chunks(data))
+                reference.commit(data)
+            self.assertEqual(sent, expected, rotation)
+            self.assertEqual(len(sent), 3, rotation)  # Repeated 41 skipped
+            self.assertLess(len(sent[1]), 4, rotation)
+
+    def test_overlay_hint_not_used_after_other_frame(self):
+        """A frame sent from elsewhere in between voids the rects."""
+        self._overlay_ctrl()
+        with patch.object(self.ctrl.devices, 'send_image_async', return_value=True) as send:
+            self.ctrl._send_frame_to_lcd(self.ctrl.overlay.render())
+            self.ctrl._send_frame_to_lcd(_make_test_image(color=(0, 0, 255)))
+            self.ctrl._send_frame_to_lcd(self.ctrl.overlay.render())  # Unchanged overlay
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(send.call_args[0][3], [0, 1, 2, 3])
+
+    def test_hid_type3_stays_rgb565(self):
+        dev = DeviceInfo(name='LCD', path='hid:0418:5303', protocol='hid', device_type=3)
+        self.ctrl.devices.model.selected_device = dev
+        self.assertFalse(self.ctrl._wants_jpeg())
+
+    def test_jpeg_budget_uses_send_time(self):
+        """The previous frame's device send time feeds the FPS budget."""
+        dev = DeviceInfo(name='LCD', path='hid:0416:5302', protocol='hid', device_type=2)
+        self.ctrl.devices.model.selected_device = dev
+        self.ctrl.set_jpeg_budget(target_fps=30)
+        stats = MagicMock(last_send_ms=100.0)  # Far over a 33 ms frame
+        quality = self.ctrl._jpeg.quality
+        with patch.object(self.ctrl.devices, 'send_image_async'), \
+             patch.object(self.ctrl.devices, 'get_send_stats', return_value=stats):
+            self.ctrl._send_frame_to_lcd(_make_test_image())
+        self.assertLess(self.ctrl._jpeg.quality, quality)
+
     def test_send_frame_to_lcd_error(self):
         """_send_frame_to_lcd handles exceptions gracefully."""
         dev = DeviceInfo(name='LCD', path='/dev/sg0')
@@ -1265,6 +1658,91 @@ class TestFormCZTVVideoAndSend(unittest.TestCase):
         self.assertLess(result.getpixel((0, 0))[0], img.getpixel((0, 0))[0])
 
 
+class TestFormCZTVShmSource(unittest.TestCase):
+    """Frames from a shared-memory ring (shm_source)."""
+
+    def setUp(self):
+        self.ctrl, self.patches = _make_form_controller()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'ring')
+        self.ctrl.devices.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+
+    def tearDown(self):
+        self.ctrl.cleanup()
+        _stop_patches(self.patches)
+
+    def _writer(self, w=320, h=320, fmt=0):
+        from trcc.shm_source import ShmFrameWriter
+        writer = ShmFrameWriter(self.path, w, h, fmt)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_rgb888_converted_from_mapping(self):
+        writer = self._writer()
+        img = _make_test_image(color=(10, 200, 30))
+        writer.write(img.tobytes())
+        self.assertTrue(self.ctrl.set_shm_source(self.path))
+        with patch.object(self.ctrl.devices, 'send_frame_async') as send:
+            self.assertTrue(self.ctrl.shm_tick())
+            self.assertFalse(self.ctrl.shm_tick())  # No new frame
+        data, w, h = send.call_args[0]
+        self.assertEqual((w, h), (320, 320))
+        self.assertEqual(data, self.ctrl._image_to_rgb565(img, self.ctrl.brightness))
+
+    def test_rgb565_sent_unchanged(self):
+        writer = self._writer(fmt=1)
+        writer.write(b'\x12\x34' * 320 * 320)
+        self.ctrl.set_shm_source(self.path)
+        with patch.object(self.ctrl.devices, 'send_frame_async') as send:
+            self.ctrl.shm_tick()
+        self.assertEqual(send.call_args[0][0], b'\x12\x34' * 320 * 320)
+
+    def test_rgb565_one_copy_per_frame(self):
+        """The ring slot goes into a reused buffer; the sender gets the diff's copy."""
+        writer = self._writer(fmt=1)
+        self.ctrl.set_shm_source(self.path)
+        with patch.object(self.ctrl.devices, 'send_image_async', return_value=True) as send:
+            writer.write(b'\x12\x34' * 320 * 320)
+            self.ctrl.shm_tick()
+            buf = self.ctrl._shm_buf
+            writer.write(b'\x56\x78' * 320 * 320)
+            self.ctrl.shm_tick()
+        self.assertIs(self.ctrl._shm_buf, buf)
+        first, second = (c[0][0] for c in send.call_args_list)
+        self.assertIsInstance(first, bytes)
+        self.assertEqual(first, b'\x12\x34' * 320 * 320)  # Not overwritten by frame 2
+        self.assertEqual(second, b'\x56\x78' * 320 * 320)
+
+    def test_rgb565_wrong_size_rejected(self):
+        self._writer(240, 240, fmt=1)
+        errors = []
+        self.ctrl.on_error = errors.append
+        self.assertFalse(self.ctrl.set_shm_source(self.path))
+        self.assertFalse(self.ctrl.is_shm_active())
+        self.assertEqual(len(errors), 1)
+
+    def test_overlay_and_resize(self):
+        writer = self._writer(160, 160)
+        writer.write(_make_test_image(160, 160).tobytes())
+        self.ctrl.set_shm_source(self.path)
+        self.ctrl.overlay.enable(True)
+        with patch.object(self.ctrl.overlay, 'render', side_effect=lambda im: im) as render, \
+             patch.object(self.ctrl, '_send_frame_to_lcd') as send:
+            self.ctrl.shm_tick()
+        self.assertEqual(render.call_args[0][0].size, (320, 320))
+        send.assert_called_once()
+
+    def test_attach_stops_video_theme_detaches(self):
+        self._writer()
+        with patch.object(self.ctrl.video, 'stop') as stop:
+            self.ctrl.set_shm_source(self.path)
+        stop.assert_called_once()
+        with patch.object(self.ctrl, 'load_local_theme'):
+            self.ctrl._on_theme_selected(MagicMock(theme_type=ThemeType.LOCAL))
+        self.assertFalse(self.ctrl.is_shm_active())
+
+
 # =============================================================================
 # FormCZTVController – mask position parsing
 # =============================================================================
@@ -1545,16 +2023,18 @@ class TestFormCZTVInitialize(unittest.TestCase):
 # =============================================================================
 
 class TestDeviceControllerBusy(unittest.TestCase):
-    """Test DeviceController.send_image_async when busy."""
+    """Test DeviceController.send_image_async while a sync send is running."""
 
-    def test_send_image_async_skips_when_busy(self):
-        """send_image_async returns immediately when model is busy."""
+    def test_send_image_async_ignores_busy_flag(self):
+        """The background sender queues the frame instead of dropping it."""
         ctrl = DeviceController()
+        ctrl.model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
         ctrl.model._send_busy = True  # Underlying flag for is_busy property
-        started = []
-        ctrl.on_send_started = lambda: started.append(True)
-        ctrl.send_image_async(b'\x00' * 10, 2, 2)
-        self.assertEqual(started, [])  # callback never fired
+        sender = MagicMock()
+        with patch('trcc.device_factory.DeviceProtocolFactory.get_sender',
+                   return_value=sender):
+            ctrl.send_image_async(b'\x00' * 10, 2, 2)
+        sender.submit.assert_called_once()
 
 
 class TestVideoControllerFrameSkip(unittest.TestCase):
@@ -0,0 +1,318 @@
+"""Tests for daemon – headless scheduler and per-device sessions."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+
+import trcc
+from trcc.core.controllers import FormCZTVController
+from trcc.core.models import DeviceInfo
+from trcc.daemon import (
+    IDLE_INTERVAL,
+    LED_INTERVAL,
+    SHM_POLL_INTERVAL,
+    Daemon,
+    LcdSession,
+    LedSession,
+    Scheduler,
+    led_style_for_model,
+    run_daemon,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.sched = Scheduler(clock=self.clock, sleep=lambda s: None)
+
+    def test_runs_due_tasks_in_deadline_order(self):
+        calls = []
+        self.sched.every(0.5, lambda: calls.append('slow'), delay=0.2)
+        self.sched.every(0.1, lambda: calls.append('fast'))
+        self.assertAlmostEqual(self.sched.run_pending(), 0.1)
+        self.assertEqual(calls, ['fast'])
+        self.clock.now += 0.2
+        self.sched.run_pending()
+        self.assertEqual(calls, ['fast', 'fast', 'slow'])
+
+    def test_fixed_rate_without_drift(self):
+        calls = []
+        self.sched.every(1.0, lambda: calls.append(self.clock.now))
+        for _ in range(3):
+            self.sched.run_pending()
+            self.clock.now += 1.0
+        self.assertEqual(calls, [100.0, 101.0, 102.0])
+
+    def test_missed_slots_skipped(self):
+        calls = []
+        self.sched.every(0.1, lambda: calls.append(1))
+        self.sched.run_pending()
+        self.clock.now += 1.0  # Ten slots late
+        self.sched.run_pending()
+        self.assertEqual(len(calls), 2)
+
+    def test_callable_interval_reread(self):
+        interval = [1.0]
+        self.sched.every(lambda: interval[0], lambda: None)
+        self.sched.run_pending()
+        interval[0] = 0.25
+        self.clock.now += 1.0
+        self.assertAlmostEqual(self.sched.run_pending(), 0.25)
+
+    def test_task_error_keeps_schedule(self):
+        self.sched.every(0.1, MagicMock(side_effect=RuntimeError('boom')))
+        self.sched.run_pending()
+        self.assertEqual(len(self.sched), 1)
+
+    def test_stop_from_task_ends_run(self):
+        ticks = []
+
+        def sleep(seconds):
+            self.clock.now += seconds
+
+        sched = Scheduler(clock=self.clock, sleep=sleep)
+
+        def task():
+            ticks.append(1)
+            if len(ticks) == 3:
+                sched.stop()
+
+        sched.every(0.05, task)
+        sched.run()
+        self.assertEqual(len(ticks), 3)
+
+    def test_empty(self):
+        self.assertIsNone(self.sched.run_pending())
+
+    def test_submit_runs_on_next_turn(self):
+        future = self.sched.submit(lambda: 42)
+        self.assertFalse(future.done())
+        self.sched.run_pending()
+        self.assertEqual(future.result(0), 42)
+
+    def test_submit_from_other_thread_wakes_loop(self):
+        sched = Scheduler()
+        sched.every(60.0, lambda: None, delay=60.0)  # Loop would otherwise sleep
+        thread = threading.Thread(target=sched.run, daemon=True)
+        thread.start()
+        try:
+            self.assertEqual(sched.submit(lambda: 'done').result(2), 'done')
+            with self.assertRaises(ValueError):
+                sched.submit(MagicMock(side_effect=ValueError('x'))).result(2)
+        finally:
+            sched.stop()
+            thread.join(2)
+
+
+def _lcd(**kw):
+    return DeviceInfo(name='LCD', path='/dev/sg0', vid=0x87CD, pid=0x70DB, **kw)
+
+
+class _SessionTest(unittest.TestCase):
+    """LcdSession against a temp theme dir, with extraction and sends mocked."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        self.theme = self.data_dir / 'Theme320320' / '001a'
+        self.theme.mkdir(parents=True)
+        Image.new('RGB', (320, 320), (255, 0, 0)).save(self.theme / '00.png')
+
+        self.config = {}
+        for target in ('ensure_themes_extracted', 'ensure_web_extracted',
+                       'ensure_web_masks_extracted'):
+            patcher = patch(f'trcc.core.controllers.{target}', return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patchers = [
+            patch('trcc.core.controllers.get_saved_resolution', return_value=(320, 320)),
+            patch('trcc.daemon.get_saved_temp_unit', return_value=0),
+            patch('trcc.daemon.get_saved_baked_playback', return_value=False),
+            patch('trcc.daemon.get_device_config', side_effect=lambda key: self.config),
+            patch.object(FormCZTVController, '_send_frame_to_lcd'),
+        ]
+        for patcher in patchers:
+            mock = patcher.start()
+            self.addCleanup(patcher.stop)
+        self.send = mock
+
+    def _session(self):
+        session = LcdSession(_lcd(), self.data_dir)
+        self.addCleanup(session.close)
+        return session
+
+
+class TestLcdSession(_SessionTest):
+
+    def test_restores_saved_settings_and_sends(self):
+        self.config = {'theme_path': str(self.theme), 'brightness_level': 1, 'rotation': 90}
+        session = self._session()
+        self.assertTrue(session.start())
+        ctrl = session.controller
+        self.assertEqual((ctrl.brightness, ctrl.rotation), (25, 90))
+        self.assertEqual(ctrl.devices.get_selected().path, '/dev/sg0')
+        self.assertTrue(self.send.called)
+        self.assertEqual(session.video_interval(), IDLE_INTERVAL)
+
+    def test_applies_saved_baked_playback(self):
+        self.config = {'theme_path': str(self.theme)}
+        session = self._session()
+        with patch('trcc.daemon.get_saved_baked_playback', return_value=True):
+            session.start()
+        self.assertTrue(session.controller.baked_playback)
+
+    def test_no_saved_theme(self):
+        session = self._session()
+        self.assertFalse(session.start())
+        self.send.assert_not_called()
+
+    def test_overlay_rerendered_on_metrics(self):
+        self.config = {'theme_path': str(self.theme),
+                       'overlay': {'enabled': True, 'config': {}}}
+        session = self._session()
+        session.start()
+        self.assertTrue(session.wants_metrics)
+        self.send.reset_mock()
+        session.update_metrics({'cpu_temp': 50})
+        self.send.assert_called_once()
+
+    def test_runtime_changes_saved(self):
+        self.config = {'theme_path': str(self.theme)}
+        session = self._session()
+        session.start()
+        with patch('trcc.daemon.save_device_setting') as save:
+            session.set_brightness_level(3)
+            session.set_rotation(180)
+            session.load_theme(self.theme)
+        self.assertEqual((session.controller.brightness, session.controller.rotation), (100, 180))
+        saved = {c.args[1]: c.args[2] for c in save.call_args_list}
+        self.assertEqual(saved, {'brightness_level': 3, 'rotation': 180,
+                                 'theme_path': str(self.theme)})
+        with self.assertRaises(ValueError):
+            session.set_brightness_level(5)
+        with self.assertRaises(ValueError):
+            session.load_theme(self.theme / 'missing')
+
+    def test_show_image_and_stats(self):
+        self.config = {'theme_path': str(self.theme)}
+        session = self._session()
+        session.start()
+        self.send.reset_mock()
+        session.show_image(self.theme / '00.png')
+        self.send.assert_called_once()
+        stats = session.stats()
+        self.assertEqual(stats['brightness'], 50)
+        self.assertIn('frames_sent', stats['send'])
+
+    def test_shm_source_and_back_to_theme(self):
+        from trcc.shm_source import ShmFrameWriter
+        self.config = {'theme_path': str(self.theme)}
+        session = self._session()
+        session.start()
+        ring = str(self.data_dir / 'ring')
+        writer = ShmFrameWriter(ring, 320, 320)
+        self.addCleanup(writer.close)
+        session.set_source(ring)
+        self.assertEqual(session.shm_interval(), SHM_POLL_INTERVAL)
+        self.send.reset_mock()
+        session.update_metrics({})  # No theme refresh over the external frames
+        self.send.assert_not_called()
+        self.assertEqual(session.stats()['source']['frames'], 0)
+        session.set_source(None)
+        self.assertEqual(session.shm_interval(), IDLE_INTERVAL)
+        self.assertTrue(self.send.called)  # Saved theme shown again
+        with self.assertRaises(ValueError):
+            session.set_source(str(self.data_dir / 'missing'))
+
+    def test_saved_overlay_off_disables_theme_overlay(self):
+        self.config = {'theme_path': str(self.theme)}
+        session = self._session()
+        session.start()
+        self.assertFalse(session.wants_metrics)
+
+
+class TestDaemon(_SessionTest):
+
+    def test_schedules_lcd_and_led(self):
+        self.config = {'theme_path': str(self.theme)}
+        daemon = Daemon(self.data_dir, Scheduler(clock=_Clock()))
+        led = DeviceInfo(name='LED', path='hid:0416:8001', implementation='hid_led')
+        with patch.object(LedSession, 'start', return_value=True), \
+             patch.object(LedSession, 'close'):
+            self.assertEqual(daemon.start([_lcd(), led]), 2)
+            self.assertEqual(len(daemon.scheduler), 4)  # video, shm, LED, metrics
+            daemon.sessions.pop().close()
+        daemon.sessions.pop().close()
+
+    def test_device_without_theme_not_scheduled(self):
+        daemon = Daemon(self.data_dir, Scheduler(clock=_Clock()))
+        self.assertEqual(daemon.start([_lcd()]), 0)
+        self.assertEqual(len(daemon.scheduler), 0)
+
+    def test_metrics_collected_once_for_all_sessions(self):
+        daemon = Daemon(self.data_dir)
+        a, b = MagicMock(wants_metrics=True), MagicMock(wants_metrics=True)
+        daemon.sessions = [a, b, MagicMock(wants_metrics=False)]
+        with patch('trcc.system_info.get_all_metrics', return_value={'cpu_temp': 1}) as get:
+            daemon.update_metrics()
+        get.assert_called_once()
+        a.update_metrics.assert_called_once_with({'cpu_temp': 1})
+        b.update_metrics.assert_called_once_with({'cpu_temp': 1})
+        daemon.sessions[2].update_metrics.assert_not_called()
+
+    def test_no_metrics_when_nobody_needs_them(self):
+        daemon = Daemon(self.data_dir)
+        daemon.sessions = [MagicMock(wants_metrics=False)]
+        with patch('trcc.system_info.get_all_metrics') as get:
+            daemon.update_metrics()
+        get.assert_not_called()
+
+
+class TestLed(unittest.TestCase):
+
+    def test_style_from_model_name(self):
+        from trcc.led_device import LED_STYLES
+        style_id, style = next(iter(LED_STYLES.items()))
+        self.assertEqual(led_style_for_model(style.model_name), style_id)
+        self.assertEqual(led_style_for_model(None), 1)
+
+    def test_led_interval_matches_gui_timer(self):
+        self.assertAlmostEqual(LED_INTERVAL, 0.030)
+
+
+class TestRunDaemon(unittest.TestCase):
+
+    @patch('trcc.daemon.time.sleep')
+    @patch('trcc.daemon.find_devices', return_value=[])
+    def test_no_devices(self, mock_find, mock_sleep):
+        self.assertEqual(run_daemon(wait_attempts=2), 1)
+        self.assertEqual(mock_find.call_count, 2)
+
+    def test_no_qt_import(self):
+        code = ("import sys, trcc.daemon, trcc.cli; "
+                "sys.exit(any(m.startswith('PyQt') for m in sys.modules))")
+        src = str(Path(trcc.__file__).resolve().parent.parent)
+        env = dict(os.environ, PYTHONPATH=src)
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""Tests for font_index – persistent font lookup shared by all renderers."""
+
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from trcc.font_index import FontIndex, load_font
+from trcc.overlay_renderer import OverlayRenderer
+
+
+class _IndexTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fonts = os.path.join(tmp.name, 'fonts')
+        self.user = os.path.join(tmp.name, 'user')
+        self.fc_cache = os.path.join(tmp.name, 'fontconfig')
+        os.makedirs(self.fonts)
+        os.makedirs(self.user)
+        os.makedirs(self.fc_cache)
+        self.index_path = os.path.join(tmp.name, 'config', 'font_index.json')
+        # No fontconfig: lookups fall back to the indexed file names
+        p = patch('trcc.font_index.subprocess.run', side_effect=FileNotFoundError)
+        self.fc_match = p.start()
+        self.addCleanup(p.stop)
+
+    def touch(self, font_dir, name):
+        open(os.path.join(font_dir, name), 'w').close()
+        # Same-second writes keep the mtime; make the change visible
+        st = os.stat(font_dir)
+        os.utime(font_dir, (st.st_atime, st.st_mtime + 1))
+
+    def index(self):
+        return FontIndex(dirs=[self.fonts, self.user], path=self.index_path,
+                         fc_cache_dirs=[self.fc_cache])
+
+
+class TestLookups(_IndexTest):
+
+    def test_default_path_priority(self):
+        self.touch(self.user, 'DejaVuSans.ttf')
+        self.touch(self.user, 'NotoSans-Regular.ttf')
+        self.touch(self.user, 'DejaVuSans-Bold.ttf')
+        index = self.index()
+        self.assertEqual(index.default_path(), os.path.join(self.user, 'NotoSans-Regular.ttf'))
+        self.assertEqual(index.default_path(bold=True),
+                         os.path.join(self.user, 'DejaVuSans-Bold.ttf'))
+
+    def test_default_path_dir_order(self):
+        self.touch(self.fonts, 'DejaVuSans.ttf')
+        self.touch(self.user, 'MSYH.TTC')
+        self.assertEqual(self.index().default_path(),
+                         os.path.join(self.fonts, 'DejaVuSans.ttf'))
+
+    def test_default_path_none(self):
+        self.assertIsNone(self.index().default_path())
+
+    def test_find_by_file_name(self):
+        self.touch(self.user, 'FiraCode-Regular.ttf')
+        self.assertEqual(self.index().find('Fira Code'),
+                         os.path.join(self.user, 'FiraCode-Regular.ttf'))
+        self.assertIsNone(self.index().find('NoSuchFontXYZ'))
+
+    def test_fc_match_answer_remembered(self):
+        font = os.path.join(self.user, 'Custom.ttf')
+        self.touch(self.user, 'Custom.ttf')
+        self.fc_match.side_effect = None
+        self.fc_match.return_value = MagicMock(returncode=0, stdout=font)
+        index = self.index()
+        self.assertEqual(index.find('Custom'), font)
+        self.assertEqual(index.find('Custom'), font)
+        self.assertEqual(self.fc_match.call_count, 1)
+        # Persisted: a new process does not run fc-match again
+        self.assertEqual(self.index().find('Custom'), font)
+        self.assertEqual(self.fc_match.call_count, 1)
+        # Bold is a separate answer
+        self.index().find('Custom', bold=True)
+        self.assertEqual(self.fc_match.call_count, 2)
+
+    def test_fc_match_timeout_falls_back(self):
+        self.fc_match.side_effect = subprocess.TimeoutExpired('fc-match', 2)
+        self.touch(self.fonts, 'SomeFont.ttf')
+        self.assertEqual(self.index().find('SomeFont'),
+                         os.path.join(self.fonts, 'SomeFont.ttf'))
+
+
+class TestPersistence(_IndexTest):
+
+    def test_unchanged_dirs_not_listed_again(self):
+        self.touch(self.user, 'DejaVuSans.ttf')
+        self.index().default_path()
+        self.assertTrue(os.path.exists(self.index_path))
+        with patch('trcc.font_index.os.listdir') as listdir:
+            path = self.index().default_path()
+        listdir.assert_not_called()
+        self.assertEqual(path, os.path.join(self.user, 'DejaVuSans.ttf'))
+
+    def test_changed_dir_relisted_and_matches_dropped(self):
+        index = self.index()
+        index.find('Custom')
+        self.assertIsNone(index.default_path())
+        self.touch(self.user, 'DejaVuSans.ttf')
+        index.refresh()
+        self.assertEqual(index.default_path(), os.path.join(self.user, 'DejaVuSans.ttf'))
+        self.assertEqual(index._matches, {})
+
+    def test_fontconfig_cache_change_drops_matches(self):
+        """A font in a subdirectory fontconfig knows (not indexed here) shows
+        up through fc-cache; the persisted fallback answer must not stick."""
+        self.touch(self.user, 'Fallback.ttf')
+        index = self.index()
+        self.assertIsNone(index.find('NewFamily'))
+        self.assertIsNone(self.index().find('NewFamily'))
+        self.assertEqual(self.fc_match.call_count, 1)  # Remembered across processes
+
+        font = os.path.join(os.path.dirname(self.fonts), 'system', 'pkg', 'NewFamily.ttf')
+        os.makedirs(os.path.dirname(font))
+        open(font, 'w').close()
+        self.fc_match.side_effect = None
+        self.fc_match.return_value = MagicMock(returncode=0, stdout=font)
+        self.touch(self.fc_cache, 'abc-le64.cache-9')  # fc-cache ran
+        self.assertEqual(self.index().find('NewFamily'), font)
+        index.refresh()
+        self.assertEqual(index.find('NewFamily'), font)
+
+    def test_refresh_interval_throttles_stat(self):
+        index = self.index()
+        index.default_path()
+        self.touch(self.user, 'DejaVuSans.ttf')
+        self.assertIsNone(index.default_path())  # Within REFRESH_INTERVAL
+        with patch('trcc.font_index.REFRESH_INTERVAL', 0):
+            self.assertIsNotNone(index.default_path())
+
+    def test_corrupt_or_old_index_ignored(self):
+        os.makedirs(os.path.dirname(self.index_path))
+        self.touch(self.user, 'DejaVuSans.ttf')
+        for content in ('{not json', json.dumps({'version': 0, 'dirs': {}})):
+            with open(self.index_path, 'w') as f:
+                f.write(content)
+            self.assertEqual(self.index().default_path(),
+                             os.path.join(self.user, 'DejaVuSans.ttf'))
+
+    def test_memory_only_index_writes_nothing(self):
+        FontIndex(dirs=[self.user]).default_path()
+        self.assertFalse(os.path.exists(self.index_path))
+
+
+class TestSharedFonts(unittest.TestCase):
+
+    def test_renderers_share_font_objects(self):
+        a = OverlayRenderer().get_font(23)
+        b = OverlayRenderer(480, 480).get_font(23)
+        if not isinstance(getattr(a, 'path', None), str):
+            self.skipTest("no TrueType font available")
+        self.assertIs(a, b)
+        self.assertIs(load_font(a.path, 23), a)
+
+    def test_unloadable_path_falls_back_to_default(self):
+        renderer = OverlayRenderer()
+        with patch.object(renderer, '_resolve_font_path', return_value='/nonexistent.ttf'):
+            font = renderer.get_font(24, font_name='Broken')
+        self.assertIsNotNone(font)
+
+
+if __name__ == '__main__':
+    unittest.main()
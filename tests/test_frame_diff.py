@@ -0,0 +1,104 @@
+"""Tests for frame_diff – skip identical LCD frames, report changed chunks."""
+
+import unittest
+
+from trcc.frame_diff import CHUNK_SIZE, FrameDiff
+
+FRAME_320 = 320 * 320 * 2  # 4 chunks (3×64K + 8K)
+
+
+class TestFrameDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.diff = FrameDiff()
+
+    def test_first_frame_all_chunks(self):
+        self.assertEqual(self.diff.changed_chunks(bytes(FRAME_320)), [0, 1, 2, 3])
+
+    def test_identical_frame_skipped(self):
+        data = bytes(FRAME_320)
+        self.diff.commit(data)
+        self.assertEqual(self.diff.changed_chunks(bytes(FRAME_320)), [])
+        self.assertEqual(self.diff.frames_skipped, 1)
+
+    def test_reports_only_changed_chunk(self):
+        self.diff.commit(bytes(FRAME_320))
+        frame = bytearray(FRAME_320)
+        frame[CHUNK_SIZE * 2 + 10] = 0xFF
+        self.assertEqual(self.diff.changed_chunks(frame), [2])
+
+    def test_change_in_short_last_chunk(self):
+        self.diff.commit(bytes(FRAME_320))
+        frame = bytearray(FRAME_320)
+        frame[-1] = 1
+        frame[0] = 1
+        self.assertEqual(self.diff.changed_chunks(frame), [0, 3])
+
+    def test_size_change_sends_all(self):
+        self.diff.commit(bytes(FRAME_320))
+        self.assertEqual(len(self.diff.changed_chunks(bytes(480 * 480 * 2))), 8)
+
+    def test_commit_copies_buffer(self):
+        buf = bytearray(FRAME_320)
+        self.diff.commit(buf)
+        buf[0] = 1  # Caller reuses its output buffer
+        self.assertEqual(self.diff.changed_chunks(buf), [0])
+
+    def test_last_is_private_copy(self):
+        buf = bytearray(FRAME_320)
+        self.diff.commit(buf)
+        buf[0] = 1
+        self.assertIsInstance(self.diff.last, bytes)
+        self.assertEqual(self.diff.last[0], 0)
+
+    def test_reset_forces_full_send(self):
+        data = bytes(FRAME_320)
+        self.diff.commit(data)
+        self.diff.reset()
+        self.assertEqual(self.diff.changed_chunks(data), [0, 1, 2, 3])
+
+    def test_counters(self):
+        self.diff.commit(bytes(FRAME_320))
+        self.diff.commit(bytes(FRAME_320), [1])
+        self.assertEqual(self.diff.frames_sent, 2)
+        self.assertEqual(self.diff.chunks_sent, 5)
+        self.assertEqual(self.diff.chunks_total, 8)
+
+    def test_custom_chunk_size(self):
+        diff = FrameDiff(chunk_size=4)
+        diff.commit(b'\x00' * 12)
+        self.assertEqual(diff.changed_chunks(b'\x00' * 4 + b'\x01' + b'\x00' * 7), [1])
+
+
+class TestDirtyRectHints(unittest.TestCase):
+
+    def setUp(self):
+        self.diff = FrameDiff()
+
+    def test_chunks_for_rects(self):
+        # Row 102 of a 320-wide RGB565 frame starts at byte 65280 (chunk 0 -> 1)
+        self.assertEqual(self.diff.chunks_for_rects([(0, 102, 320, 103)], 320, 320), [0, 1])
+        self.assertEqual(self.diff.chunks_for_rects([(10, 300, 20, 310)], 320, 320), [2, 3])
+        self.assertEqual(self.diff.chunks_for_rects([(-5, -5, 2, 2), (400, 0, 500, 10)],
+                                                    320, 320), [0])
+
+    def test_candidates_trusted_for_matching_source(self):
+        self.diff.commit(bytes(FRAME_320), source='a')
+        frame = bytearray(FRAME_320)
+        frame[0] = frame[-1] = 1
+        self.assertEqual(self.diff.changed_chunks(frame, [3], since='a'), [3])
+        self.assertEqual(self.diff.changed_chunks(bytes(FRAME_320), [3], since='a'), [])
+        self.assertEqual(self.diff.frames_skipped, 1)
+
+    def test_candidates_ignored_for_other_source(self):
+        self.diff.commit(bytes(FRAME_320), source='a')
+        frame = bytearray(FRAME_320)
+        frame[0] = 1
+        self.assertEqual(self.diff.changed_chunks(frame, [3], since='b'), [0])
+        self.assertEqual(self.diff.changed_chunks(frame, [3]), [0])
+        self.diff.reset()
+        self.assertIsNone(self.diff.source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Tests for frame_sender – per-device send worker, latest frame wins."""
+
+import threading
+import unittest
+
+from trcc.frame_sender import FrameSender, _merge_chunks
+
+
+class _Recorder:
+    """Send function that blocks on a gate and records what it was given."""
+
+    def __init__(self, result=True):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+        self.result = result
+
+    def __call__(self, data, w, h, changed):
+        self.started.set()
+        self.gate.wait(2)
+        self.calls.append((data, w, h, changed))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestFrameSender(unittest.TestCase):
+
+    def _sender(self, send):
+        sender = FrameSender(send)
+        self.addCleanup(sender.stop)
+        return sender
+
+    def _occupy(self, sender, rec):
+        """Post a first frame and wait until the worker is blocked in it."""
+        sender.submit(b'first', 1, 1)
+        self.assertTrue(rec.started.wait(2))
+
+    def test_sends_in_background(self):
+        rec = _Recorder()
+        rec.gate.set()
+        sender = self._sender(rec)
+        self.assertTrue(sender.submit(b'abc', 2, 3, [0]))
+        self.assertTrue(sender.flush(2))
+        self.assertEqual(rec.calls, [(b'abc', 2, 3, [0])])
+        self.assertEqual(sender.stats.frames_sent, 1)
+        self.assertGreaterEqual(sender.stats.last_latency_ms, sender.stats.last_send_ms)
+
+    def test_latest_frame_wins(self):
+        rec = _Recorder()
+        sender = self._sender(rec)
+        self._occupy(sender, rec)
+        for i in range(4):
+            sender.submit(bytes([i]), 1, 1)
+        self.assertTrue(sender.is_busy)
+        rec.gate.set()
+        self.assertTrue(sender.flush(2))
+        self.assertEqual([c[0] for c in rec.calls], [b'first', bytes([3])])
+        self.assertEqual(sender.stats.frames_submitted, 5)
+        self.assertEqual(sender.stats.frames_dropped, 3)
+        self.assertEqual(sender.stats.frames_sent, 2)
+        self.assertFalse(sender.is_busy)
+
+    def test_replaced_frame_chunks_merged(self):
+        rec = _Recorder()
+        sender = self._sender(rec)
+        self._occupy(sender, rec)
+        sender.submit(b'a', 1, 1, [2])
+        sender.submit(b'b', 1, 1, [0])
+        rec.gate.set()
+        sender.flush(2)
+        self.assertEqual(rec.calls[-1], (b'b', 1, 1, [0, 2]))
+
+    def test_frame_after_failure_sent_in_full(self):
+        rec = _Recorder(result=False)
+        sender = self._sender(rec)
+        self._occupy(sender, rec)
+        sender.submit(b'next', 1, 1, [1])
+        rec.gate.set()
+        sender.flush(2)
+        self.assertEqual(rec.calls[-1], (b'next', 1, 1, None))
+        self.assertEqual(sender.stats.frames_failed, 2)
+
+    def test_exception_counts_as_failure(self):
+        rec = _Recorder(result=OSError('gone'))
+        rec.gate.set()
+        sender = self._sender(rec)
+        done = []
+        sender.submit(b'x', 1, 1, on_done=done.append)
+        sender.flush(2)
+        self.assertEqual(done, [False])
+        self.assertEqual(sender.stats.frames_failed, 1)
+
+    def test_replaced_callback_not_called(self):
+        rec = _Recorder()
+        sender = self._sender(rec)
+        self._occupy(sender, rec)
+        old, new = [], []
+        sender.submit(b'a', 1, 1, on_done=old.append)
+        sender.submit(b'b', 1, 1, on_done=new.append)
+        rec.gate.set()
+        sender.flush(2)
+        self.assertEqual((old, new), ([], [True]))
+
+    def test_single_worker_thread(self):
+        rec = _Recorder()
+        rec.gate.set()
+        sender = self._sender(rec)
+        before = threading.active_count()
+        for i in range(20):
+            sender.submit(bytes([i]), 1, 1)
+            sender.flush(2)
+        self.assertLessEqual(threading.active_count(), before + 1)
+
+    def test_stop_rejects_new_frames(self):
+        rec = _Recorder()
+        rec.gate.set()
+        sender = FrameSender(rec)
+        sender.submit(b'x', 1, 1)
+        sender.stop()
+        self.assertFalse(sender._thread.is_alive())
+        self.assertFalse(sender.submit(b'y', 1, 1))
+
+
+class TestMergeChunks(unittest.TestCase):
+
+    def test_union_sorted(self):
+        self.assertEqual(_merge_chunks([3, 1], [1, 2]), [1, 2, 3])
+
+    def test_full_send_wins(self):
+        self.assertIsNone(_merge_chunks(None, [1]))
+        self.assertIsNone(_merge_chunks([1], None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,22 @@ import io
 import os
 import struct
 import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 from PIL import Image
 
-from trcc.gif_animator import GIFAnimator, GIFThemeLoader, ThemeZtPlayer, VideoPlayer
+from trcc.gif_animator import (
+    FFmpegFrameStream,
+    GIFAnimator,
+    GIFThemeLoader,
+    MappedThemeZtPlayer,
+    StreamingDecoder,
+    ThemeZtPlayer,
+    VideoPlayer,
+    read_zt_index,
+)
 
 
 def _make_gif(frames=3, size=(4, 4), durations=None):
@@ -173,9 +183,15 @@ class TestGIFThemeLoader(unittest.TestCase):
 class TestThemeZtPlayer(unittest.TestCase):
     """Theme.zt binary animation player."""
 
+    player_cls = ThemeZtPlayer
+
     def setUp(self):
         self.path = _make_theme_zt(frames=4, size=(8, 8))
-        self.player = ThemeZtPlayer(self.path)
+        self.player = self.player_cls(self.path)
+
+    def _frame(self, player, index):
+        player.current_frame = index
+        return player.get_current_frame()
 
     def tearDown(self):
         self.player.close()
@@ -192,8 +208,8 @@ class TestThemeZtPlayer(unittest.TestCase):
         self.assertEqual(self.player.delays, [42, 42, 42, 42])
 
     def test_frames_are_rgb(self):
-        for frame in self.player.frames:
-            self.assertEqual(frame.mode, 'RGB')
+        for i in range(self.player.frame_count):
+            self.assertEqual(self._frame(self.player, i).mode, 'RGB')
 
     def test_play_pause_stop(self):
         self.assertFalse(self.player.is_playing())
@@ -243,15 +259,21 @@ class TestThemeZtPlayer(unittest.TestCase):
         with open(path, 'wb') as f:
             f.write(b'\x00\x00\x00\x00\x00')
         with self.assertRaises(ValueError):
-            ThemeZtPlayer(path)
+            self.player_cls(path)
         os.unlink(path)
 
     def test_resize_on_load(self):
-        player = ThemeZtPlayer(self.path, target_size=(4, 4))
-        self.assertEqual(player.frames[0].size, (4, 4))
+        player = self.player_cls(self.path, target_size=(4, 4))
+        self.assertEqual(self._frame(player, 0).size, (4, 4))
         player.close()
 
 
+class TestThemeZtPlayerLazy(TestThemeZtPlayer):
+    """The same playback tests against the lazy player VideoModel uses by default."""
+
+    player_cls = MappedThemeZtPlayer
+
+
 # ── VideoPlayer ──────────────────────────────────────────────────────────────
 
 class TestVideoPlayerPreloaded(unittest.TestCase):
@@ -271,7 +293,7 @@ class TestVideoPlayerPreloaded(unittest.TestCase):
         player.loop = True
         player.speed_multiplier = 1.0
         player.preload = True
-        player._temp_dir = None
+        player._stream = None
         player.frames = [Image.new('RGB', (320, 320), (i * 50, 0, 0))
                          for i in range(frame_count)]
         player.frame_count = frame_count
@@ -387,12 +409,13 @@ class TestVideoPlayerPreloaded(unittest.TestCase):
         p.close()
         self.assertEqual(len(p.frames), 0)
 
-    def test_close_removes_temp_dir(self):
+    def test_close_stops_stream(self):
         p = self._make_player()
-        tmp = tempfile.mkdtemp(prefix='trcc_test_')
-        p._temp_dir = tmp
+        stream = MagicMock()
+        p._stream = stream
         p.close()
-        self.assertFalse(os.path.exists(tmp))
+        stream.close.assert_called_once()
+        self.assertIsNone(p._stream)
 
 
 class TestVideoPlayerInit(unittest.TestCase):
@@ -451,28 +474,215 @@ class TestExtractFramesDispatch(unittest.TestCase):
         mock_extract.assert_called_once()
 
 
-# ── VideoPlayer._preload_frames_ffmpeg ───────────────────────────────────────
+# ── FFmpegFrameStream ────────────────────────────────────────────────────────
+
+def _fake_popen(frames=3, size=(8, 8), returncode=0, stderr=b'', extra=b''):
+    """Popen stand-in whose stdout yields *frames* raw rgb24 frames."""
+    w, h = size
+    raw = b''.join(bytes([i * 40 % 256]) * (w * h * 3) for i in range(frames)) + extra
+    proc = MagicMock()
+    proc.stdout = io.BytesIO(raw)
+    proc.poll.return_value = returncode
+    proc.returncode = returncode
+    proc.communicate.return_value = (b'', stderr)
+    return proc
+
+
+class TestFFmpegFrameStream(unittest.TestCase):
+
+    def test_command_pipes_rgb24_at_target_size(self):
+        cmd = FFmpegFrameStream('/v.mp4', (320, 240)).command()
+        self.assertIn('scale=320:240', cmd)
+        self.assertEqual(cmd[-5:], ['-f', 'rawvideo', '-pix_fmt', 'rgb24', 'pipe:1'])
+        self.assertNotIn('-ss', cmd)
+
+    def test_command_seek(self):
+        cmd = FFmpegFrameStream('/v.mp4', start_time=2.5).command()
+        self.assertEqual(cmd[cmd.index('-ss') + 1], '2.500')
+        self.assertLess(cmd.index('-ss'), cmd.index('-i'))
+
+    @patch('subprocess.Popen')
+    def test_yields_frames(self, mock_popen):
+        mock_popen.return_value = _fake_popen(frames=3)
+        frames = list(FFmpegFrameStream('/v.mp4', (8, 8)))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].size, (8, 8))
+        self.assertEqual(frames[2].getpixel((0, 0)), (80, 80, 80))
+
+    @patch('subprocess.Popen')
+    def test_partial_trailing_frame_dropped(self, mock_popen):
+        mock_popen.return_value = _fake_popen(frames=2, extra=b'\x00' * 10)
+        self.assertEqual(len(list(FFmpegFrameStream('/v.mp4', (8, 8)))), 2)
+
+    @patch('subprocess.Popen')
+    def test_early_stop_kills_process(self, mock_popen):
+        proc = _fake_popen(frames=3)
+        proc.poll.return_value = None  # Still running
+        mock_popen.return_value = proc
+        it = iter(FFmpegFrameStream('/v.mp4', (8, 8)))
+        next(it)
+        it.close()
+        proc.kill.assert_called_once()
+
+    @patch('subprocess.Popen')
+    def test_eof_waits_without_kill(self, mock_popen):
+        proc = _fake_popen(frames=1)
+        proc.poll.return_value = None  # Not reaped yet at EOF
+        mock_popen.return_value = proc
+        list(FFmpegFrameStream('/v.mp4', (8, 8)))
+        proc.kill.assert_not_called()
+        proc.communicate.assert_called_once()
+
+
+class TestStreamingDecoder(unittest.TestCase):
 
-class TestPreloadFramesFfmpeg(unittest.TestCase):
+    def setUp(self):
+        # Patched for the whole test, so the decoder thread never sees real ffmpeg
+        patcher = patch('subprocess.Popen')
+        self.mock_popen = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _decoder(self, frames=3, **kw):
+        self.mock_popen.side_effect = lambda *a, **k: _fake_popen(frames=frames)
+        dec = StreamingDecoder('/v.mp4', (8, 8), **kw)
+        self.addCleanup(dec.stop)  # Runs before patcher.stop (LIFO)
+        return dec
+
+    def test_sequential_frames_and_loop(self):
+        dec = self._decoder(frames=3)
+        frames = [dec.get(i, timeout=2) for i in (0, 1, 2, 0)]
+        self.assertEqual([f.getpixel((0, 0))[0] for f in frames], [0, 40, 80, 0])
+        self.assertEqual(dec.frame_count, 3)
+
+    def test_ring_is_bounded(self):
+        dec = self._decoder(frames=6, capacity=2)
+        dec.start(0)
+        for _ in range(100):
+            if len(dec) == 2:
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(len(dec), 2)
+
+    def test_seek_restarts_ffmpeg(self):
+        dec = self._decoder(frames=20, capacity=4)  # Seek further than the ring
+        self.assertIsNotNone(dec.get(0, timeout=2))
+        self.assertIsNotNone(dec.get(8, timeout=2))
+        seeks = [c[0][0][c[0][0].index('-ss') + 1]
+                 for c in self.mock_popen.call_args_list if '-ss' in c[0][0]]
+        self.assertIn('0.500', seeks)
+
+    def test_no_loop_ends(self):
+        dec = self._decoder(frames=1, loop=False)
+        self.assertIsNotNone(dec.get(0, timeout=2))
+        self.assertIsNone(dec.get(1, timeout=2))
+
+    def test_get_does_not_block(self):
+        self.mock_popen.side_effect = lambda *a, **k: _fake_popen(frames=3)
+        dec = StreamingDecoder('/v.mp4', (8, 8))
+        self.addCleanup(dec.stop)
+        with patch('trcc.gif_animator.threading.Thread'):  # Decoder never runs
+            t0 = time.monotonic()
+            self.assertIsNone(dec.get(0))
+        self.assertLess(time.monotonic() - t0, 0.05)
+
+    def test_skipped_frames_dropped_without_restart(self):
+        dec = self._decoder(frames=10, capacity=4)
+        self.assertIsNotNone(dec.get(0, timeout=2))
+        calls = self.mock_popen.call_count
+        frame = dec.get(3, timeout=2)  # Tick moved on while the decoder lagged
+        self.assertEqual(frame.getpixel((0, 0))[0], 120)
+        self.assertEqual(self.mock_popen.call_count, calls)
+
+    def test_slow_decoder_shows_newest_frame(self):
+        """A decoder slower than the tick rate still advances the picture."""
+        class SlowPipe(io.BytesIO):
+            def readinto(self, b):
+                time.sleep(0.03)  # ~33 fps decoder against a 100 fps tick
+                return super().readinto(b)
+
+        def popen(*a, **k):
+            proc = _fake_popen(frames=100)  # More than the test reaches
+            proc.stdout = SlowPipe(proc.stdout.getvalue())
+            return proc
+
+        self.mock_popen.side_effect = popen
+        dec = StreamingDecoder('/v.mp4', (8, 8), capacity=64)
+        self.addCleanup(dec.stop)
+        shown = []
+        for index in range(40):
+            frame = dec.get(index)
+            if frame is not None:
+                shown.append(dec.last_index)
+                self.assertEqual(frame.getpixel((0, 0))[0], dec.last_index * 40 % 256)
+            time.sleep(0.01)
+        self.assertGreaterEqual(len(shown), 3)
+        self.assertEqual(shown, sorted(set(shown)))  # Always forward, never repeated
+        self.assertEqual(self.mock_popen.call_count, 1)  # No ffmpeg restart
+
+
+class TestVideoPlayerStreaming(unittest.TestCase):
 
-    def test_loads_bmp_files(self):
-        """Create temp dir with BMP files, verify frames loaded."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create 3 small BMPs
-            for i in range(3):
-                img = Image.new('RGB', (8, 8), (i * 80, 0, 0))
-                img.save(os.path.join(tmpdir, f'frame_{i:04d}.bmp'))
+    @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
+    @patch('subprocess.run')
+    def test_streaming_estimates_length_and_holds_no_frames(self, mock_run, mock_popen):
+        mock_run.return_value = MagicMock(returncode=0, stdout='8,8,32/1,64\n')
+        mock_popen.side_effect = lambda *a, **k: _fake_popen(frames=4)
 
-            player = VideoPlayer.__new__(VideoPlayer)
-            player.frames = []
-            player.frame_count = 0
-            player.target_size = (8, 8)
-            player._temp_dir = tmpdir
+        player = VideoPlayer('/fake/video.mp4', target_size=(8, 8), preload=False)
+        self.assertEqual(player.frame_count, 32)  # 64 frames @ 32fps -> 2s @ 16fps
+        player.start_streaming(buffer_frames=2)
+        try:
+            self.assertTrue(player.is_streaming)
+            for _ in range(200):  # get_frame doesn't wait for the decoder
+                if player.get_frame(0) is not None:
+                    break
+                time.sleep(0.01)
+            self.assertIsNotNone(player.get_frame(0))
+            self.assertEqual(player.frames, [])
+        finally:
+            player.close()
 
-            player._preload_frames_ffmpeg()
-            self.assertEqual(player.frame_count, 3)
-            self.assertEqual(len(player.frames), 3)
+    @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.run')
+    def test_empty_ring_repeats_last_frame(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout='8,8,16/1,4\n')
+        player = VideoPlayer('/fake/video.mp4', target_size=(8, 8), preload=False)
+        last = Image.new('RGB', (8, 8))
+        player._last_frame, player.shown_index = last, 2
+        player._decoder = MagicMock(frame_count=0)
+        player._decoder.get.return_value = None
+        self.assertIs(player.get_frame(3), last)
+        player._decoder.get.assert_called_once_with(3)
+        self.assertEqual(player.shown_index, 2)
+        player._decoder = None
 
+    @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.run')
+    def test_lagging_decoder_frame_keeps_its_index(self, mock_run):
+        """The decoder's newest frame stands in for a later one; shown_index
+        names the frame actually shown."""
+        mock_run.return_value = MagicMock(returncode=0, stdout='8,8,16/1,8\n')
+        player = VideoPlayer('/fake/video.mp4', target_size=(8, 8), preload=False)
+        older = Image.new('RGB', (8, 8))
+        player._decoder = MagicMock(frame_count=0, last_index=4)
+        player._decoder.get.return_value = older
+        self.assertIs(player.get_frame(6), older)
+        self.assertEqual(player.shown_index, 4)
+        player._decoder = None
+
+    @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
+    @patch('subprocess.run')
+    def test_close_stops_decoder(self, mock_run, mock_popen):
+        mock_run.return_value = MagicMock(returncode=0, stdout='8,8,16/1,4\n')
+        mock_popen.side_effect = lambda *a, **k: _fake_popen(frames=4)
+
+        player = VideoPlayer('/fake/video.mp4', target_size=(8, 8), preload=False)
+        player.start_streaming()
+        player.close()
+        self.assertFalse(player.is_streaming)
 
 
 # ── FFMPEG_AVAILABLE=False warning lines 32-33 ──────────────────────────────
@@ -548,127 +758,82 @@ class TestVideoPlayerInitFull(unittest.TestCase):
     """Cover VideoPlayer.__init__ → _load_video → _load_video_ffmpeg."""
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_load_video_ffmpeg_success(self, mock_run):
-        """Lines 307-373: full _load_video_ffmpeg with mocked subprocess."""
-        from unittest.mock import call
-
-        # ffprobe returns video info
-        probe_result = MagicMock(returncode=0, stdout='320,320,30/1,150\n')
-        # ffmpeg extract returns success
-        ffmpeg_result = MagicMock(returncode=0)
-        mock_run.side_effect = [probe_result, ffmpeg_result]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create fake BMP files in what would be the temp dir
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                for i in range(3):
-                    img = Image.new('RGB', (320, 320), (i * 50, 0, 0))
-                    img.save(os.path.join(tmpdir, f'{i+1:04d}.bmp'))
-
-                player = VideoPlayer('/fake/video.mp4', target_size=(320, 320))
-                self.assertEqual(player.frame_count, 3)
-                self.assertEqual(player.fps, 16)
-                player.close()
+    def test_load_video_ffmpeg_success(self, mock_run, mock_popen):
+        """ffprobe metadata, then frames decoded from the rgb24 pipe."""
+        mock_run.return_value = MagicMock(returncode=0, stdout='320,320,30/1,150\n')
+        mock_popen.return_value = _fake_popen(frames=3, size=(320, 320))
+
+        player = VideoPlayer('/fake/video.mp4', target_size=(320, 320))
+        self.assertEqual(player.frame_count, 3)
+        self.assertEqual(player.fps, 16)
+        self.assertEqual(player.frames[0].size, (320, 320))
+        player.close()
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_load_video_ffprobe_fails(self, mock_run):
-        """Lines 340-343: ffprobe exception → fallback to defaults."""
-        # ffprobe raises exception
-        mock_run.side_effect = [Exception("no ffprobe"), MagicMock(returncode=0)]
+    def test_load_video_ffprobe_fails(self, mock_run, mock_popen):
+        """ffprobe exception → fallback to defaults."""
+        mock_run.side_effect = Exception("no ffprobe")
+        mock_popen.return_value = _fake_popen(frames=0)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                player = VideoPlayer('/fake/vid.mp4', target_size=(320, 320))
-                self.assertEqual(player.frame_count, 0)
-                player.close()
+        player = VideoPlayer('/fake/vid.mp4', target_size=(320, 320))
+        self.assertEqual(player.frame_count, 0)
+        player.close()
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_load_video_ffmpeg_nonzero_exit(self, mock_run):
-        """Line 368: ffmpeg returns non-zero → RuntimeError."""
-        probe_result = MagicMock(returncode=1, stdout='')
-        ffmpeg_result = MagicMock(returncode=1, stderr=b'error msg')
-        mock_run.side_effect = [probe_result, ffmpeg_result]
+    def test_load_video_ffmpeg_nonzero_exit(self, mock_run, mock_popen):
+        """ffmpeg fails with no frames → RuntimeError."""
+        mock_run.return_value = MagicMock(returncode=1, stdout='')
+        mock_popen.return_value = _fake_popen(frames=0, returncode=1, stderr=b'error msg')
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                with self.assertRaises(RuntimeError):
-                    VideoPlayer('/fake/vid.mp4')
+        with self.assertRaises(RuntimeError) as ctx:
+            VideoPlayer('/fake/vid.mp4')
+        self.assertIn('error msg', str(ctx.exception))
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_load_video_ffmpeg_timeout(self, mock_run):
-        """Line 370: ffmpeg times out → RuntimeError."""
-        import subprocess as sp
-        probe_result = MagicMock(returncode=1, stdout='')
-        mock_run.side_effect = [probe_result, sp.TimeoutExpired('ffmpeg', 300)]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                with self.assertRaises(RuntimeError):
-                    VideoPlayer('/fake/vid.mp4')
+    def test_probe_fps_single_part(self, mock_run, mock_popen):
+        """fps_parts has single part (no /)."""
+        mock_run.return_value = MagicMock(returncode=0, stdout='320,320,30,100\n')
+        mock_popen.return_value = _fake_popen(frames=1, size=(320, 320))
+        player = VideoPlayer('/fake/vid.mp4', target_size=(320, 320))
+        player.close()
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_probe_fps_single_part(self, mock_run):
-        """Line 332: fps_parts has single part (no /)."""
-        probe_result = MagicMock(returncode=0, stdout='320,320,30,100\n')
-        ffmpeg_result = MagicMock(returncode=0)
-        mock_run.side_effect = [probe_result, ffmpeg_result]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                player = VideoPlayer('/fake/vid.mp4', target_size=(320, 320))
-                player.close()
+    def test_probe_frame_count_na(self, mock_run, mock_popen):
+        """frame count is N/A → counted while decoding."""
+        mock_run.return_value = MagicMock(returncode=0, stdout='320,320,30/1,N/A\n')
+        mock_popen.return_value = _fake_popen(frames=2, size=(320, 320))
+        player = VideoPlayer('/fake/vid.mp4', target_size=(320, 320))
+        self.assertEqual(player.frame_count, 2)
+        player.close()
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_probe_frame_count_na(self, mock_run):
-        """Line 336: frame count is N/A → frame_count=0."""
-        probe_result = MagicMock(returncode=0, stdout='320,320,30/1,N/A\n')
-        ffmpeg_result = MagicMock(returncode=0)
-        mock_run.side_effect = [probe_result, ffmpeg_result]
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                player = VideoPlayer('/fake/vid.mp4', target_size=(320, 320))
-                player.close()
-
-
-# ── _preload_frames_ffmpeg error path ────────────────────────────────────────
-
-class TestPreloadFramesError(unittest.TestCase):
-
-    def test_corrupt_bmp_skipped(self):
-        """Lines 389-392: corrupt BMP file is skipped."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create 1 good BMP and 1 corrupt BMP
-            Image.new('RGB', (8, 8)).save(os.path.join(tmpdir, '0001.bmp'))
-            with open(os.path.join(tmpdir, '0002.bmp'), 'wb') as f:
-                f.write(b'NOT_A_BMP')
-
-            player = VideoPlayer.__new__(VideoPlayer)
-            player.frames = []
-            player.frame_count = 0
-            player.target_size = (8, 8)
-            player._temp_dir = tmpdir
-            player._preload_frames_ffmpeg()
-            self.assertEqual(player.frame_count, 1)
-
-    def test_preload_resizes_mismatched_frames(self):
-        """Line 388: frame.size != target_size → resize."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            Image.new('RGB', (16, 16)).save(os.path.join(tmpdir, '0001.bmp'))
-
-            player = VideoPlayer.__new__(VideoPlayer)
-            player.frames = []
-            player.frame_count = 0
-            player.target_size = (8, 8)
-            player._temp_dir = tmpdir
-            player._preload_frames_ffmpeg()
-            self.assertEqual(player.frames[0].size, (8, 8))
+    def test_no_preload_streams_on_demand(self, mock_run, mock_popen):
+        """preload=False defers decoding to iter_frames()."""
+        mock_run.return_value = MagicMock(returncode=1, stdout='')
+        mock_popen.return_value = _fake_popen(frames=3)
+        player = VideoPlayer('/fake/vid.mp4', target_size=(8, 8), preload=False)
+        mock_popen.assert_not_called()
+        self.assertEqual(player.frame_count, 0)
+
+        it = player.iter_frames()
+        first = next(it)
+        self.assertIs(player.frames[0], first)
+        self.assertEqual(player.frame_count, 1)
+        list(it)
+        self.assertEqual(player.frame_count, 3)
+        player.close()
 
 
 # ── VideoPlayer.__del__ ─────────────────────────────────────────────────────
@@ -680,7 +845,7 @@ class TestVideoPlayerDel(unittest.TestCase):
         with patch.object(VideoPlayer, '__init__', lambda s, *a, **kw: None):
             player = VideoPlayer.__new__(VideoPlayer)
         player.frames = [Image.new('RGB', (4, 4))]
-        player._temp_dir = None
+        player._stream = None
         player.__del__()
         self.assertEqual(player.frames, [])
 
@@ -748,6 +913,115 @@ class TestExtractFramesFfmpeg(unittest.TestCase):
 
 # ── ThemeZtPlayer edge cases ────────────────────────────────────────────────
 
+class TestReadZtIndex(unittest.TestCase):
+
+    def test_offsets_point_at_jpegs(self):
+        path = _make_theme_zt(frames=3)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        finally:
+            os.unlink(path)
+        timestamps, index = read_zt_index(data)
+        self.assertEqual(timestamps, [0, 42, 84])
+        self.assertEqual(len(index), 3)
+        for offset, size in index:
+            self.assertEqual(data[offset:offset + 2], b'\xff\xd8')  # JPEG SOI
+        self.assertEqual(index[-1][0] + index[-1][1], len(data))
+
+    def test_truncated_raises(self):
+        path = _make_theme_zt(frames=2)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        finally:
+            os.unlink(path)
+        with self.assertRaises(ValueError):
+            read_zt_index(data[:-10])
+
+    def test_bad_magic_raises(self):
+        with self.assertRaises(ValueError):
+            read_zt_index(b'\x00' * 16)
+
+
+class TestMappedThemeZtPlayer(unittest.TestCase):
+    """Lazily decoded Theme.zt player."""
+
+    def setUp(self):
+        self.path = _make_theme_zt(frames=6, size=(8, 8))
+        self.player = MappedThemeZtPlayer(self.path, cache_size=2)
+
+    def tearDown(self):
+        self.player.close()
+        os.unlink(self.path)
+
+    def test_open_decodes_nothing(self):
+        self.assertEqual(self.player.frame_count, 6)
+        self.assertEqual(self.player.cached_count, 0)
+        self.assertEqual(self.player.frames, [])
+
+    def test_matches_eager_player(self):
+        eager = ThemeZtPlayer(self.path, target_size=(4, 4))
+        lazy = MappedThemeZtPlayer(self.path, target_size=(4, 4))
+        try:
+            self.assertEqual(lazy.timestamps, eager.timestamps)
+            self.assertEqual(lazy.delays, eager.delays)
+            for i in range(eager.frame_count):
+                self.assertEqual(lazy.get_frame(i).tobytes(), eager.frames[i].tobytes())
+                self.assertEqual(lazy.get_frame(i).mode, 'RGB')
+        finally:
+            lazy.close()
+            eager.close()
+
+    def test_lru_cache_bounded(self):
+        for i in range(6):
+            self.player.get_frame(i)
+        self.assertEqual(self.player.cached_count, 2)
+        self.assertIs(self.player.get_frame(5), self.player.get_frame(5))
+
+    def test_get_current_frame_returns_copy(self):
+        f1 = self.player.get_current_frame()
+        f2 = self.player.get_current_frame()
+        self.assertIsNot(f1, f2)
+
+    def test_out_of_range_returns_none(self):
+        self.player.current_frame = 999
+        self.assertIsNone(self.player.get_current_frame())
+        self.assertEqual(self.player.get_delay(), 42)
+
+    def test_seek_and_progress(self):
+        self.player.seek(1.0)
+        self.assertEqual(self.player.current_frame, 5)
+        self.assertEqual(self.player.get_progress(), 100)
+
+    def test_decode_ahead(self):
+        player = MappedThemeZtPlayer(self.path, decode_ahead=3)
+        try:
+            player.get_frame(4)
+            for _ in range(200):
+                if player.cached_count == 4:
+                    break
+                time.sleep(0.005)
+            self.assertEqual(set(player._cache), {4, 5, 0, 1})  # Wraps
+        finally:
+            player.close()
+
+    def test_closed_player_returns_none(self):
+        self.player.close()
+        self.assertIsNone(self.player.get_frame(0))
+
+    def test_invalid_file_raises(self):
+        fd, path = tempfile.mkstemp(suffix='.zt')
+        os.close(fd)
+        with open(path, 'wb') as f:
+            f.write(b'\x00\x00\x00\x00\x00')
+        try:
+            with self.assertRaises(ValueError):
+                MappedThemeZtPlayer(path)
+        finally:
+            os.unlink(path)
+
+
 class TestThemeZtPlayerEdge(unittest.TestCase):
 
     def test_single_frame_delay(self):
@@ -892,21 +1166,18 @@ class TestVideoPlayerCLI(unittest.TestCase):
             test_video_player()  # should not raise
 
     @patch('trcc.gif_animator.FFMPEG_AVAILABLE', True)
+    @patch('subprocess.Popen')
     @patch('subprocess.run')
-    def test_video_file_with_ffmpeg(self, mock_run):
+    def test_video_file_with_ffmpeg(self, mock_run, mock_popen):
         """Lines 678-682: video file with ffmpeg available."""
         from trcc.gif_animator import test_video_player
 
-        # mock ffprobe + ffmpeg
-        mock_run.side_effect = [
-            MagicMock(returncode=1, stdout=''),
-            MagicMock(returncode=0),
-        ]
+        # mock ffprobe + ffmpeg pipe
+        mock_run.return_value = MagicMock(returncode=1, stdout='')
+        mock_popen.return_value = _fake_popen(frames=1, size=(320, 320))
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch('tempfile.mkdtemp', return_value=tmpdir):
-                with patch('sys.argv', ['gif_animator.py', '/fake/vid.mp4']):
-                    test_video_player()
+        with patch('sys.argv', ['gif_animator.py', '/fake/vid.mp4']):
+            test_video_player()
 
     def test_extract_gif(self):
         """Lines 647-651: --extract with .gif."""
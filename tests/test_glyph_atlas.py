@@ -0,0 +1,163 @@
+"""Tests for glyph_atlas – pre-rasterized glyphs for overlay metric text."""
+
+import io
+import random
+import unittest
+
+from PIL import Image, ImageDraw, ImageFont, features
+
+from trcc import glyph_atlas
+from trcc.glyph_atlas import GlyphAtlas, atlas_for
+from trcc.overlay_renderer import OverlayRenderer
+
+ALPHABET = '0123456789.%°CF:/ AMPWEDTHUSNGzKBRV'
+
+# Layout engines Pillow can use here (RAQM needs libraqm)
+ENGINES = [ImageFont.Layout.BASIC] + (
+    [ImageFont.Layout.RAQM] if features.check('raqm') else [])
+
+
+def _font(size, bold=False):
+    font = OverlayRenderer().get_font(size, bold=bold)
+    if not isinstance(getattr(font, 'path', None), str):
+        raise unittest.SkipTest("no TrueType font available")
+    return font
+
+
+class TestGlyphAtlasMatchesFreeType(unittest.TestCase):
+
+    def _assert_same(self, font, text, xy, fill='#FF8040'):
+        expected = Image.new('RGB', (320, 120), (20, 40, 60))
+        actual = expected.copy()
+        ImageDraw.Draw(expected).text(xy, text, fill=fill, font=font, anchor='mm')
+        GlyphAtlas(font).draw(actual, xy, text, fill)
+        self.assertEqual(actual.tobytes(), expected.tobytes(), (font.size, text, xy))
+
+    def test_metric_strings(self):
+        for size in (9, 16, 24, 37):
+            font = _font(size)
+            for text in ('54°C', '129°F', '12:34', '2026/01/02', '88%', '4.2GHz',
+                         '880KB/s', '1111', 'PM', 'WED'):
+                self._assert_same(font, text, (160, 60))
+
+    def test_random_strings_sizes_and_positions(self):
+        """Kerned pairs, overlapping glyphs, odd widths and clipped edges."""
+        rng = random.Random(7)
+        for size in range(8, 48, 3):
+            for bold in (False, True):
+                font = _font(size, bold)
+                for _ in range(8):
+                    text = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 8)))
+                    xy = (rng.randint(-10, 330), rng.randint(-5, 125))
+                    self._assert_same(font, text, xy)
+
+    def test_kerned_pair(self):
+        self._assert_same(_font(29), 'AV', (160, 60))
+
+    def test_spaces_only(self):
+        atlas = GlyphAtlas(_font(20))
+        mask, _ = atlas.mask('  ')
+        self.assertEqual(mask.size, (0, 0))
+        img = Image.new('RGB', (40, 40))
+        atlas.draw(img, (20, 20), '  ', '#FFFFFF')
+        self.assertIsNone(img.getbbox())
+
+    def test_glyphs_cached(self):
+        atlas = GlyphAtlas(_font(20))
+        atlas.mask('12:34')
+        count = len(atlas._glyphs)
+        atlas.mask('12:34')
+        atlas.mask('43:21')
+        self.assertEqual(len(atlas._glyphs), count)
+
+
+class TestSupportsAndSharing(unittest.TestCase):
+
+    def test_supports(self):
+        self.assertTrue(GlyphAtlas.supports('54°C'))
+        self.assertTrue(GlyphAtlas.supports('12:34 PM'))
+        self.assertFalse(GlyphAtlas.supports(''))
+        self.assertFalse(GlyphAtlas.supports('星期一'))
+
+    def test_atlas_shared_per_font_file_and_size(self):
+        font = _font(21)
+        same = ImageFont.truetype(font.path, 21)
+        self.assertIs(atlas_for(font), atlas_for(same))
+        self.assertIsNot(atlas_for(font), atlas_for(_font(22)))
+
+    def test_no_atlas_for_fonts_without_a_file(self):
+        font = _font(20)
+        with open(font.path, 'rb') as f:
+            in_memory = ImageFont.truetype(io.BytesIO(f.read()), 20)
+        self.assertIsNone(atlas_for(in_memory))
+
+    def test_atlas_only_for_basic_layout(self):
+        """RAQM shapes whole strings (ligatures), so it never gets an atlas;
+        whatever draws the text must match ImageDraw.text under either engine."""
+        path = _font(24).path
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                font = ImageFont.truetype(path, 24, layout_engine=engine)
+                atlas = atlas_for(font)
+                self.assertEqual(atlas is not None, engine == ImageFont.Layout.BASIC)
+                for text in ('office', 'fifl 54°C'):
+                    expected = Image.new('RGB', (320, 80))
+                    actual = expected.copy()
+                    ImageDraw.Draw(expected).text((160, 40), text, fill='#FFFFFF',
+                                                  font=font, anchor='mm')
+                    if atlas is not None and GlyphAtlas.supports(text):
+                        atlas.draw(actual, (160, 40), text, '#FFFFFF')
+                    else:
+                        ImageDraw.Draw(actual).text((160, 40), text, fill='#FFFFFF',
+                                                    font=font, anchor='mm')
+                    self.assertEqual(actual.tobytes(), expected.tobytes(), text)
+
+    def test_atlas_cache_bounded(self):
+        path = _font(20).path
+        saved = glyph_atlas._atlases.copy()
+        glyph_atlas._atlases.clear()
+        try:
+            first = atlas_for(ImageFont.truetype(path, 8, layout_engine=ImageFont.Layout.BASIC))
+            for size in range(9, 9 + glyph_atlas.ATLAS_CACHE_SIZE):
+                atlas_for(ImageFont.truetype(path, size, layout_engine=ImageFont.Layout.BASIC))
+            self.assertEqual(len(glyph_atlas._atlases), glyph_atlas.ATLAS_CACHE_SIZE)
+            again = atlas_for(ImageFont.truetype(path, 8, layout_engine=ImageFont.Layout.BASIC))
+            self.assertIsNot(again, first)  # Least recently used was dropped
+            self.assertEqual(len(glyph_atlas._atlases), glyph_atlas.ATLAS_CACHE_SIZE)
+        finally:
+            glyph_atlas._atlases.clear()
+            glyph_atlas._atlases.update(saved)
+
+
+class TestRendererUsesAtlas(unittest.TestCase):
+
+    def test_render_matches_freetype(self):
+        renderer = OverlayRenderer()
+        renderer.set_background(Image.new('RGB', (320, 320), (20, 40, 60)))
+        renderer.set_config({
+            'temp': {'x': 160, 'y': 100, 'metric': 'cpu_temp', 'color': '#FF8040',
+                     'font': {'size': 30}},
+            'label': {'x': 160, 'y': 200, 'text': 'CPU', 'font': {'size': 18, 'style': 'bold'}},
+        })
+        img = renderer.render({'cpu_temp': 54})
+        basic = renderer.get_font(30).layout_engine == ImageFont.Layout.BASIC
+        self.assertEqual(renderer._elements[0][3] is not None, basic)  # Atlas iff BASIC
+
+        expected = Image.new('RGB', (320, 320), (20, 40, 60))
+        draw = ImageDraw.Draw(expected)
+        draw.text((160, 100), '54°C', fill='#FF8040', font=renderer.get_font(30),
+                  anchor='mm')
+        draw.text((160, 200), 'CPU', fill='#FFFFFF',
+                  font=renderer.get_font(18, bold=True), anchor='mm')
+        self.assertEqual(img.tobytes(), expected.tobytes())
+
+    def test_unsupported_text_uses_freetype(self):
+        renderer = OverlayRenderer()
+        renderer.set_background(Image.new('RGB', (320, 320)))
+        renderer.set_config({'wk': {'x': 160, 'y': 160, 'text': '星期一'}})
+        renderer.render()
+        self.assertIsNone(renderer._elements[0][3])
+
+
+if __name__ == '__main__':
+    unittest.main()
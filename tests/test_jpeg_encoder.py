@@ -0,0 +1,92 @@
+"""Tests for jpeg_encoder – adaptive JPEG stage for HID Type 2 panels."""
+
+import io
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from trcc.jpeg_encoder import (
+    JPEG_QUALITY_DEFAULT,
+    JPEG_QUALITY_MAX,
+    JPEG_QUALITY_MIN,
+    AdaptiveJpegEncoder,
+)
+
+
+def _noise(size=(64, 64), seed=0):
+    """Noisy image — compresses poorly, so quality changes show in size."""
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+
+
+class TestAdaptiveJpegEncoder(unittest.TestCase):
+
+    def test_encodes_valid_jpeg(self):
+        enc = AdaptiveJpegEncoder()
+        data = enc.encode(_noise())
+        img = Image.open(io.BytesIO(data))
+        self.assertEqual(img.format, 'JPEG')
+        self.assertEqual(img.size, (64, 64))
+
+    def test_converts_rgba(self):
+        data = AdaptiveJpegEncoder().encode(Image.new('RGBA', (8, 8), (1, 2, 3, 4)))
+        self.assertEqual(data[:2], b'\xff\xd8')
+
+    def test_no_budget_keeps_settings(self):
+        enc = AdaptiveJpegEncoder()
+        for _ in range(5):
+            enc.encode(_noise())
+        self.assertEqual((enc.quality, enc.subsampling), (JPEG_QUALITY_DEFAULT, 0))
+
+    def test_output_not_affected_by_next_frame(self):
+        """Returned bytes are independent of the reused output buffer."""
+        enc = AdaptiveJpegEncoder()
+        first = enc.encode(_noise(seed=1))
+        copy = bytes(first)
+        enc.encode(Image.new('RGB', (8, 8)))
+        self.assertEqual(first, copy)
+
+    def test_stats(self):
+        enc = AdaptiveJpegEncoder()
+        a = enc.encode(_noise())
+        b = enc.encode(_noise(seed=2))
+        self.assertEqual(enc.stats.frames, 2)
+        self.assertEqual(enc.stats.last_bytes, len(b))
+        self.assertEqual(enc.stats.avg_bytes, (len(a) + len(b)) / 2)
+        self.assertGreater(enc.stats.avg_encode_ms, 0)
+
+    def test_byte_budget_lowers_quality_then_subsampling(self):
+        enc = AdaptiveJpegEncoder(target_bytes=100)  # Unreachable
+        img = _noise()
+        sizes = [len(enc.encode(img)) for _ in range(20)]
+        self.assertEqual(enc.quality, JPEG_QUALITY_MIN)
+        self.assertEqual(enc.subsampling, 2)
+        self.assertLess(sizes[-1], sizes[0])
+
+    def test_byte_budget_recovers_quality(self):
+        enc = AdaptiveJpegEncoder(quality=JPEG_QUALITY_MIN, subsampling=0,
+                                  target_bytes=10_000_000)
+        enc.subsampling = 2  # As if degraded earlier
+        for _ in range(20):
+            enc.encode(_noise())
+        self.assertEqual(enc.subsampling, 0)  # Back to the preferred setting
+        self.assertEqual(enc.quality, JPEG_QUALITY_MAX)
+
+    def test_fps_budget_counts_send_time(self):
+        enc = AdaptiveJpegEncoder(target_fps=30)
+        enc.observe_send_ms(50.0)  # One frame already over 33 ms
+        enc.encode(_noise())
+        self.assertLess(enc.quality, JPEG_QUALITY_DEFAULT)
+
+    def test_set_budget_none_stops_adapting(self):
+        enc = AdaptiveJpegEncoder(target_bytes=100)
+        enc.encode(_noise())
+        quality = enc.quality
+        enc.set_budget()
+        enc.encode(_noise())
+        self.assertEqual(enc.quality, quality)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -217,7 +217,13 @@ class TestLCDDriverGetInfo(unittest.TestCase):
 # ── SCSI read/write ──────────────────────────────────────────────────────────
 
 class TestLCDDriverScsiIO(unittest.TestCase):
-    """Test _scsi_read and _scsi_write methods."""
+    """Test _scsi_read and _scsi_write methods (sg_raw fallback path)."""
+
+    def setUp(self):
+        # No SG_IO fd — exercise the sg_raw subprocess fallback
+        patcher = patch('trcc.lcd_driver.get_sg_transport', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def _make_driver(self, path='/dev/sg0'):
         driver = LCDDriver.__new__(LCDDriver)
@@ -273,6 +279,57 @@ class TestLCDDriverScsiIO(unittest.TestCase):
             driver._scsi_write(b'\x00' * 20, b'\x00')
 
 
+class TestLCDDriverSgIo(unittest.TestCase):
+    """_scsi_read/_scsi_write prefer the persistent SG_IO transport."""
+
+    def _make_driver(self):
+        driver = LCDDriver.__new__(LCDDriver)
+        driver.device_info = _mock_device()
+        driver.device_path = '/dev/sg0'
+        driver.implementation = _mock_implementation()
+        driver.initialized = False
+        return driver
+
+    @patch('trcc.lcd_driver.subprocess.run')
+    @patch('trcc.lcd_driver.get_sg_transport')
+    def test_write_uses_sg_io(self, mock_get, mock_run):
+        transport = MagicMock()
+        transport.write.return_value = True
+        mock_get.return_value = transport
+        driver = self._make_driver()
+        header = driver._build_header(0x101F5, 100)
+        self.assertTrue(driver._scsi_write(header, b'\x00' * 100))
+        transport.write.assert_called_once_with(header[:16], b'\x00' * 100)
+        mock_run.assert_not_called()
+
+    @patch('trcc.lcd_driver.subprocess.run')
+    @patch('trcc.lcd_driver.get_sg_transport')
+    def test_read_uses_sg_io(self, mock_get, mock_run):
+        transport = MagicMock()
+        transport.read.return_value = b'\xBE\xEF'
+        mock_get.return_value = transport
+        driver = self._make_driver()
+        self.assertEqual(driver._scsi_read(b'\x01', 2), b'\xBE\xEF')
+        mock_run.assert_not_called()
+
+    @patch('trcc.lcd_driver.require_sg_raw')
+    @patch('trcc.lcd_driver.os.unlink')
+    @patch('trcc.lcd_driver.subprocess.run')
+    @patch('trcc.lcd_driver.close_sg_transport')
+    @patch('trcc.lcd_driver.get_sg_transport')
+    def test_ioctl_error_falls_back_to_sg_raw(self, mock_get, mock_close,
+                                              mock_run, mock_unlink, _):
+        transport = MagicMock()
+        transport.write.side_effect = OSError(25, 'Inappropriate ioctl')
+        mock_get.return_value = transport
+        mock_run.return_value = MagicMock(returncode=0)
+        driver = self._make_driver()
+        header = driver._build_header(0x101F5, 10)
+        self.assertTrue(driver._scsi_write(header, b'\x00' * 10))
+        mock_close.assert_called_once_with('/dev/sg0')
+        mock_run.assert_called_once()
+
+
 # ── init_device ──────────────────────────────────────────────────────────────
 
 class TestLCDDriverInitDevice(unittest.TestCase):
@@ -337,6 +394,34 @@ class TestLCDDriverLoadImage(unittest.TestCase):
             import os
             os.unlink(tmp_path)
 
+    def test_load_image_matches_per_pixel_conversion(self):
+        """Shared converter output equals the implementation's rgb_to_bytes per pixel."""
+        import os
+        import random
+
+        from PIL import Image
+
+        from trcc.device_implementations import get_implementation
+        driver = self._make_driver()
+        impl = get_implementation('generic')
+        impl.width, impl.height = 24, 16
+        driver.implementation = impl
+        rng = random.Random(3)
+        img = Image.new('RGB', (40, 30))
+        img.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(40 * 30)])
+        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as f:
+            img.save(f, 'PNG')
+            tmp_path = f.name
+        try:
+            data = driver.load_image(tmp_path)
+        finally:
+            os.unlink(tmp_path)
+
+        resized = img.resize((24, 16))
+        expected = b''.join(impl.rgb_to_bytes(*resized.getpixel((x, y)))
+                            for y in range(16) for x in range(24))
+        self.assertEqual(data, expected)
+
     def test_load_image_no_impl_raises(self):
         driver = LCDDriver.__new__(LCDDriver)
         driver.implementation = None
@@ -452,6 +452,28 @@ class TestDeviceModelSend(unittest.TestCase):
         mock_cb.assert_called_once_with(True)
 
 
+    @patch('trcc.device_factory.DeviceProtocolFactory.get_protocol')
+    def test_send_partial_when_supported(self, mock_get):
+        protocol = MagicMock()
+        protocol.supports_partial_update = True
+        mock_get.return_value = protocol
+        model = DeviceModel()
+        model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        model.send_image(b'\x00', 320, 320, [1, 2])
+        protocol.send_image_partial.assert_called_once_with(b'\x00', 320, 320, [1, 2])
+        protocol.send_image.assert_not_called()
+
+    @patch('trcc.device_factory.DeviceProtocolFactory.get_protocol')
+    def test_send_full_when_partial_unsupported(self, mock_get):
+        protocol = MagicMock()
+        protocol.supports_partial_update = False
+        mock_get.return_value = protocol
+        model = DeviceModel()
+        model.selected_device = DeviceInfo(name='LCD', path='/dev/sg0')
+        model.send_image(b'\x00', 320, 320, [1])
+        protocol.send_image.assert_called_once_with(b'\x00', 320, 320)
+
+
 # =============================================================================
 # VideoModel
 # =============================================================================
@@ -472,8 +494,61 @@ class TestVideoModel(unittest.TestCase):
         self.assertEqual(model.state.total_frames, 100)
         self.assertEqual(model.state.fps, 16)
 
+    def test_load_within_budget_preloads(self):
+        model = VideoModel()
+        mock_player = MagicMock(frame_count=10, fps=16, frames=[])
+
+        with patch('trcc.gif_animator.VideoPlayer', return_value=mock_player):
+            model.load(Path('/tmp/test.mp4'))
+
+        mock_player.load_all.assert_called_once()
+        mock_player.start_streaming.assert_not_called()
+        self.assertFalse(model.streaming)
+
+    def test_load_over_budget_streams(self):
+        model = VideoModel()
+        model.set_memory_budget(320 * 320 * 3 * 5)
+        mock_player = MagicMock(frame_count=10, fps=16, frames=[])
+
+        with patch('trcc.gif_animator.VideoPlayer', return_value=mock_player):
+            model.load(Path('/tmp/test.mp4'))
+
+        mock_player.start_streaming.assert_called_once()
+        mock_player.load_all.assert_not_called()
+        self.assertTrue(model.streaming)
+        self.assertEqual(model.frames, [])
+
+        # Reloading stops the old decoder
+        with patch('trcc.gif_animator.VideoPlayer', return_value=MagicMock(frame_count=1, fps=16)):
+            model.load(Path('/tmp/other.mp4'))
+        mock_player.close_stream.assert_called_once()
+
+    def test_streaming_advance_syncs_length(self):
+        model = VideoModel()
+        model._player = MagicMock(frame_count=3)
+        model.streaming = True
+        model.state.total_frames = 5  # Estimate
+        model.state.current_frame = 2
+        model.play()
+
+        model.advance_frame()
+        self.assertEqual(model.state.total_frames, 3)
+        self.assertEqual(model.state.current_frame, 0)
+
+    def test_streaming_unknown_length_counts_up(self):
+        model = VideoModel()
+        model._player = MagicMock(frame_count=0)
+        model.streaming = True
+        model.state.total_frames = 0
+        model.play()
+
+        model.advance_frame()
+        model.advance_frame()
+        self.assertEqual(model.state.current_frame, 2)
+
     def test_load_zt_uses_theme_zt_player(self):
         model = VideoModel()
+        model.lazy_zt = False
         mock_player = MagicMock()
         mock_player.frame_count = 50
         mock_player.fps = 0
@@ -484,6 +559,21 @@ class TestVideoModel(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(model.state.fps, 16)  # Zero fps → default 16
 
+    def test_load_zt_lazy_by_default(self):
+        model = VideoModel()
+        mock_player = MagicMock(frame_count=50, fps=16)
+
+        with patch('trcc.gif_animator.MappedThemeZtPlayer',
+                   return_value=mock_player) as mapped, \
+             patch('trcc.gif_animator.ThemeZtPlayer') as eager:
+            self.assertTrue(model.load(Path('/tmp/test.zt')))
+
+        mapped.assert_called_once()
+        eager.assert_not_called()
+        self.assertTrue(model.streaming)
+        self.assertEqual(model.frames, [])
+        self.assertEqual(model.state.total_frames, 50)
+
     def test_load_failure(self):
         model = VideoModel()
         with patch('trcc.gif_animator.VideoPlayer', side_effect=Exception('bad')):
@@ -553,6 +643,7 @@ class TestVideoModel(unittest.TestCase):
         model.frames = [MagicMock() for _ in range(3)]
         model.advance_frame()
         self.assertEqual(model.state.current_frame, 0)
+        self.assertEqual(model.last_frame_index, 2)
 
     def test_advance_frame_stops_at_end(self):
         model = VideoModel()
@@ -14,6 +14,7 @@ Tests cover:
 import os
 import sys
 import unittest
+from unittest.mock import patch
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -616,6 +617,13 @@ class TestConfigResolution(unittest.TestCase):
 
 class TestResolveFontPath(unittest.TestCase):
 
+    def setUp(self):
+        # Fresh in-memory index: fc-match answers are otherwise remembered
+        from trcc.font_index import FontIndex
+        p = patch('trcc.overlay_renderer.get_font_index', return_value=FontIndex())
+        p.start()
+        self.addCleanup(p.stop)
+
     def test_fc_match_success(self):
         """fc-match returns valid path."""
         renderer = OverlayRenderer()
@@ -666,8 +674,10 @@ class TestResolveFontPath(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             # Create fake font file
             open(os.path.join(tmpdir, 'DejaVuSans.ttf'), 'w').close()
+            from trcc.font_index import FontIndex
             with patch('subprocess.run', side_effect=FileNotFoundError), \
-                 patch('trcc.overlay_renderer.FONT_SEARCH_DIRS', [tmpdir]):
+                 patch('trcc.overlay_renderer.get_font_index',
+                       return_value=FontIndex(dirs=[tmpdir])):
                 result = renderer._resolve_font_path('DejaVu Sans')
             # Should find it in our patched search dir
             if result:
@@ -780,6 +790,221 @@ class TestSetMaskVisible(unittest.TestCase):
         self.assertEqual(img.size, (320, 320))
 
 
+# ── cached background + mask layer ───────────────────────────────────────────
+
+class TestBaseLayerCache(unittest.TestCase):
+
+    def _renderer(self):
+        renderer = OverlayRenderer()
+        renderer.set_background(Image.new('RGB', (320, 320), 'blue'))
+        renderer.set_theme_mask(Image.new('RGBA', (320, 100), (255, 0, 0, 255)))
+        renderer.set_config({'x': {'x': 10, 'y': 10, 'text': 'hi', 'enabled': True}})
+        return renderer
+
+    def test_base_reused_across_renders(self):
+        renderer = self._renderer()
+        renderer.render()
+        base = renderer._base
+        renderer.render({'cpu_temp': 50})
+        self.assertIs(renderer._base, base)
+
+    def test_text_not_drawn_into_base(self):
+        renderer = self._renderer()
+        first = renderer.render()
+        second = renderer.render()
+        self.assertEqual(first.tobytes(), second.tobytes())
+        self.assertNotEqual(renderer._base.tobytes(), first.tobytes())
+
+    def test_setters_invalidate(self):
+        renderer = self._renderer()
+        for change in (
+            lambda: renderer.set_background(Image.new('RGB', (320, 320), 'green')),
+            lambda: renderer.set_theme_mask(Image.new('RGBA', (320, 50), (0, 0, 0, 255))),
+            lambda: renderer.set_mask_visible(False),
+            lambda: renderer.set_config_resolution(480, 480),
+            lambda: renderer.set_scale_enabled(False),
+        ):
+            renderer.render()
+            change()
+            self.assertIsNone(renderer._base)
+
+    def test_mask_visibility_changes_output(self):
+        renderer = self._renderer()
+        self.assertEqual(renderer.render().getpixel((0, 319)), (255, 0, 0))
+        renderer.set_mask_visible(False)
+        self.assertEqual(renderer.render().getpixel((0, 319)), (0, 0, 255))
+
+    def test_direct_assignment_rebuilds(self):
+        """Attributes assigned without a setter are still picked up."""
+        renderer = self._renderer()
+        renderer.render()
+        renderer.background = Image.new('RGB', (320, 320), 'green')
+        renderer.theme_mask = None
+        self.assertEqual(renderer.render().getpixel((0, 319)), (0, 128, 0))
+
+    def test_clear_drops_base(self):
+        renderer = self._renderer()
+        renderer.render()
+        renderer.clear()
+        self.assertIsNone(renderer._base)
+
+
+# ── per-element dirty tracking ───────────────────────────────────────────────
+
+class TestRenderDirty(unittest.TestCase):
+
+    CONFIG = {
+        'label': {'x': 160, 'y': 40, 'text': 'CPU', 'enabled': True},
+        'temp': {'x': 160, 'y': 160, 'metric': 'cpu_temp', 'enabled': True},
+        # Overlaps 'temp' so repainting one must redraw the other
+        'usage': {'x': 170, 'y': 165, 'metric': 'cpu_percent', 'enabled': True,
+                  'color': '#FF0000'},
+    }
+
+    def _renderer(self):
+        renderer = OverlayRenderer()
+        renderer.set_background(Image.new('RGB', (320, 320), (20, 40, 60)))
+        renderer.set_config({k: dict(v) for k, v in self.CONFIG.items()})
+        return renderer
+
+    def _full(self, metrics):
+        return self._renderer().render(metrics)
+
+    def test_first_render_is_full_frame(self):
+        _, dirty = self._renderer().render_dirty({'cpu_temp': 50, 'cpu_percent': 10})
+        self.assertEqual(dirty, [(0, 0, 320, 320)])
+
+    def test_unchanged_metrics_no_dirty(self):
+        renderer = self._renderer()
+        metrics = {'cpu_temp': 50, 'cpu_percent': 10}
+        renderer.render_dirty(metrics)
+        img, dirty = renderer.render_dirty(metrics)
+        self.assertEqual(dirty, [])
+        self.assertEqual(img.tobytes(), self._full(metrics).tobytes())
+
+    def test_changed_metric_dirties_its_bbox_only(self):
+        renderer = self._renderer()
+        renderer.render_dirty({'cpu_temp': 50, 'cpu_percent': 10})
+        _, dirty = renderer.render_dirty({'cpu_temp': 51, 'cpu_percent': 10})
+        self.assertTrue(dirty)
+        for x0, y0, x1, y1 in dirty:
+            self.assertGreater(y0, 60)  # label at y=40 untouched
+
+    def test_partial_matches_full_render(self):
+        renderer = self._renderer()
+        for i in range(12):
+            metrics = {'cpu_temp': 40 + i * 7, 'cpu_percent': (i * 13) % 101}
+            img, _ = renderer.render_dirty(metrics)
+            self.assertEqual(img.tobytes(), self._full(metrics).tobytes(), i)
+
+    def test_returned_image_not_mutated_later(self):
+        renderer = self._renderer()
+        first = renderer.render({'cpu_temp': 50})
+        snapshot = first.tobytes()
+        renderer.render({'cpu_temp': 99})
+        self.assertEqual(first.tobytes(), snapshot)
+
+    def test_unchanged_render_reuses_image(self):
+        """Nothing changed: the previous image is returned, not copied again."""
+        renderer = self._renderer()
+        metrics = {'cpu_temp': 50, 'cpu_percent': 10}
+        first = renderer.render(metrics)
+        serial = renderer.render_serial
+        self.assertIs(renderer.render(metrics), first)
+        self.assertEqual(renderer.render_serial, serial + 1)
+        self.assertIsNot(renderer.render({'cpu_temp': 51, 'cpu_percent': 10}), first)
+
+    def test_config_edit_in_place_redraws(self):
+        renderer = self._renderer()
+        metrics = {'cpu_temp': 50, 'cpu_percent': 10}
+        renderer.render(metrics)
+        renderer.config['label']['x'] = 60
+        img, dirty = renderer.render_dirty(metrics)
+        self.assertEqual(len(dirty), 2)  # old and new position
+        expected = self._renderer()
+        expected.config['label']['x'] = 60
+        self.assertEqual(img.tobytes(), expected.render(metrics).tobytes())
+
+    def test_element_removed_full_redraw(self):
+        renderer = self._renderer()
+        renderer.render()
+        renderer.config['label']['enabled'] = False
+        _, dirty = renderer.render_dirty()
+        self.assertEqual(dirty, [(0, 0, 320, 320)])
+
+    def test_new_background_full_redraw(self):
+        renderer = self._renderer()
+        renderer.render()
+        renderer.set_background(Image.new('RGB', (320, 320), 'white'))
+        img, dirty = renderer.render_dirty()
+        self.assertEqual(dirty, [(0, 0, 320, 320)])
+        self.assertEqual(img.getpixel((0, 0)), (255, 255, 255))
+
+    def test_no_overlay_fast_path(self):
+        renderer = OverlayRenderer()
+        bg = Image.new('RGB', (320, 320), 'blue')
+        renderer.set_background(bg)
+        img, dirty = renderer.render_dirty()
+        self.assertIs(img, bg)
+        self.assertEqual(dirty, [(0, 0, 320, 320)])
+
+
+# ── memoized scaling (mask, scale factor, fonts) ─────────────────────────────
+
+class TestScaledMaskCache(unittest.TestCase):
+
+    def _renderer(self):
+        renderer = OverlayRenderer(480, 480)
+        renderer.set_config_resolution(320, 320)
+        renderer.set_theme_mask(Image.new('RGBA', (320, 100), (255, 0, 0, 255)),
+                                position=(0, 220))
+        return renderer
+
+    def test_mask_resampled_once_across_backgrounds(self):
+        """Video frames rebuild the base but reuse the scaled mask."""
+        renderer = self._renderer()
+        calls = []
+        original = Image.Image.resize
+
+        def counting_resize(img, *args, **kwargs):
+            if img.mode == 'RGBA':  # PIL resamples RGBA via an inner 'RGBa' resize
+                calls.append(img.size)
+            return original(img, *args, **kwargs)
+
+        with patch.object(Image.Image, 'resize', counting_resize):
+            for shade in range(5):
+                renderer.set_background(Image.new('RGB', (480, 480), (shade, 0, 0)))
+                img = renderer.render()
+        self.assertEqual(calls, [(320, 100)])
+        self.assertEqual(img.getpixel((0, 479)), (255, 0, 0))
+        self.assertEqual(img.getpixel((0, 320)), (4, 0, 0))
+
+    def test_new_scale_resamples(self):
+        renderer = self._renderer()
+        renderer.render()
+        first = renderer._get_scaled_mask(renderer.theme_mask, 1.5)
+        renderer.set_config_resolution(240, 240)
+        renderer.render()
+        scaled, pos = renderer._get_scaled_mask(renderer.theme_mask, 2.0)
+        self.assertIsNot(scaled, first[0])
+        self.assertEqual(scaled.size, (640, 200))
+        self.assertEqual(pos, (0, 440))
+
+    def test_scale_factor_tracks_direct_assignment(self):
+        renderer = self._renderer()
+        self.assertAlmostEqual(renderer._get_scale_factor(), 1.5)
+        renderer._config_resolution = (480, 480)
+        self.assertAlmostEqual(renderer._get_scale_factor(), 1.0)
+
+    def test_scaled_font_memoized(self):
+        renderer = self._renderer()
+        with patch.object(renderer, 'get_font', wraps=renderer.get_font) as get_font:
+            a = renderer._get_scaled_font(20, False, None, 1.5)
+            b = renderer._get_scaled_font(20, False, None, 1.5)
+        self.assertIs(a, b)
+        get_font.assert_called_once_with(30, bold=False, font_name=None)
+
+
 # ── fallback format_metric (import failure) ──────────────────────────────────
 
 class TestFallbackFormatMetric(unittest.TestCase):
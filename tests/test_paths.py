@@ -21,6 +21,8 @@ from trcc.paths import (
     ensure_web_masks_extracted,
     find_resource,
     get_device_config,
+    get_saved_baked_playback,
+    get_saved_hid_max_in_flight,
     get_saved_resolution,
     get_saved_temp_unit,
     get_theme_dir,
@@ -28,6 +30,7 @@ from trcc.paths import (
     get_web_masks_dir,
     load_config,
     load_image,
+    save_baked_playback,
     save_config,
     save_device_setting,
     save_resolution,
@@ -197,6 +200,21 @@ class TestTempUnitConfig(unittest.TestCase):
         save_temp_unit(1)
         self.assertEqual(get_saved_temp_unit(), 1)
 
+    def test_baked_playback_default_off(self):
+        self.assertFalse(get_saved_baked_playback())
+
+    def test_hid_max_in_flight_opt_in(self):
+        self.assertIsNone(get_saved_hid_max_in_flight())
+        for value, expected in ((3, 3), (0, None), ('2', None)):
+            save_config({'hid_max_in_flight': value})
+            self.assertEqual(get_saved_hid_max_in_flight(), expected)
+
+    def test_save_baked_playback(self):
+        save_baked_playback(True)
+        self.assertTrue(get_saved_baked_playback())
+        save_baked_playback(False)
+        self.assertFalse(get_saved_baked_playback())
+
 
 class TestDeviceConfigKey(unittest.TestCase):
     """Test device_config_key formatting."""
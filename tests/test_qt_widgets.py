@@ -9,7 +9,7 @@ Tests cover:
 - UCDevice: init, device button creation, selection, about/home signals, DEVICE_IMAGE_MAP
 - UCThemeLocal: init, filter modes, slideshow toggle, theme loading from directory
 - UCAbout: init, autostart helpers, signals
-- qt_app_mvc: detect_language helper
+- qt_app_mvc: detect_language helper, animation tick (video / shm frame source)
 """
 
 import os
@@ -17,7 +17,7 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 # Must set before ANY Qt import
 os.environ['QT_QPA_PLATFORM'] = 'offscreen'
@@ -537,7 +537,12 @@ class TestAutostart(unittest.TestCase):
 # detect_language
 # ============================================================================
 
-from trcc.qt_components.qt_app_mvc import detect_language, LOCALE_TO_LANG
+from trcc.qt_components.qt_app_mvc import (
+    LOCALE_TO_LANG,
+    SHM_POLL_MS,
+    TRCCMainWindowMVC,
+    detect_language,
+)
 
 
 class TestDetectLanguage(unittest.TestCase):
@@ -575,5 +580,69 @@ class TestDetectLanguage(unittest.TestCase):
         self.assertEqual(detect_language(), 'en')
 
 
+# ============================================================================
+# Main window animation tick (video / shared-memory source)
+# ============================================================================
+
+class TestAnimationTick(unittest.TestCase):
+    """The animation timer drives video and an attached shm frame source."""
+
+    def setUp(self):
+        # Only the tick logic: controller and timers stand in for the window
+        self.window = MagicMock()
+        self.ctrl = self.window.controller
+        self.ctrl.is_shm_active.return_value = False
+        self.ctrl.is_video_playing.return_value = True
+
+    def test_video_tick(self):
+        TRCCMainWindowMVC._on_animation_tick(self.window)
+        self.ctrl.video_tick.assert_called_once()
+        self.ctrl.shm_tick.assert_not_called()
+
+    def test_shm_source_polled_instead_of_video(self):
+        self.ctrl.is_shm_active.return_value = True
+        TRCCMainWindowMVC._on_animation_tick(self.window)
+        self.ctrl.shm_tick.assert_called_once()
+        self.ctrl.video_tick.assert_not_called()
+
+    def test_idle_tick_stops_timer(self):
+        self.ctrl.is_video_playing.return_value = False
+        TRCCMainWindowMVC._on_animation_tick(self.window)
+        self.window._animation_timer.stop.assert_called_once()
+
+    def test_set_frame_source_starts_polling(self):
+        self.ctrl.set_shm_source.return_value = True
+        self.assertTrue(TRCCMainWindowMVC.set_frame_source(self.window, '/dev/shm/trcc-x'))
+        self.ctrl.set_shm_source.assert_called_once_with('/dev/shm/trcc-x')
+        self.window._screencast_timer.stop.assert_called_once()
+        self.window._animation_timer.start.assert_called_once_with(SHM_POLL_MS)
+
+    def test_set_frame_source_failure_leaves_timer(self):
+        self.ctrl.set_shm_source.return_value = False
+        self.assertFalse(TRCCMainWindowMVC.set_frame_source(self.window, '/nonexistent'))
+        self.window._animation_timer.start.assert_not_called()
+
+    def test_metrics_tick_does_not_send_over_shm_source(self):
+        """The theme + overlay must not be pushed between ring frames."""
+        self.ctrl.is_shm_active.return_value = True
+        self.ctrl.video.is_playing.return_value = False
+        self.ctrl.auto_send = True
+        with patch('trcc.system_info.get_all_metrics', return_value={}):
+            TRCCMainWindowMVC._on_metrics_tick(self.window)
+        self.ctrl.overlay.update_metrics.assert_called_once_with({})
+        self.ctrl._send_frame_to_lcd.assert_not_called()
+
+        self.ctrl.is_shm_active.return_value = False
+        with patch('trcc.system_info.get_all_metrics', return_value={}):
+            TRCCMainWindowMVC._on_metrics_tick(self.window)
+        self.ctrl._send_frame_to_lcd.assert_called_once()
+
+    def test_detach_stops_polling(self):
+        self.ctrl.is_video_playing.return_value = False
+        self.assertTrue(TRCCMainWindowMVC.set_frame_source(self.window, None))
+        self.ctrl.set_shm_source.assert_called_once_with(None)
+        self.window._animation_timer.stop.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for rgb565 – shared RGB565 converter with fused brightness/rotation."""
+
+import unittest
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+from trcc.rgb565 import BakedFrames, Rgb565Converter, build_lut, image_to_rgb565
+
+
+def _reference(img, brightness=100, rotation=0):
+    """Original PIL + numpy pipeline (controllers / cli.resume before rgb565)."""
+    if brightness < 100:
+        img = ImageEnhance.Brightness(img).enhance(brightness / 100.0)
+    if rotation == 90:
+        img = img.transpose(Image.Transpose.ROTATE_270)
+    elif rotation == 180:
+        img = img.transpose(Image.Transpose.ROTATE_180)
+    elif rotation == 270:
+        img = img.transpose(Image.Transpose.ROTATE_90)
+    arr = np.array(img.convert('RGB'), dtype=np.uint16)
+    r = (arr[:, :, 0] >> 3) & 0x1F
+    g = (arr[:, :, 1] >> 2) & 0x3F
+    b = (arr[:, :, 2] >> 3) & 0x1F
+    return ((r << 11) | (g << 5) | b).astype('>u2').tobytes()
+
+
+def _random_image(w=24, h=16):
+    rng = np.random.default_rng(42)
+    return Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+
+
+class TestRgb565Converter(unittest.TestCase):
+
+    def test_known_pixels(self):
+        img = Image.new('RGB', (2, 1))
+        img.putpixel((0, 0), (255, 0, 0))
+        img.putpixel((1, 0), (0, 0, 255))
+        self.assertEqual(image_to_rgb565(img), b'\xF8\x00\x00\x1F')
+
+    def test_matches_reference_all_modes(self):
+        img = _random_image()
+        for use_lut in (False, True):
+            conv = Rgb565Converter(use_lut=use_lut)
+            for brightness in (25, 50, 100):
+                for rotation in (0, 90, 180, 270):
+                    with self.subTest(lut=use_lut, b=brightness, r=rotation):
+                        self.assertEqual(
+                            conv.to_bytes(img, brightness, rotation),
+                            _reference(img, brightness, rotation))
+
+    def test_rotation_swaps_shape(self):
+        arr = Rgb565Converter().convert(_random_image(24, 16), rotation=90)
+        self.assertEqual(arr.shape, (24, 16))
+
+    def test_rgba_and_palette_input(self):
+        img = _random_image()
+        self.assertEqual(image_to_rgb565(img.convert('RGBA')), _reference(img))
+        pal = img.convert('P')
+        self.assertEqual(image_to_rgb565(pal), _reference(pal))
+
+    def test_ndarray_input(self):
+        img = _random_image()
+        self.assertEqual(image_to_rgb565(np.asarray(img)), _reference(img))
+
+    def test_output_buffer_reused(self):
+        conv = Rgb565Converter()
+        first = conv.convert(_random_image())
+        second = conv.convert(_random_image())
+        self.assertTrue(np.shares_memory(first, second))
+
+    def test_to_bytes_is_independent(self):
+        conv = Rgb565Converter()
+        data = conv.to_bytes(_random_image())
+        conv.convert(Image.new('RGB', (24, 16)))
+        self.assertEqual(data, _reference(_random_image()))
+
+
+class TestBuildLut(unittest.TestCase):
+
+    def test_shape_and_extremes(self):
+        lut = build_lut()
+        self.assertEqual(lut.shape, (3, 256))
+        self.assertEqual(int(lut[0][0] | lut[1][0] | lut[2][0]), 0)
+        self.assertEqual(int(lut[0][255] | lut[1][255] | lut[2][255]), 0xFFFF)
+
+    def test_brightness_dims_white(self):
+        white = Image.new('RGB', (1, 1), (255, 255, 255))
+        lut = build_lut(50)
+        word = np.array([lut[0][255] | lut[1][255] | lut[2][255]], dtype=np.uint16)
+        self.assertEqual(word.tobytes(), _reference(white, 50))
+
+
+class TestBakedFrames(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [_random_image(8, 8), Image.new('RGB', (8, 8), (255, 0, 0))]
+        self.baked = BakedFrames()
+        self.assertTrue(self.baked.configure('v.mp4', 2, 8, 8, 50, 90))
+
+    def test_matches_conversion(self):
+        for i, frame in enumerate(self.frames):
+            self.assertEqual(bytes(self.baked.get(i, frame)), _reference(frame, 50, 90))
+
+    def test_lazy_and_cached(self):
+        self.baked.get(1, self.frames[1])
+        self.assertEqual(self.baked.baked_count, 1)
+        # Second call does not reconvert (image ignored once baked)
+        self.assertEqual(bytes(self.baked.get(1, None)), _reference(self.frames[1], 50, 90))
+
+    def test_slices_share_one_buffer(self):
+        a = self.baked.get(0, self.frames[0])
+        b = self.baked.get(1, self.frames[1])
+        self.assertIs(a.obj, b.obj)
+
+    def test_settings_change_invalidates(self):
+        old = self.baked.get(0, self.frames[0])
+        self.baked.configure('v.mp4', 2, 8, 8, 100, 90)
+        self.assertEqual(self.baked.baked_count, 0)
+        new = self.baked.get(0, self.frames[0])
+        self.assertEqual(bytes(new), _reference(self.frames[0], 100, 90))
+        # Slice handed out earlier still holds the old frame
+        self.assertEqual(bytes(old), _reference(self.frames[0], 50, 90))
+
+    def test_same_settings_keep_cache(self):
+        self.baked.get(0, self.frames[0])
+        self.baked.configure('v.mp4', 2, 8, 8, 50, 90)
+        self.assertEqual(self.baked.baked_count, 1)
+
+    def test_over_budget_refuses(self):
+        baked = BakedFrames(max_bytes=100)
+        self.assertFalse(baked.configure('v.mp4', 2, 8, 8))
+
+    def test_call_limit_below_max_bytes(self):
+        """A per-call limit (streaming budget) tightens max_bytes."""
+        self.assertFalse(self.baked.configure('v.mp4', 2, 8, 8, max_bytes=255))
+        self.assertTrue(self.baked.configure('v.mp4', 2, 8, 8, max_bytes=256))
+
+    def test_wrong_frame_size_raises(self):
+        with self.assertRaises(ValueError):
+            self.baked.get(0, _random_image(4, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
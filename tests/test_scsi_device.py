@@ -8,15 +8,18 @@ from unittest.mock import MagicMock, call, patch
 from trcc.scsi_device import (
     _CHUNK_SIZE,
     _FRAME_CMD_BASE,
+    ScsiSession,
+    _build_frame_table,
     _build_header,
     _crc32,
     _get_frame_chunks,
     _init_device,
-    _initialized_devices,
     _scsi_read,
     _scsi_write,
-    _send_frame,
+    _sessions,
+    close_session,
     find_lcd_devices,
+    get_session,
     send_image_to_device,
 )
 
@@ -124,7 +127,12 @@ class TestGetFrameChunks(unittest.TestCase):
 # ── SCSI read/write ─────────────────────────────────────────────────────────
 
 class TestScsiRead(unittest.TestCase):
-    """Low-level SCSI READ via sg_raw."""
+    """Low-level SCSI READ via sg_raw (no SG_IO fd available)."""
+
+    def setUp(self):
+        patcher = patch('trcc.scsi_device.get_sg_transport', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('trcc.scsi_device.subprocess.run')
     def test_success_returns_stdout(self, mock_run):
@@ -154,7 +162,12 @@ class TestScsiRead(unittest.TestCase):
 
 
 class TestScsiWrite(unittest.TestCase):
-    """Low-level SCSI WRITE via sg_raw with temp file."""
+    """Low-level SCSI WRITE via sg_raw with temp file (no SG_IO fd available)."""
+
+    def setUp(self):
+        patcher = patch('trcc.scsi_device.get_sg_transport', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     @patch('trcc.scsi_device.os.unlink')
     @patch('trcc.scsi_device.subprocess.run')
@@ -181,6 +194,55 @@ class TestScsiWrite(unittest.TestCase):
         mock_unlink.assert_called_once()
 
 
+class TestScsiSgIo(unittest.TestCase):
+    """SG_IO transport is preferred; sg_raw only on open/ioctl failure."""
+
+    @patch('trcc.scsi_device.subprocess.run')
+    @patch('trcc.scsi_device.get_sg_transport')
+    def test_write_uses_transport(self, mock_get, mock_run):
+        transport = MagicMock()
+        transport.write.return_value = True
+        mock_get.return_value = transport
+        header = _build_header(0x101F5, 100)
+        self.assertTrue(_scsi_write('/dev/sg0', header, b'\x01' * 100))
+        transport.write.assert_called_once_with(header[:16], b'\x01' * 100)
+        mock_run.assert_not_called()
+
+    @patch('trcc.scsi_device.subprocess.run')
+    @patch('trcc.scsi_device.get_sg_transport')
+    def test_read_uses_transport(self, mock_get, mock_run):
+        transport = MagicMock()
+        transport.read.return_value = b'\xAA'
+        mock_get.return_value = transport
+        self.assertEqual(_scsi_read('/dev/sg0', b'\x01', 1), b'\xAA')
+        mock_run.assert_not_called()
+
+    @patch('trcc.scsi_device.require_sg_raw')
+    @patch('trcc.scsi_device.os.unlink')
+    @patch('trcc.scsi_device.subprocess.run')
+    @patch('trcc.scsi_device.close_sg_transport')
+    @patch('trcc.scsi_device.get_sg_transport')
+    def test_ioctl_error_falls_back(self, mock_get, mock_close, mock_run, *_):
+        transport = MagicMock()
+        transport.write.side_effect = OSError(25, 'Inappropriate ioctl')
+        mock_get.return_value = transport
+        mock_run.return_value = MagicMock(returncode=0)
+        header = _build_header(0x101F5, 10)
+        self.assertTrue(_scsi_write('/dev/sg0', header, b'\x00' * 10))
+        mock_close.assert_called_once_with('/dev/sg0')
+        mock_run.assert_called_once()
+
+    @patch('trcc.scsi_device._scsi_write')
+    def test_send_frame_passes_memoryview_slices(self, mock_write):
+        data = bytes(range(256)) * (320 * 320 * 2 // 256)
+        session = ScsiSession('/dev/sg0')
+        session.initialized = True
+        session.send_frame(data)
+        chunks = [c[0][2] for c in mock_write.call_args_list]
+        self.assertTrue(all(isinstance(c, memoryview) for c in chunks))
+        self.assertEqual(b''.join(bytes(c) for c in chunks), data)
+
+
 # ── Init device ──────────────────────────────────────────────────────────────
 
 class TestInitDevice(unittest.TestCase):
@@ -199,29 +261,109 @@ class TestInitDevice(unittest.TestCase):
         self.assertEqual(len(write_args[0][2]), 0xE100)
 
 
-# ── Send frame ───────────────────────────────────────────────────────────────
+# ── ScsiSession ──────────────────────────────────────────────────────────────
+
+class TestFrameTable(unittest.TestCase):
 
-class TestSendFrame(unittest.TestCase):
+    def test_matches_chunks_and_headers(self):
+        table = _build_frame_table(480, 480)
+        self.assertEqual([(c, s) for c, s, _ in table], _get_frame_chunks(480, 480))
+        for cmd, size, header in table:
+            self.assertEqual(header, _build_header(cmd, size))
+
+    def test_cached_per_resolution(self):
+        self.assertIs(_build_frame_table(320, 320), _build_frame_table(320, 320))
+
+
+class TestScsiSession(unittest.TestCase):
+
+    def setUp(self):
+        self.session = ScsiSession('/dev/sg0')
+        self.session.initialized = True
 
     @patch('trcc.scsi_device._scsi_write')
     def test_sends_all_chunks(self, mock_write):
         # 320x320 = 4 chunks
-        data = b'\x00' * (320 * 320 * 2)
-        _send_frame('/dev/sg0', data)
+        self.session.send_frame(b'\x00' * (320 * 320 * 2))
         self.assertEqual(mock_write.call_count, 4)
 
+    @patch('trcc.scsi_device._scsi_write')
+    def test_uses_precomputed_headers(self, mock_write):
+        self.session.send_frame(b'\x00' * (320 * 320 * 2))
+        headers = [c[0][1] for c in mock_write.call_args_list]
+        self.assertEqual(headers, [h for _, _, h in _build_frame_table(320, 320)])
+
+    @patch('trcc.scsi_device._build_header')
+    @patch('trcc.scsi_device._scsi_write')
+    def test_no_header_building_per_frame(self, _, mock_build):
+        for _ in range(3):
+            self.session.send_frame(b'\x00' * (320 * 320 * 2))
+        mock_build.assert_not_called()
+
     @patch('trcc.scsi_device._scsi_write')
     def test_pads_short_data(self, mock_write):
-        _send_frame('/dev/sg0', b'\x00' * 100)
+        self.session.send_frame(b'\x01' * 100)
         # Should still send all 4 chunks totaling 320*320*2 bytes
-        total_sent = sum(len(c[0][2]) for c in mock_write.call_args_list)
-        self.assertEqual(total_sent, 320 * 320 * 2)
+        sent = b''.join(bytes(c[0][2]) for c in mock_write.call_args_list)
+        self.assertEqual(len(sent), 320 * 320 * 2)
+        self.assertEqual(sent[:100], b'\x01' * 100)
+        self.assertEqual(sent[100:], bytes(len(sent) - 100))
+
+    @patch('trcc.scsi_device._scsi_write')
+    def test_pad_buffer_cleared_between_frames(self, mock_write):
+        self.session.send_frame(b'\xFF' * 300)
+        mock_write.reset_mock()
+        self.session.send_frame(b'\x01' * 100)
+        sent = b''.join(bytes(c[0][2]) for c in mock_write.call_args_list)
+        self.assertEqual(sent[100:300], bytes(200))
 
     @patch('trcc.scsi_device._scsi_write')
     def test_custom_resolution(self, mock_write):
-        data = b'\x00' * (480 * 480 * 2)
-        _send_frame('/dev/sg0', data, 480, 480)
+        self.session.set_resolution(480, 480)
+        self.session.send_frame(b'\x00' * (480 * 480 * 2))
         self.assertEqual(mock_write.call_count, 8)  # 480x480 = 8 chunks
+        self.assertEqual(self.session.frame_size, 480 * 480 * 2)
+
+    @patch('trcc.scsi_device._build_frame_table', wraps=_build_frame_table)
+    def test_same_resolution_is_noop(self, mock_table):
+        self.session.set_resolution(320, 320)
+        mock_table.assert_not_called()
+
+    @patch('trcc.scsi_device._scsi_write')
+    @patch('trcc.scsi_device._init_device')
+    def test_first_send_initializes_once(self, mock_init, _):
+        session = ScsiSession('/dev/sg1')
+        session.send_frame(b'\x00')
+        session.send_frame(b'\x00')
+        mock_init.assert_called_once_with('/dev/sg1')
+        self.assertTrue(session.initialized)
+
+    @patch('trcc.scsi_device.close_sg_transport')
+    def test_reset_clears_init_and_transport(self, mock_close):
+        self.session.reset()
+        self.assertFalse(self.session.initialized)
+        mock_close.assert_called_once_with('/dev/sg0')
+
+
+class TestSessionRegistry(unittest.TestCase):
+
+    def setUp(self):
+        _sessions.clear()
+
+    def tearDown(self):
+        _sessions.clear()
+
+    def test_same_session_per_path(self):
+        self.assertIs(get_session('/dev/sg0'), get_session('/dev/sg0'))
+        self.assertIsNot(get_session('/dev/sg0'), get_session('/dev/sg1'))
+
+    @patch('trcc.scsi_device.close_sg_transport')
+    def test_close_session_forgets(self, mock_close):
+        session = get_session('/dev/sg0')
+        close_session('/dev/sg0')
+        self.assertNotIn('/dev/sg0', _sessions)
+        self.assertIsNot(get_session('/dev/sg0'), session)
+        mock_close.assert_called_once_with('/dev/sg0')
 
 
 # ── find_lcd_devices ─────────────────────────────────────────────────────────
@@ -287,33 +429,44 @@ class TestFindLCDDevices(unittest.TestCase):
 class TestSendImageToDevice(unittest.TestCase):
 
     def setUp(self):
-        _initialized_devices.clear()
+        _sessions.clear()
+
+    def tearDown(self):
+        _sessions.clear()
 
-    @patch('trcc.scsi_device._send_frame')
+    @patch('trcc.scsi_device._scsi_write')
     @patch('trcc.scsi_device._init_device')
     def test_first_send_initializes(self, mock_init, mock_send):
         result = send_image_to_device('/dev/sg0', b'\x00' * 100, 320, 320)
         self.assertTrue(result)
         mock_init.assert_called_once_with('/dev/sg0')
-        mock_send.assert_called_once()
+        self.assertEqual(mock_send.call_count, 4)
 
-    @patch('trcc.scsi_device._send_frame')
+    @patch('trcc.scsi_device._scsi_write')
     @patch('trcc.scsi_device._init_device')
     def test_second_send_skips_init(self, mock_init, mock_send):
         send_image_to_device('/dev/sg0', b'\x00', 320, 320)
         send_image_to_device('/dev/sg0', b'\x00', 320, 320)
         mock_init.assert_called_once()  # Only once
-        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(mock_send.call_count, 8)
+
+    @patch('trcc.scsi_device._scsi_write')
+    @patch('trcc.scsi_device._init_device')
+    def test_resolution_passed_to_session(self, _, mock_send):
+        send_image_to_device('/dev/sg0', b'\x00', 480, 480)
+        self.assertEqual(mock_send.call_count, 8)
+        self.assertEqual(get_session('/dev/sg0').width, 480)
 
-    @patch('trcc.scsi_device._send_frame', side_effect=Exception('fail'))
+    @patch('trcc.scsi_device.close_sg_transport')
+    @patch('trcc.scsi_device._scsi_write', side_effect=Exception('fail'))
     @patch('trcc.scsi_device._init_device')
-    def test_error_returns_false_and_resets(self, mock_init, _):
+    def test_error_returns_false_and_resets(self, mock_init, *_):
         result = send_image_to_device('/dev/sg0', b'\x00', 320, 320)
         self.assertFalse(result)
-        # Device should be removed from initialized set for re-init
-        self.assertNotIn('/dev/sg0', _initialized_devices)
+        # Session should be marked for re-init
+        self.assertFalse(get_session('/dev/sg0').initialized)
 
-    @patch('trcc.scsi_device._send_frame')
+    @patch('trcc.scsi_device._scsi_write')
     @patch('trcc.scsi_device._init_device', side_effect=Exception('init fail'))
     def test_init_error_returns_false(self, mock_init, _):
         result = send_image_to_device('/dev/sg0', b'\x00', 320, 320)
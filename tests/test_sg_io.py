@@ -0,0 +1,152 @@
+"""Tests for sg_io – native SG_IO transport for /dev/sgX devices."""
+
+import ctypes
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from trcc.sg_io import (
+    SG_DXFER_FROM_DEV,
+    SG_DXFER_NONE,
+    SG_DXFER_TO_DEV,
+    SG_INTERFACE_ID,
+    SgIoHeader,
+    SgIoTransport,
+    _transports,
+    close_all_sg_transports,
+    close_sg_transport,
+    get_sg_transport,
+    is_sg_transport_open,
+)
+
+
+def _fake_ioctl(captured, resid=0, info=0, fill=None):
+    """Build an ioctl stand-in that records the header and simulates the kernel."""
+    def ioctl(fd, request, hdr):
+        captured.append({
+            'direction': hdr.dxfer_direction,
+            'length': hdr.dxfer_len,
+            'cmd': ctypes.string_at(hdr.cmdp, hdr.cmd_len),
+            'payload': ctypes.string_at(hdr.dxferp, hdr.dxfer_len) if hdr.dxferp else b'',
+            'interface_id': hdr.interface_id,
+        })
+        if fill is not None and hdr.dxfer_direction == SG_DXFER_FROM_DEV:
+            ctypes.memmove(hdr.dxferp, fill, len(fill))
+        hdr.resid = resid
+        hdr.info = info
+        return 0
+    return ioctl
+
+
+class _OpenTransportMixin:
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.transport = SgIoTransport(self.path)
+        self.transport.open()
+
+    def tearDown(self):
+        self.transport.close()
+        os.unlink(self.path)
+
+
+class TestSgIoHeader(unittest.TestCase):
+
+    def test_struct_size_matches_kernel_abi(self):
+        expected = 88 if ctypes.sizeof(ctypes.c_void_p) == 8 else 64
+        self.assertEqual(ctypes.sizeof(SgIoHeader), expected)
+
+
+class TestSgIoWrite(_OpenTransportMixin, unittest.TestCase):
+
+    def test_write_sends_cdb_and_payload(self):
+        captured = []
+        with patch('trcc.sg_io.fcntl.ioctl', side_effect=_fake_ioctl(captured)):
+            ok = self.transport.write(b'\x01' * 16, b'\xAB\xCD' * 8)
+        self.assertTrue(ok)
+        self.assertEqual(captured[0]['direction'], SG_DXFER_TO_DEV)
+        self.assertEqual(captured[0]['interface_id'], SG_INTERFACE_ID)
+        self.assertEqual(captured[0]['cmd'], b'\x01' * 16)
+        self.assertEqual(captured[0]['payload'], b'\xAB\xCD' * 8)
+
+    def test_write_accepts_memoryview_slice(self):
+        data = bytes(range(200))
+        captured = []
+        with patch('trcc.sg_io.fcntl.ioctl', side_effect=_fake_ioctl(captured)):
+            self.transport.write(b'\x00' * 16, memoryview(data)[50:150])
+        self.assertEqual(captured[0]['payload'], data[50:150])
+
+    def test_write_empty_payload_is_no_data(self):
+        captured = []
+        with patch('trcc.sg_io.fcntl.ioctl', side_effect=_fake_ioctl(captured)):
+            self.transport.write(b'\x00' * 16, b'')
+        self.assertEqual(captured[0]['direction'], SG_DXFER_NONE)
+
+    def test_write_bad_status_returns_false(self):
+        with patch('trcc.sg_io.fcntl.ioctl', side_effect=_fake_ioctl([], info=1)):
+            self.assertFalse(self.transport.write(b'\x00' * 16, b'\x00'))
+
+    def test_write_on_regular_file_raises_oserror(self):
+        # Real ioctl on a non-sg fd fails with ENOTTY — callers fall back
+        with self.assertRaises(OSError):
+            self.transport.write(b'\x00' * 16, b'\x00' * 4)
+
+    def test_write_when_closed_raises(self):
+        self.transport.close()
+        with self.assertRaises(OSError):
+            self.transport.write(b'\x00' * 16, b'\x00')
+
+
+class TestSgIoRead(_OpenTransportMixin, unittest.TestCase):
+
+    def test_read_returns_transferred_bytes(self):
+        captured = []
+        ioctl = _fake_ioctl(captured, resid=2, fill=b'\x11\x22\x33\x44')
+        with patch('trcc.sg_io.fcntl.ioctl', side_effect=ioctl):
+            data = self.transport.read(b'\xF5' + b'\x00' * 15, 6)
+        self.assertEqual(captured[0]['direction'], SG_DXFER_FROM_DEV)
+        self.assertEqual(captured[0]['length'], 6)
+        self.assertEqual(data, b'\x11\x22\x33\x44')
+
+    def test_read_bad_status_returns_empty(self):
+        with patch('trcc.sg_io.fcntl.ioctl', side_effect=_fake_ioctl([], info=1)):
+            self.assertEqual(self.transport.read(b'\x00' * 16, 8), b'')
+
+
+class TestTransportCache(unittest.TestCase):
+
+    def tearDown(self):
+        close_all_sg_transports()
+
+    def test_missing_node_returns_none(self):
+        self.assertIsNone(get_sg_transport('/dev/does-not-exist-sg99'))
+        self.assertNotIn('/dev/does-not-exist-sg99', _transports)
+
+    def test_empty_path_returns_none(self):
+        self.assertIsNone(get_sg_transport(''))
+
+    def test_same_fd_reused(self):
+        with tempfile.NamedTemporaryFile() as f:
+            first = get_sg_transport(f.name)
+            second = get_sg_transport(f.name)
+            self.assertIsNotNone(first)
+            self.assertIs(first, second)
+            self.assertTrue(is_sg_transport_open(f.name))
+
+    def test_close_forgets_transport(self):
+        with tempfile.NamedTemporaryFile() as f:
+            transport = get_sg_transport(f.name)
+            close_sg_transport(f.name)
+            self.assertFalse(transport.is_open)
+            self.assertFalse(is_sg_transport_open(f.name))
+
+    @patch('trcc.sg_io.SG_IO_AVAILABLE', False)
+    def test_unavailable_platform_returns_none(self):
+        with tempfile.NamedTemporaryFile() as f:
+            self.assertIsNone(get_sg_transport(f.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
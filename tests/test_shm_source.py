@@ -0,0 +1,116 @@
+"""Tests for shm_source – shared-memory frame ring for external renderers."""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from trcc.shm_source import (
+    FORMAT_RGB565,
+    ShmFrameSource,
+    ShmFrameWriter,
+    shm_path,
+)
+
+
+class _RingTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'ring')
+
+    def _writer(self, *args, **kw):
+        writer = ShmFrameWriter(self.path, *args, **kw)
+        self.addCleanup(writer.close)
+        return writer
+
+    def _source(self):
+        source = ShmFrameSource(self.path)
+        self.addCleanup(source.close)
+        return source
+
+
+class TestRing(_RingTest):
+
+    def test_header_read_back(self):
+        self._writer(4, 2, FORMAT_RGB565, slots=4)
+        source = self._source()
+        self.assertEqual(source.size, (4, 2))
+        self.assertEqual((source.format_name, source.slots, source.frame_size),
+                         ('rgb565', 4, 16))
+
+    def test_newest_frame_once(self):
+        writer = self._writer(2, 2)
+        source = self._source()
+        self.assertIsNone(source.latest())
+        writer.write(b'\x01' * 12)
+        writer.write(b'\x02' * 12)
+        seq, view = source.latest()
+        self.assertEqual((seq, bytes(view)), (2, b'\x02' * 12))
+        view.release()
+        self.assertIsNone(source.latest())  # Nothing newer
+        self.assertTrue(source.is_intact(2))
+
+    def test_lapped_frame_is_torn(self):
+        writer = self._writer(1, 1, slots=2)
+        source = self._source()
+        writer.write(b'abc')
+        seq, view = source.latest()
+        view.release()
+        writer.write(b'def')
+        writer.write(b'ghi')  # Reuses the slot of frame 1
+        self.assertFalse(source.is_intact(seq))
+        self.assertEqual(source.torn, 1)
+
+    def test_slot_being_written_skipped(self):
+        writer = self._writer(1, 1)
+        source = self._source()
+        writer.write(b'abc')
+        with open(self.path, 'r+b') as f:  # Writer stopped between steps 1 and 3
+            f.seek(64 + 1 * (16 + 3))
+            f.write(struct.pack('<Q', 0))
+        self.assertIsNone(source.latest())
+
+    def test_wrong_frame_size_rejected(self):
+        writer = self._writer(2, 2)
+        with self.assertRaises(ValueError):
+            writer.write(b'short')
+
+    def test_close_with_live_view(self):
+        writer = self._writer(1, 1)
+        source = ShmFrameSource(self.path)
+        writer.write(b'abc')
+        _, view = source.latest()
+        source.close()  # Must not raise while the view is alive
+        view.release()
+
+
+class TestInvalidRing(_RingTest):
+
+    def test_not_a_ring(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x00' * 128)
+        with self.assertRaises(ValueError):
+            ShmFrameSource(self.path)
+
+    def test_truncated(self):
+        self._writer(8, 8).close()
+        os.truncate(self.path, 100)
+        with self.assertRaises(ValueError):
+            ShmFrameSource(self.path)
+
+    def test_missing(self):
+        with self.assertRaises(OSError):
+            ShmFrameSource(self.path)
+
+
+class TestShmPath(unittest.TestCase):
+
+    def test_name_and_path(self):
+        self.assertTrue(shm_path('dash').endswith('/trcc-dash'))
+        self.assertEqual(shm_path('/tmp/x'), '/tmp/x')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 """Tests for system_info – metric reading helpers and format_metric display."""
 
+import time
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
@@ -25,11 +26,24 @@ from trcc.system_info import (
     get_memory_usage,
     get_network_stats,
     read_file,
+    reset_sampler,
 )
+from trcc.system_info import _nvml_device as _real_nvml_device
+
+
+class _SamplerTestCase(unittest.TestCase):
+    """Fresh sampler caches per test; NVML off unless a test enables it."""
+
+    def setUp(self):
+        reset_sampler()
+        patcher = patch('trcc.system_info._nvml_device', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(reset_sampler)
 
 # ── read_file ────────────────────────────────────────────────────────────────
 
-class TestReadFile(unittest.TestCase):
+class TestReadFile(_SamplerTestCase):
 
     def test_returns_stripped_content(self):
         m = mock_open(read_data="  hello world  \n")
@@ -42,7 +56,7 @@ class TestReadFile(unittest.TestCase):
 
 # ── find_hwmon_by_name ───────────────────────────────────────────────────────
 
-class TestFindHwmon(unittest.TestCase):
+class TestFindHwmon(_SamplerTestCase):
 
     @patch('trcc.system_info.os.path.exists', return_value=True)
     @patch('trcc.system_info.read_file')
@@ -64,7 +78,7 @@ class TestFindHwmon(unittest.TestCase):
 
 # ── get_cpu_temperature ──────────────────────────────────────────────────────
 
-class TestGetCpuTemperature(unittest.TestCase):
+class TestGetCpuTemperature(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file')
     @patch('trcc.system_info.find_hwmon_by_name')
@@ -89,7 +103,7 @@ class TestGetCpuTemperature(unittest.TestCase):
 
 # ── get_cpu_usage ────────────────────────────────────────────────────────────
 
-class TestGetCpuUsage(unittest.TestCase):
+class TestGetCpuUsage(_SamplerTestCase):
 
     def test_reads_proc_stat(self):
         stat_line = "cpu  1000 200 300 8000 100 0 0 0 0 0\n"
@@ -103,7 +117,7 @@ class TestGetCpuUsage(unittest.TestCase):
 
 # ── get_cpu_frequency ────────────────────────────────────────────────────────
 
-class TestGetCpuFrequency(unittest.TestCase):
+class TestGetCpuFrequency(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file', return_value='3500000')
     def test_reads_cpufreq(self, _):
@@ -123,7 +137,7 @@ class TestGetCpuFrequency(unittest.TestCase):
 
 # ── get_memory_usage / get_memory_available ──────────────────────────────────
 
-class TestMemoryMetrics(unittest.TestCase):
+class TestMemoryMetrics(_SamplerTestCase):
 
     def _meminfo(self):
         return (
@@ -149,7 +163,7 @@ class TestMemoryMetrics(unittest.TestCase):
 
 # ── format_metric ────────────────────────────────────────────────────────────
 
-class TestFormatMetric(unittest.TestCase):
+class TestFormatMetric(_SamplerTestCase):
     """format_metric covers temperatures, percentages, frequencies, etc."""
 
     # Temperatures
@@ -270,7 +284,7 @@ class TestFormatMetric(unittest.TestCase):
 
 # ── get_gpu_temperature ──────────────────────────────────────────────────────
 
-class TestGetGpuTemperature(unittest.TestCase):
+class TestGetGpuTemperature(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file', return_value='55000')
     @patch('trcc.system_info.find_hwmon_by_name', return_value='/sys/class/hwmon/hwmon1')
@@ -281,7 +295,7 @@ class TestGetGpuTemperature(unittest.TestCase):
     @patch('trcc.system_info.find_hwmon_by_name', return_value=None)
     @patch('trcc.system_info.subprocess.run')
     def test_nvidia_gpu(self, mock_run, _):
-        mock_run.return_value = type('R', (), {'stdout': '72\n', 'returncode': 0})()
+        mock_run.return_value = type('R', (), {'stdout': '72, 30, 1500\n', 'returncode': 0})()
         temp = get_gpu_temperature()
         self.assertAlmostEqual(temp, 72.0)
 
@@ -294,14 +308,14 @@ class TestGetGpuTemperature(unittest.TestCase):
     @patch('trcc.system_info.find_hwmon_by_name', return_value='/sys/class/hwmon/hwmon1')
     @patch('trcc.system_info.subprocess.run')
     def test_amd_no_temp_falls_through(self, mock_run, mock_find, mock_read):
-        mock_run.return_value = type('R', (), {'stdout': '60\n', 'returncode': 0})()
+        mock_run.return_value = type('R', (), {'stdout': '60, 30, 1500\n', 'returncode': 0})()
         temp = get_gpu_temperature()
         self.assertAlmostEqual(temp, 60.0)
 
 
 # ── get_gpu_usage ────────────────────────────────────────────────────────────
 
-class TestGetGpuUsage(unittest.TestCase):
+class TestGetGpuUsage(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file', return_value='85')
     @patch('trcc.system_info.find_hwmon_by_name', return_value='/sys/class/hwmon/hwmon1')
@@ -312,7 +326,7 @@ class TestGetGpuUsage(unittest.TestCase):
     @patch('trcc.system_info.find_hwmon_by_name', return_value=None)
     @patch('trcc.system_info.subprocess.run')
     def test_nvidia_gpu(self, mock_run, _):
-        mock_run.return_value = type('R', (), {'stdout': '45\n', 'returncode': 0})()
+        mock_run.return_value = type('R', (), {'stdout': '70, 45, 1500\n', 'returncode': 0})()
         usage = get_gpu_usage()
         self.assertAlmostEqual(usage, 45.0)
 
@@ -324,7 +338,7 @@ class TestGetGpuUsage(unittest.TestCase):
 
 # ── get_gpu_clock ────────────────────────────────────────────────────────────
 
-class TestGetGpuClock(unittest.TestCase):
+class TestGetGpuClock(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file', return_value='1500000000')
     @patch('trcc.system_info.find_hwmon_by_name', return_value='/sys/class/hwmon/hwmon1')
@@ -335,7 +349,7 @@ class TestGetGpuClock(unittest.TestCase):
     @patch('trcc.system_info.find_hwmon_by_name', return_value=None)
     @patch('trcc.system_info.subprocess.run')
     def test_nvidia_gpu(self, mock_run, _):
-        mock_run.return_value = type('R', (), {'stdout': '1800\n', 'returncode': 0})()
+        mock_run.return_value = type('R', (), {'stdout': '70, 30, 1800\n', 'returncode': 0})()
         clock = get_gpu_clock()
         self.assertAlmostEqual(clock, 1800.0)
 
@@ -347,7 +361,7 @@ class TestGetGpuClock(unittest.TestCase):
 
 # ── get_memory_temperature ───────────────────────────────────────────────────
 
-class TestGetMemoryTemperature(unittest.TestCase):
+class TestGetMemoryTemperature(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file')
     @patch('trcc.system_info.os.path.exists', return_value=True)
@@ -371,7 +385,7 @@ class TestGetMemoryTemperature(unittest.TestCase):
 
 # ── get_memory_clock ─────────────────────────────────────────────────────────
 
-class TestGetMemoryClock(unittest.TestCase):
+class TestGetMemoryClock(_SamplerTestCase):
 
     @patch('trcc.system_info.subprocess.run')
     def test_dmidecode_configured_speed(self, mock_run):
@@ -395,10 +409,16 @@ class TestGetMemoryClock(unittest.TestCase):
     def test_returns_none_when_unavailable(self, _):
         self.assertIsNone(get_memory_clock())
 
+    @patch('trcc.system_info._find_memory_clock', return_value=None)
+    def test_miss_is_cached(self, mock_find):
+        self.assertIsNone(get_memory_clock())
+        self.assertIsNone(get_memory_clock())
+        mock_find.assert_called_once()
+
 
 # ── get_disk_stats ───────────────────────────────────────────────────────────
 
-class TestGetDiskStats(unittest.TestCase):
+class TestGetDiskStats(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', False)
     def test_no_psutil(self):
@@ -419,7 +439,7 @@ class TestGetDiskStats(unittest.TestCase):
 
 # ── get_disk_temperature ─────────────────────────────────────────────────────
 
-class TestGetDiskTemperature(unittest.TestCase):
+class TestGetDiskTemperature(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file', return_value='38000')
     @patch('trcc.system_info.find_hwmon_by_name', return_value='/sys/class/hwmon/hwmon3')
@@ -436,7 +456,7 @@ class TestGetDiskTemperature(unittest.TestCase):
 
 # ── get_network_stats ────────────────────────────────────────────────────────
 
-class TestGetNetworkStats(unittest.TestCase):
+class TestGetNetworkStats(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', False)
     def test_no_psutil(self):
@@ -457,7 +477,7 @@ class TestGetNetworkStats(unittest.TestCase):
 
 # ── get_fan_speeds ───────────────────────────────────────────────────────────
 
-class TestGetFanSpeeds(unittest.TestCase):
+class TestGetFanSpeeds(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
     @patch('trcc.system_info.psutil')
@@ -482,7 +502,7 @@ class TestGetFanSpeeds(unittest.TestCase):
 
 # ── get_all_metrics ──────────────────────────────────────────────────────────
 
-class TestGetAllMetrics(unittest.TestCase):
+class TestGetAllMetrics(_SamplerTestCase):
 
     @patch('trcc.system_info.get_fan_speeds', return_value={})
     @patch('trcc.system_info.get_network_stats', return_value={})
@@ -524,7 +544,7 @@ class TestGetAllMetrics(unittest.TestCase):
 
 # ── Format dictionaries ─────────────────────────────────────────────────────
 
-class TestFormatConstants(unittest.TestCase):
+class TestFormatConstants(_SamplerTestCase):
 
     def test_time_formats_keys(self):
         self.assertEqual(set(TIME_FORMATS.keys()), {0, 1, 2})
@@ -540,7 +560,7 @@ class TestFormatConstants(unittest.TestCase):
 
 # ── Additional format_metric branches ────────────────────────────────────────
 
-class TestFormatMetricExtra(unittest.TestCase):
+class TestFormatMetricExtra(_SamplerTestCase):
     """Cover date_format 2/3/4, time_format 2, and invalid format fallbacks."""
 
     @patch('trcc.system_info.datetime')
@@ -585,7 +605,7 @@ class TestFormatMetricExtra(unittest.TestCase):
 
 # ── CPU temperature fallback branches ────────────────────────────────────────
 
-class TestCpuTempFallbacks(unittest.TestCase):
+class TestCpuTempFallbacks(_SamplerTestCase):
 
     @patch('trcc.system_info.subprocess.run')
     @patch('trcc.system_info.read_file', return_value=None)
@@ -614,7 +634,7 @@ class TestCpuTempFallbacks(unittest.TestCase):
 
 # ── CPU usage fallback branches ──────────────────────────────────────────────
 
-class TestCpuUsageFallbacks(unittest.TestCase):
+class TestCpuUsageFallbacks(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file', return_value='2.50 1.00 0.50 1/234 5678')
     def test_loadavg_fallback(self, mock_read):
@@ -633,7 +653,7 @@ class TestCpuUsageFallbacks(unittest.TestCase):
 
 # ── Memory temperature lm_sensors fallback ───────────────────────────────────
 
-class TestMemoryTempSensors(unittest.TestCase):
+class TestMemoryTempSensors(_SamplerTestCase):
 
     @patch('trcc.system_info.subprocess.run')
     @patch('trcc.system_info.read_file', return_value=None)
@@ -656,7 +676,7 @@ class TestMemoryTempSensors(unittest.TestCase):
 
 # ── Memory clock fallbacks ───────────────────────────────────────────────────
 
-class TestMemoryClockFallbacks(unittest.TestCase):
+class TestMemoryClockFallbacks(_SamplerTestCase):
 
     @patch('trcc.system_info.os.path.exists', return_value=False)
     @patch('trcc.system_info.subprocess.run')
@@ -683,7 +703,7 @@ class TestMemoryClockFallbacks(unittest.TestCase):
 
 # ── Disk stats delta calculation ─────────────────────────────────────────────
 
-class TestDiskStatsDelta(unittest.TestCase):
+class TestDiskStatsDelta(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
     @patch('trcc.system_info.psutil')
@@ -724,7 +744,7 @@ class TestDiskStatsDelta(unittest.TestCase):
 
 # ── Disk temperature fallbacks ───────────────────────────────────────────────
 
-class TestDiskTempFallbacks(unittest.TestCase):
+class TestDiskTempFallbacks(_SamplerTestCase):
 
     @patch('trcc.system_info.subprocess.run', side_effect=FileNotFoundError)
     @patch('trcc.system_info.read_file', return_value='38000')
@@ -749,7 +769,7 @@ class TestDiskTempFallbacks(unittest.TestCase):
 
 # ── Network stats delta ─────────────────────────────────────────────────────
 
-class TestNetworkStatsDelta(unittest.TestCase):
+class TestNetworkStatsDelta(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
     @patch('trcc.system_info.psutil')
@@ -773,7 +793,7 @@ class TestNetworkStatsDelta(unittest.TestCase):
 
 # ── Fan speeds hwmon fallback ────────────────────────────────────────────────
 
-class TestFanSpeedsHwmon(unittest.TestCase):
+class TestFanSpeedsHwmon(_SamplerTestCase):
 
     @patch('trcc.system_info.read_file')
     @patch('trcc.system_info.os.path.exists')
@@ -803,7 +823,7 @@ class TestFanSpeedsHwmon(unittest.TestCase):
 
 # ── find_hwmon_by_name no match ──────────────────────────────────────────────
 
-class TestFindHwmonNoMatch(unittest.TestCase):
+class TestFindHwmonNoMatch(_SamplerTestCase):
 
     @patch('trcc.system_info.os.path.exists', return_value=True)
     @patch('trcc.system_info.read_file', return_value='nct6775')
@@ -815,7 +835,7 @@ class TestFindHwmonNoMatch(unittest.TestCase):
 
 # ── CPU frequency /proc/cpuinfo fallback ─────────────────────────────────────
 
-class TestCpuFreqFallback(unittest.TestCase):
+class TestCpuFreqFallback(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', False)
     @patch('trcc.system_info.read_file', return_value=None)
@@ -837,7 +857,7 @@ class TestCpuFreqFallback(unittest.TestCase):
 
 # ── Memory fallbacks ─────────────────────────────────────────────────────────
 
-class TestMemoryFallbacks(unittest.TestCase):
+class TestMemoryFallbacks(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', False)
     @patch('builtins.open', unittest.mock.mock_open(
@@ -867,7 +887,7 @@ class TestMemoryFallbacks(unittest.TestCase):
 
 # ── Memory temperature paths ─────────────────────────────────────────────────
 
-class TestMemoryTemperature(unittest.TestCase):
+class TestMemoryTemperature(_SamplerTestCase):
 
     @patch('trcc.system_info.os.path.exists', return_value=True)
     @patch('trcc.system_info.read_file')
@@ -901,7 +921,7 @@ class TestMemoryTemperature(unittest.TestCase):
 
 # ── Memory clock ─────────────────────────────────────────────────────────────
 
-class TestMemoryClock(unittest.TestCase):
+class TestMemoryClock(_SamplerTestCase):
 
     @patch('trcc.system_info.subprocess.run')
     def test_dmidecode_configured_speed(self, mock_run):
@@ -924,7 +944,7 @@ class TestMemoryClock(unittest.TestCase):
 
 # ── Disk activity estimate fallback ──────────────────────────────────────────
 
-class TestDiskActivityEstimate(unittest.TestCase):
+class TestDiskActivityEstimate(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
     @patch('trcc.system_info.psutil')
@@ -958,7 +978,7 @@ class TestDiskActivityEstimate(unittest.TestCase):
 
 # ── Network rate calculation ─────────────────────────────────────────────────
 
-class TestNetworkRates(unittest.TestCase):
+class TestNetworkRates(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
     @patch('trcc.system_info.psutil')
@@ -994,7 +1014,7 @@ class TestNetworkRates(unittest.TestCase):
 
 # ── Fan speed hwmon direct path ──────────────────────────────────────────────
 
-class TestFanSpeedHwmon(unittest.TestCase):
+class TestFanSpeedHwmon(_SamplerTestCase):
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', False)
     @patch('trcc.system_info.os.path.exists', return_value=True)
@@ -1017,7 +1037,7 @@ class TestFanSpeedHwmon(unittest.TestCase):
 
 # ── get_all_metrics None branches ────────────────────────────────────────────
 
-class TestGetAllMetricsNoneBranches(unittest.TestCase):
+class TestGetAllMetricsNoneBranches(_SamplerTestCase):
 
     @patch('trcc.system_info.get_fan_speeds', return_value={})
     @patch('trcc.system_info.get_network_stats', return_value={})
@@ -1050,7 +1070,7 @@ class TestGetAllMetricsNoneBranches(unittest.TestCase):
 
 # ── Targeted coverage: exception / edge paths ────────────────────────────────
 
-class TestMemoryUsageExcept(unittest.TestCase):
+class TestMemoryUsageExcept(_SamplerTestCase):
     """Cover except-Exception and return-None in get_memory_usage."""
 
     def test_open_fails(self):
@@ -1065,7 +1085,7 @@ class TestMemoryUsageExcept(unittest.TestCase):
             self.assertIsNone(get_memory_usage())
 
 
-class TestMemoryTempContinue(unittest.TestCase):
+class TestMemoryTempContinue(_SamplerTestCase):
     """Cover continue when hwmon sensor_name is None (line 258)."""
 
     @patch('trcc.system_info.subprocess.run', side_effect=Exception)
@@ -1084,7 +1104,7 @@ class TestMemoryTempContinue(unittest.TestCase):
         self.assertAlmostEqual(get_memory_temperature(), 41.0)
 
 
-class TestMemoryTempSensorsExcept(unittest.TestCase):
+class TestMemoryTempSensorsExcept(_SamplerTestCase):
     """Cover except-Exception in lm_sensors path (lines 282-283)."""
 
     @patch('trcc.system_info.subprocess.run', side_effect=FileNotFoundError)
@@ -1094,7 +1114,7 @@ class TestMemoryTempSensorsExcept(unittest.TestCase):
         self.assertIsNone(get_memory_temperature())
 
 
-class TestMemoryClockEdacExcept(unittest.TestCase):
+class TestMemoryClockEdacExcept(_SamplerTestCase):
     """Cover except-Exception in EDAC mc section (lines 337-338)."""
 
     @patch('trcc.system_info.os.listdir', side_effect=PermissionError)
@@ -1104,7 +1124,7 @@ class TestMemoryClockEdacExcept(unittest.TestCase):
         self.assertIsNone(get_memory_clock())
 
 
-class TestDiskStatsNoBusyTimeClean(unittest.TestCase):
+class TestDiskStatsNoBusyTimeClean(_SamplerTestCase):
     """Cover else branch for disk_activity estimate (lines 380-381).
 
     Uses plain objects instead of MagicMock to avoid spec/hasattr ambiguity.
@@ -1136,7 +1156,7 @@ class TestDiskStatsNoBusyTimeClean(unittest.TestCase):
             si._prev_disk_time = old_time
 
 
-class TestNetworkStatsExcept(unittest.TestCase):
+class TestNetworkStatsExcept(_SamplerTestCase):
     """Cover except-Exception in get_network_stats (lines 453-454)."""
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
@@ -1146,7 +1166,7 @@ class TestNetworkStatsExcept(unittest.TestCase):
         self.assertEqual(get_network_stats(), {})
 
 
-class TestDiskStatsExcept(unittest.TestCase):
+class TestDiskStatsExcept(_SamplerTestCase):
     """Cover except-Exception in get_disk_stats (lines 380-381)."""
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
@@ -1156,7 +1176,7 @@ class TestDiskStatsExcept(unittest.TestCase):
         self.assertEqual(get_disk_stats(), {})
 
 
-class TestFanSpeedsExceptPaths(unittest.TestCase):
+class TestFanSpeedsExceptPaths(_SamplerTestCase):
     """Cover psutil exception (lines 477-478) and hwmon ValueError (501-502)."""
 
     @patch('trcc.system_info.PSUTIL_AVAILABLE', True)
@@ -1178,7 +1198,7 @@ class TestFanSpeedsExceptPaths(unittest.TestCase):
         self.assertEqual(get_fan_speeds(), {})
 
 
-class TestGetAllMetricsAllPresent(unittest.TestCase):
+class TestGetAllMetricsAllPresent(_SamplerTestCase):
     """Cover not-None assignment branches (lines 540,544,548,560,564,569)."""
 
     @patch('trcc.system_info.get_fan_speeds', return_value={'fan_cpu': 1200.0})
@@ -1206,5 +1226,103 @@ class TestGetAllMetricsAllPresent(unittest.TestCase):
         self.assertIn('fan_cpu', m)
 
 
+
+# ── Sampler caching (NVML, hwmon paths, probed-once fallbacks) ───────────────
+
+def _ok(stdout):
+    return type('R', (), {'stdout': stdout, 'returncode': 0})()
+
+
+class TestNvmlSampler(_SamplerTestCase):
+
+    def test_nvml_preferred_over_nvidia_smi(self):
+        nvml = MagicMock(NVML_TEMPERATURE_GPU=0, NVML_CLOCK_GRAPHICS=0)
+        nvml.nvmlDeviceGetTemperature.return_value = 61
+        nvml.nvmlDeviceGetUtilizationRates.return_value = MagicMock(gpu=33)
+        nvml.nvmlDeviceGetClockInfo.return_value = 1950
+        with patch('trcc.system_info._nvml_device', return_value=object()), \
+             patch.dict('sys.modules', {'pynvml': nvml}), \
+             patch('trcc.system_info.find_hwmon_by_name', return_value=None), \
+             patch('trcc.system_info.subprocess.run') as mock_run:
+            self.assertEqual(get_gpu_temperature(), 61.0)
+            self.assertEqual(get_gpu_usage(), 33.0)
+            self.assertEqual(get_gpu_clock(), 1950.0)
+        mock_run.assert_not_called()
+
+    def test_nvml_handle_opened_once(self):
+        nvml = MagicMock()
+        with patch.dict('sys.modules', {'pynvml': nvml}):
+            h1 = _real_nvml_device()  # The base class patches the module attribute
+            h2 = _real_nvml_device()
+        self.assertIs(h1, h2)
+        nvml.nvmlInit.assert_called_once()
+        nvml.nvmlDeviceGetHandleByIndex.assert_called_once_with(0)
+
+    @patch('trcc.system_info.find_hwmon_by_name', return_value=None)
+    @patch('trcc.system_info.subprocess.run')
+    def test_one_nvidia_smi_fork_for_three_metrics(self, mock_run, _):
+        mock_run.return_value = _ok('70, 40, 1800\n')
+        self.assertEqual(get_gpu_temperature(), 70.0)
+        self.assertEqual(get_gpu_usage(), 40.0)
+        self.assertEqual(get_gpu_clock(), 1800.0)
+        self.assertEqual(mock_run.call_count, 1)
+
+
+class TestFallbackProbing(_SamplerTestCase):
+
+    @patch('trcc.system_info.find_hwmon_by_name', return_value=None)
+    @patch('trcc.system_info.subprocess.run', side_effect=FileNotFoundError)
+    def test_missing_tool_not_forked_again(self, mock_run, _):
+        for _ in range(3):
+            self.assertIsNone(get_disk_temperature())
+        self.assertEqual(mock_run.call_count, 1)
+
+    @patch('trcc.system_info.find_hwmon_by_name', return_value=None)
+    @patch('trcc.system_info.subprocess.run')
+    def test_working_tool_survives_transient_failure(self, mock_run, _):
+        mock_run.return_value = _ok('194 Temperature_Celsius 0x0022 36\n')
+        self.assertEqual(get_disk_temperature(), 36.0)
+        mock_run.return_value = _ok('')
+        self.assertIsNone(get_disk_temperature())
+        mock_run.return_value = _ok('194 Temperature_Celsius 0x0022 37\n')
+        self.assertEqual(get_disk_temperature(), 37.0)
+
+    @patch('trcc.system_info.subprocess.run')
+    def test_memory_clock_looked_up_once(self, mock_run):
+        mock_run.return_value = _ok('Configured Memory Speed: 6000 MT/s\n')
+        self.assertEqual(get_memory_clock(), 6000.0)
+        self.assertEqual(get_memory_clock(), 6000.0)
+        self.assertEqual(mock_run.call_count, 1)
+
+
+class TestHwmonCache(_SamplerTestCase):
+
+    @patch('trcc.system_info.os.path.exists', return_value=True)
+    @patch('trcc.system_info.read_file')
+    def test_path_cached_and_revalidated(self, mock_read, _):
+        names = {'/sys/class/hwmon/hwmon3/name': 'k10temp'}
+        mock_read.side_effect = names.get
+        self.assertEqual(find_hwmon_by_name('k10temp'), '/sys/class/hwmon/hwmon3')
+        mock_read.reset_mock()
+        self.assertEqual(find_hwmon_by_name('k10temp'), '/sys/class/hwmon/hwmon3')
+        mock_read.assert_called_once_with('/sys/class/hwmon/hwmon3/name')
+
+        # Driver reloaded under another index -> rescan
+        names.clear()
+        names['/sys/class/hwmon/hwmon5/name'] = 'k10temp'
+        self.assertEqual(find_hwmon_by_name('k10temp'), '/sys/class/hwmon/hwmon5')
+
+    @patch('trcc.system_info.os.path.exists', return_value=True)
+    @patch('trcc.system_info.read_file', return_value=None)
+    def test_missing_name_not_rescanned_immediately(self, mock_read, _):
+        self.assertIsNone(find_hwmon_by_name('amdgpu'))
+        calls = mock_read.call_count
+        self.assertIsNone(find_hwmon_by_name('amdgpu'))
+        self.assertEqual(mock_read.call_count, calls)
+
+        with patch('trcc.system_info.time.monotonic', return_value=time.monotonic() + 120):
+            find_hwmon_by_name('amdgpu')
+        self.assertGreater(mock_read.call_count, calls)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,154 @@
+"""Tests for virtual_device – loopback DeviceProtocol for benchmarking."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from trcc.core.models import DeviceInfo
+from trcc.device_factory import DeviceProtocolFactory
+from trcc.hid_device import TYPE3_FRAME_TOTAL
+from trcc.virtual_device import (
+    LinkProfile,
+    VirtualLink,
+    VirtualProtocol,
+)
+
+FREE = LinkProfile()  # Unlimited bandwidth, no latency
+
+
+class _VirtualTest(unittest.TestCase):
+
+    def setUp(self):
+        # Handshake / LED cooldown delays are real-device timings
+        for target in ('trcc.hid_device.time.sleep', 'trcc.led_device.time.sleep'):
+            p = patch(target)
+            p.start()
+            self.addCleanup(p.stop)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def _proto(self, *args, **kw):
+        kw.setdefault('profile', FREE)
+        proto = VirtualProtocol(*args, **kw)
+        self.addCleanup(proto.close)
+        return proto
+
+
+class TestScsi(_VirtualTest):
+
+    def test_chunks_and_framebuffer(self):
+        sink = os.path.join(self.dir, 'fb')
+        proto = self._proto('scsi', sink=sink)
+        frame = bytes(range(256)) * 800  # 320x320 RGB565
+        self.assertTrue(proto.send_image(frame, 320, 320))
+        last = proto.frames[-1]
+        # Poll + init on first send, then 4 chunks with a 16-byte CDB each
+        self.assertEqual(last.transfers, 2 + 4)
+        self.assertEqual(last.nbytes, 0xE100 + 4 * 16 + len(frame))
+        proto.close()
+        with open(sink, 'rb') as f:
+            self.assertEqual(f.read(), frame)
+
+    def test_short_frame_padded(self):
+        proto = self._proto('scsi')
+        proto.send_image(b'\x01' * 100, 320, 320)
+        proto.send_image(b'\x01' * 100, 320, 320)
+        self.assertEqual(proto.frames[-1].nbytes, 320 * 320 * 2 + 4 * 16)
+
+    def test_pipe_gets_cdb_and_data(self):
+        fifo = os.path.join(self.dir, 'pipe')
+        os.mkfifo(fifo)
+        received = []
+        reader = threading.Thread(
+            target=lambda: received.append(open(fifo, 'rb').read()))
+        reader.start()
+        proto = VirtualProtocol('scsi', profile=FREE, sink=fifo)
+        proto.send_image(b'\x00' * 8, 2, 2)
+        proto.close()
+        reader.join(2)
+        # Init (0xE100) + CDB (16) + 8 data bytes
+        self.assertEqual(len(received[0]), 0xE100 + 16 + 8)
+
+
+class TestHid(_VirtualTest):
+
+    def test_type2_framing(self):
+        proto = self._proto('hid', device_type=2)
+        self.assertTrue(proto.send_image(b'\xff' * 1000, 320, 320))
+        self.assertTrue(proto.send_image(b'\xff' * 1000, 320, 320))
+        self.assertEqual(proto.frames[-1].nbytes, 1024)  # 20 + 1000 -> 512-aligned
+        self.assertEqual(proto.frames[-1].transfers, 1)
+
+    def test_type3_write_and_ack(self):
+        proto = self._proto('hid', device_type=3)
+        proto.send_image(b'\x00' * 204800, 320, 320)
+        proto.send_image(b'\x00' * 204800, 320, 320)
+        self.assertEqual(proto.frames[-1].transfers, 2)
+        self.assertEqual(proto.frames[-1].nbytes, TYPE3_FRAME_TOTAL)
+
+    def test_async_depth(self):
+        proto = self._proto('hid', device_type=3, max_in_flight=2)
+        for _ in range(4):
+            self.assertTrue(proto.send_image(b'\x00' * 204800, 320, 320))
+        proto.close()  # Flushes frames still in flight
+        self.assertEqual(proto.link.transfers, 2 + 4 * 2)
+
+
+class TestLed(_VirtualTest):
+
+    def test_reports_and_handshake(self):
+        proto = self._proto('led')
+        self.assertEqual(proto.handshake().style.led_count, 31)
+        self.assertTrue(proto.send_led_data([(255, 0, 0)] * 31))
+        # 20 + 93 bytes -> two 64-byte reports
+        self.assertEqual((proto.frames[-1].transfers, proto.frames[-1].nbytes), (2, 128))
+        self.assertFalse(proto.send_image(b'', 1, 1))
+        self.assertTrue(proto.is_led)
+
+
+class TestLink(unittest.TestCase):
+
+    def test_cost_is_latency_plus_bytes(self):
+        link = VirtualLink(LinkProfile(bandwidth=1000, latency=0.01))
+        with patch('trcc.virtual_device.time.sleep') as sleep:
+            link.transfer(b'x' * 490, header=b'y' * 10)
+            link.read(0)
+        self.assertAlmostEqual(sleep.call_args_list[0][0][0], 0.51)
+        self.assertAlmostEqual(link.link_time, 0.52)
+        self.assertEqual((link.transfers, link.bytes), (2, 500))
+
+    def test_stats_and_reset(self):
+        proto = VirtualProtocol('scsi', profile=FREE)
+        proto.send_image(b'\x00' * 8, 2, 2)
+        self.assertEqual(proto.stats.frames, 1)
+        self.assertGreater(proto.stats.avg_frame_ms, 0)
+        self.assertEqual(len(proto.frame_times()), 1)
+        proto.reset_stats()
+        self.assertEqual((proto.stats.frames, proto.link.bytes, len(proto.frames)), (0, 0, 0))
+
+
+class TestFactory(unittest.TestCase):
+
+    def tearDown(self):
+        DeviceProtocolFactory.close_all()
+
+    def test_kind_from_device_info(self):
+        cases = [
+            (DeviceInfo(name='v', path='virtual:0', protocol='virtual'), 'scsi'),
+            (DeviceInfo(name='v', path='virtual:1', protocol='virtual', device_type=3), 'hid'),
+            (DeviceInfo(name='v', path='virtual:2', protocol='virtual',
+                        implementation='hid_led'), 'led'),
+        ]
+        for info, kind in cases:
+            proto = DeviceProtocolFactory.get_protocol(info)
+            self.assertIsInstance(proto, VirtualProtocol)
+            self.assertEqual(proto.kind, kind)
+            self.assertIsNone(proto.link.sink.path)  # Not a filesystem path
+            self.assertTrue(proto.get_info().has_backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
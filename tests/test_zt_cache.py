@@ -0,0 +1,178 @@
+"""Tests for zt_cache – pre-decoded Theme.zt sidecar caches."""
+
+import io
+import os
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PIL import Image
+
+from trcc.gif_animator import MappedThemeZtPlayer, ThemeZtPlayer
+from trcc.zt_cache import (
+    ZtCache,
+    compile_zt_cache,
+    find_zt_cache,
+    open_zt_cache,
+    zt_cache_path,
+)
+
+
+def _write_theme_zt(path, frames=3, size=(8, 8)):
+    """Write a minimal Theme.zt with solid-colour JPEG frames."""
+    blobs = []
+    for i in range(frames):
+        buf = io.BytesIO()
+        Image.new('RGB', size, color=(i * 80, 128, 255 - i * 80)).save(buf, format='JPEG')
+        blobs.append(buf.getvalue())
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Bi', 0xDC, frames))
+        for i in range(frames):
+            f.write(struct.pack('<i', i * 50))
+        for blob in blobs:
+            f.write(struct.pack('<i', len(blob)) + blob)
+
+
+class _ZtDirTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.zt = Path(self._tmp.name) / 'Theme.zt'
+        _write_theme_zt(self.zt)
+
+    def _age_cache(self, path, seconds=-100):
+        """Make *path* older (negative) or newer than the source."""
+        t = os.stat(self.zt).st_mtime + seconds
+        os.utime(path, (t, t))
+
+
+class TestCachePaths(_ZtDirTest):
+
+    def test_path_keyed_by_resolution_and_format(self):
+        self.assertEqual(zt_cache_path(self.zt, (320, 320)).name, 'Theme.zt.320x320.rgb565')
+        self.assertEqual(zt_cache_path(self.zt, (480, 480), 'rgb888').name,
+                         'Theme.zt.480x480.rgb888')
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            zt_cache_path(self.zt, (320, 320), 'yuv')
+
+    def test_find_missing(self):
+        self.assertIsNone(find_zt_cache(self.zt, (8, 8)))
+
+    def test_stale_cache_ignored(self):
+        path = compile_zt_cache(self.zt, (8, 8))
+        self.assertEqual(find_zt_cache(self.zt, (8, 8)), path)
+        self._age_cache(path)
+        self.assertIsNone(find_zt_cache(self.zt, (8, 8)))
+
+    def test_resolutions_side_by_side(self):
+        a = compile_zt_cache(self.zt, (8, 8))
+        b = compile_zt_cache(self.zt, (4, 4))
+        self.assertNotEqual(a, b)
+        self.assertEqual(find_zt_cache(self.zt, (8, 8)), a)
+        self.assertEqual(find_zt_cache(self.zt, (4, 4)), b)
+
+    def test_rgb888_preferred_for_images(self):
+        rgb565 = compile_zt_cache(self.zt, (8, 8), 'rgb565')
+        rgb888 = compile_zt_cache(self.zt, (8, 8), 'rgb888')
+        self.assertEqual(find_zt_cache(self.zt, (8, 8)), rgb888)
+        self.assertEqual(find_zt_cache(self.zt, (8, 8), 'rgb565'), rgb565)
+
+
+class TestCompileAndRead(_ZtDirTest):
+
+    def test_rgb888_roundtrip_matches_player(self):
+        compile_zt_cache(self.zt, (8, 8), 'rgb888')
+        eager = ThemeZtPlayer(str(self.zt))  # No target_size -> JPEG path
+        with ZtCache(zt_cache_path(self.zt, (8, 8), 'rgb888')) as cache:
+            self.assertEqual(cache.frame_count, 3)
+            self.assertEqual(cache.timestamps, [0, 50, 100])
+            self.assertEqual(cache.size, (8, 8))
+            for i in range(3):
+                self.assertEqual(cache.image(i).tobytes(), eager.frames[i].tobytes())
+        eager.close()
+
+    def test_rgb565_fixed_stride(self):
+        path = compile_zt_cache(self.zt, (8, 8))
+        with ZtCache(path) as cache:
+            self.assertEqual(cache.format, 'rgb565')
+            self.assertEqual(cache.frame_size, 8 * 8 * 2)
+            self.assertEqual(len(cache.frame_bytes(2)), 128)
+            r, g, b = cache.image(0).getpixel((0, 0))
+            self.assertLess(abs(g - 128), 8)  # Within RGB565 precision
+            self.assertGreater(b, 240)
+
+    def test_truncated_cache_rejected(self):
+        path = compile_zt_cache(self.zt, (8, 8))
+        with open(path, 'r+b') as f:
+            f.truncate(os.path.getsize(path) - 1)
+        with self.assertRaises(ValueError):
+            ZtCache(path)
+        self.assertIsNone(open_zt_cache(self.zt, (8, 8)))
+
+    def test_no_tmp_left_behind(self):
+        compile_zt_cache(self.zt, (8, 8))
+        self.assertEqual(sorted(p.name for p in self.zt.parent.iterdir()),
+                         ['Theme.zt', 'Theme.zt.8x8.rgb565'])
+
+
+class TestPlayersUseCache(_ZtDirTest):
+
+    def test_eager_player_skips_jpeg_decode(self):
+        compile_zt_cache(self.zt, (8, 8))
+        with patch.object(ThemeZtPlayer, '_read_zt') as read_zt:
+            player = ThemeZtPlayer(str(self.zt), target_size=(8, 8))
+        read_zt.assert_not_called()
+        self.assertEqual(player.frame_count, 3)
+        self.assertEqual(player.delays, [50, 50, 50])
+        player.close()
+
+    def test_eager_player_ignores_stale_cache(self):
+        path = compile_zt_cache(self.zt, (8, 8))
+        self._age_cache(path)
+        with patch.object(ThemeZtPlayer, '_read_zt') as read_zt:
+            ThemeZtPlayer(str(self.zt), target_size=(8, 8))
+        read_zt.assert_called_once()
+
+    def test_mapped_player_reads_cache(self):
+        compile_zt_cache(self.zt, (8, 8), 'rgb888')
+        player = MappedThemeZtPlayer(str(self.zt), target_size=(8, 8))
+        try:
+            self.assertIsNone(player._mm)
+            self.assertEqual(player.frame_count, 3)
+            self.assertEqual(player.get_frame(1).size, (8, 8))
+        finally:
+            player.close()
+
+    def test_mapped_player_device_frames(self):
+        compile_zt_cache(self.zt, (8, 8), 'rgb888')
+        player = MappedThemeZtPlayer(str(self.zt), target_size=(8, 8))
+        self.assertIsNone(player.device_frame(0))  # No RGB565 sidecar
+        player.close()
+
+        compile_zt_cache(self.zt, (8, 8), 'rgb565')
+        player = MappedThemeZtPlayer(str(self.zt), target_size=(8, 8))
+        try:
+            self.assertEqual(player._zt_cache.format, 'rgb888')  # Images
+            with ZtCache(zt_cache_path(self.zt, (8, 8))) as cache:
+                self.assertEqual(bytes(player.device_frame(2)), bytes(cache.frame_bytes(2)))
+            self.assertIsNone(player.device_frame(3))
+        finally:
+            player.close()
+        self.assertIsNone(player.device_frame(0))
+
+    def test_other_resolution_not_used(self):
+        compile_zt_cache(self.zt, (4, 4))
+        player = MappedThemeZtPlayer(str(self.zt), target_size=(8, 8))
+        try:
+            self.assertIsNotNone(player._mm)
+        finally:
+            player.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Microbenchmark: HID frame send path, time and allocations per frame.
+
+Compares the original concatenate-and-pad packet builders against the
+reusable-buffer path in trcc.hid_device, for Type 2 (20-byte header,
+512-aligned JPEG) and Type 3 (fixed 204816 bytes).  Both sides run the
+whole host-side path down to the pyusb call: the legacy packet goes
+through ``PyUsbTransport.write`` as bytes, the new one through
+``send_frame()`` -> ``PyUsbTransport.write`` with a packet-buffer view.
+The USB device is a stand-in that converts its input the way pyusb does
+before handing it to libusb (array.array as is, anything else copied), so
+the copies pyusb would make are counted.  The C# inter-frame sleep is set
+to 0 and the Type 3 ACK arrives immediately, on both sides.  Allocations
+are measured with tracemalloc.
+
+Usage:
+    python tools/bench_hid_packets.py             # default JPEG sizes
+    python tools/bench_hid_packets.py -n 2000     # more iterations
+"""
+import argparse
+import array
+import os
+import struct
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import trcc.hid_device as hid_device  # noqa: E402
+from trcc.hid_device import (  # noqa: E402
+    EP_READ_01,
+    EP_WRITE_02,
+    TYPE3_ACK_SIZE,
+    TYPE3_DATA_SIZE,
+    TYPE3_FRAME_PREFIX,
+    TYPE3_FRAME_TOTAL,
+    HidDeviceType2,
+    HidDeviceType3,
+    PyUsbTransport,
+    _ceil_to_512,
+)
+
+JPEG_SIZES = [20_000, 60_000, 150_000]  # Typical 320x320 / 480x480 JPEG frames
+
+
+def legacy_type2(image_data):
+    """Pre-change Type 2 builder: header + data, then ljust padding."""
+    header = b'\x00' * 16 + struct.pack('<I', len(image_data))
+    raw = header + image_data
+    return raw.ljust(_ceil_to_512(len(raw)), b'\x00')
+
+
+def legacy_type3(image_data):
+    """Pre-change Type 3 builder: prefix + padded/truncated data."""
+    prefix = TYPE3_FRAME_PREFIX + b'\x00\x00\x00\x00' + struct.pack('<I', TYPE3_DATA_SIZE)
+    if len(image_data) < TYPE3_DATA_SIZE:
+        padded = image_data + b'\x00' * (TYPE3_DATA_SIZE - len(image_data))
+    else:
+        padded = image_data[:TYPE3_DATA_SIZE]
+    return prefix + padded
+
+
+class PyUsbLikeDevice:
+    """pyusb Device stand-in: converts data like usb._interop.as_array."""
+
+    def write(self, endpoint, data, timeout=None):
+        if not isinstance(data, array.array):
+            data = array.array('B', data)  # pyusb's copy for non-array input
+        return len(data)
+
+    def read(self, endpoint, length, timeout=None):
+        return array.array('B', bytes(length))
+
+
+def make_transport():
+    """PyUsbTransport (synchronous) over PyUsbLikeDevice."""
+    available, hid_device.PYUSB_AVAILABLE = hid_device.PYUSB_AVAILABLE, True
+    try:
+        transport = PyUsbTransport(0x0416, 0x5302)
+    finally:
+        hid_device.PYUSB_AVAILABLE = available
+    transport._device = PyUsbLikeDevice()
+    transport._is_open = True
+    return transport
+
+
+def bench(fn, n):
+    """(ms per frame, bytes allocated per frame)."""
+    fn()  # Warm up (buffer allocation)
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = (time.perf_counter() - start) / n * 1e3
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for _ in range(10):
+        fn()
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', type=int, default=500, help='iterations per case')
+    args = parser.parse_args()
+
+    hid_device.DELAY_FRAME_TYPE2_S = 0  # Host-side cost only
+    transport = make_transport()
+    type2 = HidDeviceType2(transport)
+    type3 = HidDeviceType3(transport)
+    for handler in (type2, type3):
+        handler._initialized = True
+    # Type 3 reads a 16-byte ACK per frame; keep it out of the comparison
+    transport.read = lambda endpoint, length, timeout=0: bytes(TYPE3_ACK_SIZE)
+
+    # The original send_frame() bodies, around the original builders
+    def legacy_send_type2(data):
+        transferred = transport.write(EP_WRITE_02, legacy_type2(data))
+        time.sleep(hid_device.DELAY_FRAME_TYPE2_S)
+        return transferred > 0
+
+    def legacy_send_type3(data):
+        if transport.write(EP_WRITE_02, legacy_type3(data)) == 0:
+            return False
+        return len(transport.read(EP_READ_01, TYPE3_ACK_SIZE)) > 0
+
+    cases = [(f"type2 {size // 1000}k jpeg", os.urandom(size), legacy_send_type2, type2)
+             for size in JPEG_SIZES]
+    cases.append(("type3 rgb565", os.urandom(TYPE3_DATA_SIZE), legacy_send_type3, type3))
+
+    print(f"{'case':<18} {'legacy ms':>10} {'new ms':>8} {'speedup':>8} "
+          f"{'legacy alloc':>13} {'new alloc':>10}")
+    for name, data, old, handler in cases:
+        t_old, a_old = bench(lambda: old(data), args.n)
+        t_new, a_new = bench(lambda: handler.send_frame(data), args.n)
+        print(f"{name:<18} {t_old:>10.4f} {t_new:>8.4f} {t_old / t_new:>7.1f}x "
+              f"{a_old:>12,}B {a_new:>9,}B")
+    print(f"(type3 packet = {TYPE3_FRAME_TOTAL:,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
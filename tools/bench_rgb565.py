@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-frame RGB565 conversion cost.
+
+Compares the original numpy conversion (widen to uint16, temporaries,
+big-endian copy) against trcc.rgb565.Rgb565Converter, with and without the
+lookup table and with fused brightness + rotation.
+
+Usage:
+    python tools/bench_rgb565.py             # all LCD resolutions
+    python tools/bench_rgb565.py -n 500      # more iterations
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from trcc.rgb565 import Rgb565Converter  # noqa: E402
+
+RESOLUTIONS = [(240, 240), (320, 320), (480, 480), (640, 480)]
+
+
+def legacy(img, brightness=100, rotation=0):
+    """Pre-rgb565.py path: PIL brightness/rotation, then numpy temporaries."""
+    if brightness < 100:
+        img = ImageEnhance.Brightness(img).enhance(brightness / 100.0)
+    if rotation == 90:
+        img = img.transpose(Image.Transpose.ROTATE_270)
+    arr = np.array(img, dtype=np.uint16)
+    r = (arr[:, :, 0] >> 3) & 0x1F
+    g = (arr[:, :, 1] >> 2) & 0x3F
+    b = (arr[:, :, 2] >> 3) & 0x1F
+    return ((r << 11) | (g << 5) | b).astype('>u2').tobytes()
+
+
+def bench(fn, n):
+    fn()  # Warm up (buffer / LUT allocation)
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', type=int, default=200, help='iterations per case')
+    args = parser.parse_args()
+
+    shift = Rgb565Converter()
+    lut = Rgb565Converter(use_lut=True)
+    rng = np.random.default_rng(0)
+
+    print(f"{'resolution':>10}  {'case':<22} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for w, h in RESOLUTIONS:
+        img = Image.fromarray(rng.integers(0, 256, (h, w, 3), dtype=np.uint8))
+        cases = [
+            ('plain (shift)', lambda: legacy(img), lambda: shift.convert(img)),
+            ('plain (lut)', lambda: legacy(img), lambda: lut.convert(img)),
+            ('bright 50 + rot 90', lambda: legacy(img, 50, 90),
+             lambda: shift.convert(img, 50, 90)),
+            ('plain -> bytes', lambda: legacy(img), lambda: shift.to_bytes(img)),
+        ]
+        for name, old, new in cases:
+            t_old = bench(old, args.n)
+            t_new = bench(new, args.n)
+            print(f"{w:>4}x{h:<5}  {name:<22} {t_old:>10.3f} {t_new:>8.3f} "
+                  f"{t_old / t_new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
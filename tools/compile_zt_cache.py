@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Pre-decode Theme.zt animations into sidecar caches (trcc.zt_cache).
+
+Writes Theme.zt.{W}x{H}.{fmt} next to each Theme.zt so the players read
+ready-made frames instead of decoding JPEGs on every load.  Caches for
+different resolutions live side by side.  rgb888 (default) feeds the
+players; add rgb565 to also send frames to the LCD without converting them
+(used with no overlay, 100% brightness and no rotation).
+
+Usage:
+    python tools/compile_zt_cache.py src/data/Theme320320             # every Theme.zt below
+    python tools/compile_zt_cache.py Theme.zt -s 480x480              # one file
+    python tools/compile_zt_cache.py DIR -s 320x320 -s 480x480 -f rgb888 -f rgb565
+    python tools/compile_zt_cache.py DIR --force                      # rebuild fresh caches too
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from trcc.zt_cache import ZT_CACHE_FORMATS, compile_zt_cache, find_zt_cache  # noqa: E402
+
+
+def parse_size(text):
+    try:
+        w, h = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {text!r}")
+    return (w, h)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', type=Path, help='Theme.zt files or directories')
+    parser.add_argument('-s', '--size', type=parse_size, action='append',
+                        help='LCD resolution WxH (repeatable, default 320x320)')
+    parser.add_argument('-f', '--format', choices=list(ZT_CACHE_FORMATS), action='append',
+                        help='pixel format (repeatable, default rgb888)')
+    parser.add_argument('--force', action='store_true', help='rebuild caches that are up to date')
+    args = parser.parse_args()
+
+    sizes = args.size or [(320, 320)]
+    formats = args.format or ['rgb888']
+    sources = []
+    for path in args.paths:
+        sources.extend(sorted(path.rglob('Theme.zt')) if path.is_dir() else [path])
+
+    failed = 0
+    for zt in sources:
+        for size in sizes:
+            for fmt in formats:
+                if not args.force and find_zt_cache(zt, size, fmt):
+                    print(f"[=] {zt} {size[0]}x{size[1]} {fmt}: up to date")
+                    continue
+                try:
+                    compile_zt_cache(zt, size, fmt)
+                except (OSError, ValueError) as e:
+                    print(f"[!] {zt}: {e}")
+                    failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())